@@ -11,6 +11,7 @@
 #
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from datetime import datetime, timedelta, timezone
 from DataClasses import SeriesDescription, SemaphoreSeriesDescription, TimeDescription, Series
@@ -20,12 +21,25 @@ from fastapi.encoders import jsonable_encoder
 import pandas as pd
 import numpy as np
 from contextvars import ContextVar
+from contextlib import asynccontextmanager
+from collections.abc import Iterator
+import json
+from SeriesStorage.ISeriesStorage import dispose_series_storage
+from SeriesStorage.OutputCodec import LazyOutputValue
 import logging
 
 
 load_dotenv()
 
-app = FastAPI(root_path='/semaphore-api',)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """ Each worker shares one db connection pool across all of its requests.
+        The pool is released when the worker shuts down.
+    """
+    yield
+    dispose_series_storage()
+
+app = FastAPI(root_path='/semaphore-api', lifespan=lifespan)
 @app.get('/')
 def read_main():
     return {'message': 'Hello World'}
@@ -104,9 +118,6 @@ async def get_input(source: str, series: str, location: str, fromDateTime: str,
     
     responseSeries = provider.request_input(requestDescription, timeDescription, nowTime)
 
-    # Protect the API's JSON ENCODER from freaking out about floats sneaking from the ingestion class
-    responseSeries.dataFrame['dataValue'] = responseSeries.dataFrame['dataValue'].astype(str)
-
     return serialize_series(responseSeries)
 
 
@@ -195,16 +206,21 @@ async def get_output_statistics_range(modelNames: list[str] = Query(None), fromD
     return serialize_statistics( statistics_results, modelNames, ranged=True)
 
 @app.get('/output_time_span/')
-async def get_outputs_time_span(fromDateTime: str, toDateTime: str, modelNames: list[str] = Query(None)):
+async def get_outputs_time_span(fromDateTime: str, toDateTime: str, modelNames: list[str] = Query(None), 
+                                stream: bool = False, chunkSize: int = 100):
     """
     Queries outputs for a given time range for given models.
     Args:
         - `fromDateTime` (string): "YYYYMMDDHH" Date to start at
         - `toDateTime` (string): "YYYYMMDDHH" Date to end at
         - `modelNames` (string): The name of the model (e.g. "test AI"), you can repeat this parameter to request multiple models
+        - `stream` (bool): Optional. Streams the results as newline delimited JSON instead, for long time ranges
+        - `chunkSize` (int): Optional. The number of predictions per streamed line, only used when streaming
 
     Returns:
         The results for each model index by the model name. If no data can be found for that model for the provided time range the value will be null.
+        When streaming, each line is {"modelName": ..., "series": ...} holding at most chunkSize of the model's predictions,
+        in generated time order. Models without data in the time range have no lines.
     """ 
     try:
         fromDateTime = datetime.strptime(fromDateTime, '%Y%m%d%H').replace(tzinfo=timezone.utc)
@@ -213,6 +229,11 @@ async def get_outputs_time_span(fromDateTime: str, toDateTime: str, modelNames:
         raise HTTPException(status_code=404, detail=f'{e}')
 
     provider = SeriesProvider()
+    if stream:
+        if chunkSize < 1:
+            raise HTTPException(status_code=422, detail='chunkSize must be at least 1')
+        return StreamingResponse(stream_outputs_time_span(provider, modelNames, fromDateTime, toDateTime, chunkSize), media_type='application/x-ndjson')
+
     results = {}
     for modelName in modelNames:
         results[modelName] = serialize_series(provider.request_output('TIME_SPAN', model_name=modelName, from_time=fromDateTime, to_time=toDateTime))
@@ -220,6 +241,15 @@ async def get_outputs_time_span(fromDateTime: str, toDateTime: str, modelNames:
 
 
 
+def stream_outputs_time_span(provider: SeriesProvider, modelNames: list[str], fromDateTime: datetime, toDateTime: datetime, chunkSize: int) -> Iterator[str]:
+    """ Yields one newline delimited JSON line per streamed chunk of each model's outputs, see get_outputs_time_span.
+    Only one chunk is deserialized and serialized at a time, so memory does not grow with the time range.
+    """
+    for modelName in modelNames:
+        for series in provider.request_output('TIME_SPAN_STREAM', model_name=modelName, from_time=fromDateTime, to_time=toDateTime, chunk_size=chunkSize):
+            yield json.dumps({'modelName': modelName, 'series': serialize_series(series)}) + '\n'
+
+
 @app.get('/output/modelName={modelName}/modelVersion={modelVersion}/series={series}/location={location}/fromDateTime={fromDateTime}/toDateTime={toDateTime}')
 async def get_output(modelName: str, modelVersion: str, series: str, location: str, fromDateTime: str, 
                      toDateTime: str, datum: str = None, interval: int = None):
@@ -351,7 +381,7 @@ def serialize_input_series(series: Series) -> dict[any]:
     serialized_data = []
     for _, row in series.dataFrame.iterrows():
         row_dict = {
-            "dataValue":        row['dataValue'],
+            "dataValue":        serialize_input_value(row['dataValue']),
             "dataUnit":         row['dataUnit'],
             "timeVerified":     row['timeVerified'].replace(tzinfo=None),
             "timeGenerated":    row['timeGenerated'].replace(tzinfo=None),
@@ -369,6 +399,21 @@ def serialize_input_series(series: Series) -> dict[any]:
     serialized['_Series__data'] = serialized_data # Add it back to the response
     return serialized
 
+def serialize_input_value(value: any) -> str | None:
+    """ Input values are floats everywhere else (database version 3.11), the API keeps serving them the way
+    astype(str) did before: str() of the value ('25.0', 'nan'), ensembles as the string of their member strings
+    ("['1.0', '2.5']") and None as None.
+    param: value - float | list[float] | str | None The dataValue of an input row.
+    return: The dataValue as a string, or None.
+    """
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if isinstance(value, list):
+        return str([str(member) for member in value])
+    return str(value)
+
 def from_time_in_past(fromDateTime: datetime, now: datetime) -> bool:
     return fromDateTime < now
 
@@ -412,6 +457,10 @@ def serialize_output_series(series: Series) -> dict[any]:
         # Replace NaNs with None and ensure JSON safe types
         row_dict = {}
         for k, v in row.items():
+            # Outputs are selected lazily, this is where their arrays are first needed
+            if isinstance(v, LazyOutputValue):
+                v = v.value
+
             if isinstance(v, list):
                 row_dict[k] = None if pd.isna(v).any() else v
             elif isinstance(v, np.ndarray):
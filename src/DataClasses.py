@@ -17,7 +17,7 @@ from pandas import DataFrame
 def get_input_dataFrame() -> DataFrame:
     """ Constructs a dataframe with the columns Semaphore would expect from a dataframe of inputs.
     The columns are: 
-    - dataValue: The value of the data point - string
+    - dataValue: The value of the data point - float (a list of floats for ensembles), converted to string only by the API
     - dataUnit: The unit of the data point - string
     - timeVerified: The time the data was verified - datetime (non timezone aware but understood to be UTC)
     - timeGenerated: The time the data was generated - datetime (non timezone aware but understood to be UTC)
@@ -20,10 +20,14 @@ from datetime import datetime, timezone
 from urllib.error import HTTPError
 from urllib.request import urlopen
 import json
+from pandas import to_numeric
 
 
 class LIGHTHOUSE(IDataIngestion):
 
+    # Requests are made for a begin and end date, so only the missing parts of a range need to be fetched
+    SUPPORTS_SUB_RANGES = True
+
     
     def __init__(self):
         self.seriesStorage = series_storage_factory()
@@ -144,7 +148,7 @@ class LIGHTHOUSE(IDataIngestion):
             ]
 
         if(len(df) > 0):
-            df['dataValue'] = df['dataValue'].astype(str)
+            df['dataValue'] = to_numeric(df['dataValue'], errors='coerce')
 
             ### Build Series, return data
             resultSeries = Series(seriesDescription, timeDescription)
@@ -146,7 +146,7 @@ class NDBC(IDataIngestion):
                     None,       # lon
                     None        # lat
                 ]
-        df_result['dataValue'] = df_result['dataValue'].astype(str)
+        df_result['dataValue'] = pd.to_numeric(df_result['dataValue'], errors='coerce')
         
         series = Series(seriesDescription, timeDescription)
         series.dataFrame = df_result
@@ -196,9 +196,6 @@ class NDBC(IDataIngestion):
         one_row_df = full_dataFrame.iloc[[-1]].copy()
         one_row_df['dataValue'] = mean_four_max
 
-        # Cast back to string
-        one_row_df['dataValue'].astype(str)
-
         series = Series(seriesDescription, timeDescription)
         series.dataFrame = one_row_df
         return series
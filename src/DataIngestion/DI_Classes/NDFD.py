@@ -29,6 +29,7 @@ from typing import List, Dict, TypeVar, NewType, Tuple, Generic, Callable
 from urllib.error import HTTPError
 import urllib.parse
 from lxml import etree # type: ignore
+from pandas import to_numeric
                        # since lxml has no type hints
 
 from DataIngestion.IDataIngestion import IDataIngestion
@@ -202,7 +203,7 @@ class NDFD(IDataIngestion):
                     continue
 
                 df.loc[len(df)] = [
-                    str(row[dataValueIndex]),                       # dataValue
+                    row[dataValueIndex],                            # dataValue
                     self.__unitMappingDict[NDFD_Predictions.unit],  # dataUnit
                     timeVerified,                                   # timeVerified
                     None,                                           # timeGenerated
@@ -210,7 +211,7 @@ class NDFD(IDataIngestion):
                     NDFD_Predictions.latitude                       # latitude
                 ]
 
-            df['dataValue'] = df['dataValue'].astype(str)
+            df['dataValue'] = to_numeric(df['dataValue'], errors='coerce')
 
             resultSeries = Series(seriesRequest, True)
             resultSeries.dataFrame = df
@@ -283,7 +284,7 @@ class NDFD(IDataIngestion):
         for idx in range(len(windDirection)): 
             xComp = float(windSpeed[idx]['dataValue'])  * cos(radians(float(windDirection[idx]['dataValue']) - offset))
             xCompDF.loc[len(xCompDF)] = [
-                str(xComp),                              # dataValue
+                xComp,                                   # dataValue
                 "mps",                                  # dataUnit
                 windDirection[idx]['timeVerified'],     # timeVerified
                 None,                                   # timeGenerated
@@ -293,7 +294,7 @@ class NDFD(IDataIngestion):
 
             yComp = float(windSpeed[idx]['dataValue'])  * sin(radians(float(windDirection[idx]['dataValue']) - offset))
             yCompDF.loc[len(yCompDF)] = [
-                str(yComp),                              # dataValue
+                yComp,                                   # dataValue
                 "mps",                                  # dataUnit
                 windDirection[idx]['timeVerified'],     # timeVerified
                 None,                                   # timeGenerated
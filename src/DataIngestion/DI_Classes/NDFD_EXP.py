@@ -28,6 +28,7 @@ from typing import List, Dict, TypeVar, NewType, Tuple, Generic, Callable
 from urllib.error import HTTPError
 import urllib.parse
 from lxml import etree # type: ignore
+from pandas import to_numeric
                        # since lxml has no type hints
 
 from DataIngestion.IDataIngestion import IDataIngestion
@@ -221,7 +222,7 @@ class NDFD_EXP(IDataIngestion):
                     continue
 
                 df.loc[len(df)] = [
-                    str(row[dataValueIndex]),                       # dataValue
+                    row[dataValueIndex],                            # dataValue
                     self.__unitMappingDict[NDFD_Predictions.unit],  # dataUnit
                     timeVerified,                                   # timeVerified
                     None,                                           # timeGenerated
@@ -229,7 +230,7 @@ class NDFD_EXP(IDataIngestion):
                     NDFD_Predictions.latitude                       # latitude
                 ]
 
-            df['dataValue'] = df['dataValue'].astype(str)
+            df['dataValue'] = to_numeric(df['dataValue'], errors='coerce')
 
             resultSeries = Series(seriesRequest, timeRequest)
             resultSeries.dataFrame = df
@@ -306,7 +307,7 @@ class NDFD_EXP(IDataIngestion):
         for idx in range(len(windDirection)): 
             xComp = float(windSpeed[idx]['dataValue'])  * cos(radians(float(windDirection[idx]['dataValue']) - offset))
             xCompDF.loc[len(xCompDF)] = [
-                str(xComp),                              # dataValue
+                xComp,                                   # dataValue
                 "mps",                                  # dataUnit
                 windDirection[idx]['timeVerified'],     # timeVerified
                 None,                                   # timeGenerated
@@ -316,7 +317,7 @@ class NDFD_EXP(IDataIngestion):
 
             yComp = float(windSpeed[idx]['dataValue'])  * sin(radians(float(windDirection[idx]['dataValue']) - offset))
             yCompDF.loc[len(yCompDF)] = [
-                str(yComp),                              # dataValue
+                yComp,                                   # dataValue
                 "mps",                                  # dataUnit
                 windDirection[idx]['timeVerified'],     # timeVerified
                 None,                                   # timeGenerated
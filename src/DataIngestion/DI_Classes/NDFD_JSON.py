@@ -91,7 +91,7 @@ class NDFD_JSON(IDataIngestion):
                 if range_time > to_datetime_aware:
                     break # same thing here, continue would be safer but less effective
                 ndfd_df.loc[len(ndfd_df)] = [
-                    str(item['value']),                   # dataValue
+                    float('nan') if item['value'] is None else float(item['value']),  # dataValue, a missing value is a gap
                     data_unit,                            # dataUnit
                     range_time,                           # timeVerified
                 time_generated,                           # timeGenerated
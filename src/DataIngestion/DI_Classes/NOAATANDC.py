@@ -27,7 +27,7 @@ from math import cos, sin
 from noaa_coops import Station
 import re
 import datetime
-from pandas import DataFrame
+from pandas import DataFrame, to_numeric
 from datetime import timezone
 
 
@@ -35,6 +35,9 @@ from datetime import timezone
 
 class NOAATANDC(IDataIngestion):
 
+    # Requests are made for a begin and end date, so only the missing parts of a range need to be fetched
+    SUPPORTS_SUB_RANGES = True
+
     def __init__(self):
         """
         Initialize the NOAA Tides and Currents data ingestion interface.
@@ -209,7 +212,7 @@ class NOAATANDC(IDataIngestion):
                 lat_lon[0]      # latitude
             ]
 
-        df['dataValue'] = df['dataValue'].astype(str)
+        df['dataValue'] = to_numeric(df['dataValue'], errors='coerce')
 
         series = Series(seriesDescription, timeDescription)
         series.dataFrame = df
@@ -249,7 +252,7 @@ class NOAATANDC(IDataIngestion):
                 lat_lon[0]              # Latitude
             ]
 
-        df['dataValue'] = df['dataValue'].astype(str)
+        df['dataValue'] = to_numeric(df['dataValue'], errors='coerce')
 
         series = Series(seriesDescription, timeDescription)
         series.dataFrame = df
@@ -288,7 +291,7 @@ class NOAATANDC(IDataIngestion):
             dt = idx.to_pydatetime().replace(tzinfo=timezone.utc)
             water_level = wlData['v'][idx]
             predictive_water_level = pData['v'][idx]
-            surge = str(float(water_level) - float(predictive_water_level))
+            surge = float(water_level) - float(predictive_water_level)
 
             df.loc[len(df)] = [
                 surge,                  # dataValue
@@ -299,7 +302,7 @@ class NOAATANDC(IDataIngestion):
                 lat_lon[0]              # latitude
             ]
 
-        df['dataValue'] = df['dataValue'].astype(str)
+        df['dataValue'] = to_numeric(df['dataValue'], errors='coerce')
 
         # Surge is datum-less. A datum is required for ingesting water level but we remove it here
         seriesDescription.dataDatum = 'NA'
@@ -342,7 +345,7 @@ class NOAATANDC(IDataIngestion):
                 lat_lon[0]      # latitude
             ]
 
-        df['dataValue'] = df['dataValue'].astype(str)
+        df['dataValue'] = to_numeric(df['dataValue'], errors='coerce')
 
         wnDir_series = Series(seriesDescription, timeDescription)
         wnDir_series.dataFrame = df
@@ -382,7 +385,7 @@ class NOAATANDC(IDataIngestion):
                 lat_lon[0]      # latitude
             ]
 
-        df['dataValue'] = df['dataValue'].astype(str)
+        df['dataValue'] = to_numeric(df['dataValue'], errors='coerce')
 
         wnSpd_series = Series(seriesDescription, timeDescription)
         wnSpd_series.dataFrame = df
@@ -450,8 +453,8 @@ class NOAATANDC(IDataIngestion):
         xCompDesc = SeriesDescription(seriesDescription.dataSource, f'dXWnCmp{str(int(offset)).zfill(3)}D', seriesDescription.dataLocation, seriesDescription.dataDatum)
         yCompDesc = SeriesDescription(seriesDescription.dataSource, f'dYWnCmp{str(int(offset)).zfill(3)}D', seriesDescription.dataLocation, seriesDescription.dataDatum)
 
-        x_df['dataValue'] = x_df['dataValue'].astype(str)
-        y_df['dataValue'] = y_df['dataValue'].astype(str)
+        x_df['dataValue'] = x_df['dataValue'].astype(float)
+        y_df['dataValue'] = y_df['dataValue'].astype(float)
 
         x_series = Series(xCompDesc, timeDescription)
         x_series.dataFrame = x_df
@@ -498,7 +501,7 @@ class NOAATANDC(IDataIngestion):
             lat_lon[0]                      # latitude
         ]
 
-        df['dataValue'] = df['dataValue'].astype(str)
+        df['dataValue'] = to_numeric(df['dataValue'], errors='coerce')
         series = Series(seriesDescription, timeDescription)
         series.dataFrame = df
 
@@ -536,7 +539,7 @@ class NOAATANDC(IDataIngestion):
                 lat_lon[0]              # latitude
             ]
 
-        df['dataValue'] = df['dataValue'].astype(str)
+        df['dataValue'] = to_numeric(df['dataValue'], errors='coerce')
         series = Series(seriesDescription, timeDescription)
         series.dataFrame = df
 
@@ -575,7 +578,7 @@ class NOAATANDC(IDataIngestion):
                 lat_lon[0]              # latitude
             ]
 
-        df['dataValue'] = df['dataValue'].astype(str)
+        df['dataValue'] = to_numeric(df['dataValue'], errors='coerce')
 
         series = Series(seriesDescription, timeDescription)
         series.dataFrame = df
@@ -160,9 +160,8 @@ class TWC(IDataIngestion):
 
         # Get ensemble members shaped (ensemble_member_index, time_index), indexing first value b/c we only requested one prototype (temperature)
         data_buckets: list[list[float]] = response_data['prototypes'][0]['forecast']
-        data_buckets: ndarray[float] = np.array(data_buckets).T     # Transpose to (time_index, ensemble_member_index), easier to work with
-        data_buckets: ndarray[str] = data_buckets.astype(str)       # Cast to string as expected by the input dataFrame
-        data_buckets: list[str] = data_buckets.tolist()
+        data_buckets: ndarray[float] = np.array(data_buckets, dtype=float).T     # Transpose to (time_index, ensemble_member_index), easier to work with
+        data_buckets: list[list[float]] = data_buckets.tolist()
         # Pack data into input dataframe
         out_df = get_input_dataFrame()
         for validation_time, ensemble_data in zip(validation_timestamps, data_buckets):
@@ -21,6 +21,10 @@ from importlib import import_module
 
 class IDataIngestion(ABC):
 
+    # True when ingest_series fetches only the verified times of the time description it is given, so the
+    # series provider can ask for just the missing or stale parts of a request instead of its whole range
+    SUPPORTS_SUB_RANGES = False
+
     @abstractmethod
     def ingest_series(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription) -> Series | None:
         raise NotImplementedError
@@ -30,8 +34,15 @@ def data_ingestion_factory(seriesRequest: SeriesDescription) -> IDataIngestion:
     """Uses the source atribute of a data request to dynamically import a module
         :param seriesRequest: SeriesDescription - A data SeriesDescription object with the information to pull (src/DataManagment/DataClasses>SeriesDescription)
     """
+    return data_ingestion_class(seriesRequest)()
+
+
+def data_ingestion_class(seriesRequest: SeriesDescription) -> type[IDataIngestion]:
+    """Returns the ingestion class for the source of a data request without instantiating it, e.g. to read its capabilities
+        :param seriesRequest: SeriesDescription - A data SeriesDescription object with the information to pull (src/DataManagment/DataClasses>SeriesDescription)
+    """
     try:
-        return getattr(import_module(f'.DI_Classes.{seriesRequest.dataSource}', 'DataIngestion'), f'{seriesRequest.dataSource}')()
+        return getattr(import_module(f'.DI_Classes.{seriesRequest.dataSource}', 'DataIngestion'), f'{seriesRequest.dataSource}')
     except ModuleNotFoundError:
         raise ModuleNotFoundError(f'No module named {seriesRequest.dataSource} in DI_Classes!')
     
\ No newline at end of file
@@ -88,7 +88,6 @@ class EnsemblePandasInterpolation(IDataIntegrity):
         # Here we replace the mistakenly interpolated rows by replacing them with nan. Dropping nans remove the rows and keeps the df clean
         df_ensemble_interpolated[error_mask] = np.nan
         df_ensemble_interpolated.dropna(inplace=True)
-        df_ensemble_interpolated.astype(str)
 
         # The dataframe has changed sizes so we reindex, add the interpolated values, and then ffill the metadata.
         out_df = input_df.reindex(df_ensemble_interpolated.index) 
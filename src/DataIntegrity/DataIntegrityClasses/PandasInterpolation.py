@@ -101,9 +101,6 @@ class PandasInterpolation(IDataIntegrity):
         # Drop rows where 'dataValue' is NaN
         filled_input_df = filled_input_df.dropna(subset=['dataValue'])
 
-        # Convert dataValue back to string
-        filled_input_df['dataValue'] = filled_input_df['dataValue'].astype(str)
-
         # Reset the index to make timeVerified a normal column again
         filled_input_df.reset_index(inplace=True)
 
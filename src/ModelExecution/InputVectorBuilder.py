@@ -20,6 +20,7 @@ from .dspecParser import VectorOrder, Dspec, ExpectedOutputShape
 from utility import log
 from exceptions import Semaphore_Exception
 from typing import Generator
+import numpy as np
 
 class InputVectorBuilder:
 
@@ -117,7 +118,7 @@ class InputVectorBuilder:
 
                 if data is not None:
                     # Cast Data
-                    casted_data = [self.__cast_value(d, dtype) for d in data]
+                    casted_data = self.__cast_values(data, dtype)
 
                     # Concatenate the casted data into the input vector
                     input_vector += casted_data
@@ -126,15 +127,16 @@ class InputVectorBuilder:
             yield input_vector
     
 
-    def __cast_value(self, value: any, dataType: str) -> any:
-        """This function casts the value to the correct type based on the data type specified in the vector order.
-        :param value: any - The value to cast
-        :param dataType: str - The data type to cast the value to
-        :returns: any - The casted value
+    def __cast_values(self, values: list[any], dataType: str) -> list[any]:
+        """This function casts the values to the correct type based on the data type specified in the vector order.
+        Input series already hold float64 values, so the float cast is one vectorized conversion rather than a float() per value.
+        :param values: list[any] - The values to cast
+        :param dataType: str - The data type to cast the values to
+        :returns: list[any] - The casted values
         """
         match dataType:
             case 'float':
-                return float(value)
+                return np.asarray(values, dtype=float).tolist()
             case _:
                 log(f'Input gatherer has no conversion for Unit: {dataType}')
                 raise NotImplementedError
@@ -2,8 +2,8 @@
 #dataGatherer.py
 #----------------------------------
 # Created By: Matthew Kastl
-# Version: 4.0
-# Last Updated: 10/05/2025 by Christian Quintero
+# Version: 4.1
+# Last Updated: 10/18/2026
 #----------------------------------
 """ 
 This file is responsible for gathering the data needed to construct input vectors for the model.
@@ -68,12 +68,31 @@ class DataGatherer:
         return post_processed_series_repository
     
 
+    def prefetch_data(self, dspecs: list[tuple[Dspec, datetime]]) -> None:
+        """
+        Plans the inputs of every dspec of a run before any of them is gathered. The dependent series of all
+        the dspecs are collected and handed to the series provider, which merges the ones for the same series
+        into covering requests and ingests each once (see SeriesProvider.prefetch_inputs). The per dspec
+        requests made by get_data_repository are then answered from the db or the input cache.
+
+        :param dspecs: list[tuple[Dspec, datetime]] - Every dspec of the run with its reference time
+        """
+        requests = [
+            (seriesDescription, timeDescription, referenceTime)
+            for dspec, referenceTime in dspecs
+            for seriesDescription, timeDescription in self.__build_requests(dspec.dependentSeries, referenceTime)
+        ]
+        if requests:
+            coalesced = self.__seriesProvider.prefetch_inputs(requests)
+            log(f'[DataGatherer] Planned {len(requests)} dependent series of {len(dspecs)} dspec(s) as {coalesced} request(s)')
+
+
     def __request_dependent_data(self, dependentSeriesList: list[DependentSeries], referenceTime: datetime, key_to_index: dict[str, list[int]], postProcessCalls: list[PostProcessCall]) -> dict[str, Series]:
         """This method handles the process of requesting the dependant series from the DSPEC. Its requests will be temporally
         referenced from the passed reference time. It will:
             - Build the series description
             - Build the time description
-            - Request the data from the series provider
+            - Request the data for every series from the series provider in one batch
             - Interpolate the data if allowed
             - Reindex the data based on the interval
             - Validate the data
@@ -93,18 +112,18 @@ class DataGatherer:
         
         series_repository: dict[str, Series] = {}
 
-        for dependentSeries in dependentSeriesList:
-            
-            # Build the description objects
-            seriesDescription = self.__build_seriesDescription(dependentSeries)
-            timeDescription = self.__build_timeDescription(dependentSeries, referenceTime)
+        # Build the description objects
+        requests = self.__build_requests(dependentSeriesList, referenceTime)
+
+        # Request the data for every series from Series provider at once, series that don't need
+        # ingestion are all selected in a single round trip
+        requested_series = self.__seriesProvider.request_inputs(requests, referenceTime)
+
+        for dependentSeries, series in zip(dependentSeriesList, requested_series):
 
             # Get the out key for the series
             key = dependentSeries.outKey
 
-            # Request the data from Series provider from its description 
-            series = self.__seriesProvider.request_input(seriesDescription, timeDescription, referenceTime)
-
             # Perform data integrity processing if specified
             if dependentSeries.dataIntegrityCall is not None:
                 # Create an instance of the data integrity class and execute it
@@ -244,6 +263,14 @@ class DataGatherer:
         return series_repository
 
 
+    def __build_requests(self, dependentSeriesList: list[DependentSeries], referenceTime: datetime) -> list[tuple[SeriesDescription, TimeDescription]]:
+        """Builds the (series description, time description) request of every dependent series."""
+        return [
+            (self.__build_seriesDescription(dependentSeries), self.__build_timeDescription(dependentSeries, referenceTime))
+            for dependentSeries in dependentSeriesList
+        ]
+
+
     def __build_seriesDescription(self, dependentSeries: DependentSeries) -> SeriesDescription:
         """This function builds a series description from the dependentSeries object.
         :param dependentSeries: DependentSeries - The dependent series object to build the series description from.
@@ -87,7 +87,6 @@ class ArithmeticOperation(IPostProcessing):
         # Create a new DF to hold the results
         df_result = FIRST_SERIES.dataFrame.copy(deep=True)
         df_result['dataValue'] = out_data
-        df_result['dataValue'] = df_result['dataValue'].astype(str)
 
         # Repack average as new series, reading the key from the arguments obj
         timeDescription = deepcopy(FIRST_SERIES.timeDescription)
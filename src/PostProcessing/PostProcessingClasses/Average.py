@@ -60,10 +60,9 @@ class Average(IPostProcessing):
         df_second = second_series.dataFrame
         df_second['dataValue'] = df_second['dataValue'].astype(float)
 
-        # Copy a place for the result to go, then calculate the item wise average. Finally cast it back to str
+        # Copy a place for the result to go, then calculate the item wise average
         df_result = df_first.copy(deep=True)
         df_result['dataValue'] = (df_first['dataValue'] + df_second['dataValue']) / 2
-        df_result['dataValue'] = df_result['dataValue'].astype(str)
 
 
         # Repack average as new series, reading the key from the arguments obj
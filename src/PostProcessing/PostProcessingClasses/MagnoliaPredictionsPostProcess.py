@@ -72,9 +72,6 @@ class MagnoliaPredictionsPostProcess(IPostProcessing):
         average = (df_magnolia_predHarmFirst['dataValue'] + df_magnolia_predHarmSecond['dataValue']) / 2
         df_result['dataValue'] = df_magnolia_Preds['dataValue'] + average
 
-        # Cast the result back to sting
-        df_result['dataValue'] = df_result['dataValue'].astype(str)
-
         # Repack transformed values in a new Series
         desc = magnolia_Preds.description
 
@@ -79,10 +79,10 @@ class ResolveVectorComponents(IPostProcessing):
 
         # Copy the mag df for the result series
         df_x_result = df_mag.copy(deep=True)
-        df_x_result['dataValue'] = x_comp.astype(str)
+        df_x_result['dataValue'] = x_comp
 
         df_y_result = df_mag.copy(deep=True)
-        df_y_result['dataValue'] = y_comp.astype(str)
+        df_y_result['dataValue'] = y_comp
 
         
         # Repack component vectors as new series, reading the key from the arguments obj
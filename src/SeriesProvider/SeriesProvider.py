@@ -14,12 +14,123 @@
 #
 #Imports
 from SeriesStorage.ISeriesStorage import series_storage_factory
-from DataIngestion.IDataIngestion import data_ingestion_factory
-from DataClasses import Series, SemaphoreSeriesDescription, SeriesDescription, TimeDescription
+from DataIngestion.IDataIngestion import data_ingestion_factory, data_ingestion_class
+from DataClasses import Series, SeriesDescription, TimeDescription
 from exceptions import Semaphore_Ingestion_Exception, Semaphore_Exception
 from utility import log
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import copy_context
+from os import getenv
+from threading import BoundedSemaphore, Lock
 
+from numpy import ndarray, ones
+from pandas import DataFrame, DatetimeIndex, date_range
+
+
+class InputCache(object):
+    """A process-wide singleton that holds the input series selected during a run, so the dspecs of a grouped run
+    (see init_cron.generate_job_groups) that depend on the same series only select and splice it once.
+
+    Entries are keyed by the series (dataSource, dataSeries, dataLocation, dataDatum) and the reference time, and hold
+    the rows selected for a verified time range. A request is served from any entry whose range covers its own,
+    sliced to the requested range. Every verified time keeps its latest generated rows whatever range it was selected
+    in, so the slice holds the same rows select_input would return. Freshness is checked on the sliced rows the same
+    way the storage checks it, so a stale or incomplete slice still goes to ingestion.
+        - Caching only happens between open() and close() (or inside scope()). The orchestrator opens one per
+          run_semaphore call, outside a scope (e.g. the API) every request reads the db.
+        - Entries are dropped when the outermost scope exits.
+        - SEMAPHORE sourced series are never cached, they are the outputs of models in the same run.
+        - Served dataFrames are copies, but ensemble member lists are shared and must not be modified in place.
+    """
+
+    _lock = Lock()
+    _depth = 0
+    _entries: dict[tuple, list[tuple[datetime, datetime, DataFrame]]] = {}
+
+    def __new__(cls):
+        """A singleton constructor that ensures only one instance of the class"""
+        if not hasattr(cls, 'instance'):
+            cls.instance = super(InputCache, cls).__new__(cls)
+        return cls.instance
+
+    @property
+    def active(self) -> bool:
+        return self._depth > 0
+
+    def open(self) -> None:
+        """Starts caching, every open must be matched by a close."""
+        with self._lock:
+            InputCache._depth += 1
+
+    def close(self) -> None:
+        """Ends the scope started by the matching open, the cache is emptied when the outermost scope ends."""
+        with self._lock:
+            InputCache._depth = max(InputCache._depth - 1, 0)
+            if InputCache._depth == 0:
+                self._entries.clear()
+
+    @contextmanager
+    def scope(self) -> Iterator[None]:
+        """Caches the input series requested inside the block, see open and close."""
+        self.open()
+        try:
+            yield
+        finally:
+            self.close()
+
+    def get(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription, referenceTime: datetime) -> tuple[Series, datetime | None, datetime | None] | None:
+        """Returns a cached series covering the requested range, in the shape of ISeriesStorage.select_input_with_freshness.
+            :param seriesDescription: SeriesDescription - The requested series
+            :param timeDescription: TimeDescription - The requested verified time range
+            :param referenceTime: datetime - The reference time of the run
+            :returns tuple[Series, datetime | None, datetime | None] | None - The series, the oldest generated time (tz aware UTC)
+                and the max verified time (tz naive) of its rows, or None when no entry covers the request
+        """
+        if not self.active:
+            return None
+
+        with self._lock:
+            entries = list(self._entries.get(self.__key(seriesDescription, referenceTime), ()))
+
+        for fromDateTime, toDateTime, dataFrame in entries:
+            if fromDateTime <= timeDescription.fromDateTime and timeDescription.toDateTime <= toDateTime:
+                inRange = (dataFrame['timeVerified'] >= timeDescription.fromDateTime) & (dataFrame['timeVerified'] <= timeDescription.toDateTime)
+                series = Series(seriesDescription, timeDescription)
+                series.dataFrame = dataFrame[inRange].reset_index(drop=True)
+
+                if series.dataFrame.empty:
+                    return series, None, None
+                return series, series.dataFrame['timeGenerated'].min(), series.dataFrame['timeVerified'].max().tz_localize(None)
+        return None
+
+    def put(self, series: Series, referenceTime: datetime) -> None:
+        """Caches a series selected for its time description's range, replacing the entries it covers. Does nothing outside a scope.
+            :param series: Series - A series as returned by select_input
+            :param referenceTime: datetime - The reference time of the run
+        """
+        if not self.active:
+            return
+
+        fromDateTime, toDateTime = series.timeDescription.fromDateTime, series.timeDescription.toDateTime
+        key = self.__key(series.description, referenceTime)
+        with self._lock:
+            entries = [
+                entry for entry in self._entries.get(key, [])
+                if not (fromDateTime <= entry[0] and entry[1] <= toDateTime)
+            ]
+            entries.append((fromDateTime, toDateTime, series.dataFrame.copy()))
+            self._entries[key] = entries
+
+    def discard(self, seriesDescription: SeriesDescription, referenceTime: datetime) -> None:
+        """Drops every entry of a series, called once new rows were ingested for it so older selections are not served."""
+        with self._lock:
+            self._entries.pop(self.__key(seriesDescription, referenceTime), None)
+
+    def __key(self, seriesDescription: SeriesDescription, referenceTime: datetime) -> tuple:
+        return (seriesDescription.dataSource, seriesDescription.dataSeries, seriesDescription.dataLocation, seriesDescription.dataDatum, referenceTime)
 
 
 class SeriesProvider():
@@ -27,9 +138,12 @@ class SeriesProvider():
     # class constants
     DEFAULT_ACQUIRE_THRESHOLD = timedelta(hours=1)
     DEFAULT_STALENESS_THRESHOLD = timedelta(hours=7)
+    # More missing or stale sub ranges than this are fetched as one range covering them, see __ingestion_ranges
+    MAX_INGESTION_SUB_RANGES = 4
 
     def __init__(self) -> None:
         self.seriesStorage = series_storage_factory()
+        self.__inputCache = InputCache()
     
     
     def request_input(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription, referenceTime: datetime) -> Series:
@@ -41,9 +155,6 @@ class SeriesProvider():
         """
         log(f'\nInit input request from \t{seriesDescription}\t{timeDescription}')
 
-        # assume we have not ingested data yet
-        already_ingested_data = False
-
         # If the data source is from the semaphore ingestion class, we ignore the default behavior and always request new data.
         if seriesDescription.dataSource.upper() == 'SEMAPHORE':
             return self.__data_ingestion_query(seriesDescription, timeDescription)
@@ -51,23 +162,199 @@ class SeriesProvider():
         # We request new data if:
         #   - The data in the db is stale.
         #   - We can get more verified times for the requested range.
+        # The rows and both checks come back from a single storage call, so on the common fresh path
+        # the rows are returned as is without another trip to the db.
+        # Another dspec of the run may already have selected a range covering this one, see InputCache
+        cached = self.__inputCache.get(seriesDescription, timeDescription, referenceTime)
+        if cached is not None:
+            log(f'Input cache hit...')
+            series, oldestGeneratedTime, maxVerifiedTime = cached
+        else:
+            # The ingestion ledger is not read here, for a single request it would add a round trip, see request_inputs
+            log(f'Init DB Query...')
+            series, oldestGeneratedTime, maxVerifiedTime = self.seriesStorage.select_input_with_freshness(seriesDescription, timeDescription)
 
-        # always call the db freshness check to ensure we aren't using old data
-        db_is_fresh = self.db_has_freshly_acquired_data(seriesDescription, timeDescription, referenceTime)
-        if not db_is_fresh:
-            self.__data_ingestion_query(seriesDescription, timeDescription)
-            already_ingested_data = True
+        db_is_fresh = self.__is_fresh(oldestGeneratedTime, timeDescription, referenceTime)
+        if db_is_fresh and not self.__verified_time_needs_ingestion(maxVerifiedTime, timeDescription):
+            if cached is None:
+                self.__inputCache.put(series, referenceTime)
+            return series
 
-        # if we haven't ingested due to staleness, check verified time ingestion
-        if not already_ingested_data:
-            should_ingest_for_verified_time = self.__check_verified_time_for_ingestion(seriesDescription, timeDescription)
-            if should_ingest_for_verified_time:
-                self.__data_ingestion_query(seriesDescription, timeDescription)
+        return self.__ingest_and_select(seriesDescription, timeDescription, referenceTime, self.__needed_from_rows(timeDescription, series, referenceTime))
 
-        return self.__data_base_query(seriesDescription, timeDescription)
-    
+    def request_inputs(self, requests: list[tuple[SeriesDescription, TimeDescription]], referenceTime: datetime) -> list[Series]:
+        """This method returns the same series request_input would for every request, resolving them together.
+            Every request that can be answered from the db is selected with its freshness checks in one storage call
+            (see ISeriesStorage.select_inputs_with_freshness). Only the requests that need ingestion, because they are
+            SEMAPHORE sourced, stale or missing verified times, fall back to ingesting and querying the db on their own.
+            When more than one request goes to the db, the ingestion ledger is read for all of them in one round trip first.
+            Requests whose series have entries are decided by them instead, and selected together without the freshness
+            checks when the ledger shows they are fresh (see __ledger_decision).
+            Inside an InputCache scope, requests covered by a series another dspec of the run already selected are
+            resolved from the cache instead of the db.
+            :param requests: list[tuple[SeriesDescription, TimeDescription]] - The wanted series and their temporal information
+            :param referenceTime - The time of execution
+            :returns list[Series] - The series in the same order as the requests
+        """
+        log(f'\nInit batched input request for {len(requests)} series')
+
+        series: list[Series | None] = [None] * len(requests)
+
+        # SEMAPHORE series are always ingested, requests covered by the input cache skip the db
+        semaphoreRequestIndexes = []
+        dbRequestIndexes = []
+        resolved: dict[int, tuple[Series, datetime | None, datetime | None]] = {}
+        for requestIndex, (seriesDescription, timeDescription) in enumerate(requests):
+            if seriesDescription.dataSource.upper() == 'SEMAPHORE':
+                semaphoreRequestIndexes.append(requestIndex)
+                continue
+
+            cached = self.__inputCache.get(seriesDescription, timeDescription, referenceTime)
+            if cached is not None:
+                resolved[requestIndex] = cached
+            else:
+                dbRequestIndexes.append(requestIndex)
+
+        cachedRequestIndexes = set(resolved)
+        if cachedRequestIndexes:
+            log(f'Input cache hit for {len(cachedRequestIndexes)} of {len(requests)} series')
+
+        # Requests whose series have ingestion ledger entries are decided by them without scanning the rows,
+        # the rest are selected with their freshness checks. A lone request is only scanned, the ledger lookup
+        # would be a second round trip without saving one.
+        staleRequestIndexes = []
+        neededTimes: dict[int, tuple[DatetimeIndex, ndarray] | None] = {}
+        scanRequestIndexes = list(dbRequestIndexes)
+        ledgerRequestIndexes = []
+        if len(dbRequestIndexes) > 1:
+            scanRequestIndexes = []
+            ledger = self.__fetch_ledger([requests[requestIndex] for requestIndex in dbRequestIndexes])
+            for batchIndex, requestIndex in enumerate(dbRequestIndexes):
+                if batchIndex not in ledger:
+                    scanRequestIndexes.append(requestIndex)
+                    continue
+
+                seriesDescription, timeDescription = requests[requestIndex]
+                answered, neededTimes[requestIndex] = self.__ledger_decision(timeDescription, ledger[batchIndex], referenceTime)
+                if answered:
+                    ledgerRequestIndexes.append(requestIndex)
+                else:
+                    log(f'Batched request needs ingestion by the ingestion ledger \t{seriesDescription}\t{timeDescription}')
+                    staleRequestIndexes.append(requestIndex)
+
+        if ledgerRequestIndexes:
+            log(f'Init batched DB Query for {len(ledgerRequestIndexes)} series fresh by the ingestion ledger...')
+            results = self.seriesStorage.select_inputs([requests[requestIndex] for requestIndex in ledgerRequestIndexes])
+            for batchIndex, requestIndex in enumerate(ledgerRequestIndexes):
+                series[requestIndex] = results[batchIndex]
+                self.__inputCache.put(results[batchIndex], referenceTime)
+
+        if scanRequestIndexes:
+            log(f'Init batched DB Query...')
+            results = self.seriesStorage.select_inputs_with_freshness([requests[requestIndex] for requestIndex in scanRequestIndexes])
+            for batchIndex, requestIndex in enumerate(scanRequestIndexes):
+                resolved[requestIndex] = results[batchIndex]
+
+        for requestIndex in sorted(resolved):
+            seriesDescription, timeDescription = requests[requestIndex]
+            dbSeries, oldestGeneratedTime, maxVerifiedTime = resolved[requestIndex]
 
-    def request_output(self, method: str, **kwargs) -> Series | list[Series] | None:
+            db_is_fresh = self.__is_fresh(oldestGeneratedTime, timeDescription, referenceTime)
+            if db_is_fresh and not self.__verified_time_needs_ingestion(maxVerifiedTime, timeDescription):
+                series[requestIndex] = dbSeries
+                if requestIndex not in cachedRequestIndexes:
+                    self.__inputCache.put(dbSeries, referenceTime)
+                continue
+
+            log(f'Batched request needs ingestion \t{seriesDescription}\t{timeDescription}')
+            staleRequestIndexes.append(requestIndex)
+            neededTimes[requestIndex] = self.__needed_from_rows(timeDescription, dbSeries, referenceTime)
+        staleRequestIndexes.sort()
+
+        # Every ingestion of the batch is independent, so they can wait on their sources together
+        ingestionRequests = [(requestIndex, requests[requestIndex]) for requestIndex in semaphoreRequestIndexes]
+        for requestIndex in staleRequestIndexes:
+            seriesDescription, timeDescription = requests[requestIndex]
+            ingestionRanges = self.__ingestion_ranges(seriesDescription, timeDescription, neededTimes[requestIndex])
+            ingestionRequests.extend((requestIndex, (seriesDescription, ingestionRange)) for ingestionRange in ingestionRanges)
+        ingestionResults = self.__data_ingestion_queries([request for _, request in ingestionRequests])
+
+        for (requestIndex, _), ingestionResult in zip(ingestionRequests, ingestionResults):
+            if requestIndex in semaphoreRequestIndexes:
+                series[requestIndex] = ingestionResult
+
+        for requestIndex in staleRequestIndexes:
+            seriesDescription, timeDescription = requests[requestIndex]
+            series[requestIndex] = self.__data_base_query(seriesDescription, timeDescription)
+            self.__inputCache.discard(seriesDescription, referenceTime)
+            self.__inputCache.put(series[requestIndex], referenceTime)
+
+        return series
+
+    def prefetch_inputs(self, requests: list[tuple[SeriesDescription, TimeDescription, datetime]]) -> int:
+        """Resolves the input requests of every dspec of a run ahead of them, so a series several dspecs depend on
+            is checked and ingested once over a range covering all of them (see coalesce_requests). The coalesced
+            series are left in the InputCache, where the dspecs' own requests find them.
+            A failed prefetch is only logged, the dspecs that need the series request it again and fail on their own.
+            :param requests: list[tuple[SeriesDescription, TimeDescription, datetime]] - The requests of every dspec with their reference times
+            :returns int - The number of coalesced requests, 0 outside an InputCache scope where nothing would be kept
+        """
+        if not self.__inputCache.active:
+            return 0
+
+        plan = self.coalesce_requests(requests)
+        for referenceTime, coalescedRequests in plan.items():
+            log(f'Prefetching {len(coalescedRequests)} input series for {referenceTime}...')
+            try:
+                self.request_inputs(coalescedRequests, referenceTime)
+            except Exception as e:
+                # The series resolved before the failure are cached, so going one by one only repeats the rest
+                log(f'WARNING:: Prefetching inputs failed, retrying them one at a time: {e!r}')
+                for request in coalescedRequests:
+                    try:
+                        self.request_inputs([request], referenceTime)
+                    except Exception as e:
+                        log(f'WARNING:: Prefetching failed for {request[0]}: {e!r}')
+
+        return sum(len(coalescedRequests) for coalescedRequests in plan.values())
+
+    @staticmethod
+    def coalesce_requests(requests: list[tuple[SeriesDescription, TimeDescription, datetime]]) -> dict[datetime, list[tuple[SeriesDescription, TimeDescription]]]:
+        """Merges the requests for the same series into the fewest requests covering them.
+            Requests share a series when their source, series, location, datum, interval and reference time match.
+            Their ranges are merged when they overlap or are at most one interval apart, farther ranges stay separate
+            so no gap is ingested that nobody asked for. A merged request keeps the strictest staleness offset.
+            SEMAPHORE sourced requests are left out, they are the outputs of models in the same run.
+            :param requests: list[tuple[SeriesDescription, TimeDescription, datetime]] - The requests with their reference times
+            :returns dict[datetime, list[tuple[SeriesDescription, TimeDescription]]] - The merged requests by reference time
+        """
+        groups: dict[tuple, list[TimeDescription]] = {}
+        for seriesDescription, timeDescription, referenceTime in requests:
+            if seriesDescription.dataSource.upper() == 'SEMAPHORE':
+                continue
+            key = (seriesDescription.dataSource, seriesDescription.dataSeries, seriesDescription.dataLocation,
+                   seriesDescription.dataDatum, timeDescription.interval, referenceTime)
+            groups.setdefault(key, []).append(timeDescription)
+
+        plan: dict[datetime, list[tuple[SeriesDescription, TimeDescription]]] = {}
+        for (dataSource, dataSeries, dataLocation, dataDatum, interval, referenceTime), timeDescriptions in groups.items():
+            merged: list[TimeDescription] = []
+            for timeDescription in sorted(timeDescriptions, key=lambda timeDescription: timeDescription.fromDateTime):
+                last = merged[-1] if merged else None
+                if last is not None and timeDescription.fromDateTime <= last.toDateTime + (interval or timedelta(0)):
+                    last.toDateTime = max(last.toDateTime, timeDescription.toDateTime)
+                    offsets = [offset for offset in (last.stalenessOffset, timeDescription.stalenessOffset) if offset is not None]
+                    last.stalenessOffset = min(offsets) if offsets else None
+                else:
+                    merged.append(TimeDescription(timeDescription.fromDateTime, timeDescription.toDateTime, interval, timeDescription.stalenessOffset))
+
+            plan.setdefault(referenceTime, []).extend(
+                (SeriesDescription(dataSource, dataSeries, dataLocation, dataDatum), timeDescription) for timeDescription in merged
+            )
+        return plan
+
+
+    def request_output(self, method: str, **kwargs) -> Series | list[Series] | Iterator[Series] | None:
         ''' Selects the correct method from the ORM, calling it, and passing it the correct args
             :param method: str - This is a string value to select which style of request you are trying to make
             :param **kwargs - This is python kwargs formatted depending on method, see below
@@ -82,6 +369,11 @@ class SeriesProvider():
             method= 'TIME_SPAN'
             request_output('TIME_SPAN', model_name= REQUESTED_MODEL_NAME, from_time= DATETIME, to_time= DATETIME)
 
+            NOTE:: Time span stream returns the same predictions as time span, as an iterator of series holding at most chunk_size
+            predictions each, so long time spans can be read with bounded memory. chunk_size is optional.
+            method= 'TIME_SPAN_STREAM'
+            request_output('TIME_SPAN_STREAM', model_name= REQUESTED_MODEL_NAME, from_time= DATETIME, to_time= DATETIME, chunk_size= INT)
+
             NOTE:: Specific takes the most amount of detail in the request, taking a full semaphore series description and a full time description 
             method= 'SPECIFIC'
             request_output('SPECIFIC', semaphoreSeriesDescription= DESCRIPTION, timeDescription= DESCRIPTION)
@@ -98,6 +390,11 @@ class SeriesProvider():
                     return self.seriesStorage.select_output(**kwargs)
                 except TypeError:
                     raise Semaphore_Exception(f'Method {method} in SeriesProvider.request_output received {kwargs} call should be formatted like request_output("TIME_SPAN", model_name= REQUESTED_MODEL_NAME, from_time= DATETIME, to_time= DATETIME)')
+            case 'TIME_SPAN_STREAM':
+                try:
+                    return self.seriesStorage.stream_output(**kwargs)
+                except TypeError:
+                    raise Semaphore_Exception(f'Method {method} in SeriesProvider.request_output received {kwargs} call should be formatted like request_output("TIME_SPAN_STREAM", model_name= REQUESTED_MODEL_NAME, from_time= DATETIME, to_time= DATETIME, chunk_size= INT)')
             case 'SPECIFIC':
                 try:
                     return self.seriesStorage.select_specific_output(**kwargs)
@@ -105,26 +402,19 @@ class SeriesProvider():
                     raise Semaphore_Exception(f'Method {method} in SeriesProvider.request_output received {kwargs} call should be formatted like request_output("SPECIFIC", semaphoreSeriesDescription= DESCRIPTION, timeDescription= DESCRIPTION)')
             case _:
                 raise NotImplementedError(f'Method {method} has not been implemented in SeriesProvider.request_output')
-    def db_has_freshly_acquired_data(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription, referenceTime: datetime) -> bool:
-        """
-        Checks whether the database contains fresh data for the requested series. 
-        
-        Freshness is evaluated using generated time by comparing the age of the oldest
-        generated time against the stalenessOffset. If stalenessOffset is None, freshness checks are disabled.
 
-        Args:
-            seriesDescription (SeriesDescription): The requested data series.
-            timeDescription (TimeDescription): Contains the staleness offset.
-            referenceTime (datetime): Time at which freshness is evaluated.
-
-        Returns:
-            bool: True if the data is fresh, False otherwise.
+    def __is_fresh(self, oldestGeneratedTime: datetime | None, timeDescription: TimeDescription, referenceTime: datetime) -> bool:
+        """ Checks whether the db holds fresh data for a request, given the oldest latest generated time in its range
+        (see ISeriesStorage.select_input_with_freshness). If stalenessOffset is None, freshness checks are disabled.
+        :param oldestGeneratedTime: datetime | None - The oldest latest generated time in range, None if no data was found
+        :param timeDescription: TimeDescription - Contains the staleness offset
+        :param referenceTime: datetime - Time at which freshness is evaluated
+        :returns bool - True if the data is fresh, False otherwise
         """
         stalenessOffset = timeDescription.stalenessOffset
         if stalenessOffset is None:
             return True
-         
-        oldestGeneratedTime = self.seriesStorage.fetch_oldest_generated_time(seriesDescription, timeDescription)
+
         if oldestGeneratedTime is None:
             return False
         
@@ -171,42 +461,198 @@ class SeriesProvider():
         hasData = len(data_ingestion_results.dataFrame) > 0 # If we actually got some data, 
         isSemaphoreSource = str(data_ingestion_results.description.dataSource).upper() == "SEMAPHORE" # If this data came from semaphore itself
         if hasData and not isSemaphoreSource:
-            inserted_series = self.seriesStorage.insert_input(data_ingestion_results)
+            # Only the count is needed for the sanity check so skip sending the inserted rows back
+            inserted_count = self.seriesStorage.insert_input(data_ingestion_results, returning=False)
             
-            if(inserted_series is None or len(inserted_series.dataFrame) == 0): # A sanity check that the data is actually getting inserted!
+            if not inserted_count: # A sanity check that the data is actually getting inserted!
                 log('WARNING:: A data insertion was triggered but no data was actually inserted!')
+            else:
+                self.__record_ingestion(data_ingestion_results, timeDescription)
         
         return data_ingestion_results
     
-    def __check_verified_time_for_ingestion(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription) -> bool:
-        """ 
-        Queries the db for the max verified time in the requested range and uses it to 
-        determine if we should ingest new data based on the most recent verified time in the requested range.
+    def __ingest_and_select(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription, referenceTime: datetime, neededTimes: tuple[DatetimeIndex, ndarray] | None) -> Series:
+        """ Ingests the needed parts of a request (see __ingestion_ranges), then selects the whole request from the db
+        and caches it in place of the series' older selections.
+        """
+        ingestionRanges = self.__ingestion_ranges(seriesDescription, timeDescription, neededTimes)
+        self.__data_ingestion_queries([(seriesDescription, ingestionRange) for ingestionRange in ingestionRanges])
+        series = self.__data_base_query(seriesDescription, timeDescription)
+        self.__inputCache.discard(seriesDescription, referenceTime)
+        self.__inputCache.put(series, referenceTime)
+        return series
 
-        :param seriesDescription: SeriesDescription - The description for a series
-        :param timeDescription: TimeDescription - The time description for a series
-        :returns bool 
+    def __ingestion_ranges(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription, neededTimes: tuple[DatetimeIndex, ndarray] | None) -> list[TimeDescription]:
+        """ The verified time ranges to ingest for a request the db could not answer.
+        When the source's ingestion class SUPPORTS_SUB_RANGES, only the verified times of the interval grid that are needed
+        (see __needed_from_rows and __ledger_decision) are fetched, as one range per contiguous run.
+        Otherwise, or when the needed times are not known, the whole requested range is fetched as before.
+        :param seriesDescription: SeriesDescription - The requested series
+        :param timeDescription: TimeDescription - The requested range
+        :param neededTimes: tuple[DatetimeIndex, ndarray] | None - The interval grid of the range and which of its verified times are needed
+        :returns list[TimeDescription] - The ranges to ingest, with the request's interval and staleness offset
 
-        True (should ingest) if:
-        - No rows exists for the provided series and time description
-        - The max verified time is < requested toDateTime (more data might be available)
+        NOTE:: More than MAX_INGESTION_SUB_RANGES runs are fetched as the single range from the first to the last of them,
+            so a gappy series does not turn into a call per gap.
+        """
+        wholeRange = [timeDescription]
+        if neededTimes is None:
+            return wholeRange
+
+        try:
+            if not data_ingestion_class(seriesDescription).SUPPORTS_SUB_RANGES:
+                return wholeRange
+        except (ModuleNotFoundError, AttributeError):
+            return wholeRange # The ingestion itself reports the unknown source
 
-        False (should NOT ingest) if:
-        - The max verified time is >= requested toDateTime
+        grid, needed = neededTimes
+        runs: list[list[int]] = []
+        for position in needed.nonzero()[0]:
+            if runs and runs[-1][1] == position - 1:
+                runs[-1][1] = position
+            else:
+                runs.append([position, position])
 
-        NOTE::
-        The requested toDateTime is converted to tz naive for comparison.
+        if not runs:
+            return wholeRange
+        if len(runs) > self.MAX_INGESTION_SUB_RANGES:
+            runs = [[runs[0][0], runs[-1][1]]]
+
+        ingestionRanges = [
+            TimeDescription(grid[first].to_pydatetime(), grid[last].to_pydatetime(), timeDescription.interval, timeDescription.stalenessOffset)
+            for first, last in runs
+        ]
+        log(f'Ingesting {len(ingestionRanges)} sub range(s) of the request: ' + ', '.join(f'{r.fromDateTime} -> {r.toDateTime}' for r in ingestionRanges))
+        return ingestionRanges
+
+    def __needed_from_rows(self, timeDescription: TimeDescription, dbSeries: Series, referenceTime: datetime) -> tuple[DatetimeIndex, ndarray] | None:
+        """ The verified times of the interval grid that have no row or whose latest generated time is stale (as __is_fresh
+        decides it), given the rows selected for a request.
+        :param timeDescription: TimeDescription - The requested range
+        :param dbSeries: Series - The rows selected for the request
+        :param referenceTime: datetime - Time at which freshness is evaluated
+        :returns tuple[DatetimeIndex, ndarray] | None - The grid and a mask of its needed verified times, None without an interval or rows
         """
+        dataFrame = getattr(dbSeries, 'dataFrame', None)
+        if timeDescription.interval is None or not isinstance(dataFrame, DataFrame) or dataFrame.empty:
+            return None
+
+        # The latest generated time of every verified time on the grid, ensembles have a row per member
+        latestGenerated = dataFrame.groupby('timeVerified')['timeGenerated'].max()
+        grid = date_range(timeDescription.fromDateTime, timeDescription.toDateTime, freq=timeDescription.interval)
+        needed = ~grid.isin(latestGenerated.index)
+        if timeDescription.stalenessOffset is not None:
+            stale = latestGenerated[(referenceTime - latestGenerated).abs() > timeDescription.stalenessOffset]
+            needed |= grid.isin(stale.index)
+        return grid, needed
 
-        # get the row with the max verified time in the requested range
-        max_verified_time_row = self.seriesStorage.fetch_row_with_max_verified_time_in_range(seriesDescription, timeDescription)
+    def __ledger_decision(self, timeDescription: TimeDescription, entries: list[dict], referenceTime: datetime) -> tuple[bool, tuple[DatetimeIndex, ndarray] | None]:
+        """ Decides a request from the ingestion ledger entries of its series (see ISeriesStorage.fetch_ingestion_ledger)
+        instead of the rows in the db. An entry is fresh when its oldest generated time is within the staleness offset,
+        the same age __is_fresh allows the oldest row. The request is answered by the db when every verified time of its
+        interval grid is inside a fresh entry, and a fresh entry reaches its toDateTime (as __verified_time_needs_ingestion asks).
+        Without an interval there is no grid, so the fresh entries must chain without a gap from its fromDateTime to its toDateTime.
+        :param timeDescription: TimeDescription - The requested range
+        :param entries: list[dict] - The ledger entries overlapping the range
+        :param referenceTime: datetime - Time at which freshness is evaluated
+        :returns tuple[bool, tuple[DatetimeIndex, ndarray] | None] - Whether the db answers the request, and the grid with a mask
+            of the verified times no fresh entry covers (None without an interval)
+        """
+        stalenessOffset = timeDescription.stalenessOffset
+        freshEntries = [
+            entry for entry in entries
+            if stalenessOffset is None or abs(referenceTime - entry['oldestGeneratedTime']) <= stalenessOffset
+        ]
+        if timeDescription.interval is None:
+            coveredTo = None
+            for entry in sorted(freshEntries, key=lambda entry: entry['fromVerifiedTime']):
+                if entry['fromVerifiedTime'] > (timeDescription.fromDateTime if coveredTo is None else coveredTo):
+                    break # a gap no fresh entry covers
+                coveredTo = entry['toVerifiedTime'] if coveredTo is None else max(coveredTo, entry['toVerifiedTime'])
+            return coveredTo is not None and coveredTo >= timeDescription.toDateTime, None
 
-        # check if we have any rows for the provided series and time description
-        if not max_verified_time_row:
+        reachesEnd = any(entry['toVerifiedTime'] >= timeDescription.toDateTime for entry in freshEntries)
+
+        grid = date_range(timeDescription.fromDateTime, timeDescription.toDateTime, freq=timeDescription.interval)
+        needed = ones(len(grid), dtype=bool)
+        for entry in freshEntries:
+            needed &= ~((grid >= entry['fromVerifiedTime']) & (grid <= entry['toVerifiedTime']))
+        return reachesEnd and not needed.any(), (grid, needed)
+
+    def __fetch_ledger(self, requests: list[tuple[SeriesDescription, TimeDescription]]) -> dict[int, list[dict]]:
+        """ The ingestion ledger entries of every request that has any. A missing or failing ledger yields no entries,
+        so those requests fall back to deciding freshness from the rows they select.
+        """
+        try:
+            ledger = self.seriesStorage.fetch_ingestion_ledger(requests)
+        except Exception as e:
+            log(f'WARNING:: Reading the ingestion ledger failed, deciding freshness from the inputs: {e!r}')
+            return {}
+        if ledger is None:
+            return {}
+        return {requestIndex: entries for requestIndex, entries in ledger.items() if entries}
+
+    def __record_ingestion(self, series: Series, timeDescription: TimeDescription) -> None:
+        """ Records an inserted ingestion in the ingestion ledger. A failure is only logged, the rows are already in."""
+        try:
+            self.seriesStorage.insert_ingestion_ledger(series, timeDescription)
+        except Exception as e:
+            log(f'WARNING:: Recording the ingestion in the ingestion ledger failed: {e!r}')
+
+    def __data_ingestion_queries(self, requests: list[tuple[SeriesDescription, TimeDescription]]) -> list[Series | None]:
+        """ Runs __data_ingestion_query for every request. Ingestion is mostly waiting on NOAA, LIGHTHOUSE, NDFD, TWC, ...
+        so with INGESTION_WORKERS over 1 the requests are ingested concurrently in a thread pool, with at most
+        INGESTION_WORKERS_PER_SOURCE of them calling the same source at once. By default they run one after another.
+        :param requests: list[tuple[SeriesDescription, TimeDescription]] - The series to ingest and their temporal information
+        :returns list[Series | None] - The ingestion results in the same order as the requests
+
+        NOTE:: If any ingestion fails, the ones not yet started are cancelled and the first failure in request order is raised
+            once the running ones finish.
+        """
+        workers = int(getenv('INGESTION_WORKERS', 1))
+        if workers <= 1 or len(requests) <= 1:
+            return [self.__data_ingestion_query(seriesDescription, timeDescription) for seriesDescription, timeDescription in requests]
+
+        perSource = max(int(getenv('INGESTION_WORKERS_PER_SOURCE', 2)), 1)
+        sourceLimits = {seriesDescription.dataSource.upper(): BoundedSemaphore(perSource) for seriesDescription, _ in requests}
+
+        def ingest(seriesDescription: SeriesDescription, timeDescription: TimeDescription) -> Series | None:
+            with sourceLimits[seriesDescription.dataSource.upper()]:
+                return self.__data_ingestion_query(seriesDescription, timeDescription)
+
+        # Interleave the sources so a worker is not left waiting on a busy source while another source has work
+        turns: dict[str, int] = {}
+        rounds: list[int] = []
+        for seriesDescription, _ in requests:
+            source = seriesDescription.dataSource.upper()
+            rounds.append(turns.get(source, 0))
+            turns[source] = rounds[-1] + 1
+        submissionOrder = sorted(range(len(requests)), key=lambda requestIndex: rounds[requestIndex])
+
+        futures: list[Future | None] = [None] * len(requests)
+        with ThreadPoolExecutor(max_workers=min(workers, len(requests)), thread_name_prefix='ingestion') as executor:
+            for requestIndex in submissionOrder:
+                # Each worker runs in a copy of this context, so the storage calls it makes keep the QueryProfiler scope
+                futures[requestIndex] = executor.submit(copy_context().run, ingest, *requests[requestIndex])
+            try:
+                return [future.result() for future in futures]
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def __verified_time_needs_ingestion(self, verified_time: datetime | None, timeDescription: TimeDescription) -> bool:
+        """ 
+        Decides if we should ingest new data based on the max verified time in the requested range.
+        True (should ingest) when no rows exist or the max verified time is < the requested toDateTime
+        (more data might be available). The requested toDateTime is converted to tz naive for comparison.
+
+        :param verified_time: datetime | None - The max verified time in the requested range (tz naive), None if no data was found
+        :param timeDescription: TimeDescription - The time description for a series
+        :returns bool - True if we should ingest new data
+        """
+        if verified_time is None:
             return True
-        
-        # extract times from the row and add timezone info
-        verified_time = max_verified_time_row[3]
 
         # convert the toDateTime to tz naive for comparisons
         toDateTime = timeDescription.toDateTime.replace(tzinfo=None)
@@ -15,6 +15,7 @@ from DataClasses import Series, SemaphoreSeriesDescription, SeriesDescription, T
 from datetime import datetime
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from importlib import import_module
 from os import getenv
 
@@ -25,11 +26,11 @@ class ISeriesStorage(ABC):
         raise NotImplementedError()
     
     @abstractmethod
-    def select_latest_output(self, model_names: list[str]) -> list[Series] | None: 
+    def select_latest_output(self, model_names: list[str], decode: str = 'lazy') -> list[Series] | None: 
         raise NotImplementedError()
     
     @abstractmethod
-    def select_output(self, model_name: str, from_time: datetime, to_time: datetime) -> Series | None: 
+    def select_output(self, model_name: str, from_time: datetime, to_time: datetime, decode: str = 'lazy') -> Series | None: 
         raise NotImplementedError()
     
     @abstractmethod
@@ -49,7 +50,7 @@ class ISeriesStorage(ABC):
         raise NotImplementedError()
 
     @abstractmethod
-    def insert_input(self, series: Series) -> Series:
+    def insert_input(self, series: Series, returning: bool = True) -> Series | int:
         raise NotImplementedError()
     
     @abstractmethod
@@ -71,6 +72,95 @@ class ISeriesStorage(ABC):
     @abstractmethod
     def fetch_row_with_max_verified_time_in_range(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription) -> tuple | None:
         raise NotImplementedError()
+    
+    def select_input_with_freshness(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription) -> tuple[Series, datetime | None, datetime | None]:
+        """Returns select_input's series together with the oldest latest generated time and the max verified time in range.
+            Storage classes that can compute these in one query should override this, by default the three calls are made.
+        """
+        maxVerifiedTimeRow = self.fetch_row_with_max_verified_time_in_range(seriesDescription, timeDescription)
+        return (
+            self.select_input(seriesDescription, timeDescription),
+            self.fetch_oldest_generated_time(seriesDescription, timeDescription),
+            maxVerifiedTimeRow[3] if maxVerifiedTimeRow else None
+        )
+
+    def select_inputs_with_freshness(self, requests: list[tuple[SeriesDescription, TimeDescription]]) -> dict[int, tuple[Series, datetime | None, datetime | None]]:
+        """Returns select_input_with_freshness for every (SeriesDescription, TimeDescription) request, keyed by the request's index.
+            Storage classes that can resolve many requests in one query should override this, by default each request is made in turn.
+        """
+        return {
+            requestIndex: self.select_input_with_freshness(seriesDescription, timeDescription)
+            for requestIndex, (seriesDescription, timeDescription) in enumerate(requests)
+        }
+
+    def select_inputs(self, requests: list[tuple[SeriesDescription, TimeDescription]]) -> dict[int, Series]:
+        """Returns select_input for every (SeriesDescription, TimeDescription) request, keyed by the request's index.
+            Storage classes that can resolve many requests in one query should override this, by default each request is made in turn.
+        """
+        return {
+            requestIndex: self.select_input(seriesDescription, timeDescription)
+            for requestIndex, (seriesDescription, timeDescription) in enumerate(requests)
+        }
+
+    def stream_input(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription, chunk_size: int = 10000) -> Iterator[Series]:
+        """Yields select_input's series in chunks of about chunk_size rows, so long windows can be read with bounded memory.
+            Storage classes that can read through a server side cursor should override this, by default the whole range is selected and yielded once.
+        """
+        yield self.select_input(seriesDescription, timeDescription)
+
+    def stream_output(self, model_name: str, from_time: datetime, to_time: datetime, chunk_size: int = 100, decode: str = 'lazy') -> Iterator[Series]:
+        """Yields select_output's series in chunks of at most chunk_size rows, so long ranges can be read with bounded memory.
+            Storage classes that can read through a server side cursor should override this, by default the whole range is selected and yielded once.
+        """
+        series = self.select_output(model_name, from_time, to_time, decode)
+        if series is not None:
+            yield series
+
+    def insert_outputs_and_model_runs(self, runs: list[tuple[Series, datetime, int, dict | None]]) -> list[tuple[Series, tuple | None, tuple | None]]:
+        """Writes the output, model run and statistics (when not None) of every (output_series, execution_time, return_code, statistics_dict) run
+            and returns the inserted (output series, model run row, statistics row) of each.
+            Storage classes that can write them in one transaction should override this, by default each run is written in turn.
+        """
+        results = []
+        for output_series, execution_time, return_code, statistics_dict in runs:
+            inserted_series, model_run_row = self.insert_output_and_model_run(output_series, execution_time, return_code)
+
+            statistics_row = None
+            if statistics_dict is not None and model_run_row is not None:
+                statistics_row = self.insert_output_statistics(model_run_row[1], statistics_dict)
+            results.append((inserted_series, model_run_row, statistics_row))
+        return results
+
+    def fetch_ingestion_ledger(self, requests: list[tuple[SeriesDescription, TimeDescription]]) -> dict[int, list[dict]] | None:
+        """Returns the ingestion ledger entries overlapping every request, see SQLAlchemyORM_Postgres.fetch_ingestion_ledger.
+        Storage classes without an ingestion ledger can leave this as is, freshness is then decided from the selected inputs.
+        """
+        return None
+
+    def insert_ingestion_ledger(self, series: Series, timeDescription: TimeDescription) -> int:
+        """Records an ingested input series in the ingestion ledger and returns the number of entries written.
+        Storage classes without an ingestion ledger can leave this as is, nothing is recorded.
+        """
+        return 0
+
+    def insert_query_profiles(self, records: list) -> int:
+        """Writes QueryProfiler records (see QueryProfiler.py) and returns the number written.
+        Storage classes without a query_profiles table can leave this as is, nothing is written.
+        """
+        return 0
+
+    def refresh_reference_data(self) -> None:
+        """Reloads any cached reference data (location codes and coordinates).
+        Storage classes that do not cache reference data can leave this as is.
+        """
+        pass
+
+    @classmethod
+    def dispose(cls) -> None:
+        """Releases any process-wide resources (connection pools, cached schema) held by the storage class.
+        Storage classes that do not share anything across instances can leave this as is.
+        """
+        pass
 
 
 def series_storage_factory() -> ISeriesStorage:
@@ -84,4 +174,13 @@ def series_storage_factory() -> ISeriesStorage:
    
 
     return getattr(import_module(f'.SS_Classes.{ss}', 'SeriesStorage'), f'{ss}')()
-    
+
+
+def dispose_series_storage() -> None:
+    """Releases the process-wide resources held by the series storage class selected by
+    the environment variable ISERIESSTORAGE_INSTANCE. Should be called once a process is done with storage.
+    """
+
+    ss = getenv('ISERIESSTORAGE_INSTANCE')
+
+    getattr(import_module(f'.SS_Classes.{ss}', 'SeriesStorage'), f'{ss}').dispose()
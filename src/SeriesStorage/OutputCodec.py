@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+#OutputCodec.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""
+Encodes the ndarrays stored in the dataValue column of outputs into compact, versioned blobs.
+
+Blob layout (all integers little endian):
+    byte 0      - Format version (currently 1). Legacy rows are plain .npy files whose first byte is 0x93,
+                  so the first byte alone tells the two apart and legacy rows keep decoding unchanged.
+    byte 1      - Compression: 0 none, 1 zlib, 2 zstd, 3 lz4
+    byte 2      - Precision: 0 full, 1 float16, 2 quantized16
+    byte 3      - The dtype char of the original array, reduced precision arrays are restored to it
+    byte 4      - Flags: bit 0 set when the array bytes are shuffled
+    [16 bytes]  - quantized16 only, the float64 offset and scale of the quantization
+    rest        - The compressed .npy file of the stored array
+
+Compressed arrays are byte shuffled first (the first byte of every value, then the second, ...). Neighbouring
+predictions share their sign, exponent and high mantissa bytes, so the shuffled planes compress far better
+and faster than the interleaved values.
+
+Precision:
+    full        - Lossless, the array is stored as is.
+    float16     - Floating arrays are stored as float16 (about 3 significant digits).
+    quantized16 - Floating arrays are stored as uint16 steps between their min and max (65534 steps),
+                  non finite values decode as NaN.
+    Reduced precision only applies to floating arrays, anything else is always stored at full precision.
+
+zstd comes from zstandard, which is in requirements.txt, and lz4 from the optional lz4 wheel. When the configured
+library is not installed blobs are written with zlib (standard library) instead, blobs that need a missing library
+to decode raise.
+
+LazyOutputValue wraps a blob and only decodes it when the array is first used, see SQLAlchemyORM_Postgres.select_output.
+
+Configuration is read from the environment:
+    OUTPUT_COMPRESSION - none | zlib | zstd | lz4 (default zstd)
+    OUTPUT_PRECISION - full | float16 | quantized16 (default full)
+"""
+#----------------------------------
+#
+#
+#Imports
+import struct
+import zlib
+from io import BytesIO
+from os import getenv
+from collections.abc import Sequence
+
+import numpy as np
+from numpy import ndarray
+
+from utility import log
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+
+class OutputCodec:
+
+    FORMAT_VERSION = 1
+    NPY_MAGIC_BYTE = 0x93
+
+    COMPRESSION_IDS = {'none': 0, 'zlib': 1, 'zstd': 2, 'lz4': 3}
+    PRECISION_IDS = {'full': 0, 'float16': 1, 'quantized16': 2}
+
+    HEADER = struct.Struct('<BBBBB')
+    FLAG_SHUFFLED = 0b1
+    QUANTIZATION = struct.Struct('<dd')
+
+    # The largest uint16 is kept free to mark non finite values
+    QUANTIZED_NAN = np.iinfo(np.uint16).max
+    QUANTIZED_STEPS = QUANTIZED_NAN - 1
+
+    def __init__(self, compression: str | None = None, precision: str | None = None):
+        """
+        :param compression: str | None - none | zlib | zstd | lz4, read from OUTPUT_COMPRESSION when None
+        :param precision: str | None - full | float16 | quantized16, read from OUTPUT_PRECISION when None
+        :raises ValueError - If the compression or precision is unknown
+        """
+        compression = (compression or getenv('OUTPUT_COMPRESSION', 'zstd')).lower()
+        precision = (precision or getenv('OUTPUT_PRECISION', 'full')).lower()
+
+        if compression not in self.COMPRESSION_IDS:
+            raise ValueError(f'Unknown output compression {compression}, expected one of {list(self.COMPRESSION_IDS)}')
+        if precision not in self.PRECISION_IDS:
+            raise ValueError(f'Unknown output precision {precision}, expected one of {list(self.PRECISION_IDS)}')
+
+        if (compression == 'zstd' and zstandard is None) or (compression == 'lz4' and lz4_frame is None):
+            log(f'Warning:: Output compression {compression} is not installed, falling back to zlib.')
+            compression = 'zlib'
+
+        self.compression = compression
+        self.precision = precision
+
+    def encode(self, array: ndarray | None) -> bytes | None:
+        """
+        Encodes an ndarray into a blob.
+
+        :param array: ndarray | None - The array to encode or None on run fails
+        :returns bytes | None - The encoded blob or None if the array was None
+        """
+        if array is None:
+            return None
+
+        precision = self.precision if np.issubdtype(array.dtype, np.floating) else 'full'
+
+        stored = array
+        quantization = b''
+        match precision:
+            case 'float16':
+                stored = array.astype(np.float16)
+            case 'quantized16':
+                stored, offset, scale = self.__quantize(array)
+                quantization = self.QUANTIZATION.pack(offset, scale)
+
+        buffer = BytesIO()
+        np.save(buffer, stored, allow_pickle=False)
+        npy = buffer.getvalue()
+        buffer.close()
+
+        flags = 0
+        if self.compression != 'none' and stored.dtype.itemsize > 1:
+            dataOffset = self.__npy_data_offset(npy)
+            npy = npy[:dataOffset] + self.__shuffle(memoryview(npy)[dataOffset:], stored.dtype.itemsize)
+            flags |= self.FLAG_SHUFFLED
+
+        header = self.HEADER.pack(
+            self.FORMAT_VERSION,
+            self.COMPRESSION_IDS[self.compression],
+            self.PRECISION_IDS[precision],
+            ord(array.dtype.char),
+            flags
+        )
+        return header + quantization + self.__compress(npy, self.COMPRESSION_IDS[self.compression])
+
+    def decode(self, blob: bytes | None) -> ndarray | None:
+        """
+        Decodes one blob, see decode_many.
+
+        :param blob: bytes | None - The encoded blob, a legacy .npy file, or None
+        :returns ndarray | None - The reconstructed array or None
+        """
+        return self.decode_many([blob])[0]
+
+    def decode_many(self, blobs: Sequence[bytes | None]) -> list[ndarray | None]:
+        """
+        Decodes many blobs at once. Blobs written for the same model carry identical .npy headers, so each
+        distinct header is parsed only once and the payload is wrapped with np.frombuffer instead of being
+        copied out through np.load.
+
+        NOTE:: Full precision arrays are read-only views over the (decompressed) bytes.
+            Callers that need to modify them in place must copy them first.
+
+        :param blobs: Sequence[bytes | None] - The blobs or legacy .npy files, None for failed runs
+        :returns list[ndarray | None] - The reconstructed arrays in the same order as the blobs
+        :raises ValueError - If a blob has an unknown format version
+        """
+        parsedHeaders = {}
+        arrays = []
+        for blob in blobs:
+            if blob is None:
+                arrays.append(None)
+                continue
+
+            if blob[0] == self.NPY_MAGIC_BYTE:
+                arrays.append(self.__load_npy(blob, parsedHeaders))
+                continue
+
+            version = blob[0]
+            if version != self.FORMAT_VERSION:
+                raise ValueError(f'Unknown output blob format version {version}')
+            _, compressionID, precisionID, dtypeChar, flags = self.HEADER.unpack_from(blob)
+
+            payloadOffset = self.HEADER.size
+            if precisionID == self.PRECISION_IDS['quantized16']:
+                offset, scale = self.QUANTIZATION.unpack_from(blob, payloadOffset)
+                payloadOffset += self.QUANTIZATION.size
+
+            npy = self.__decompress(memoryview(blob)[payloadOffset:], compressionID)
+            array = self.__load_npy(npy, parsedHeaders, shuffled=bool(flags & self.FLAG_SHUFFLED))
+
+            dtype = np.dtype(chr(dtypeChar))
+            if precisionID == self.PRECISION_IDS['float16']:
+                array = array.astype(dtype)
+            elif precisionID == self.PRECISION_IDS['quantized16']:
+                array = self.__dequantize(array, offset, scale, dtype)
+            arrays.append(array)
+
+        return arrays
+
+    def __load_npy(self, npy: bytes, parsedHeaders: dict, shuffled: bool = False) -> ndarray:
+        """
+        Loads a .npy file, parsing its header only if it is not already in parsedHeaders.
+
+        :param npy: bytes - The .npy file
+        :param parsedHeaders: dict - Header bytes to (shape, fortranOrder, dtype), shared across one decode_many call
+        :param shuffled: bool - The array bytes were shuffled by encode
+        :returns ndarray - A read-only view over the array bytes (or a loaded copy for object arrays)
+        """
+        dataOffset = self.__npy_data_offset(npy)
+
+        header = bytes(npy[:dataOffset])
+        if header not in parsedHeaders:
+            buffer = BytesIO(header)
+            version = np.lib.format.read_magic(buffer)
+            if version == (1, 0):
+                parsedHeaders[header] = np.lib.format.read_array_header_1_0(buffer)
+            else:
+                parsedHeaders[header] = np.lib.format.read_array_header_2_0(buffer)
+            buffer.close()
+        shape, fortranOrder, dtype = parsedHeaders[header]
+
+        # Object arrays can not be viewed over raw bytes
+        if dtype.hasobject:
+            buffer = BytesIO(npy)
+            array = np.load(buffer, allow_pickle=False)
+            buffer.close()
+            return array
+
+        if shuffled and dtype.itemsize > 1:
+            data = self.__unshuffle(memoryview(npy)[dataOffset:], dtype.itemsize)
+            array = np.frombuffer(data, dtype=dtype, count=int(np.prod(shape)))
+        else:
+            array = np.frombuffer(npy, dtype=dtype, count=int(np.prod(shape)), offset=dataOffset)
+        return array.reshape(shape, order='F' if fortranOrder else 'C')
+
+    def __npy_data_offset(self, npy: bytes) -> int:
+        """Returns where the array bytes of a .npy file start.
+            Byte 6 is the major format version, v1 stores a 2 byte header length and v2/v3 store 4 bytes.
+        """
+        if npy[6] == 1:
+            return 10 + int.from_bytes(npy[8:10], 'little')
+        return 12 + int.from_bytes(npy[8:12], 'little')
+
+    def __shuffle(self, data: memoryview, itemsize: int) -> bytes:
+        """Groups the bytes of every value by position, all first bytes, then all second bytes, ..."""
+        return np.frombuffer(data, dtype=np.uint8).reshape(-1, itemsize).T.tobytes()
+
+    def __unshuffle(self, data: memoryview, itemsize: int) -> bytes:
+        """Reverses __shuffle."""
+        return np.frombuffer(data, dtype=np.uint8).reshape(itemsize, -1).T.tobytes()
+
+    def __compress(self, data: bytes, compressionID: int) -> bytes:
+        """Compresses data with the given compression."""
+        match compressionID:
+            case 0:
+                return data
+            case 1:
+                return zlib.compress(data, 1)
+            case 2:
+                return zstandard.ZstdCompressor(level=3).compress(data)
+            case 3:
+                return lz4_frame.compress(data)
+
+    def __decompress(self, data: memoryview, compressionID: int) -> bytes:
+        """Decompresses data with the given compression.
+            :raises ValueError - If the compression is unknown or its library is not installed
+        """
+        match compressionID:
+            case 0:
+                return bytes(data)
+            case 1:
+                return zlib.decompress(data)
+            case 2 if zstandard is not None:
+                return zstandard.ZstdDecompressor().decompress(data)
+            case 3 if lz4_frame is not None:
+                return lz4_frame.decompress(data)
+        raise ValueError(f'Can not decode output blob with compression {compressionID}, its library is not installed or the id is unknown')
+
+    def __quantize(self, array: ndarray) -> tuple[ndarray, float, float]:
+        """
+        Maps the finite values of an array linearly onto uint16 steps between its min and max.
+
+        :param array: ndarray - A floating array
+        :returns tuple[ndarray, float, float] - The uint16 array, the offset and the scale (value = offset + step * scale)
+        """
+        isFinite = np.isfinite(array)
+        finite = array[isFinite].astype(np.float64)
+
+        offset = float(finite.min()) if finite.size else 0.0
+        span = float(finite.max()) - offset if finite.size else 0.0
+        scale = span / self.QUANTIZED_STEPS if span > 0 else 1.0
+
+        quantized = np.full(array.shape, self.QUANTIZED_NAN, dtype=np.uint16)
+        quantized[isFinite] = np.rint((finite - offset) / scale).astype(np.uint16)
+        return quantized, offset, scale
+
+    def __dequantize(self, quantized: ndarray, offset: float, scale: float, dtype: np.dtype) -> ndarray:
+        """Reverses __quantize, restoring the original dtype with NaN for the non finite values."""
+        array = (offset + quantized.astype(np.float64) * scale).astype(dtype)
+        array[quantized == self.QUANTIZED_NAN] = np.nan
+        return array
+
+
+class LazyOutputValue:
+    """
+    An output dataValue that is decoded on first use instead of when it is selected, so consumers that only
+    read the metadata of an output frame (or a few of its runs) do not pay to decode every blob.
+
+    The decoded array is cached and the blob released. Anything numpy accepts works on the proxy directly
+    (np.asarray, ufuncs, indexing, len) and attribute access (shape, dtype, tolist, ...) is forwarded to the array.
+    Code that needs a real ndarray, e.g. for isinstance checks, should use value.
+    """
+    __slots__ = ('_blob', '_codec', '_array')
+
+    def __init__(self, blob: bytes, codec: OutputCodec):
+        """
+        :param blob: bytes - The encoded blob or legacy .npy file, failed runs are stored as None rather than a proxy
+        :param codec: OutputCodec - The codec that decodes the blob
+        """
+        self._blob = blob
+        self._codec = codec
+        self._array = None
+
+    @property
+    def is_decoded(self) -> bool:
+        return self._array is not None
+
+    @property
+    def value(self) -> ndarray:
+        """The decoded array, decoded on the first access."""
+        if self._array is None:
+            self._array = self._codec.decode(self._blob)
+            self._blob = None
+        return self._array
+
+    def __array__(self, dtype=None, copy=None) -> ndarray:
+        array = self.value if dtype is None else self.value.astype(dtype, copy=False)
+        return array.copy() if copy else array
+
+    def __getattr__(self, name: str):
+        # Private names are never forwarded, so copy and pickle do not decode (or recurse before __init__)
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.value, name)
+
+    def __getitem__(self, key):
+        return self.value[key]
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __repr__(self) -> str:
+        return f'LazyOutputValue({self.value!r})' if self.is_decoded else f'LazyOutputValue(<{len(self._blob)} encoded bytes>)'
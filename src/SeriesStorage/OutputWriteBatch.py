@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#OutputWriteBatch.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""
+A unit of work for model run results. Outputs, model runs and statistics are queued as each model finishes
+and written together by flush, through ISeriesStorage.insert_outputs_and_model_runs, so a group run ends with
+one transaction instead of a connect and commit per row. If that transaction fails, flush writes the runs one
+at a time, so a single bad run does not roll back the results of the others.
+"""
+#----------------------------------
+#
+#
+#Imports
+from datetime import datetime
+import traceback
+
+from utility import log, log_error
+from DataClasses import Series
+from SeriesStorage.ISeriesStorage import ISeriesStorage, series_storage_factory
+
+
+class OutputWriteBatch:
+
+    def __init__(self, seriesStorage: ISeriesStorage | None = None) -> None:
+        """
+        :param seriesStorage: ISeriesStorage | None - The storage to flush to, built with series_storage_factory on flush when None
+        """
+        self.__seriesStorage = seriesStorage
+        self.__runs: list[tuple[Series, datetime, int, dict | None]] = []
+
+    def __len__(self) -> int:
+        return len(self.__runs)
+
+    def add(self, output_series: Series, execution_time: datetime, return_code: int, statistics_dict: dict | None = None) -> None:
+        """
+        Queues one model run.
+
+        :param output_series: Series - The single row output series of the run, see ISeriesStorage.insert_output
+        :param execution_time: datetime - The time this instance of semaphore was ran
+        :param return_code: int - The return code of the run
+        :param statistics_dict: dict | None - The statistics of the run's output or None to not write statistics
+        """
+        self.__runs.append((output_series, execution_time, return_code, statistics_dict))
+
+    def flush(self) -> list[tuple[tuple[Series, datetime, int, dict | None], tuple[Series, tuple | None, tuple | None] | None]]:
+        """
+        Writes every queued run and empties the batch. The runs are written in one transaction, and when that fails,
+        again one run per transaction. A run that can not be written on its own is logged and paired with None.
+
+        :returns list[tuple[tuple, tuple | None]] - Each queued (output_series, execution_time, return_code, statistics_dict) run
+            paired with its (inserted output series, model run row, statistics row), or None if it could not be written,
+            in the order the runs were added
+        """
+        if not self.__runs:
+            return []
+
+        runs, self.__runs = self.__runs, []
+        seriesStorage = self.__seriesStorage if self.__seriesStorage is not None else series_storage_factory()
+        try:
+            return list(zip(runs, seriesStorage.insert_outputs_and_model_runs(runs)))
+        except Exception:
+            if len(runs) == 1:
+                raise
+            log(f'WARNING:: Writing {len(runs)} model runs together failed, writing them one at a time.\n{traceback.format_exc()}')
+
+        flushed = []
+        for run in runs:
+            try:
+                flushed.append((run, seriesStorage.insert_outputs_and_model_runs([run])[0]))
+            except Exception:
+                log_error(f'ERROR:: The results of model {run[0].description.modelName} could not be written.\n{traceback.format_exc()}')
+                flushed.append((run, None))
+        return flushed
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+#QueryProfiler.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""
+Records how long each series storage call takes, so a slow model run can be traced back to the storage call that
+dominates it.
+
+Every public storage method decorated with @profiled becomes one QueryRecord per call, tagged with the model name and
+reference time of the enclosing QueryProfiler().scope (the orchestrator opens one per dspec). The SQL statements a call
+runs are counted through SQLAlchemy cursor events on the shared engine (see instrument):
+    statements - The statements the call executed
+    rows        - The rows the statements returned or affected (for streams, the rows yielded)
+    bytes       - The bytes of the result values plus the str and bytes parameters sent (e.g. output blobs)
+    elapsed     - Wall time of the call. A nested call (e.g. insert_output inside insert_output_and_model_run)
+                  is recorded on its own and is also part of its caller's time.
+Rows staged with COPY by insert_input are part of the call's time but are not a statement of their own.
+
+A statement slower than DB_SLOW_QUERY_MS is run again as EXPLAIN (ANALYZE, BUFFERS) on the same connection inside a
+savepoint that is rolled back, so slow writes are explained without being applied twice. ANALYZE executes the
+statement, so a captured statement costs about twice its time.
+
+The records are kept in memory, the orchestrator logs a summary and optionally writes them to the query_profiles
+table at the end of each run (see ISeriesStorage.insert_query_profiles).
+
+Configuration is read from the environment:
+    DB_PROFILE - 1 to record storage calls (default 0). The cursor events are only registered when it is set.
+    DB_SLOW_QUERY_MS - Statements slower than this get an EXPLAIN (ANALYZE, BUFFERS) plan, none disables it (default 1000)
+    DB_PROFILE_PERSIST - 1 to also write the records of a run to the query_profiles table (default 0)
+"""
+#----------------------------------
+#
+#
+#Imports
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from functools import wraps
+from inspect import isgeneratorfunction
+from os import getenv, register_at_fork
+from threading import Lock
+from time import perf_counter
+
+from sqlalchemy import Engine, event
+
+
+class QueryRecord(object):
+    """One call to a profiled storage method."""
+
+    __slots__ = ('method', 'modelName', 'referenceTime', 'startedAt', 'depth', 'elapsed', 'statements', 'rows', 'bytes', 'plans')
+
+    def __init__(self, method: str, modelName: str | None, referenceTime: datetime | None, depth: int) -> None:
+        """
+        :param method: str - The name of the storage method
+        :param modelName: str | None - The model the call was made for, None outside a scope
+        :param referenceTime: datetime | None - The reference time of the run the call was made for, None outside a scope
+        :param depth: int - 0 for a call made from outside storage, 1 for a call made by another profiled call, ...
+        """
+        self.method = method
+        self.modelName = modelName
+        self.referenceTime = referenceTime
+        self.startedAt = datetime.now(timezone.utc)
+        self.depth = depth
+        self.elapsed = 0.0
+        self.statements = 0
+        self.rows = 0
+        self.bytes = 0
+        # (elapsed seconds, statement, EXPLAIN output) of every statement over the slow threshold
+        self.plans: list[tuple[float, str, str]] = []
+
+    def __repr__(self) -> str:
+        return (f'QueryRecord({self.method}, model={self.modelName}, elapsed={self.elapsed * 1000:.1f}ms, '
+                f'statements={self.statements}, rows={self.rows}, bytes={self.bytes})')
+
+
+class QueryProfiler(object):
+    """A process-wide singleton that collects the QueryRecords of profiled storage calls.
+        - The current scope and call are held in context variables, so concurrent threads record separately.
+        - At most DB_PROFILE_MAX_RECORDS (default 100000) records are kept, the oldest are dropped first.
+    """
+
+    _lock = Lock()
+    _records: deque[QueryRecord] = deque(maxlen=int(getenv('DB_PROFILE_MAX_RECORDS', 100000)))
+
+    # (modelName, referenceTime) of the enclosing scope
+    _scope: ContextVar[tuple[str | None, datetime | None]] = ContextVar('query_profiler_scope', default=(None, None))
+    # The record of the innermost profiled call in progress, statements are counted against it
+    _current: ContextVar[QueryRecord | None] = ContextVar('query_profiler_current', default=None)
+
+    def __new__(cls):
+        """A singleton constructor that ensures only one instance of the class"""
+        if not hasattr(cls, 'instance'):
+            cls.instance = super(QueryProfiler, cls).__new__(cls)
+        return cls.instance
+
+    @property
+    def enabled(self) -> bool:
+        return getenv('DB_PROFILE', '0') == '1'
+
+    @property
+    def slow_threshold(self) -> float | None:
+        """The slow statement threshold in seconds, None when capturing plans is disabled."""
+        threshold = getenv('DB_SLOW_QUERY_MS', '1000')
+        return None if threshold.lower() == 'none' else float(threshold) / 1000
+
+    @contextmanager
+    def scope(self, modelName: str | None, referenceTime: datetime | None) -> Iterator[None]:
+        """Tags every storage call made inside the block with a model name and reference time.
+            :param modelName: str | None - The model being run
+            :param referenceTime: datetime | None - The reference time of the run
+        """
+        token = self._scope.set((modelName, referenceTime))
+        try:
+            yield
+        finally:
+            self._scope.reset(token)
+
+    @contextmanager
+    def call(self, method: str) -> Iterator[QueryRecord]:
+        """Records the block as one call to a storage method, see profiled."""
+        parent = self._current.get()
+        record = QueryRecord(method, *self._scope.get(), depth=0 if parent is None else parent.depth + 1)
+        try:
+            with self.step(record):
+                yield record
+        finally:
+            with self._lock:
+                self._records.append(record)
+
+    @contextmanager
+    def step(self, record: QueryRecord) -> Iterator[None]:
+        """Counts the block's time and statements against a record, a stream is recorded one step per chunk."""
+        token = self._current.set(record)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            record.elapsed += perf_counter() - start
+            self._current.reset(token)
+
+    def records(self) -> list[QueryRecord]:
+        """Returns the records collected so far, oldest first."""
+        with self._lock:
+            return list(self._records)
+
+    def drain(self) -> list[QueryRecord]:
+        """Returns the records collected so far, oldest first, and forgets them."""
+        with self._lock:
+            records = list(self._records)
+            self._records.clear()
+        return records
+
+    def instrument(self, engine: Engine) -> None:
+        """Registers the cursor events that count statements, rows and bytes and capture slow plans on an engine.
+            :param engine: Engine - The engine to instrument, see EngineRegistry.acquire
+        """
+        event.listen(engine, 'before_cursor_execute', self.__before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self.__after_cursor_execute)
+
+    @staticmethod
+    def summarize(records: list[QueryRecord]) -> str:
+        """Formats records as a table of calls per method followed by the plans of slow statements.
+            :param records: list[QueryRecord] - The records to summarize, usually of one model
+            :returns str - The summary
+        """
+        byMethod: dict[str, list[QueryRecord]] = {}
+        for record in records:
+            byMethod.setdefault(record.method, []).append(record)
+
+        # Nested calls are part of their caller's time, so only calls made from outside storage are totaled
+        total = sum(record.elapsed for record in records if record.depth == 0)
+        lines = [
+            f'[QueryProfiler] {len(records)} storage call(s), {total * 1000:.1f} ms',
+            f'\t{"method":<40} {"calls":>6} {"stmts":>6} {"rows":>9} {"bytes":>12} {"total ms":>10} {"max ms":>10}'
+        ]
+        for method, calls in sorted(byMethod.items(), key=lambda item: -sum(record.elapsed for record in item[1])):
+            lines.append(
+                f'\t{method:<40} {len(calls):>6} {sum(record.statements for record in calls):>6} '
+                f'{sum(record.rows for record in calls):>9} {sum(record.bytes for record in calls):>12} '
+                f'{sum(record.elapsed for record in calls) * 1000:>10.1f} {max(record.elapsed for record in calls) * 1000:>10.1f}'
+            )
+
+        for record in records:
+            for elapsed, statement, plan in record.plans:
+                lines.append(f'\tSlow statement in {record.method} ({elapsed * 1000:.1f} ms):\n{statement.strip()}\n{plan}')
+        return '\n'.join(lines)
+
+    def _reset_after_fork(self) -> None:
+        """Runs in a freshly forked child, the inherited lock may have been held by another parent thread
+        and the parent's records are not the child's to report.
+        """
+        QueryProfiler._lock = Lock()
+        self._records.clear()
+
+    def __before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if self._current.get() is not None:
+            conn.info.setdefault('query_profiler_start', []).append(perf_counter())
+
+    def __after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        record = self._current.get()
+        if record is None or not conn.info.get('query_profiler_start'):
+            return
+        elapsed = perf_counter() - conn.info['query_profiler_start'].pop()
+
+        record.statements += 1
+        record.rows += max(cursor.rowcount, 0)
+        record.bytes += self.__result_bytes(cursor) + self.__parameter_bytes(parameters)
+
+        threshold = self.slow_threshold
+        if threshold is not None and elapsed > threshold and not executemany:
+            record.plans.append((elapsed, statement, self.__explain(cursor, statement, parameters)))
+
+    def __result_bytes(self, cursor) -> int:
+        """The bytes of every value in a psycopg result, 0 for server side cursors and other drivers."""
+        pgresult = getattr(cursor, 'pgresult', None)
+        if pgresult is None:
+            return 0
+        return sum(pgresult.get_length(row, column) for row in range(pgresult.ntuples) for column in range(pgresult.nfields))
+
+    def __parameter_bytes(self, parameters) -> int:
+        if not isinstance(parameters, dict):
+            return 0
+        return sum(len(value) for value in parameters.values() if isinstance(value, (str, bytes)))
+
+    def __explain(self, cursor, statement: str, parameters) -> str:
+        """Runs EXPLAIN (ANALYZE, BUFFERS) of a statement on the connection that ran it, inside a savepoint that is
+        rolled back, so temporary tables are visible and writes are undone. Failures are returned as the plan.
+        """
+        explainCursor = cursor.connection.cursor()
+        try:
+            explainCursor.execute('SAVEPOINT query_profiler_explain')
+            try:
+                explainCursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {statement}', parameters)
+                return '\n'.join(row[0] for row in explainCursor.fetchall())
+            except Exception as e:
+                return f'EXPLAIN failed: {e}'
+            finally:
+                explainCursor.execute('ROLLBACK TO SAVEPOINT query_profiler_explain')
+        except Exception as e:
+            return f'EXPLAIN failed: {e}'
+        finally:
+            explainCursor.close()
+
+
+register_at_fork(after_in_child=lambda: QueryProfiler()._reset_after_fork())
+
+
+def profiled(method: Callable) -> Callable:
+    """Decorates a storage method so each call is recorded by the QueryProfiler while DB_PROFILE is set.
+        Generator methods (streams) are timed while a chunk is being produced, not while the caller holds it.
+    """
+    if isgeneratorfunction(method):
+        @wraps(method)
+        def stream_wrapper(*args, **kwargs):
+            profiler = QueryProfiler()
+            if not profiler.enabled:
+                yield from method(*args, **kwargs)
+                return
+
+            with profiler.call(method.__name__) as record:
+                iterator = method(*args, **kwargs)
+            try:
+                while True:
+                    with profiler.step(record):
+                        try:
+                            chunk = next(iterator)
+                        except StopIteration:
+                            return
+                    # a server side cursor has no row count when it is opened, so the yielded rows are counted
+                    record.rows += len(getattr(chunk, 'dataFrame', ()))
+                    yield chunk
+            finally:
+                iterator.close()
+        return stream_wrapper
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        profiler = QueryProfiler()
+        if not profiler.enabled:
+            return method(*args, **kwargs)
+
+        with profiler.call(method.__name__):
+            return method(*args, **kwargs)
+    return wrapper
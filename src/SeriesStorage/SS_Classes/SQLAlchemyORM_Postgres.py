@@ -3,7 +3,7 @@
 #-------------------------------
 # Created By : Matthew Kastl
 # Created Date: 3/26/2023
-# version 10.0
+# version 12.0
 #-------------------------------
 """
 This file is an implementation of the SQLAlchemy ORM geared towards Semaphore and its schema.
@@ -12,6 +12,32 @@ NOTE:: As of version 10.0, this storage class uses binary serialization for
 ndarrays in the dataValue column of dataframes.
 Every model run will have their ndarray serialized to bytes before insertion into the database 
 and deserialized back to ndarrays after selection from the database.
+Since version 12.0 the bytes are written by the OutputCodec (compressed, optionally reduced precision,
+see OutputCodec.py). Rows written as plain .npy files before that still decode.
+
+NOTE:: As of version 11.0, the engine (connection pool) and the reflected schema are shared
+process-wide through the EngineRegistry. Constructing this class is cheap, the first construction
+in a process pays for create_engine and MetaData.reflect and every later one reuses them.
+
+NOTE:: As of database version 3.9, inputs is range partitioned by month of verifiedTime. Every input
+query is bounded on verifiedTime so they are pruned to the months they touch, and insert_input creates
+any missing partition before it writes.
+
+NOTE:: As of database version 3.10, ensemble inputs are stored in input_ensembles with one row per
+verified and generated time holding every member in a DOUBLE PRECISION[] dataValues column. The input
+selections read both layouts (see __latest_inputs_sql) and return the same Series either way, with ensemble
+members coming back as floats.
+
+NOTE:: As of database version 3.11, inputs."dataValue" is DOUBLE PRECISION rather than VARCHAR, so every input dataValue
+is inserted and comes back as a float64 and only the API converts values to strings. insert_input converts any value
+that is still a string, values that are not numbers are stored as NaN.
+
+NOTE:: As of database version 3.14, every ingestion is recorded in ingestion_ledger (see insert_ingestion_ledger) and
+the series provider answers freshness and coverage from it (see fetch_ingestion_ledger). Without the table both methods
+do nothing and freshness is decided from the selected inputs as before.
+
+NOTE:: Every public selection and insertion method is decorated with @profiled, with DB_PROFILE=1 each call is
+timed and its statements, rows and bytes are counted by the QueryProfiler (see QueryProfiler.py).
 """ 
 #-------------------------------
 # 
@@ -19,38 +45,232 @@ and deserialized back to ndarrays after selection from the database.
 #Imports
 from itertools import groupby
 from sqlalchemy import create_engine as sqlalchemy_create_engine
-from sqlalchemy import String, MetaData, Engine, CursorResult, Select, select, distinct, text, bindparam
-from sqlalchemy import inspect
+from sqlalchemy import MetaData, Engine, CursorResult, Select, TextClause, select, distinct, text
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.dialects import postgresql
-from os import getenv
+from sqlalchemy.exc import OperationalError
+from os import getenv, register_at_fork
+from threading import Lock
+from time import monotonic
 from datetime import timedelta, datetime, timezone
 import pandas as pd
 from pandas import DataFrame
 import numpy as np
-from io import BytesIO
+from collections.abc import Callable, Iterator, Sequence
 from numpy import ndarray
 
 from SeriesStorage.ISeriesStorage import ISeriesStorage
+from SeriesStorage.OutputCodec import OutputCodec, LazyOutputValue
+from SeriesStorage.QueryProfiler import QueryProfiler, QueryRecord, profiled
 
 from DataClasses import Series, SeriesDescription, SemaphoreSeriesDescription, TimeDescription, get_input_dataFrame, get_output_dataFrame
 from utility import log
 
 
+class EngineRegistry(object):
+    """A process-wide singleton that holds one engine and one reflected schema per connection string.
+
+    Every storage instance asks the registry for its engine and metadata instead of building its own,
+    so schema reflection and pool creation happen once per process rather than once per factory call.
+        - Creation is guarded by a lock so concurrent threads can not build duplicate engines.
+        - After a fork the child drops the pooled connections inherited from the parent (without closing
+          them, they still belong to the parent) and lazily builds a fresh pool on first use.
+        - dispose() closes every pool and forgets the cached schema, the next request rebuilds both.
+
+    Pool tuning is read from the environment:
+        DB_POOL_SIZE - The number of connections kept open in the pool (default 5)
+        DB_MAX_OVERFLOW - The number of extra connections allowed above the pool size (default 10)
+        DB_POOL_TIMEOUT - Seconds to wait for a connection before giving up (default 30)
+        DB_POOL_RECYCLE - Seconds after which a pooled connection is replaced (default 1800)
+        DB_PREPARE_THRESHOLD - Executions of the same statement on a connection before psycopg prepares it
+            server side (default 1, so from the second execution on). 'none' disables prepared statements,
+            which is needed behind a transaction pooling proxy such as pgbouncer.
+    """
+
+    _lock = Lock()
+    _entries: dict[str, tuple[Engine, MetaData]] = {}
+
+    def __new__(cls):
+        """A singleton constructor that ensures only one instance of the class"""
+        if not hasattr(cls, 'instance'):
+            cls.instance = super(EngineRegistry, cls).__new__(cls)
+        return cls.instance
+
+    def acquire(self, connectionString: str) -> tuple[Engine, MetaData]:
+        """Returns the shared engine and reflected metadata for a connection string, creating them on first use.
+            :param connectionString: str - An sqlalchemy connection string (e.g. postgresql+psycopg://...)
+            :returns tuple[Engine, MetaData] - The shared engine and the schema reflected through it
+        """
+        entry = self._entries.get(connectionString)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            # Another thread may have finished building the entry while we waited on the lock
+            entry = self._entries.get(connectionString)
+            if entry is None:
+                engine = sqlalchemy_create_engine(
+                    connectionString,
+                    echo=False,
+                    pool_pre_ping=True,
+                    pool_size=int(getenv('DB_POOL_SIZE', 5)),
+                    max_overflow=int(getenv('DB_MAX_OVERFLOW', 10)),
+                    pool_timeout=int(getenv('DB_POOL_TIMEOUT', 30)),
+                    pool_recycle=int(getenv('DB_POOL_RECYCLE', 1800)),
+                    connect_args=self.__connect_args(connectionString),
+                )
+                if QueryProfiler().enabled:
+                    QueryProfiler().instrument(engine)
+                metadata = MetaData()
+                metadata.reflect(bind=engine)
+
+                entry = (engine, metadata)
+                self._entries[connectionString] = entry
+        return entry
+
+    def __connect_args(self, connectionString: str) -> dict:
+        """The driver connection arguments, only psycopg (3) understands prepare_threshold."""
+        if not connectionString.startswith('postgresql+psycopg:'):
+            return {}
+
+        threshold = getenv('DB_PREPARE_THRESHOLD', '1')
+        return {'prepare_threshold': None if threshold.lower() == 'none' else int(threshold)}
+
+    def dispose(self) -> None:
+        """Closes every pooled connection and forgets the cached engines and schemas."""
+        with self._lock:
+            for engine, _ in self._entries.values():
+                engine.dispose()
+            self._entries.clear()
+
+    def _reset_after_fork(self) -> None:
+        """Runs in a freshly forked child. The inherited connections belong to the parent, so the
+        pools are dropped without closing the sockets. The reflected schema stays valid and is kept.
+        """
+        EngineRegistry._lock = Lock()
+        for engine, _ in self._entries.values():
+            engine.dispose(close=False)
+
+
+class ReferenceDataCache(object):
+    """A process-wide singleton that holds the reference tables every ingestion class looks locations up in,
+    ref_dataLocation (coordinates) and dataLocation_dataSource_mapping (external location codes), per connection string.
+
+    Both tables only change through migrations, so they are loaded together in one query on first use and
+    served from memory afterwards instead of costing a round trip per ingested series.
+        - Entries expire after REFERENCE_DATA_TTL seconds (default 3600), 0 reloads on every lookup.
+        - invalidate() drops every entry, the next lookup reloads.
+    """
+
+    _lock = Lock()
+    _entries: dict[str, tuple[float, dict, dict]] = {}
+
+    def __new__(cls):
+        """A singleton constructor that ensures only one instance of the class"""
+        if not hasattr(cls, 'instance'):
+            cls.instance = super(ReferenceDataCache, cls).__new__(cls)
+        return cls.instance
+
+    def get(self, key: str, load: Callable[[], tuple[dict, dict]], refresh: bool = False) -> tuple[dict, dict]:
+        """Returns the cached reference data for a database, loading it if it is missing, expired or refresh is set.
+            :param key: str - Identifies the database the data was loaded from
+            :param load: Callable[[], tuple[dict, dict]] - Loads the (locationCodes, coordinates) dictionaries
+            :param refresh: bool - Reload even if the cached data has not expired
+            :returns tuple[dict, dict] - The external location codes keyed by (sourceCode, location, priorityOrder)
+                and the (latitude, longitude) tuples keyed by location code
+        """
+        ttl = float(getenv('REFERENCE_DATA_TTL', 3600))
+
+        entry = self._entries.get(key)
+        if entry is not None and not refresh and monotonic() - entry[0] < ttl:
+            return entry[1], entry[2]
+
+        with self._lock:
+            # Another thread may have reloaded the entry while we waited on the lock
+            entry = self._entries.get(key)
+            if entry is None or monotonic() - entry[0] >= ttl or refresh:
+                loadedAt = monotonic()
+                locationCodes, coordinates = load()
+                entry = (loadedAt, locationCodes, coordinates)
+                self._entries[key] = entry
+        return entry[1], entry[2]
+
+    def invalidate(self) -> None:
+        """Drops every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def _reset_after_fork(self) -> None:
+        """Runs in a freshly forked child, the inherited lock may have been held by another parent thread.
+        The cached data is still valid and is kept.
+        """
+        ReferenceDataCache._lock = Lock()
+
+
+register_at_fork(after_in_child=lambda: EngineRegistry()._reset_after_fork())
+register_at_fork(after_in_child=lambda: ReferenceDataCache()._reset_after_fork())
+
+
 class SQLAlchemyORM_Postgres(ISeriesStorage):
- 
+
+    # The inputs columns written by insert_input, in the order the staged rows are built
+    INPUT_INSERTION_COLUMNS = (
+        "generatedTime", "acquiredTime", "verifiedTime", "dataValue", "isActual", "dataUnit", "dataSource",
+        "dataLocation", "dataSeries", "dataDatum", "latitude", "longitude", "ensembleMemberID"
+    )
+
+    # The columns covered by the inputs_AK00 unique constraint
+    INPUT_UNIQUE_COLUMNS = (
+        "isActual", "generatedTime", "verifiedTime", "dataUnit", "dataSource", "dataLocation",
+        "dataSeries", "dataDatum", "latitude", "longitude", "ensembleMemberID"
+    )
+
+    # The input_ensembles columns written by insert_input, in the order the staged rows are built
+    ENSEMBLE_INSERTION_COLUMNS = (
+        "generatedTime", "acquiredTime", "verifiedTime", "dataValues", "isActual", "dataUnit", "dataSource",
+        "dataLocation", "dataSeries", "dataDatum", "latitude", "longitude"
+    )
+
+    # The columns covered by the input_ensembles_AK00 unique constraint
+    ENSEMBLE_UNIQUE_COLUMNS = (
+        "isActual", "generatedTime", "verifiedTime", "dataUnit", "dataSource", "dataLocation",
+        "dataSeries", "dataDatum", "latitude", "longitude"
+    )
+
+    # The columns an inputs row is superseded within, select_input keeps the latest generated time per group
+    INPUT_SUPERSEDE_COLUMNS = ("dataSource", "dataLocation", "dataSeries", "dataDatum", "verifiedTime", "ensembleMemberID")
+
+    # The columns an input_ensembles row is superseded within
+    ENSEMBLE_SUPERSEDE_COLUMNS = ("dataSource", "dataLocation", "dataSeries", "dataDatum", "verifiedTime")
+
+    # The output_statistics columns filled from a statistics dictionary
+    STATISTICS_COLUMNS = (
+        "p1", "p5", "p10", "p25", "p50", "p75", "p90", "p95", "p99", "min", "max", "mean", "std_dev"
+    )
+
+    # The OutputCodec used for output dataValues, see __get_output_codec
+    _outputCodec: OutputCodec | None = None
+
+    # The text() statements built so far, see __statement
+    _statements: dict[tuple, TextClause] = {}
+
     def __init__(self) -> None:
-        """Constructor generates an a db schema. Automatically creates the 
-            metadata object holding the defined schema.
+        """Constructor fetches the shared engine and reflected db schema from the EngineRegistry.
+            The first instance in a process creates them, every other instance reuses them.
         """
-        self.__create_engine(getenv('DB_LOCATION_STRING'), False)
-        self.__metadata = MetaData()
-        self.__metadata.reflect(bind=self.__get_engine())
+        self._engine, self.__metadata = EngineRegistry().acquire(getenv('DB_LOCATION_STRING'))
+
+    @classmethod
+    def dispose(cls) -> None:
+        """Closes the shared connection pool and drops the cached schema and reference data for this process."""
+        EngineRegistry().dispose()
+        ReferenceDataCache().invalidate()
 
     #############################################################################################
     ################################################################################## Public methods
     #############################################################################################
     
+    @profiled
     def select_input(self, seriesDescription: SeriesDescription, timeDescription : TimeDescription) -> Series:
         """Selects a given series given a SeriesDescription and TimeDescription using splice_input to give the latest generated time per verified time.
         
@@ -66,54 +286,17 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
            
            Query Summary: The data is ordered into groups with the same verifiedTime AND ensembleMemberId. 
            From EACH group the latest generatedTime is selected. This query effectively gathers the latest 
-           generated time for each ensemble and non ensemble members.
+           generated time for each ensemble and non ensemble members. Ensembles stored as arrays in input_ensembles
+           are selected alongside, see __latest_inputs_sql.
            
            :param seriesDescription: SeriesDescription - A series description object
            :param timeDescription: TimeDescription - A hydrated time description object
         """
-        inputs_select_latest_stmt = text(f""" 
-        SELECT DISTINCT ON ("verifiedTime", "ensembleMemberID")
-            i."id",
-            i."generatedTime",
-            i."acquiredTime",
-            i."verifiedTime",
-            i."dataValue",
-            i."isActual",
-            i."dataUnit",
-            i."dataSource",
-            i."dataLocation",
-            i."dataSeries",
-            i."dataDatum",
-            i."latitude",
-            i."longitude",
-            i."ensembleMemberID"
-            FROM inputs AS i
-            WHERE         
-                i."dataSource"   = :dataSource
-                AND i."dataLocation" = :dataLocation
-                AND i."dataSeries"   = :dataSeries
-                AND {'i."dataDatum" = :dataDatum' if seriesDescription.dataDatum is not None else 'i."dataDatum" IS NULL'}
-                AND i."verifiedTime" BETWEEN :from_dt AND :to_dt
-            ORDER BY
-            i."verifiedTime",
-            i."ensembleMemberID",
-            i."generatedTime" DESC
+        inputs_select_latest_stmt = self.__statement(('select_input', seriesDescription.dataDatum is None), lambda: f""" 
+        SELECT l.* FROM ({self.__latest_inputs_sql(seriesDescription)}) AS l
         """)
-        
-        # Only bind dataDatum if it's not None
-        bind_params = {
-            'dataSource': seriesDescription.dataSource,
-            'dataLocation': seriesDescription.dataLocation,
-            'dataSeries': seriesDescription.dataSeries,
-            'from_dt': timeDescription.fromDateTime,
-            'to_dt': timeDescription.toDateTime 
-        }
-        if seriesDescription.dataDatum is not None:
-            bind_params['dataDatum'] = seriesDescription.dataDatum
-        
-        inputs_select_latest_stmt = inputs_select_latest_stmt.bindparams(**bind_params)
 
-        tupleishResult = self.__dbSelection(inputs_select_latest_stmt).fetchall()
+        tupleishResult = self.__dbSelection(inputs_select_latest_stmt, self.__input_params(seriesDescription, timeDescription)).fetchall()
         
         df_inputResult = self.__splice_input(tupleishResult)
         
@@ -122,7 +305,221 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
         series = Series(seriesDescription, timeDescription)
         series.dataFrame = df_inputResult
         return series
+
+    @profiled
+    def stream_input(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription, chunk_size: int = 10000) -> Iterator[Series]:
+        """Selects the same rows as select_input through a server side cursor and yields them as a series per chunk,
+        so memory stays bounded by the chunk size rather than the length of the time range (e.g. backfills over long windows).
+
+        The rows are ordered by verified time and a chunk never splits a verified time, so ensembles are spliced
+        whole. A chunk can therefore hold a little more than chunk_size rows when its last verified time has many members.
+        The connection is held until the generator is exhausted or closed.
+
+        :param seriesDescription: SeriesDescription - A series description object
+        :param timeDescription: TimeDescription - A hydrated time description object, every yielded series carries it
+        :param chunk_size: int - The number of rows fetched from the cursor at a time
+        """
+        stmt = self.__statement(('stream_input', seriesDescription.dataDatum is None), lambda: f""" 
+        SELECT l.* FROM ({self.__latest_inputs_sql(seriesDescription)}) AS l
+        ORDER BY l."verifiedTime"
+        """)
+
+        # verifiedTime is the fourth input column
+        for tupleishResult in self.__stream_rows(stmt, self.__input_params(seriesDescription, timeDescription), chunk_size, keyIndex=3):
+            series = Series(seriesDescription, timeDescription)
+            series.dataFrame = self.__splice_input(tupleishResult)
+            yield series
     
+    @profiled
+    def select_input_with_freshness(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription) -> tuple[Series, datetime | None, datetime | None]:
+        """Resolves an input request in a single round trip. Selects the same latest generated time per verified time
+           and ensemble member rows as select_input, and alongside them the values that fetch_oldest_generated_time
+           and fetch_row_with_max_verified_time_in_range would return, so a caller can decide if ingestion is needed
+           and reuse the rows when it isn't.
+
+           Query Summary: The latest_per_group CTE is the select_input query. The oldest of those latest generated times
+           and the max verified time are then computed over it with window functions and attached to every row.
+           The max verified time of the latest rows is the max verified time in range, as every verified time has a group.
+
+           :param seriesDescription: SeriesDescription - A series description object
+           :param timeDescription: TimeDescription - A hydrated time description object
+
+           :returns tuple[Series, datetime | None, datetime | None] - The input series, the oldest latest generated time (tz aware UTC)
+                and the max verified time in range (tz naive, as stored). Both times are None when no rows are found.
+        """
+        stmt = self.__statement(('select_input_with_freshness', seriesDescription.dataDatum is None), lambda: f"""
+        WITH latest_per_group AS (
+            {self.__latest_inputs_sql(seriesDescription)}
+        )
+        SELECT
+            l.*,
+            MIN(l."generatedTime") OVER () AS "oldestGeneratedTime",
+            MAX(l."verifiedTime") OVER () AS "maxVerifiedTime"
+        FROM latest_per_group AS l
+        ORDER BY
+            l."verifiedTime",
+            l."ensembleMemberID"
+        """)
+
+        tupleishResult = self.__dbSelection(stmt, self.__input_params(seriesDescription, timeDescription)).fetchall()
+
+        oldestGeneratedTime = None
+        maxVerifiedTime = None
+        if tupleishResult:
+            if tupleishResult[0][15]:
+                oldestGeneratedTime = pd.to_datetime(tupleishResult[0][15]).tz_localize(timezone.utc)
+            maxVerifiedTime = tupleishResult[0][16]
+
+        # The trailing window columns are stripped so the rows match what select_input splices
+        series = Series(seriesDescription, timeDescription)
+        series.dataFrame = self.__splice_input([tuple(row[:15]) for row in tupleishResult])
+        return series, oldestGeneratedTime, maxVerifiedTime
+
+    @profiled
+    def select_inputs_with_freshness(self, requests: list[tuple[SeriesDescription, TimeDescription]]) -> dict[int, tuple[Series, datetime | None, datetime | None]]:
+        """Resolves many input requests (e.g. every dependent series of a dspec) in a single round trip. Each request gets
+           exactly what select_input_with_freshness would return for it.
+
+           Query Summary: The requests are unnested from one array per column into a requests relation, one row per request
+           with its index. Every request row is joined LATERAL to the select_input query, filtered on that row instead of
+           bound parameters, so each request still only reads its own series and the partitions of its own verified time range.
+           The freshness window functions are partitioned by request index.
+
+           :param requests: list[tuple[SeriesDescription, TimeDescription]] - The requests to resolve
+           :returns dict[int, tuple[Series, datetime | None, datetime | None]] - The index of each request in requests mapped to its
+                input series, oldest latest generated time (tz aware UTC) and max verified time in range (tz naive, as stored).
+                Requests without rows get an empty series and None for both times.
+        """
+        if not requests:
+            return {}
+
+        stmt = self.__statement(('select_inputs_with_freshness',), lambda: f"""
+        WITH requests AS ({self.__requests_sql()})
+        SELECT
+            r."requestIndex",
+            l.*,
+            MIN(l."generatedTime") OVER (PARTITION BY r."requestIndex") AS "oldestGeneratedTime",
+            MAX(l."verifiedTime") OVER (PARTITION BY r."requestIndex") AS "maxVerifiedTime"
+        FROM requests AS r
+        CROSS JOIN LATERAL ({self.__latest_inputs_sql(None)}) AS l
+        ORDER BY
+            r."requestIndex",
+            l."verifiedTime",
+            l."ensembleMemberID"
+        """)
+
+        tupleishResult = self.__dbSelection(stmt, self.__requests_params(requests)).fetchall()
+
+        # Rows come back ordered by request index, so each request's rows are one contiguous group
+        rowsByRequest = {requestIndex: list(rows) for requestIndex, rows in groupby(tupleishResult, key=lambda row: row[0])}
+
+        results = {}
+        for requestIndex, (seriesDescription, timeDescription) in enumerate(requests):
+            rows = rowsByRequest.get(requestIndex, [])
+
+            oldestGeneratedTime = None
+            maxVerifiedTime = None
+            if rows:
+                if rows[0][16]:
+                    oldestGeneratedTime = pd.to_datetime(rows[0][16]).tz_localize(timezone.utc)
+                maxVerifiedTime = rows[0][17]
+
+            # The leading request index and trailing window columns are stripped so the rows match what select_input splices
+            series = Series(seriesDescription, timeDescription)
+            series.dataFrame = self.__splice_input([tuple(row[1:16]) for row in rows])
+            results[requestIndex] = (series, oldestGeneratedTime, maxVerifiedTime)
+
+        return results
+
+    @profiled
+    def select_inputs(self, requests: list[tuple[SeriesDescription, TimeDescription]]) -> dict[int, Series]:
+        """Resolves many input requests in a single round trip, each getting exactly what select_input would return for it.
+           The same query as select_inputs_with_freshness without the freshness window functions, for requests whose
+           freshness is already decided (see SeriesProvider.request_inputs and the ingestion ledger).
+
+           :param requests: list[tuple[SeriesDescription, TimeDescription]] - The requests to resolve
+           :returns dict[int, Series] - The index of each request in requests mapped to its input series,
+                requests without rows get an empty series
+        """
+        if not requests:
+            return {}
+
+        stmt = self.__statement(('select_inputs',), lambda: f"""
+        WITH requests AS ({self.__requests_sql()})
+        SELECT
+            r."requestIndex",
+            l.*
+        FROM requests AS r
+        CROSS JOIN LATERAL ({self.__latest_inputs_sql(None)}) AS l
+        ORDER BY
+            r."requestIndex",
+            l."verifiedTime",
+            l."ensembleMemberID"
+        """)
+
+        tupleishResult = self.__dbSelection(stmt, self.__requests_params(requests)).fetchall()
+
+        # Rows come back ordered by request index, so each request's rows are one contiguous group
+        rowsByRequest = {requestIndex: list(rows) for requestIndex, rows in groupby(tupleishResult, key=lambda row: row[0])}
+
+        results = {}
+        for requestIndex, (seriesDescription, timeDescription) in enumerate(requests):
+            series = Series(seriesDescription, timeDescription)
+            series.dataFrame = self.__splice_input([tuple(row[1:]) for row in rowsByRequest.get(requestIndex, [])])
+            results[requestIndex] = series
+
+        return results
+
+    @profiled
+    def fetch_ingestion_ledger(self, requests: list[tuple[SeriesDescription, TimeDescription]]) -> dict[int, list[dict]] | None:
+        """Returns the ingestion ledger entries (see migration 3.14) of every request's series whose verified range overlaps
+           the request's, in a single round trip. Each request is an index range scan on the series and toVerifiedTime.
+
+           :param requests: list[tuple[SeriesDescription, TimeDescription]] - The requests to look up
+           :returns dict[int, list[dict]] | None - The index of each request in requests mapped to its entries ordered by
+                fromVerifiedTime, each with fromVerifiedTime, toVerifiedTime, oldestGeneratedTime, latestGeneratedTime and
+                acquiredTime (tz aware UTC). None when the database has no ingestion_ledger table.
+        """
+        if 'ingestion_ledger' not in self.__metadata.tables:
+            return None
+        if not requests:
+            return {}
+
+        stmt = self.__statement(('fetch_ingestion_ledger',), lambda: f"""
+        WITH requests AS ({self.__requests_sql()})
+        SELECT
+            r."requestIndex",
+            g."fromVerifiedTime",
+            g."toVerifiedTime",
+            g."oldestGeneratedTime",
+            g."latestGeneratedTime",
+            g."acquiredTime"
+        FROM requests AS r
+        JOIN ingestion_ledger AS g
+            ON g."dataSource" = r."dataSource"
+            AND g."dataLocation" = r."dataLocation"
+            AND g."dataSeries" = r."dataSeries"
+            AND g."dataDatum" IS NOT DISTINCT FROM r."dataDatum"
+            AND g."toVerifiedTime" >= r."fromTime"
+            AND g."fromVerifiedTime" <= r."toTime"
+        ORDER BY
+            r."requestIndex",
+            g."fromVerifiedTime"
+        """)
+        tupleishResult = self.__dbSelection(stmt, self.__requests_params(requests)).fetchall()
+
+        entries = {requestIndex: [] for requestIndex in range(len(requests))}
+        for row in tupleishResult:
+            entries[row[0]].append({
+                'fromVerifiedTime': row[1].replace(tzinfo=timezone.utc),
+                'toVerifiedTime': row[2].replace(tzinfo=timezone.utc),
+                'oldestGeneratedTime': row[3].replace(tzinfo=timezone.utc),
+                'latestGeneratedTime': row[4].replace(tzinfo=timezone.utc),
+                'acquiredTime': row[5].replace(tzinfo=timezone.utc)
+            })
+        return entries
+
+    @profiled
     def select_specific_output(self, semaphoreSeriesDescription: SemaphoreSeriesDescription, timeDescription : TimeDescription) -> Series:
         """
         Selects an output series given a SemaphoreSeriesDescription and TimeDescription.
@@ -139,7 +536,7 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
 
         series = Series(semaphoreSeriesDescription, timeDescription)
         
-        stmt = text(f"""
+        stmt = self.__statement(('select_specific_output_lead_time', semaphoreSeriesDescription.dataDatum is None), lambda: f"""
             SELECT "leadTime" FROM outputs
             WHERE "dataLocation" = :dataLocation
             AND "dataSeries" = :dataSeries
@@ -159,8 +556,7 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
         if semaphoreSeriesDescription.dataDatum is not None:
             bind_params['dataDatum'] = semaphoreSeriesDescription.dataDatum
 
-        stmt = stmt.bindparams(**bind_params)
-        leadTime = self.__dbSelection(stmt).fetchone()
+        leadTime = self.__dbSelection(stmt, bind_params).fetchone()
 
         # if no lead time is found for some reason return nothing and log this
         if leadTime is None:
@@ -170,7 +566,7 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
         fromGeneratedTime = timeDescription.fromDateTime - leadTime[0]
         toGeneratedTime = timeDescription.toDateTime - leadTime[0]
 
-        stmt = text(f"""
+        stmt = self.__statement(('select_specific_output', semaphoreSeriesDescription.dataDatum is None), lambda: f"""
             SELECT * FROM outputs
             WHERE "modelName" = :modelName
             AND "modelVersion" = :modelVersion
@@ -193,13 +589,13 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
         if semaphoreSeriesDescription.dataDatum is not None:
             bind_params['dataDatum'] = semaphoreSeriesDescription.dataDatum
 
-        stmt = stmt.bindparams(**bind_params)
-        tupleishResult = self.__dbSelection(stmt).fetchall()
+        tupleishResult = self.__dbSelection(stmt, bind_params).fetchall()
         series.dataFrame = self.__splice_output(tupleishResult)
         return series
     
 
-    def select_output(self, model_name: str, from_time: datetime, to_time: datetime) -> Series | None: 
+    @profiled
+    def select_output(self, model_name: str, from_time: datetime, to_time: datetime, decode: str = 'lazy') -> Series | None: 
         ''' This selects outputs based just on a model name and a time range, all other information is inferred.
             The modelname will be used to select the lead time for the most recent model run with that model name,
             then a second query is made to select all rows for that model name that have a generated time that falls within
@@ -211,13 +607,121 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             :param model_name: str - The name of the model to query
             :param to_time: datetime - The latest time to include
             :param from_time: datetime - The earliest time to include
+            :param decode: str - How the dataValue column is returned, see __splice_output. By default each
+                array is only decoded when it is first used.
+        '''
+
+        tupleishResult = self.__select_output_rows('select_output', model_name, from_time, to_time)
+
+        if not tupleishResult:
+            return None    
+
+        series = Series(self.__output_description(tupleishResult[0]))
+        series.dataFrame = self.__splice_output(tupleishResult, decode)
+        return series
+
+    @profiled
+    def stream_output(self, model_name: str, from_time: datetime, to_time: datetime, chunk_size: int = 100, decode: str = 'lazy') -> Iterator[Series]:
+        ''' Selects the same outputs as select_output through a server side cursor and yields them as a series per chunk
+            ordered by generated time, so memory stays bounded by the chunk size rather than the length of the time range
+            (e.g. months of CRPS runs). Each chunk's blobs are only deserialized when the chunk is reached.
+            Nothing is yielded if no outputs were found. The connection is held until the generator is exhausted or closed.
+
+            :param model_name: str - The name of the model to query
+            :param to_time: datetime - The latest time to include
+            :param from_time: datetime - The earliest time to include
+            :param chunk_size: int - The number of output rows (model runs) per yielded series
+            :param decode: str - How the dataValue column is returned, see __splice_output
+        '''
+        bind_params = self.__output_range_params('stream_output', model_name, from_time, to_time)
+        if bind_params is None:
+            return
+
+        stmt = self.__statement(('stream_output',), lambda: f"""
+            {self.__output_range_sql()}
+            ORDER BY "timeGenerated"
+        """)
+
+        for tupleishResult in self.__stream_rows(stmt, bind_params, chunk_size):
+            series = Series(self.__output_description(tupleishResult[0]))
+            series.dataFrame = self.__splice_output(tupleishResult, decode)
+            yield series
+
+    def __output_description(self, row: tuple) -> SemaphoreSeriesDescription:
+        ''' Parses out model information from an output row, this is constant metadata across all the rows of a model.
+            :param row: tupleish - An outputs row, see __splice_output
+        '''
+        return SemaphoreSeriesDescription(
+            row[3],   # modelName
+            row[4],   # modelVersion
+            row[8],   # dataSeries
+            row[7],   # dataLocation
+            row[9]    # dataDatum
+        )
+    
+
+    @profiled
+    def select_output_stack(self, model_name: str, from_time: datetime, to_time: datetime) -> tuple[ndarray, DataFrame] | None:
+        ''' Selects the same outputs as select_output but returns the predictions as a single stacked array
+            for analytics consumers that work over many runs at once.
+
+            :param model_name: str - The name of the model to query
+            :param to_time: datetime - The latest time to include
+            :param from_time: datetime - The earliest time to include
+
+            :returns tuple[ndarray, DataFrame] | None - The (runs, members, inputs, outputs) array, with failed runs
+                filled with NaN, and an output dataframe without the dataValue column whose rows line up with the
+                first axis of the array. None if no outputs were found.
+        '''
+        tupleishResult = self.__select_output_rows('select_output_stack', model_name, from_time, to_time)
+
+        if not tupleishResult:
+            return None
+
+        columns = list(zip(*tupleishResult))
+        stack = self.__stack_output_data(columns[5])
+
+        df_metadata = self.__splice_output([tuple(row[:5]) + (None,) + tuple(row[6:]) for row in tupleishResult])
+        return stack, df_metadata.drop(columns=['dataValue'])
+
+
+    def __select_output_rows(self, caller: str, model_name: str, from_time: datetime, to_time: datetime) -> list[tuple]:
+        ''' Runs the output selection shared by select_output and select_output_stack.
+
+            :param caller: str - The public method name, used for logging
+            :param model_name: str - The name of the model to query
+            :param to_time: datetime - The latest time to include
+            :param from_time: datetime - The earliest time to include
+
+            :returns list[tupleish] - The selected output rows, empty if none were found
+        '''
+        bind_params = self.__output_range_params(caller, model_name, from_time, to_time)
+        if bind_params is None:
+            return []
+
+        stmt = self.__statement(('select_output',), self.__output_range_sql)
+
+        tupleishResult = self.__dbSelection(stmt, bind_params).fetchall()
+
+        return tupleishResult
+
+    def __output_range_params(self, caller: str, model_name: str, from_time: datetime, to_time: datetime) -> dict | None:
+        ''' Infers the generated time range of a model's outputs from the lead time of its latest prediction,
+            returning the bind parameters of __output_range_sql.
+
+            :param caller: str - The public method name, used for logging
+            :param model_name: str - The name of the model to query
+            :param to_time: datetime - The latest time to include
+            :param from_time: datetime - The earliest time to include
+
+            :returns dict | None - The bind parameters, None if no lead time was found for the model
         '''
 
         # Get the lead time for time calculations
         # Because we are inferring model information
         # We select the latest version of the model under that name
         # and the lead time from its latest prediction
-        stmt = text("""
+        stmt = self.__statement(('select_output_lead_time',), lambda: """
             SELECT "leadTime" FROM outputs
             WHERE "modelName" = :model_name
             ORDER BY "modelVersion" DESC, "timeGenerated" DESC
@@ -228,18 +732,24 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             'model_name': model_name
         }
 
-        stmt = stmt.bindparams(**bind_params)
-        leadTime = self.__dbSelection(stmt).fetchone()
+        leadTime = self.__dbSelection(stmt, bind_params).fetchone()
         
         # if no lead time is found for some reason return nothing and log this
         if leadTime is None: 
-            log(f'SQLAlchemyORM | select_output | No leadtime found for model_name:{model_name}')
+            log(f'SQLAlchemyORM | {caller} | No leadtime found for model_name:{model_name}')
             return None
         
-        fromGeneratedTime = from_time - leadTime[0]
-        toGeneratedTime = to_time - leadTime[0]
-        
-        stmt = text("""
+        return {
+            'model_name': model_name,
+            'fromGeneratedTime': from_time - leadTime[0],
+            'toGeneratedTime': to_time - leadTime[0]
+        }
+
+    def __output_range_sql(self) -> str:
+        ''' The selection of a model's outputs within a generated time range, binds :model_name,
+            :fromGeneratedTime and :toGeneratedTime (see __output_range_params).
+        '''
+        return """
             SELECT
             "id",
             "timeGenerated",
@@ -255,52 +765,23 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             WHERE "modelName" = :model_name
             AND "timeGenerated" >= :fromGeneratedTime
             AND "timeGenerated" <= :toGeneratedTime
-        """)
-
-        bind_params = {
-            'model_name': model_name,
-            'fromGeneratedTime': fromGeneratedTime,
-            'toGeneratedTime': toGeneratedTime
-        }
-
-        stmt = stmt.bindparams(**bind_params)
-        tupleishResult = self.__dbSelection(stmt).fetchall()
-
-        if not tupleishResult:
-            return None    
-
-        outputResult = self.__splice_output(tupleishResult)
-
-        # Parse out model information from first output result
-        # this is constant metadata across all the rows returned
-        row = tupleishResult[0]
-        description = SemaphoreSeriesDescription(
-            row[3],   # modelName
-            row[4],   # modelVersion
-            row[8],   # dataSeries
-            row[7],   # dataLocation
-            row[9]    # dataDatum
-        )
-        series = Series(description)
-        series.dataFrame = outputResult
-        return series
+        """
     
 
-    def select_latest_output(self, model_names: list[str]) -> list[Series] | None: 
+    @profiled
+    def select_latest_output(self, model_names: list[str], decode: str = 'lazy') -> list[Series] | None: 
         ''' 
         This selects the latest output for each model in the list of model names, all other information is inferred.
         NOTE:: This will return the latest prediction, per model, that was generated regardless of version.
+        The latest outputs are read through the latest_outputs side table (database version 3.12), which the
+        outputs insert trigger keeps pointed at each model's latest rows, so the lookup does not scan outputs.
+
+        :param model_names: list[str] - The names of the models to query
+        :param decode: str - How the dataValue column is returned, see __splice_output. By default each
+            array is only decoded when it is first used.
         '''   
 
-        stmt_collect_all_latest_outputs = text("""
-        WITH latest_time_per_model AS (
-            SELECT 
-                o."modelName",
-                MAX(o."timeGenerated") AS latest_time
-            FROM outputs AS o
-            WHERE o."modelName" IN :model_names
-            GROUP BY o."modelName"
-        )
+        stmt_collect_all_latest_outputs = self.__statement(('select_latest_output',), lambda: """
         SELECT 
             o."id",
             o."timeGenerated",
@@ -312,24 +793,25 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             o."dataLocation",
             o."dataSeries",
             o."dataDatum"
-        FROM outputs AS o
-        INNER JOIN latest_time_per_model AS ltpm
-            ON o."modelName" = ltpm."modelName"
-            AND o."timeGenerated" = ltpm.latest_time
+        FROM latest_outputs AS l
+        INNER JOIN outputs AS o
+            ON o."id" = l."outputID"
+        WHERE l."modelName" = ANY(CAST(:model_names AS VARCHAR[]))
         ORDER BY
             o."modelName"
         """)     
-        stmt_collect_all_latest_outputs = stmt_collect_all_latest_outputs.bindparams(bindparam("model_names", value=tuple(model_names), expanding=True, type_=String))
-        result = self.__dbSelection(stmt_collect_all_latest_outputs).fetchall()
+        result = self.__dbSelection(stmt_collect_all_latest_outputs, {'model_names': list(model_names)}).fetchall()
         
         if not result:
             return None
         
+        # Splice every model's output at once then hand each model its own row
+        df_all_parsed_data = self.__splice_output(result, decode)
+
         # Each model will be processed into a Series individually 
         results = []
-        for row in result:
-            # wrap the single row in a list for splice output
-            df_parsed_data = self.__splice_output([row]) 
+        for idx, row in enumerate(result):
+            df_parsed_data = df_all_parsed_data.iloc[[idx]].reset_index(drop=True)
 
             # create the series object for this model
             series = Series(
@@ -346,6 +828,7 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             results.append(series)
         return results
     
+    @profiled
     def select_output_statistics_range(self, model_names: list[str], fromDateTime: datetime, toDateTime: datetime) -> list[dict] | None:
         '''
         This function returns the statistics for each model in the provided list of model names
@@ -377,7 +860,7 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
                 'std_dev': float
             }
         '''
-        stmt = text("""
+        stmt = self.__statement(('select_output_statistics_range',), lambda: """
         SELECT
             o."modelName",
             o."timeGenerated",
@@ -397,19 +880,19 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
         FROM outputs AS o
         INNER JOIN output_statistics AS s
             ON s."outputID" = o."id"
-        WHERE o."modelName" IN :model_names
+        WHERE o."modelName" = ANY(CAST(:model_names AS VARCHAR[]))
         AND o."timeGenerated" >= :fromDateTime
         AND o."timeGenerated" <= :toDateTime
         ORDER BY o."modelName", o."timeGenerated" DESC
         """)
 
-        stmt = stmt.bindparams(
-            bindparam("model_names", value=tuple(model_names), expanding=True, type_=String),
-            bindparam("fromDateTime", value=fromDateTime),
-            bindparam("toDateTime", value=toDateTime),
-        )
+        bind_params = {
+            'model_names': list(model_names),
+            'fromDateTime': fromDateTime,
+            'toDateTime': toDateTime
+        }
 
-        result = self.__dbSelection(stmt).fetchall()
+        result = self.__dbSelection(stmt, bind_params).fetchall()
         
         if not result:
             return None
@@ -439,6 +922,7 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
         return statistics_results
         
             
+    @profiled
     def select_latest_output_statistics(self, model_names: list[str]) -> list[dict] | None:
         '''
         This function returns the latest statistics for each model in the list of model names, or None
@@ -467,13 +951,12 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             }
         '''
 
-        # by sorting by generated time descending and using
-        # distinct on model names, we can get the latest
-        # statistics for each model in a simple query
-        stmt = text('''
-        SELECT DISTINCT ON (o."modelName")
-            o."modelName",
-            o."timeGenerated",
+        # latest_output_statistics (database version 3.12) holds the latest output with statistics
+        # for each model, kept current by the output_statistics insert trigger
+        stmt = self.__statement(('select_latest_output_statistics',), lambda: '''
+        SELECT
+            l."modelName",
+            l."timeGenerated",
             s."p1",
             s."p5",
             s."p10",
@@ -487,17 +970,16 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             s."max",
             s."mean",
             s."std_dev"
-        FROM outputs AS o
+        FROM latest_output_statistics AS l
         INNER JOIN output_statistics AS s
-            ON s."outputID" = o."id"
-        WHERE o."modelName" IN :model_names
-        ORDER BY o."modelName", o."timeGenerated" DESC
+            ON s."outputID" = l."outputID"
+        WHERE l."modelName" = ANY(CAST(:model_names AS VARCHAR[]))
+        ORDER BY l."modelName"
         ''')
-        stmt = stmt.bindparams(bindparam("model_names", value=tuple(model_names), expanding=True, type_=String))
 
         # the result tuples will have the form 
         # (modelName, timeGenerated, p1, p5, p10, p25, p50, p75, p90, p95, p99, min, max, mean, std_dev)
-        result = self.__dbSelection(stmt).fetchall()
+        result = self.__dbSelection(stmt, {'model_names': list(model_names)}).fetchall()
         
         if not result:
             return None
@@ -527,94 +1009,368 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
         return statistics_results
 
     
+    @profiled
     def find_external_location_code(self, sourceCode: str, location: str, priorityOrder: int = 0) -> str:
         """Returns a data source location code based off of passed parameters
+           The lookup is served from the ReferenceDataCache, a miss reloads it once in case the mapping was added since.
            :param sourceCode: str - the data source code (noaaT&C)
            :param location: str - the local location name 
            :param priorityOrder: int - priority of which locations to go to if one is unavailable 
+           :raises IndexError - If no mapping exists
         """
-        dataLocation_dataSource_mapping = self.__metadata.tables['dataLocation_dataSource_mapping']
-        statement = (select(dataLocation_dataSource_mapping.c.dataSourceLocationCode)
-                     .where(dataLocation_dataSource_mapping.c.dataSourceCode == sourceCode)
-                     .where(dataLocation_dataSource_mapping.c.dataLocationCode == location)
-                     .where(dataLocation_dataSource_mapping.c.priorityOrder == priorityOrder)
-                    )
-        dataSourceLocationCode = self.__dbSelection(statement).fetchall()[0]
-        return dataSourceLocationCode[0]
+        key = (sourceCode, location, priorityOrder)
+
+        locationCodes, _ = self.__reference_data()
+        if key not in locationCodes:
+            locationCodes, _ = self.__reference_data(refresh=True)
+        if key not in locationCodes:
+            raise IndexError(f'No dataLocation_dataSource_mapping row for sourceCode: {sourceCode}, location: {location}, priorityOrder: {priorityOrder}')
+        return locationCodes[key]
 
+    @profiled
     def find_lat_lon_coordinates(self, locationCode: str) -> tuple:
         """Returns lat and lon tuple
-           :param sourceCode: str - the data source code (noaaT&C)
-           :param location: str - the local location name 
-           :param priorityOrder: int - priority of which locations to go to if one is unavailable 
+           The lookup is served from the ReferenceDataCache, a miss reloads it once in case the location was added since.
+           :param locationCode: str - the local location name 
+           :raises TypeError - If the location does not exist
+        """
+        _, coordinates = self.__reference_data()
+        if locationCode not in coordinates:
+            _, coordinates = self.__reference_data(refresh=True)
+        if locationCode not in coordinates:
+            raise TypeError(f'No ref_dataLocation row for locationCode: {locationCode}')
+        return coordinates[locationCode]
+
+    def refresh_reference_data(self) -> None:
+        """Reloads the cached ref_dataLocation and dataLocation_dataSource_mapping tables."""
+        self.__reference_data(refresh=True)
+
+    def __reference_data(self, refresh: bool = False) -> tuple[dict, dict]:
+        """Returns the (locationCodes, coordinates) dictionaries of this database from the ReferenceDataCache.
+            :param refresh: bool - Reload even if the cached data has not expired
+        """
+        return ReferenceDataCache().get(str(self.__get_engine().url), self.__load_reference_data, refresh)
+
+    def __load_reference_data(self) -> tuple[dict, dict]:
+        """Loads ref_dataLocation and dataLocation_dataSource_mapping in one query. Every mapping references a
+            ref_dataLocation code, so joining the mappings onto the locations returns both tables.
+            :returns tuple[dict, dict] - The external location codes keyed by (sourceCode, location, priorityOrder)
+                and the (latitude, longitude) tuples keyed by location code
         """
-        ref_dataLocationTable = self.__metadata.tables['ref_dataLocation']
-        statement = (select(ref_dataLocationTable.c.latitude, ref_dataLocationTable.c.longitude)
-                     .where(ref_dataLocationTable.c.code == locationCode)
-                    )
-        latLon = self.__dbSelection(statement).first()
-        return (latLon[0], latLon[1])
+        stmt = self.__statement(('load_reference_data',), lambda: """
+        SELECT
+            r."code",
+            r."latitude",
+            r."longitude",
+            m."dataSourceCode",
+            m."dataSourceLocationCode",
+            m."priorityOrder"
+        FROM "ref_dataLocation" AS r
+        LEFT JOIN "dataLocation_dataSource_mapping" AS m
+            ON m."dataLocationCode" = r."code"
+        ORDER BY m."id"
+        """)
+
+        locationCodes = {}
+        coordinates = {}
+        for code, latitude, longitude, sourceCode, sourceLocationCode, priorityOrder in self.__dbSelection(stmt).fetchall():
+            coordinates[code] = (latitude, longitude)
+            # The first mapping is kept when several share a priority, as the single row lookup did
+            if sourceCode is not None:
+                locationCodes.setdefault((sourceCode, code, priorityOrder), sourceLocationCode)
+        return locationCodes, coordinates
         
 
-    def insert_input(self, series: Series) -> Series:
-        """This method inserts actual/predictions into the input table
+    @profiled
+    def insert_input(self, series: Series, returning: bool = True) -> Series | int:
+        """This method inserts actual/predictions into the input tables
+            Non ensemble series are written to inputs, one row per value. Ensemble series are written to
+            input_ensembles, one row per verified and generated time with every member in the dataValues array.
+            The rows are streamed with COPY into a temporary staging table and then merged into the table
+            with a single INSERT ... SELECT. On conflict with the table's AK00 the acquired time is updated to now.
+
             :param series: Series - A series object with a time description, series description, and input data
-            :return Series - A series object that contains the actually inserted  data
+            :param returning: bool - When False the inserted rows are not sent back, only their count
+            :return Series | int - A series object that contains the actually inserted data,
+                or the number of inserted/updated rows if returning is False
         """
 
         if(type(series.description).__name__ != 'SeriesDescription'): raise ValueError('Description should be type SeriesDescription')
 
-        # If dataValue is a list its an ensemble
-        isEnsemble = isinstance(series.dataFrame['dataValue'].iloc[0], list) 
         now = datetime.now(timezone.utc)
-        insertionRows = []
-
-        for df_index, row in series.dataFrame.iterrows():
-            # We need to iterate over every value in dataValue if it is an ensemble
-            # but non ensemble inputs are just a single value so we convert them
-            # temporarily to a list to make the iteration easier
-            dataValues = row["dataValue"] if isEnsemble else [ row["dataValue"] ] 
-            for value_index, value in enumerate(dataValues):
-                new_row = {
-                    "generatedTime": series.dataFrame.iloc[df_index]['timeGenerated'], 
-                    "acquiredTime": now, 
-                    "verifiedTime": series.dataFrame.iloc[df_index]['timeVerified'], 
-                    "dataValue": value, 
-                    "isActual": False if series.description.dataSeries[0] == 'p' else True, 
-                    "dataUnit": series.dataFrame.iloc[df_index]['dataUnit'], 
-                    "dataSource": series.description.dataSource, 
-                    "dataLocation": series.description.dataLocation,
-                    "dataSeries": series.description.dataSeries, 
-                    "dataDatum": series.description.dataDatum, 
-                    "latitude": series.dataFrame.iloc[df_index]['latitude'], 
-                    "longitude": series.dataFrame.iloc[df_index]['longitude'],
-                    "ensembleMemberID": value_index if isEnsemble else None # Only set for ensemble inputs
-                }
-                insertionRows.append(new_row)
+        insertionRows = self.__build_input_insertion_rows(series, now)
+
+        # If dataValue is a list its an ensemble
+        isEnsemble = not series.dataFrame.empty and isinstance(series.dataFrame['dataValue'].iloc[0], list)
+        if isEnsemble:
+            # Returned in the layout of inputs so __splice_input can read them
+            returningSql = f'''RETURNING "id", "generatedTime", "acquiredTime", "verifiedTime", NULL::DOUBLE PRECISION AS "dataValue", "isActual", "dataUnit",
+                "dataSource", "dataLocation", "dataSeries", "dataDatum", "latitude", "longitude", NULL::INTEGER AS "ensembleMemberID", "dataValues"'''
+            result = self.__copy_and_merge('input_ensembles', self.ENSEMBLE_INSERTION_COLUMNS, self.ENSEMBLE_UNIQUE_COLUMNS, insertionRows, returningSql if returning else '')
+        else:
+            # Make sure every month being written to has a partition. This runs in its own short transaction
+            # so the partition lock is not held while the rows are copied and merged.
+            if insertionRows:
+                verifiedTimes = [row[2] for row in insertionRows]
+                self.create_input_partitions(min(verifiedTimes), max(verifiedTimes))
+            result = self.__copy_and_merge('inputs', self.INPUT_INSERTION_COLUMNS, self.INPUT_UNIQUE_COLUMNS, insertionRows, 'RETURNING *' if returning else '')
+
+        if not returning:
+            return result
 
-    
-        # It seems that Postgres has a limit of 65535 parameters per query. If you have a lot of rows (say 6700, then you only have ~9 parameters per row)
-        # Our rows have more parameters than that so we if we have more than 999 rows we are trying to insert we need to batch them
-        batch_size = 999  # Set your desired batch size
-        batched_rows = [insertionRows[i:i + batch_size] for i in range(0, len(insertionRows), batch_size)]
-        
-        for batch in batched_rows:
-            # Insert the rows into the inputs table returning what is inserted as a sanity check
-            # On conflict we update the acquired time to now
-            with self.__get_engine().connect() as conn:
-                cursor = conn.execute(insert(self.__metadata.tables['inputs'])
-                                        .values(batch)
-                                        .on_conflict_do_update(constraint='inputs_AK00', set_={"acquiredTime": now})
-                                        .returning(self.__metadata.tables['inputs'])
-                                    )
-                result = cursor.fetchall()
-                conn.commit()
-        
         # Create a series object to return with the inserted data
         resultSeries = Series(series.description, series.timeDescription)
         resultSeries.dataFrame = self.__splice_input(result) #Turn tuple objects into actual objects
         return resultSeries
+
+    def __copy_and_merge(self, tableName: str, columns: tuple[str], uniqueColumns: tuple[str], rows: list[tuple], returningSql: str) -> list[tuple] | int:
+        """Streams rows with COPY into a temporary staging table shaped like tableName, then merges them in with a single
+            INSERT ... SELECT ... ON CONFLICT on the table's AK00 constraint, updating the acquired time of existing rows.
+
+            :param tableName: str - inputs or input_ensembles
+            :param columns: tuple[str] - The columns being written, in the order of the row tuples
+            :param uniqueColumns: tuple[str] - The columns of the table's AK00 constraint
+            :param rows: list[tuple] - The rows to write
+            :param returningSql: str - A RETURNING clause, or an empty string to only count the rows
+            :return list[tuple] | int - The returned rows, or the number of inserted/updated rows without a RETURNING clause
+        """
+        columnList = ', '.join(f'"{column}"' for column in columns)
+        keyList = ', '.join(f'"{column}"' for column in uniqueColumns)
+
+        # A temporary table is never written to the WAL and is private to this connection, so concurrent
+        # ingests can not see each others staged rows. It is dropped when the transaction commits.
+        stmt_create_staging = f"""
+            CREATE TEMP TABLE {tableName}_staging ON COMMIT DROP AS
+            SELECT {columnList} FROM {tableName} WITH NO DATA
+        """
+
+        # DISTINCT ON guards against the same key being staged twice which ON CONFLICT DO UPDATE can not handle.
+        # Each table is always merged with the same columns and RETURNING clause, so they key the statement with it.
+        stmt_merge = self.__statement(('copy_and_merge', tableName, bool(returningSql)), lambda: f"""
+            INSERT INTO {tableName} ({columnList})
+            SELECT DISTINCT ON ({keyList}) {columnList}
+            FROM {tableName}_staging
+            ON CONFLICT ON CONSTRAINT "{tableName}_AK00"
+            DO UPDATE SET "acquiredTime" = EXCLUDED."acquiredTime"
+            {returningSql}
+        """)
+
+        with self.__get_engine().begin() as conn:
+            with conn.connection.driver_connection.cursor() as cursor:
+                cursor.execute(stmt_create_staging)
+                with cursor.copy(f'COPY {tableName}_staging ({columnList}) FROM STDIN') as copy:
+                    for row in rows:
+                        copy.write_row(row)
+
+            cursor = conn.execute(stmt_merge)
+            if not returningSql:
+                return cursor.rowcount
+            return cursor.fetchall()
+
+    def __build_input_insertion_rows(self, series: Series, acquiredTime: datetime) -> list[tuple]:
+        """Flattens an input series into the rows that are copied into the staging table.
+            Non ensemble series give one tuple per value ordered as INPUT_INSERTION_COLUMNS.
+            Ensemble series (list dataValues) give one tuple per dataframe row ordered as ENSEMBLE_INSERTION_COLUMNS,
+            with the members as a list of floats.
+
+            :param series: Series - A series object with a series description and input data
+            :param acquiredTime: datetime - The acquired time to stamp on every row
+            :return list[tuple] - The rows ready to be copied into the staging table
+        """
+        df = series.dataFrame
+        if df.empty:
+            return []
+
+        # If dataValue is a list its an ensemble
+        isEnsemble = isinstance(df['dataValue'].iloc[0], list)
+        if isEnsemble:
+            dataValues = [[None if value is None else float(value) for value in values] for values in df['dataValue']]
+        else:
+            # "dataValue" is DOUBLE PRECISION (version 3.11) and NOT NULL, a missing value is stored as NaN
+            dataValues = pd.to_numeric(df['dataValue'], errors='coerce').astype(np.float64).tolist()
+
+        def column(name: str) -> list:
+            # NaT/NaN can not be copied so they are sent as nulls
+            values = df[name].astype(object).to_numpy()
+            return [None if pd.isna(value) else self.__to_naive_utc(value) for value in values]
+
+        rowCount = len(df)
+        description = series.description
+        columns = [
+            column('timeGenerated'),
+            [self.__to_naive_utc(acquiredTime)] * rowCount,
+            column('timeVerified'),
+            dataValues,
+            [description.dataSeries[0] != 'p'] * rowCount,
+            column('dataUnit'),
+            [description.dataSource] * rowCount,
+            [description.dataLocation] * rowCount,
+            [description.dataSeries] * rowCount,
+            [description.dataDatum] * rowCount,
+            column('latitude'),
+            column('longitude')
+        ]
+        if not isEnsemble:
+            columns.append([None] * rowCount) # ensembleMemberID
+        return list(zip(*columns))
+    
+    def __to_naive_utc(self, value):
+        """The time columns are TIMESTAMP WITHOUT TIME ZONE and COPY's text input drops any offset rather than
+            converting it, so tz aware datetimes are converted to naive UTC before they are staged.
+            Anything that is not a tz aware datetime is returned unchanged.
+        """
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
     
+    @profiled
+    def create_input_partitions(self, from_time: datetime, to_time: datetime) -> int:
+        """Creates any missing monthly inputs partitions covering a verified time range.
+            Partitions are created by the create_inputs_partitions database function (see migration 3.9).
+
+            :param from_time: datetime - The earliest verified time that needs a partition
+            :param to_time: datetime - The latest verified time that needs a partition
+            :return int - The number of partitions created
+        """
+        stmt = text('SELECT create_inputs_partitions(CAST(:from_time AS TIMESTAMP), CAST(:to_time AS TIMESTAMP))')
+        stmt = stmt.bindparams(from_time=self.__to_naive_utc(from_time), to_time=self.__to_naive_utc(to_time))
+        with self.__get_engine().begin() as conn:
+            created = conn.execute(stmt).scalar()
+
+        if created:
+            log(f'SQLAlchemyORM | create_input_partitions | Created {created} inputs partition(s) for {from_time} to {to_time}')
+        return created
+
+    @profiled
+    def detach_input_partitions(self, before_time: datetime) -> list[str]:
+        """Detaches every monthly inputs partition that ends on or before the month of before_time.
+            Detached partitions are renamed to archived_inputs_YYYY_MM, they keep their rows but are no longer
+            part of inputs. They can be dumped and dropped without touching the live table.
+            In the same transaction, the ingestion ledger entries (see migration 3.14) that start before that month are
+            deleted, so the ledger does not report the detached rows as ingested. Requests for those times fall back
+            to deciding freshness from the inputs themselves.
+
+            :param before_time: datetime - Partitions for months entirely before this month are detached
+            :return list[str] - The names of the archived tables
+        """
+        before_time = self.__to_naive_utc(before_time)
+        stmt = text('SELECT detach_inputs_partitions(CAST(:before_time AS TIMESTAMP))').bindparams(before_time=before_time)
+        with self.__get_engine().begin() as conn:
+            archived = conn.execute(stmt).scalars().all()
+
+            ledgerCount = 0
+            if 'ingestion_ledger' in self.__metadata.tables:
+                ledgerCount = conn.execute(
+                    text('DELETE FROM ingestion_ledger WHERE "fromVerifiedTime" < date_trunc(\'month\', CAST(:before_time AS TIMESTAMP))'),
+                    {'before_time': before_time}
+                ).rowcount
+
+        log(f'SQLAlchemyORM | detach_input_partitions | Detached {len(archived)} inputs partition(s) and deleted {ledgerCount} ingestion_ledger entries before {before_time}')
+        return list(archived)
+
+    def prune_superseded_inputs(self, before_time: datetime, batch_size: int = 10000, window: timedelta = timedelta(days=1),
+                                archive: Callable[[str, DataFrame], None] | None = None, lock_timeout_ms: int = 2000) -> dict[str, int]:
+        """Deletes the superseded generations of inputs and input_ensembles rows verified before before_time.
+
+            A row is superseded when its group has a row with a later generated time. For inputs the group is the
+            series, verified time and ensemble member. For input_ensembles it is the series and verified time.
+            These are the groups select_input takes the latest generated time of. The latest generation of every group
+            is never deleted, so select_input, the staleness checks and the backfill of past reference times read the
+            same rows as before.
+
+            The rows are deleted window by window of verified time, at most batch_size rows per transaction,
+            so each batch only touches one partition and holds its locks briefly. A batch that waits more than
+            lock_timeout_ms for a lock (e.g. insert_input updating the same rows) is abandoned. Its window is
+            skipped and is picked up on the next run.
+
+            :param before_time: datetime - Only rows verified before this time are pruned
+            :param batch_size: int - The most rows deleted per transaction
+            :param window: timedelta - The verified time span each batch looks through
+            :param archive: Callable[[str, DataFrame], None] | None - Called with the table name and the deleted rows of every batch
+                before it commits, an exception raised by it rolls the batch back
+            :param lock_timeout_ms: int - The longest a batch waits for a lock
+            :return dict[str, int] - The number of rows deleted from each table
+        """
+        before_time = self.__to_naive_utc(before_time)
+
+        deleted = {}
+        for tableName, groupColumns in (('inputs', self.INPUT_SUPERSEDE_COLUMNS), ('input_ensembles', self.ENSEMBLE_SUPERSEDE_COLUMNS)):
+            deleted[tableName] = 0
+
+            with self.__get_engine().connect() as conn:
+                windowStart = conn.execute(
+                    text(f'SELECT MIN("verifiedTime") FROM {tableName} WHERE "verifiedTime" < :before_time'), {'before_time': before_time}
+                ).scalar()
+
+            while windowStart is not None and windowStart < before_time:
+                windowEnd = min(windowStart + window, before_time)
+                while True:
+                    batchCount = self.__prune_superseded_batch(tableName, groupColumns, windowStart, windowEnd, batch_size, archive, lock_timeout_ms)
+                    if batchCount is None:
+                        break
+                    deleted[tableName] += batchCount
+                    if batchCount < batch_size:
+                        break
+                windowStart = windowEnd
+
+            log(f'SQLAlchemyORM | prune_superseded_inputs | Deleted {deleted[tableName]} superseded {tableName} row(s) verified before {before_time}')
+        return deleted
+
+    def __prune_superseded_batch(self, tableName: str, groupColumns: tuple[str], from_time: datetime, to_time: datetime, batch_size: int,
+                                 archive: Callable[[str, DataFrame], None] | None, lock_timeout_ms: int) -> int | None:
+        """Deletes up to batch_size superseded rows verified in [from_time, to_time) in one transaction, see prune_superseded_inputs.
+            :return int | None - The number of rows deleted, None when the batch timed out waiting for a lock and was rolled back
+        """
+        stmt = self.__statement(('prune_superseded_inputs', tableName, archive is not None), lambda: f"""
+        WITH ranked AS (
+            SELECT
+                t."id",
+                t."verifiedTime",
+                t."generatedTime",
+                MAX(t."generatedTime") OVER (PARTITION BY {', '.join(f't."{column}"' for column in groupColumns)}) AS "latestGeneratedTime"
+            FROM {tableName} AS t
+            WHERE t."verifiedTime" >= :from_dt AND t."verifiedTime" < :to_dt
+        ),
+        superseded AS (
+            SELECT r."id", r."verifiedTime"
+            FROM ranked AS r
+            WHERE r."generatedTime" < r."latestGeneratedTime"
+            LIMIT :batch_size
+        )
+        DELETE FROM {tableName} AS t
+        USING superseded AS s
+        WHERE t."id" = s."id" AND t."verifiedTime" = s."verifiedTime"
+            AND t."verifiedTime" >= :from_dt AND t."verifiedTime" < :to_dt
+        {'RETURNING t.*' if archive is not None else ''}
+        """)
+
+        try:
+            with self.__get_engine().begin() as conn:
+                conn.execute(text("SELECT set_config('lock_timeout', :lock_timeout, true)"), {'lock_timeout': f'{lock_timeout_ms}ms'})
+                result = conn.execute(stmt, {'from_dt': from_time, 'to_dt': to_time, 'batch_size': batch_size})
+                if archive is None:
+                    return result.rowcount
+
+                rows = result.fetchall()
+                if rows:
+                    archive(tableName, DataFrame(rows, columns=list(result.keys())))
+                return len(rows)
+        except OperationalError as e:
+            # 55P03 lock_not_available, raised when lock_timeout runs out
+            if getattr(e.orig, 'sqlstate', None) != '55P03':
+                raise
+            log(f'SQLAlchemyORM | prune_superseded_inputs | Timed out waiting for a lock on {tableName} between {from_time} and {to_time}, skipping')
+            return None
+
+    def vacuum_input_tables(self) -> None:
+        """Runs VACUUM (ANALYZE) on inputs (every partition) and input_ensembles, so the space of pruned rows is reused
+            by later inserts instead of growing the tables. VACUUM can not run in a transaction, so it runs in autocommit.
+        """
+        with self.__get_engine().connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            for tableName in ('inputs', 'input_ensembles'):
+                conn.execute(text(f'VACUUM (ANALYZE) {tableName}'))
+
+    @profiled
     def insert_output_and_model_run(self, output_series: Series, execution_time: datetime, return_code: int) -> tuple[Series, tuple | None]:
         """
         This method inserts actual/predictions into the output table and model run information into the model run table.
@@ -648,7 +1404,7 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             "returnCode": return_code
         }
 
-        stmt = text("""
+        stmt = self.__statement(('insert_model_run',), lambda: """
         INSERT INTO model_runs (
             "outputID",
             "executionTime",
@@ -667,10 +1423,9 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             'executionTime': model_run_row["executionTime"],
             'returnCode': model_run_row["returnCode"]
         }
-        stmt = stmt.bindparams(**bind_params)
 
         with self.__get_engine().connect() as conn:
-            cursor = conn.execute(stmt)
+            cursor = conn.execute(stmt, bind_params)
             model_run_result = cursor.fetchone()
             conn.commit()
 
@@ -682,6 +1437,7 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
         return output_series, model_run_result
         
 
+    @profiled
     def insert_output(self, series: Series) -> tuple[Series, int | None]:
         """
         This method inserts a single row for actual/predictions into the output table
@@ -696,26 +1452,9 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
                 or None if no row was inserted due to a conflict with an existing row
         """
 
-        if(type(series.description).__name__ != 'SemaphoreSeriesDescription'): raise ValueError('Description should be type SemaphoreSeriesDescription')
+        row_to_insert = self.__build_output_row(series)
 
-        if len(series.dataFrame) != 1: raise ValueError(f'Output series dataframe should only have one row, got {len(series.dataFrame)}')
-    
-        # pack the output data into a row
-        output_row = series.dataFrame.iloc[0]
-        serialized_data_results = self.__serialize_data(output_row['dataValue'])# serialize the ndarray to bytes
-        row_to_insert = {
-            "timeGenerated": output_row['timeGenerated'],
-            "leadTime": output_row['leadTime'],
-            "modelName": series.description.modelName,
-            "modelVersion": series.description.modelVersion,
-            "dataValue": serialized_data_results,    
-            "dataUnit": output_row['dataUnit'],
-            "dataLocation": series.description.dataLocation,
-            "dataSeries": series.description.dataSeries,
-            "dataDatum": series.description.dataDatum,
-        }
-
-        stmt = text("""
+        stmt = self.__statement(('insert_output',), lambda: """
         INSERT INTO outputs (
             "timeGenerated",
             "leadTime",
@@ -752,11 +1491,10 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             'dataSeries': row_to_insert["dataSeries"],
             'dataDatum': row_to_insert["dataDatum"]
         }
-        stmt = stmt.bindparams(**bind_params)
 
         # insert the row into the outputs table returning what is inserted as a sanity check
         with self.__get_engine().connect() as conn:
-            cursor = conn.execute(stmt)
+            cursor = conn.execute(stmt, bind_params)
             result = cursor.fetchone()
             conn.commit()
         
@@ -778,6 +1516,32 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             id = result[0]
         return resultSeries, id
     
+    def __build_output_row(self, series: Series) -> dict:
+        """Packs the single row of an output series into the outputs columns, serializing its ndarray.
+            :param series: Series - An output series, see insert_output
+            :returns dict - The outputs row keyed by column name
+            :raises ValueError - If the series is not a single row output series
+        """
+        if(type(series.description).__name__ != 'SemaphoreSeriesDescription'): raise ValueError('Description should be type SemaphoreSeriesDescription')
+
+        if len(series.dataFrame) != 1: raise ValueError(f'Output series dataframe should only have one row, got {len(series.dataFrame)}')
+    
+        # pack the output data into a row
+        output_row = series.dataFrame.iloc[0]
+        serialized_data_results = self.__serialize_data(output_row['dataValue'])# serialize the ndarray to bytes
+        return {
+            "timeGenerated": output_row['timeGenerated'],
+            "leadTime": output_row['leadTime'],
+            "modelName": series.description.modelName,
+            "modelVersion": series.description.modelVersion,
+            "dataValue": serialized_data_results,    
+            "dataUnit": output_row['dataUnit'],
+            "dataLocation": series.description.dataLocation,
+            "dataSeries": series.description.dataSeries,
+            "dataDatum": series.description.dataDatum,
+        }
+
+    @profiled
     def insert_output_statistics(self, output_table_id: int, statistics_dict: dict) -> tuple | None:
         '''
         This function will insert the statistics dictionary into the statistics table and return
@@ -807,7 +1571,7 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             (id, outputID, p1, p5, p10, p25, p50, p75, p90, p95, p99, min, max, mean, std_dev)
         '''
 
-        stmt = text("""
+        stmt = self.__statement(('insert_output_statistics',), lambda: """
         INSERT INTO output_statistics (
             "outputID",
             "p1",
@@ -860,11 +1624,10 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             'mean':     statistics_dict['mean'],
             'std_dev':  statistics_dict['std_dev']
         }
-        stmt = stmt.bindparams(**bind_params)
 
         # insert the row into the statistics table returning what is inserted as a sanity check
         with self.__get_engine().connect() as conn:
-            cursor = conn.execute(stmt)
+            cursor = conn.execute(stmt, bind_params)
             result = cursor.fetchone()
             conn.commit()
         
@@ -872,6 +1635,82 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
         return result
     
 
+    @profiled
+    def insert_outputs_and_model_runs(self, runs: list[tuple[Series, datetime, int, dict | None]]) -> list[tuple[Series, tuple | None, tuple | None]]:
+        """
+        Writes the outputs, model runs and statistics of many model runs (e.g. a whole group run) in one transaction,
+        with one multi-row insert per table instead of a connect and commit per row.
+
+        Each run is handled the way insert_output_and_model_run followed by insert_output_statistics would handle it:
+            - An output that conflicts with an existing row (outputs_AK00) is skipped, and so are its model run and statistics.
+            - Statistics are only written for runs that have a statistics dictionary and whose model run was written.
+        The inserted outputs are matched back to their runs through the outputs_AK00 columns, the model runs and
+        statistics through their outputID.
+
+        :param runs: list[tuple[Series, datetime, int, dict | None]] - One (output_series, execution_time, return_code, statistics_dict)
+            per model run, see insert_output_and_model_run and insert_output_statistics. statistics_dict is None when
+            no statistics should be written.
+        :returns list[tuple[Series, tuple | None, tuple | None]] - In the order of runs, the series with the inserted output
+            (empty on conflict), the inserted model_runs row and the inserted output_statistics row (None when not written).
+        :raises ValueError - If any output series is not a single row output series, nothing is written
+        """
+        if not runs:
+            return []
+
+        outputs = self.__metadata.tables['outputs']
+        model_runs = self.__metadata.tables['model_runs']
+        output_statistics = self.__metadata.tables['output_statistics']
+
+        output_rows = [self.__build_output_row(output_series) for output_series, _, _, _ in runs]
+
+        with self.__get_engine().begin() as conn:
+            stmt = insert(outputs).values(output_rows).on_conflict_do_nothing(constraint='outputs_AK00').returning(*outputs.c)
+            insertedByKey = {self.__output_key(row._mapping): row for row in conn.execute(stmt)}
+
+            # pop so that a run repeated within the batch only claims the inserted row once
+            inserted_outputs = [insertedByKey.pop(self.__output_key(row), None) for row in output_rows]
+
+            model_run_rows = [
+                {"outputID": inserted[0], "executionTime": execution_time, "returnCode": return_code}
+                for inserted, (_, execution_time, return_code, _) in zip(inserted_outputs, runs)
+                if inserted is not None
+            ]
+            modelRunsByOutputID = {}
+            if model_run_rows:
+                stmt = insert(model_runs).values(model_run_rows).on_conflict_do_nothing().returning(*model_runs.c)
+                modelRunsByOutputID = {row[1]: row for row in conn.execute(stmt)}
+
+            statistics_rows = [
+                {"outputID": inserted[0], **{column: statistics_dict[column] for column in self.STATISTICS_COLUMNS}}
+                for inserted, (_, _, _, statistics_dict) in zip(inserted_outputs, runs)
+                if inserted is not None and statistics_dict is not None and inserted[0] in modelRunsByOutputID
+            ]
+            statisticsByOutputID = {}
+            if statistics_rows:
+                stmt = (insert(output_statistics).values(statistics_rows)
+                        .on_conflict_do_nothing(constraint='output_statistics_outputID_key').returning(*output_statistics.c))
+                statisticsByOutputID = {row[1]: row for row in conn.execute(stmt)}
+
+        results = []
+        for inserted, (output_series, _, _, _) in zip(inserted_outputs, runs):
+            resultSeries = Series(output_series.description, output_series.timeDescription)
+            if inserted is None:
+                resultSeries.dataFrame = get_output_dataFrame()
+                results.append((resultSeries, None, None))
+                continue
+
+            resultSeries.dataFrame = self.__splice_output([inserted])
+            results.append((resultSeries, modelRunsByOutputID.get(inserted[0]), statisticsByOutputID.get(inserted[0])))
+        return results
+
+    def __output_key(self, row) -> tuple:
+        """The outputs_AK00 columns of an outputs row (a dict or a row mapping), with timeGenerated as naive UTC as it is stored."""
+        return (
+            self.__to_naive_utc(row["timeGenerated"]), row["leadTime"], row["modelName"], row["modelVersion"],
+            row["dataLocation"], row["dataSeries"], row["dataDatum"]
+        )
+
+    @profiled
     def fetch_oldest_generated_time(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription) -> datetime | None:
         """
         Returns the oldest generated time within a time window.
@@ -895,44 +1734,13 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
         :param timeDescription: TimeDescription - A hydrated time description object
         """
 
-        query_stmt = text(f"""
-        WITH latest_per_group AS (
-            SELECT DISTINCT ON ("verifiedTime", "ensembleMemberID")
-                i."generatedTime",
-                i."verifiedTime",
-                i."ensembleMemberID"
-            FROM inputs AS i
-            WHERE 	
-				i."dataSource"   = :dataSource
-                AND i."dataLocation" = :dataLocation
-                AND i."dataSeries"   = :dataSeries
-                AND {'i."dataDatum" = :dataDatum' if seriesDescription.dataDatum is not None else 'i."dataDatum" IS NULL'}
-                AND i."verifiedTime" BETWEEN :from_dt AND :to_dt
-            ORDER BY
-                i."verifiedTime",
-                i."ensembleMemberID",
-                i."generatedTime" DESC
-        )
+        query_stmt = self.__statement(('fetch_oldest_generated_time', seriesDescription.dataDatum is None), lambda: f"""
         SELECT
-            MIN("generatedTime") OVER () AS "generatedTime"
-        FROM latest_per_group
-        ORDER BY
-            "verifiedTime",
-            "ensembleMemberID"
-		LIMIT 1
+            MIN(l."generatedTime") AS "generatedTime"
+        FROM ({self.__latest_inputs_sql(seriesDescription)}) AS l
         """)
-        bind_params = {
-            'dataSource': seriesDescription.dataSource,
-            'dataLocation': seriesDescription.dataLocation,
-            'dataSeries': seriesDescription.dataSeries,
-            'from_dt': timeDescription.fromDateTime,
-            'to_dt': timeDescription.toDateTime,
-        }
-        if seriesDescription.dataDatum is not None:
-            bind_params['dataDatum'] = seriesDescription.dataDatum
-        query_stmt = query_stmt.bindparams(**bind_params)
         
-        tupleishResult = self.__dbSelection(query_stmt).fetchall()
+        tupleishResult = self.__dbSelection(query_stmt, self.__input_params(seriesDescription, timeDescription)).fetchall()
         
         # Data is not present in the DB
         if not tupleishResult or not tupleishResult[0][0]: 
@@ -942,6 +1750,7 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
 
         return oldestGeneratedTime
        
+    @profiled
     def fetch_row_with_max_verified_time_in_range(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription) -> tuple | None:
         """
         This function returns the row with the max verified time in the requested range
@@ -959,33 +1768,32 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
         """
 
         # this query gets the row with the max verified time in the requested range
-        query_stmt = text(f"""
-        SELECT  
-        i.*
-        FROM inputs AS i
-        WHERE i."dataSource"   = :dataSource
-        AND i."dataLocation" = :dataLocation
-        AND i."dataSeries"   = :dataSeries
-        AND {'i."dataDatum" = :dataDatum' if seriesDescription.dataDatum is not None else 'i."dataDatum" IS NULL'}
-        AND i."verifiedTime" BETWEEN :from_dt AND :to_dt
-        ORDER BY i."verifiedTime" DESC
+        # ensemble arrays have no single dataValue or member so those columns come back null for them
+        query_stmt = self.__statement(('fetch_row_with_max_verified_time_in_range', seriesDescription.dataDatum is None), lambda: f"""
+        (
+            SELECT
+            i.*
+            FROM inputs AS i
+            WHERE {self.__input_filter_sql('i', seriesDescription)}
+            ORDER BY i."verifiedTime" DESC
+            LIMIT 1
+        )
+        UNION ALL
+        (
+            SELECT
+            e."id", e."generatedTime", e."acquiredTime", e."verifiedTime", NULL::DOUBLE PRECISION AS "dataValue", e."isActual",
+            e."dataUnit", e."dataSource", e."dataLocation", e."dataSeries", e."dataDatum", e."latitude", e."longitude",
+            NULL::INTEGER AS "ensembleMemberID"
+            FROM input_ensembles AS e
+            WHERE {self.__input_filter_sql('e', seriesDescription)}
+            ORDER BY e."verifiedTime" DESC
+            LIMIT 1
+        )
+        ORDER BY "verifiedTime" DESC
         LIMIT 1;
         """)
-        bind_params = {
-            'dataSource': seriesDescription.dataSource,
-            'dataLocation': seriesDescription.dataLocation,
-            'dataSeries': seriesDescription.dataSeries,
-            'from_dt': timeDescription.fromDateTime,
-            'to_dt': timeDescription.toDateTime
-        }
-
-        # only bind dataDatum if it's not None
-        if seriesDescription.dataDatum is not None:
-            bind_params['dataDatum'] = seriesDescription.dataDatum
-        
-        query_stmt = query_stmt.bindparams(**bind_params)
         
-        tupleishResult = self.__dbSelection(query_stmt).fetchall()
+        tupleishResult = self.__dbSelection(query_stmt, self.__input_params(seriesDescription, timeDescription)).fetchall()
         
         # convert the list of tuples to a single tuple and return it, else return None
         return tuple(tupleishResult[0]) if tupleishResult else None
@@ -994,23 +1802,13 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
     ################################################################################## DB Managment Methods
     #############################################################################################
 
-    def __create_engine(self, parmaString: str, echo: bool ) -> None: #"sqlite+pysqlite:///:memory:"
-        """Creates an engine object and tethers it to this interface class as an atribute
-
-        Parameters:
-            permaString: str - An sqlalchemy string that defines the location the engine should point to: (e.g. "sqlite+pysqlite:///:memory:")
-            echo: str - Weather or not the engine should echo to stdout
-        """
-        self._engine = sqlalchemy_create_engine(parmaString, echo=echo) #, pool_pre_ping=True
-
-    
     def __get_engine(self) -> Engine:
         """Fetches the engine attribute. Requires the engine attribute to be created.
-        See: DBManager.create_engine()
+        See: EngineRegistry.acquire()
         """
 
         if not hasattr(self, '_engine') or self._engine == None:
-            raise Exception("An engine was requested from DBManager, but no engine has been created. See DBManager.create_engine()")
+            raise Exception("An engine was requested from SQLAlchemyORM_Postgres, but no engine has been created. See EngineRegistry.acquire()")
         else:
             return self._engine
 
@@ -1018,82 +1816,339 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
     ################################################################################## DB Interaction private methods
     #############################################################################################
 
-    def __dbSelection(self, stmt: Select) -> CursorResult:
+    def __dbSelection(self, stmt: Select, params: dict | None = None) -> CursorResult:
         """Runs a selection statement 
         Parameters:
             stmt: SQLAlchemy Select - The statement to run
+            params: dict | None - The values of the statement's bind parameters, for statements from __statement
         Returns:
             SQLAlchemy CursorResult
         """
 
         with self.__get_engine().connect() as conn:
-            result = conn.execute(stmt)
+            result = conn.execute(stmt, params)
 
         return result
+
+    def __stream_rows(self, stmt: TextClause, params: dict, chunk_size: int, keyIndex: int | None = None) -> Iterator[list[tuple]]:
+        """Runs a selection statement through a server side cursor, yielding its rows chunk_size at a time
+        so the whole result set is never held in memory. The connection is held until the generator is exhausted or closed.
+        Parameters:
+            stmt: TextClause - The statement to run, from __statement
+            params: dict - The values of the statement's bind parameters
+            chunk_size: int - The number of rows fetched from the cursor at a time
+            keyIndex: int | None - When set, the statement must be ordered by this column and a chunk never
+                splits rows sharing its value, they are carried over to the next chunk instead
+        Returns:
+            Iterator[list[tupleish]] - The rows, one non empty list per chunk
+        """
+
+        with self.__get_engine().connect() as conn:
+            result = conn.execution_options(yield_per=chunk_size).execute(stmt, params)
+
+            carried = []
+            for partition in result.partitions():
+                rows = carried + list(partition)
+                carried = []
+
+                if keyIndex is not None:
+                    # hold back the trailing rows sharing the last key, the next partition may hold more of them
+                    split = len(rows)
+                    while split > 0 and rows[split - 1][keyIndex] == rows[-1][keyIndex]:
+                        split -= 1
+                    rows, carried = rows[:split], rows[split:]
+
+                if rows:
+                    yield rows
+
+            if carried:
+                yield carried
+
+    def __statement(self, key: tuple, build: Callable[[], str]) -> TextClause:
+        """Returns the text() statement registered under key, building it on first use.
+
+        Statements are built once per process (per variant, e.g. the dataDatum IS NULL branch is part of the key)
+        and their values are passed to execute rather than bound into a copy of the statement. Every call then
+        sends the exact same SQL, so SQLAlchemy's compiled cache is hit and psycopg can prepare the statement
+        server side (see DB_PREPARE_THRESHOLD), instead of the SQL being formatted, parsed and compiled on each call.
+
+        :param key: tuple - The method name followed by whatever selects the variant
+        :param build: Callable[[], str] - Builds the SQL of the statement
+        :return: TextClause - The registered statement
+        """
+        stmt = self._statements.get(key)
+        if stmt is None:
+            stmt = self._statements[key] = text(build())
+        return stmt
     
+    def __input_filter_sql(self, alias: str, seriesDescription: SeriesDescription | None) -> str:
+        """ The WHERE clause shared by every input query, binds :dataSource, :dataLocation, :dataSeries,
+        :dataDatum (only when the datum is not None), :from_dt and :to_dt.
+        When seriesDescription is None the condition is taken from the columns of the request row r instead,
+        see select_inputs_with_freshness.
+        :param alias: str - The alias of the inputs or input_ensembles table in the query
+        :param seriesDescription: SeriesDescription | None - The series being selected, None to filter on r
+        :return: str - The sql condition
+        """
+        if seriesDescription is None:
+            return f"""
+                {alias}."dataSource"   = r."dataSource"
+                AND {alias}."dataLocation" = r."dataLocation"
+                AND {alias}."dataSeries"   = r."dataSeries"
+                AND {alias}."dataDatum" IS NOT DISTINCT FROM r."dataDatum"
+                AND {alias}."verifiedTime" BETWEEN r."fromTime" AND r."toTime"
+                """
+
+        return f"""
+                {alias}."dataSource"   = :dataSource
+                AND {alias}."dataLocation" = :dataLocation
+                AND {alias}."dataSeries"   = :dataSeries
+                AND {f'{alias}."dataDatum" = :dataDatum' if seriesDescription.dataDatum is not None else f'{alias}."dataDatum" IS NULL'}
+                AND {alias}."verifiedTime" BETWEEN :from_dt AND :to_dt"""
+
+    def __requests_sql(self) -> str:
+        """ The requests relation of the batched input queries, one row per request with its index, unnested from one
+        array per column. Binds the parameters built by __requests_params.
+        :return: str - The sql of the relation
+        """
+        return """
+            SELECT * FROM unnest(
+                CAST(:requestIndexes AS INTEGER[]),
+                CAST(:dataSources AS VARCHAR[]),
+                CAST(:dataLocations AS VARCHAR[]),
+                CAST(:dataSeries AS VARCHAR[]),
+                CAST(:dataDatums AS VARCHAR[]),
+                CAST(:fromTimes AS TIMESTAMP[]),
+                CAST(:toTimes AS TIMESTAMP[])
+            ) AS r("requestIndex", "dataSource", "dataLocation", "dataSeries", "dataDatum", "fromTime", "toTime")
+        """
+
+    def __requests_params(self, requests: list[tuple[SeriesDescription, TimeDescription]]) -> dict:
+        """ The parameters of __requests_sql for a list of requests."""
+        return {
+            'requestIndexes': list(range(len(requests))),
+            'dataSources': [seriesDescription.dataSource for seriesDescription, _ in requests],
+            'dataLocations': [seriesDescription.dataLocation for seriesDescription, _ in requests],
+            'dataSeries': [seriesDescription.dataSeries for seriesDescription, _ in requests],
+            'dataDatums': [seriesDescription.dataDatum for seriesDescription, _ in requests],
+            'fromTimes': [self.__to_naive_utc(timeDescription.fromDateTime) for _, timeDescription in requests],
+            'toTimes': [self.__to_naive_utc(timeDescription.toDateTime) for _, timeDescription in requests]
+        }
+
+    def __input_params(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription) -> dict:
+        """ The values of the parameters bound by __input_filter_sql.
+        :param seriesDescription: SeriesDescription - The series being selected
+        :param timeDescription: TimeDescription - The verified time range being selected
+        :return: dict - The parameter values, dataDatum is only included when it is not None
+        """
+        params = {
+            'dataSource': seriesDescription.dataSource,
+            'dataLocation': seriesDescription.dataLocation,
+            'dataSeries': seriesDescription.dataSeries,
+            'from_dt': timeDescription.fromDateTime,
+            'to_dt': timeDescription.toDateTime
+        }
+        if seriesDescription.dataDatum is not None:
+            params['dataDatum'] = seriesDescription.dataDatum
+        return params
+
+    def __latest_inputs_sql(self, seriesDescription: SeriesDescription | None) -> str:
+        """ The latest generated time per verified time (and ensemble member) from both input layouts, used as a sub query.
+            - inputs holds non ensemble rows (and ensemble member rows written before version 3.10), the latest row
+              is taken per (verifiedTime, ensembleMemberID).
+            - input_ensembles holds one row per ensemble run with every member in the dataValues array, the latest row
+              is taken per verifiedTime.
+        Both halves return the inputs columns followed by "dataValues", which is null for inputs rows while
+        "dataValue" and "ensembleMemberID" are null for input_ensembles rows.
+        :param seriesDescription: SeriesDescription | None - The series being selected, None to filter on the request row r (see __input_filter_sql)
+        :return: str - The sql for the sub query
+        """
+        return f"""
+            (
+                SELECT DISTINCT ON ("verifiedTime", "ensembleMemberID")
+                    i."id",
+                    i."generatedTime",
+                    i."acquiredTime",
+                    i."verifiedTime",
+                    i."dataValue",
+                    i."isActual",
+                    i."dataUnit",
+                    i."dataSource",
+                    i."dataLocation",
+                    i."dataSeries",
+                    i."dataDatum",
+                    i."latitude",
+                    i."longitude",
+                    i."ensembleMemberID",
+                    NULL::DOUBLE PRECISION[] AS "dataValues"
+                FROM inputs AS i
+                WHERE {self.__input_filter_sql('i', seriesDescription)}
+                ORDER BY
+                    i."verifiedTime",
+                    i."ensembleMemberID",
+                    i."generatedTime" DESC
+            )
+            UNION ALL
+            (
+                SELECT DISTINCT ON ("verifiedTime")
+                    e."id",
+                    e."generatedTime",
+                    e."acquiredTime",
+                    e."verifiedTime",
+                    NULL::DOUBLE PRECISION AS "dataValue",
+                    e."isActual",
+                    e."dataUnit",
+                    e."dataSource",
+                    e."dataLocation",
+                    e."dataSeries",
+                    e."dataDatum",
+                    e."latitude",
+                    e."longitude",
+                    NULL::INTEGER AS "ensembleMemberID",
+                    e."dataValues"
+                FROM input_ensembles AS e
+                WHERE {self.__input_filter_sql('e', seriesDescription)}
+                ORDER BY
+                    e."verifiedTime",
+                    e."generatedTime" DESC
+            )"""
+
     def __splice_input(self, results: list[tuple]) -> DataFrame:
         """ Converts DB rows to a proper input dataframe to be packed into a series.
         This method also handles ensemble data by grouping them into single rows as expected by Semaphore.
+
+        Rows are spliced column-wise rather than row by row:
+            - Non ensemble rows are copied straight across from the result columns.
+            - Ensemble member rows are sorted once by (verifiedTime, generatedTime, ensembleMemberID) and the dataValue
+              column is reshaped into one list per (verifiedTime, generatedTime) group, ordered by member ID.
+            - Ensemble array rows (input_ensembles) are already one row per group, their dataValues array becomes the list.
+        The output is ordered by (timeVerified, timeGenerated) the same way the old groupby based splice was.
+
         :param list[tupleish] -a list of selections from the table formatted in tupleish
         :return: DataFrame - a dataframe with the data formatted for use in a series
         """
 
+        if not results:
+            return get_input_dataFrame()
+
         # Convert returned DB rows into a dataframe to make manipulation easier 
-        df_results = pd.DataFrame(
-            data=results, 
-            columns=[   
-                "id", "generatedTime", "acquiredTime", "verifiedTime", "dataValue", 
-                "isActual", "dataUnit", "dataSource", "dataLocation", "dataSeries", 
-                "dataDatum", "latitude", "longitude", "ensembleMemberID"
-            ]
-        )
+        # Rows straight from inputs (e.g. the insert RETURNING) do not carry the trailing dataValues column
+        columns = [
+            "id", "generatedTime", "acquiredTime", "verifiedTime", "dataValue", 
+            "isActual", "dataUnit", "dataSource", "dataLocation", "dataSeries", 
+            "dataDatum", "latitude", "longitude", "ensembleMemberID", "dataValues"
+        ]
+        df_results = pd.DataFrame(data=results, columns=columns[:len(results[0])])
+        if "dataValues" not in df_results:
+            df_results["dataValues"] = None
 
         # --- Normalize dtypes and ADD TIMEZONE INFO ---
         df_results["generatedTime"] = pd.to_datetime(df_results["generatedTime"], errors="coerce").dt.tz_localize(timezone.utc)
         df_results["verifiedTime"] = pd.to_datetime(df_results["verifiedTime"], errors="coerce").dt.tz_localize(timezone.utc)
         df_results["acquiredTime"] = pd.to_datetime(df_results["acquiredTime"], errors="coerce").dt.tz_localize(timezone.utc)
 
-        # A formatted dataframe to place the spliced data 
-        df_out = get_input_dataFrame()
-
-        # We have to post process the results as this could be ensemble data or not
-        # grouping by verifiedTime groups the data by time point
-        for _, group in df_results.groupby(["verifiedTime", "generatedTime"]): # group by verified time and generated time to prevent collapsing when there are multiple generated times for one verified time
+        # Rows without a generated time never formed a (verifiedTime, generatedTime) group
+        # in the original groupby splice, so they are still left out here
+        df_results = df_results[df_results["verifiedTime"].notna() & df_results["generatedTime"].notna()]
+
+        # dataValues is only set for ensembles stored as arrays and
+        # ensembleMemberID is only set for ensembles stored as one row per member
+        isArrayEnsemble = df_results["dataValues"].notna().to_numpy()
+        isMemberEnsemble = df_results["ensembleMemberID"].notna().to_numpy() & ~isArrayEnsemble
+        isScalar = ~(isArrayEnsemble | isMemberEnsemble)
+
+        spliced_frames = [
+            frame for frame in (
+                self.__splice_scalar_input(df_results[isScalar]),
+                self.__splice_ensemble_input(df_results[isMemberEnsemble]),
+                self.__splice_array_ensemble_input(df_results[isArrayEnsemble])
+            )
+            if not frame.empty
+        ]
 
-            # ensembleMemberID is None if not an ensemble, so we check the first row of the group
-            firstRow = group.iloc[0]
-            isEnsemble = firstRow["ensembleMemberID"] is not None
-            
-            # If its an ensemble the dataValue is all the values sorted by there ID (to ensure correct order)
-            # If not an ensemble we just take the solitary dataValue
-            if isEnsemble:
-                group = group.sort_values(by=("ensembleMemberID"))
-                dataValues = group["dataValue"].to_list()
-                
-                # Pack the data into the out dataframe
-                df_out.loc[len(df_out)] = [
-                    dataValues,                   # dataValue
-                    firstRow["dataUnit"],         # dataUnit
-                    firstRow["verifiedTime"],     # timeVerified
-                    firstRow["generatedTime"],    # timeGenerated
-                    firstRow["longitude"],        # longitude
-                    firstRow["latitude"]          # latitude
-                ]
-            
-            else:
-                for _, row in group.iterrows():
-                    df_out.loc[len(df_out)] = [
-                        row["dataValue"],  # full list for ensembles; scalar otherwise
-                        row["dataUnit"],         # dataUnit
-                        row["verifiedTime"],     # timeVerified
-                        row["generatedTime"],    # timeGenerated
-                        row["longitude"],        # longitude
-                        row["latitude"]          # latitude
-                    ]
-            
-        return df_out
+        if not spliced_frames:
+            return get_input_dataFrame()
+        
+        df_out = spliced_frames[0] if len(spliced_frames) == 1 else pd.concat(spliced_frames)
 
-    def __splice_output(self, results: list[tuple]) -> DataFrame:
+        # A stable sort keeps the database order of rows sharing a verified and generated time
+        df_out = df_out.sort_values(by=["timeVerified", "timeGenerated"], kind="mergesort")
+        return df_out.reset_index(drop=True)
+    
+    def __splice_scalar_input(self, df_rows: DataFrame) -> DataFrame:
+        """ Builds the input dataframe for non ensemble rows. Each db row is one row of the output,
+        so the columns are copied straight across with dataValue as float64.
+        :param df_rows: DataFrame - the non ensemble db rows with timezone aware times
+        :return: DataFrame - a dataframe with the input dataframe columns
+        """
+        return DataFrame({
+            "dataValue":     pd.to_numeric(df_rows["dataValue"], errors="coerce").to_numpy(dtype=np.float64),
+            "dataUnit":      df_rows["dataUnit"].to_numpy(dtype=object),
+            "timeVerified":  df_rows["verifiedTime"].array,
+            "timeGenerated": df_rows["generatedTime"].array,
+            "longitude":     df_rows["longitude"].to_numpy(dtype=object),
+            "latitude":      df_rows["latitude"].to_numpy(dtype=object)
+        })
+    
+    def __splice_array_ensemble_input(self, df_rows: DataFrame) -> DataFrame:
+        """ Builds the input dataframe for ensembles stored as arrays. Each db row already holds every member
+        of one (verifiedTime, generatedTime) group, so no regrouping is needed.
+        :param df_rows: DataFrame - the input_ensembles db rows with timezone aware times
+        :return: DataFrame - a dataframe with the input dataframe columns
+        """
+        return DataFrame({
+            "dataValue":     pd.Series([list(values) for values in df_rows["dataValues"]], dtype=object),
+            "dataUnit":      df_rows["dataUnit"].to_numpy(dtype=object),
+            "timeVerified":  df_rows["verifiedTime"].array,
+            "timeGenerated": df_rows["generatedTime"].array,
+            "longitude":     df_rows["longitude"].to_numpy(dtype=object),
+            "latitude":      df_rows["latitude"].to_numpy(dtype=object)
+        })
+    
+    def __splice_ensemble_input(self, df_rows: DataFrame) -> DataFrame:
+        """ Builds the input dataframe for ensemble rows. Members sharing a verified and generated time
+        are packed into one row whose dataValue is the list of member values ordered by member ID.
+        :param df_rows: DataFrame - the ensemble db rows with timezone aware times
+        :return: DataFrame - a dataframe with the input dataframe columns
+        """
+        if df_rows.empty:
+            return get_input_dataFrame()
+
+        verifiedTimes = df_rows["verifiedTime"].astype("int64").to_numpy()
+        generatedTimes = df_rows["generatedTime"].astype("int64").to_numpy()
+        memberIDs = df_rows["ensembleMemberID"].astype("int64").to_numpy()
+
+        # One sort puts every group in a contiguous block with its members in ID order
+        # (lexsort sorts by the last key first)
+        order = np.lexsort((memberIDs, generatedTimes, verifiedTimes))
+        verifiedTimes = verifiedTimes[order]
+        generatedTimes = generatedTimes[order]
+        values = pd.to_numeric(df_rows["dataValue"], errors="coerce").to_numpy(dtype=np.float64)[order]
+
+        # A group starts wherever the verified or generated time changes
+        isGroupStart = np.ones(len(order), dtype=bool)
+        isGroupStart[1:] = (verifiedTimes[1:] != verifiedTimes[:-1]) | (generatedTimes[1:] != generatedTimes[:-1])
+        groupStarts = np.flatnonzero(isGroupStart)
+        groupSizes = np.diff(np.append(groupStarts, len(order)))
+
+        # TWC always delivers full ensembles, so usually every group is the same size and can be reshaped in one go
+        if (groupSizes == groupSizes[0]).all():
+            dataValues = values.reshape(len(groupStarts), groupSizes[0]).tolist()
+        else:
+            dataValues = [group.tolist() for group in np.split(values, groupStarts[1:])]
+
+        # Every other column is taken from the first member of each group
+        df_firsts = df_rows.iloc[order[groupStarts]]
+        return DataFrame({
+            "dataValue":     pd.Series(dataValues, dtype=object),
+            "dataUnit":      df_firsts["dataUnit"].to_numpy(dtype=object),
+            "timeVerified":  df_firsts["verifiedTime"].array,
+            "timeGenerated": df_firsts["generatedTime"].array,
+            "longitude":     df_firsts["longitude"].to_numpy(dtype=object),
+            "latitude":      df_firsts["latitude"].to_numpy(dtype=object)
+        })
+
+    def __splice_output(self, results: list[tuple], decode: str = 'eager') -> DataFrame:
         """
         Converts DB row results into a proper output dataframe to be packed into a series.
 
@@ -1112,47 +2167,79 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             On output selections, the dataframe may have many rows but will still have the columns above.
 
             In both cases, the returned dataValue column for each row is expected to be in serialized format
-            where we must deserialize the bytes back into an ndarray.
+            where we must deserialize the bytes back into an ndarray. 
+
+        :param decode: str - How the serialized dataValues are returned, failed runs are None in every mode
+            eager - The blobs are decoded in bulk (see __deserialize_many) so each dataValue is a read-only view over the fetched bytes.
+            lazy - Each dataValue is a LazyOutputValue that decodes its blob on first use, for consumers that
+                only need the metadata or a few of the runs.
+            raw - Each dataValue is left as the serialized bytes, decode them with OutputCodec.decode.
+        :raises ValueError - If decode is not one of the modes above
         """
+        if decode not in ('eager', 'lazy', 'raw'):
+            raise ValueError(f'Unknown output decode mode {decode}, expected eager, lazy or raw')
 
-        # Convert returned DB rows into a dataframe to make manipulation easier 
-        df_results = pd.DataFrame(
-            data=results, 
-            columns=[
-                "ID", "timeGenerated", "leadTime", "modelName", "modelVersion", "dataValue", 
-                "dataUnit", "dataLocation", "dataSeries", "dataDatum"
-            ]
-        )
-
-        if df_results.empty:
+        if not results:
             return get_output_dataFrame()
-        
-        # --- ADD TIMEZONE INFO to timeGenerated ---
-        df_results["timeGenerated"] = pd.to_datetime(df_results["timeGenerated"], errors="coerce").dt.tz_localize(timezone.utc)
 
-        # A formatted dataframe to place the spliced data 
-        df_out = get_output_dataFrame()
+        # Transpose the rows into columns once rather than walking them with iterrows
+        columns = list(zip(*results))
+
+        if decode == 'eager':
+            dataValues = self.__deserialize_many(columns[5])
+        elif decode == 'lazy':
+            codec = self.__get_output_codec()
+            dataValues = [None if blob is None else LazyOutputValue(bytes(blob), codec) for blob in columns[5]]
+        else:
+            dataValues = [None if blob is None else bytes(blob) for blob in columns[5]]
+
+        return DataFrame({
+            "dataValue":     pd.Series(dataValues, dtype=object),
+            "dataUnit":      np.array(columns[6], dtype=object),
+            "timeGenerated": pd.to_datetime(pd.Series(columns[1]), errors="coerce").dt.tz_localize(timezone.utc).array,
+            "leadTime":      pd.to_timedelta(pd.Series(columns[2])).array
+        })
 
+    def __deserialize_many(self, blobs: Sequence[bytes | None]) -> list[np.ndarray | None]:
         """
-        TODO:: This currently deserializes the dataValue for each row in the data frame one at a time.
-        For queries that return many rows like select_output, this could be a performance issue.
-        After implementing this, we should do some profiling on this and potentially deserialize 
-        in a vectorized way by deserializing many items at once.
+        Deserializes many output blobs at once through the OutputCodec. Both the versioned codec blobs
+        and the legacy .npy rows are decoded, each distinct .npy header is parsed only once and the
+        payloads are wrapped with np.frombuffer instead of being copied out through np.load.
+
+        NOTE:: Full precision arrays are read-only views over the fetched (or decompressed) bytes.
+            Callers that need to modify them in place must copy them first.
+
+        :param blobs: Sequence[bytes | None] - The serialized dataValues, None for failed runs
+
+        :returns list[ndarray | None] - The reconstructed arrays in the same order as the blobs
         """
+        return self.__get_output_codec().decode_many(blobs)
 
-        for idx, row in df_results.iterrows():
-            # deserialize the data back into an ndarray
-            deserialized_data = self.__deserialize_data(row["dataValue"])
-            
-            # Pack the data into the out dataframe
-            df_out.loc[len(df_out)] = [
-                deserialized_data,     # dataValue    
-                row["dataUnit"],       # dataUnit
-                row["timeGenerated"],  # timeGenerated
-                row["leadTime"]        # leadTime
-            ]
+    def __stack_output_data(self, blobs: Sequence[bytes | None]) -> np.ndarray:
+        """
+        Decodes many serialized dataValues into one stacked ndarray.
+
+        :param blobs: Sequence[bytes | None] - The serialized dataValues, None for failed runs
 
-        return df_out
+        :returns ndarray - An array of shape (runs, members, inputs, outputs). Runs that failed
+            (a null dataValue) are filled with NaN.
+        :raises ValueError - If the non null dataValues do not all share a single shape
+        """
+        arrays = self.__deserialize_many(blobs)
+
+        shapes = {array.shape for array in arrays if array is not None}
+        if len(shapes) > 1:
+            raise ValueError(f'Can not stack outputs with differing shapes: {sorted(shapes)}')
+        if not shapes:
+            return np.empty((len(arrays), 0, 0, 0), dtype=np.float64)
+
+        shape = shapes.pop()
+        dtype = np.result_type(*[array.dtype for array in arrays if array is not None], np.float64)
+        stack = np.full((len(arrays), *shape), np.nan, dtype=dtype)
+        for idx, array in enumerate(arrays):
+            if array is not None:
+                stack[idx] = array
+        return stack
 
     def __serialize_data(self, array: np.ndarray | None) -> bytes | None:
         """
@@ -1167,15 +2254,7 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
         
         :returns bytes | None - The serialized array in bytes or None if the input array was None
         """
-        if array is None:
-            return None
-        
-        buffer = BytesIO()
-        np.save(buffer, array, allow_pickle=False)
-        serialized_array = buffer.getvalue()
-        buffer.close()
-
-        return serialized_array
+        return self.__get_output_codec().encode(array)
 
     def __deserialize_data(self, serialized_data: bytes | None) -> np.ndarray | None:
         """
@@ -1187,15 +2266,90 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
         :returns ndarray | None - The reconstructed ndarray before it was serialized and stored
             or None if the original array was None before it was inserted.
         """
-        if serialized_data is None:
-            return None
-        
-        buffer = BytesIO(serialized_data)
-        array = np.load(buffer, allow_pickle=False)
-        buffer.close()
+        return self.__get_output_codec().decode(serialized_data)
 
-        return array
+    def __get_output_codec(self) -> OutputCodec:
+        """Returns the codec shared by every storage instance, created from the environment on first use."""
+        if SQLAlchemyORM_Postgres._outputCodec is None:
+            SQLAlchemyORM_Postgres._outputCodec = OutputCodec()
+        return SQLAlchemyORM_Postgres._outputCodec
     
+    def insert_query_profiles(self, records: list[QueryRecord]) -> int:
+        """Writes profiled storage calls to the query_profiles table (see migration 3.13) in one multi-row insert.
+            This method is not profiled itself.
+
+            :param records: list[QueryRecord] - The records to write, see QueryProfiler.drain
+            :return int - The number of rows written
+        """
+        if not records:
+            return 0
+
+        rows = [
+            {
+                "method": record.method,
+                "modelName": record.modelName,
+                "referenceTime": self.__to_naive_utc(record.referenceTime),
+                "startedAt": self.__to_naive_utc(record.startedAt),
+                "depth": record.depth,
+                "elapsedMs": record.elapsed * 1000,
+                "statements": record.statements,
+                "rows": record.rows,
+                "bytes": record.bytes,
+                "plans": '\n\n'.join(f'{statement.strip()}\n{plan}' for _, statement, plan in record.plans) or None
+            }
+            for record in records
+        ]
+        query_profiles = self.__metadata.tables['query_profiles']
+        with self.__get_engine().begin() as conn:
+            # counted from RETURNING, the rowcount of an insert psycopg returns rows for is -1
+            return len(conn.execute(insert(query_profiles).values(rows).returning(query_profiles.c.id)).all())
+
+    @profiled
+    def insert_ingestion_ledger(self, series: Series, timeDescription: TimeDescription) -> int:
+        """Records an ingested input series in the ingestion ledger (see migration 3.14): the verified range it covered,
+            its oldest and latest generated times and when it was acquired. The range starts at the requested from time,
+            so verified times the source had no rows for are not ingested again, and ends at the latest row ingested.
+
+            :param series: Series - The series returned by an ingestion class, with at least one row
+            :param timeDescription: TimeDescription - The temporal information the series was ingested for
+            :return int - The number of entries written, 0 when the series is empty or there is no ingestion_ledger table
+        """
+        if 'ingestion_ledger' not in self.__metadata.tables or series.dataFrame is None or series.dataFrame.empty:
+            return 0
+
+        verifiedTimes = pd.to_datetime(series.dataFrame['timeVerified'], utc=True)
+        generatedTimes = pd.to_datetime(series.dataFrame['timeGenerated'], utc=True)
+        row = {
+            "dataSource": series.description.dataSource,
+            "dataLocation": series.description.dataLocation,
+            "dataSeries": series.description.dataSeries,
+            "dataDatum": series.description.dataDatum,
+            "fromVerifiedTime": min(self.__to_naive_utc(timeDescription.fromDateTime), self.__to_naive_utc(verifiedTimes.min().to_pydatetime())),
+            "toVerifiedTime": self.__to_naive_utc(verifiedTimes.max().to_pydatetime()),
+            "oldestGeneratedTime": self.__to_naive_utc(generatedTimes.min().to_pydatetime()),
+            "latestGeneratedTime": self.__to_naive_utc(generatedTimes.max().to_pydatetime()),
+            "acquiredTime": datetime.now(timezone.utc).replace(tzinfo=None),
+            "rowCount": len(series.dataFrame)
+        }
+        ingestion_ledger = self.__metadata.tables['ingestion_ledger']
+        with self.__get_engine().begin() as conn:
+            # counted from RETURNING, the rowcount of an insert psycopg returns rows for is -1
+            return len(conn.execute(insert(ingestion_ledger).values(row).returning(ingestion_ledger.c.id)).all())
+
+    def prune_ingestion_ledger(self, before_time: datetime) -> int:
+        """Deletes the ingestion ledger entries whose whole verified range is before a horizon. Requests for those times
+            fall back to deciding freshness from the inputs themselves.
+
+            :param before_time: datetime - Entries verified entirely before this time are deleted
+            :return int - The number of entries deleted, 0 when there is no ingestion_ledger table
+        """
+        if 'ingestion_ledger' not in self.__metadata.tables:
+            return 0
+
+        stmt = text('DELETE FROM ingestion_ledger WHERE "toVerifiedTime" < :before_time')
+        with self.__get_engine().begin() as conn:
+            return conn.execute(stmt, {'before_time': self.__to_naive_utc(before_time)}).rowcount
+
     def insert_lat_lon_test(self, code: str, displayName: str, notes: str, latitude: str, longitude: str):
         """This method inserts lat and lon information
         """
@@ -1206,6 +2360,7 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
             conn.execute(insert(self.__metadata.tables['ref_dataLocation'])
                         .values(insertionValueRow))
             conn.commit()
+        ReferenceDataCache().invalidate()
 
     def insert_external_location_code(self, dataLocationCode: str, dataSourceCode: str, dataSourceLocationCode: str, priorityOrder: int):
         """This method inserts external location code information
@@ -1216,4 +2371,5 @@ class SQLAlchemyORM_Postgres(ISeriesStorage):
         with self.__get_engine().connect() as conn:
             conn.execute(insert(self.__metadata.tables['dataLocation_dataSource_mapping'])
                         .values(insertionValueRow))
-            conn.commit()
\ No newline at end of file
+            conn.commit()
+        ReferenceDataCache().invalidate()
\ No newline at end of file
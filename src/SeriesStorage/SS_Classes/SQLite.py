@@ -0,0 +1,798 @@
+# -*- coding: utf-8 -*-
+#SQLite.py
+#-------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#-------------------------------
+"""
+A series storage backed by a single SQLite file (standard library sqlite3), for local runs, benchmarks and
+profiling without a Postgres container, and as a lightweight option for edge deployments.
+
+Select it with ISERIESSTORAGE_INSTANCE=SQLite and point DB_LOCATION_STRING at the file:
+    sqlite:///relative/path/semaphore.db
+    sqlite:////absolute/path/semaphore.db
+    sqlite://  (or sqlite:///:memory:) - A private in memory database, shared by every instance in the process
+The schema is created on first use, no migrations are needed. Requires SQLite 3.35 or later (RETURNING).
+
+The selections follow SQLAlchemyORM_Postgres:
+    - select_input returns the latest generated time per verified time (and ensemble member).
+    - Ensembles are stored the pre 3.10 way, one inputs row per member, and are spliced back into one row
+      per verified and generated time with the members as a list of floats.
+    - Output dataValues are encoded with the OutputCodec, so blobs can be copied between the two storages.
+    - The outputs, inputs, model_runs and output_statistics uniqueness rules match their Postgres AK00 constraints,
+      with null columns comparing equal.
+
+Times are stored as naive UTC ISO text (which sorts in time order) and lead times as seconds.
+
+NOTE:: Every call opens its own short lived connection, so instances can be used from any thread. A file database
+is put in WAL mode so readers do not block the writer, an in memory database is best kept to one thread.
+"""
+#-------------------------------
+#
+#
+#Imports
+import json
+import sqlite3
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from datetime import datetime, timedelta, timezone
+from os import getenv, register_at_fork
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from SeriesStorage.ISeriesStorage import ISeriesStorage
+from SeriesStorage.OutputCodec import OutputCodec, LazyOutputValue
+
+from DataClasses import Series, SeriesDescription, SemaphoreSeriesDescription, TimeDescription, get_input_dataFrame, get_output_dataFrame
+from utility import log
+
+
+class SQLite(ISeriesStorage):
+
+    # Created on first use of a database, every statement is idempotent
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS "ref_dataLocation" (
+            "id" INTEGER PRIMARY KEY,
+            "code" TEXT NOT NULL UNIQUE,
+            "displayName" TEXT NOT NULL,
+            "notes" TEXT,
+            "latitude" TEXT NOT NULL,
+            "longitude" TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS "dataLocation_dataSource_mapping" (
+            "id" INTEGER PRIMARY KEY,
+            "dataLocationCode" TEXT NOT NULL,
+            "dataSourceCode" TEXT NOT NULL,
+            "dataSourceLocationCode" TEXT NOT NULL,
+            "priorityOrder" INTEGER NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS "inputs" (
+            "id" INTEGER PRIMARY KEY,
+            "generatedTime" TEXT,
+            "acquiredTime" TEXT NOT NULL,
+            "verifiedTime" TEXT NOT NULL,
+            "dataValue" REAL,
+            "isActual" INTEGER NOT NULL,
+            "dataUnit" TEXT NOT NULL,
+            "dataSource" TEXT NOT NULL,
+            "dataLocation" TEXT NOT NULL,
+            "dataSeries" TEXT NOT NULL,
+            "dataDatum" TEXT,
+            "latitude" TEXT,
+            "longitude" TEXT,
+            "ensembleMemberID" INTEGER
+        );
+
+        CREATE UNIQUE INDEX IF NOT EXISTS "inputs_AK00" ON "inputs" (
+            "isActual", IFNULL("generatedTime", ''), "verifiedTime", "dataUnit", "dataSource", "dataLocation", "dataSeries",
+            IFNULL("dataDatum", ''), IFNULL("latitude", ''), IFNULL("longitude", ''), IFNULL("ensembleMemberID", -1)
+        );
+
+        CREATE INDEX IF NOT EXISTS "inputs_series_lookup" ON "inputs" (
+            "dataSource", "dataLocation", "dataSeries", "verifiedTime"
+        );
+
+        CREATE TABLE IF NOT EXISTS "outputs" (
+            "id" INTEGER PRIMARY KEY,
+            "timeGenerated" TEXT NOT NULL,
+            "leadTime" REAL NOT NULL,
+            "modelName" TEXT NOT NULL,
+            "modelVersion" TEXT NOT NULL,
+            "dataValue" BLOB,
+            "dataUnit" TEXT NOT NULL,
+            "dataLocation" TEXT NOT NULL,
+            "dataSeries" TEXT NOT NULL,
+            "dataDatum" TEXT
+        );
+
+        CREATE UNIQUE INDEX IF NOT EXISTS "outputs_AK00" ON "outputs" (
+            "timeGenerated", "leadTime", "modelName", "modelVersion", "dataLocation", "dataSeries", IFNULL("dataDatum", '')
+        );
+
+        CREATE INDEX IF NOT EXISTS "outputs_model_lookup" ON "outputs" ("modelName", "timeGenerated");
+
+        CREATE TABLE IF NOT EXISTS "model_runs" (
+            "id" INTEGER PRIMARY KEY,
+            "outputID" INTEGER NOT NULL UNIQUE REFERENCES "outputs" ("id"),
+            "executionTime" TEXT NOT NULL,
+            "returnCode" INTEGER NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS "output_statistics" (
+            "id" INTEGER PRIMARY KEY,
+            "outputID" INTEGER NOT NULL UNIQUE REFERENCES "outputs" ("id"),
+            "p1" REAL, "p5" REAL, "p10" REAL, "p25" REAL, "p50" REAL, "p75" REAL, "p90" REAL, "p95" REAL, "p99" REAL,
+            "min" REAL, "max" REAL, "mean" REAL, "std_dev" REAL
+        );
+    """
+
+    # The inputs columns in table order, as every input selection returns them
+    INPUT_COLUMNS = (
+        "id", "generatedTime", "acquiredTime", "verifiedTime", "dataValue", "isActual", "dataUnit", "dataSource",
+        "dataLocation", "dataSeries", "dataDatum", "latitude", "longitude", "ensembleMemberID"
+    )
+
+    # The output_statistics columns filled from a statistics dictionary
+    STATISTICS_COLUMNS = (
+        "p1", "p5", "p10", "p25", "p50", "p75", "p90", "p95", "p99", "min", "max", "mean", "std_dev"
+    )
+
+    # The OutputCodec used for output dataValues, see __get_output_codec
+    _outputCodec: OutputCodec | None = None
+
+    # One open connection per database whose schema has been created. It keeps an in memory database alive
+    # between calls, the calls themselves use their own connections (see __transaction).
+    _databases: dict[str, sqlite3.Connection] = {}
+    _lock = Lock()
+
+    def __init__(self) -> None:
+        """Constructor resolves the database from DB_LOCATION_STRING, creating its schema the first time it is used in a process."""
+        self.__database = self.__parse_location(getenv('DB_LOCATION_STRING'))
+
+        with SQLite._lock:
+            if self.__database not in SQLite._databases:
+                conn = self.__connect()
+                if not self.__database.startswith('file:'):
+                    conn.execute('PRAGMA journal_mode=WAL')
+                conn.executescript(self.SCHEMA)
+                SQLite._databases[self.__database] = conn
+
+    @classmethod
+    def dispose(cls) -> None:
+        """Closes the connection held for each database, an in memory database is dropped with it."""
+        with cls._lock:
+            for conn in cls._databases.values():
+                conn.close()
+            cls._databases.clear()
+
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        """Forgets the connections inherited from the parent, without closing them as they still belong to it."""
+        cls._lock = Lock()
+        cls._databases = {}
+
+    #############################################################################################
+    ################################################################################## Public methods
+    #############################################################################################
+
+    def select_input(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription) -> Series:
+        """Selects the latest generated time per verified time (and ensemble member) of a series in a verified time range.
+            Ensemble members are spliced into one row per verified and generated time, see SQLAlchemyORM_Postgres.select_input.
+
+            :param seriesDescription: SeriesDescription - A series description object
+            :param timeDescription: TimeDescription - A hydrated time description object
+        """
+        with self.__transaction() as conn:
+            rows = conn.execute(self.__latest_inputs_sql(), self.__input_params(seriesDescription, timeDescription)).fetchall()
+
+        series = Series(seriesDescription, timeDescription)
+        series.dataFrame = self.__splice_input([self.__input_row(row) for row in rows])
+        return series
+
+    def select_latest_output(self, model_names: list[str], decode: str = 'lazy') -> list[Series] | None:
+        """Selects every output at the latest generated time of each model, regardless of version, one series per row.
+
+            :param model_names: list[str] - The names of the models to query
+            :param decode: str - How the dataValue column is returned, see __splice_output
+        """
+        with self.__transaction() as conn:
+            rows = conn.execute("""
+                SELECT o.* FROM "outputs" AS o
+                INNER JOIN (
+                    SELECT "modelName", MAX("timeGenerated") AS "timeGenerated" FROM "outputs"
+                    WHERE "modelName" IN (SELECT value FROM json_each(:model_names))
+                    GROUP BY "modelName"
+                ) AS l
+                    ON l."modelName" = o."modelName" AND l."timeGenerated" = o."timeGenerated"
+                ORDER BY o."modelName"
+            """, {'model_names': json.dumps(list(model_names))}).fetchall()
+
+        if not rows:
+            return None
+
+        df_all_parsed_data = self.__splice_output(rows, decode)
+
+        results = []
+        for idx, row in enumerate(rows):
+            series = Series(self.__output_description(row), None)
+            series.dataFrame = df_all_parsed_data.iloc[[idx]].reset_index(drop=True)
+            results.append(series)
+        return results
+
+    def select_output(self, model_name: str, from_time: datetime, to_time: datetime, decode: str = 'lazy') -> Series | None:
+        """Selects a model's outputs predicting within a time range, inferring the lead time from its latest prediction
+            of its latest version, see SQLAlchemyORM_Postgres.select_output.
+
+            :param model_name: str - The name of the model to query
+            :param from_time: datetime - The earliest time to include
+            :param to_time: datetime - The latest time to include
+            :param decode: str - How the dataValue column is returned, see __splice_output
+        """
+        with self.__transaction() as conn:
+            leadTime = conn.execute("""
+                SELECT "leadTime" FROM "outputs"
+                WHERE "modelName" = :model_name
+                ORDER BY "modelVersion" DESC, "timeGenerated" DESC
+                LIMIT 1
+            """, {'model_name': model_name}).fetchone()
+
+            if leadTime is None:
+                log(f'SQLite | select_output | No leadtime found for model_name:{model_name}')
+                return None
+
+            leadTime = timedelta(seconds=leadTime[0])
+            rows = conn.execute("""
+                SELECT * FROM "outputs"
+                WHERE "modelName" = :model_name
+                AND "timeGenerated" >= :fromGeneratedTime
+                AND "timeGenerated" <= :toGeneratedTime
+                ORDER BY "timeGenerated"
+            """, {
+                'model_name': model_name,
+                'fromGeneratedTime': self.__to_db_time(from_time - leadTime),
+                'toGeneratedTime': self.__to_db_time(to_time - leadTime)
+            }).fetchall()
+
+        if not rows:
+            return None
+
+        series = Series(self.__output_description(rows[0]))
+        series.dataFrame = self.__splice_output(rows, decode)
+        return series
+
+    def select_specific_output(self, semaphoreSeriesDescription: SemaphoreSeriesDescription, timeDescription: TimeDescription) -> Series:
+        """Selects the outputs of a fully described model predicting within a time range, see SQLAlchemyORM_Postgres.select_specific_output.
+
+            :param semaphoreSeriesDescription: SemaphoreSeriesDescription - A semaphore series description object
+            :param timeDescription: TimeDescription - A hydrated time description object
+        """
+        series = Series(semaphoreSeriesDescription, timeDescription)
+
+        bind_params = {
+            'modelName': semaphoreSeriesDescription.modelName,
+            'modelVersion': semaphoreSeriesDescription.modelVersion,
+            'dataLocation': semaphoreSeriesDescription.dataLocation,
+            'dataSeries': semaphoreSeriesDescription.dataSeries,
+            'dataDatum': semaphoreSeriesDescription.dataDatum
+        }
+        descriptionFilter = """
+            "modelName" = :modelName
+            AND "modelVersion" = :modelVersion
+            AND "dataLocation" = :dataLocation
+            AND "dataSeries" = :dataSeries
+            AND "dataDatum" IS :dataDatum
+        """
+
+        with self.__transaction() as conn:
+            leadTime = conn.execute(f'SELECT "leadTime" FROM "outputs" WHERE {descriptionFilter} LIMIT 1', bind_params).fetchone()
+
+            if leadTime is None:
+                log(f'SQLite | select_specific_output | No leadtime found for SemaphoreSeriesDescription:{semaphoreSeriesDescription}')
+                return series
+
+            leadTime = timedelta(seconds=leadTime[0])
+            rows = conn.execute(f"""
+                SELECT * FROM "outputs"
+                WHERE {descriptionFilter}
+                AND "timeGenerated" >= :fromGeneratedTime
+                AND "timeGenerated" <= :toGeneratedTime
+                ORDER BY "timeGenerated"
+            """, {
+                **bind_params,
+                'fromGeneratedTime': self.__to_db_time(timeDescription.fromDateTime - leadTime),
+                'toGeneratedTime': self.__to_db_time(timeDescription.toDateTime - leadTime)
+            }).fetchall()
+
+        series.dataFrame = self.__splice_output(rows)
+        return series
+
+    def select_output_statistics_range(self, model_names: list[str], fromDateTime: datetime, toDateTime: datetime) -> list[dict] | None:
+        """Returns the statistics of each model's outputs generated within a time range, newest first per model,
+            or None if none are found. See SQLAlchemyORM_Postgres.select_output_statistics_range for the dictionary format.
+
+            :param model_names: list[str] - A list of model names to query for
+            :param fromDateTime: datetime - The inclusive start of the time range (UTC)
+            :param toDateTime: datetime - The inclusive end of the time range (UTC)
+        """
+        with self.__transaction() as conn:
+            rows = conn.execute(f"""
+                SELECT o."modelName", o."timeGenerated", {self.__statistics_columns_sql('s')}
+                FROM "outputs" AS o
+                INNER JOIN "output_statistics" AS s
+                    ON s."outputID" = o."id"
+                WHERE o."modelName" IN (SELECT value FROM json_each(:model_names))
+                AND o."timeGenerated" >= :fromDateTime
+                AND o."timeGenerated" <= :toDateTime
+                ORDER BY o."modelName", o."timeGenerated" DESC
+            """, {
+                'model_names': json.dumps(list(model_names)),
+                'fromDateTime': self.__to_db_time(fromDateTime),
+                'toDateTime': self.__to_db_time(toDateTime)
+            }).fetchall()
+
+        return self.__statistics_dicts(rows)
+
+    def select_latest_output_statistics(self, model_names: list[str]) -> list[dict] | None:
+        """Returns the statistics of the latest output with statistics of each model, or None if none are found.
+            See SQLAlchemyORM_Postgres.select_latest_output_statistics for the dictionary format.
+
+            :param model_names: list[str] - A list of model names to query for
+        """
+        with self.__transaction() as conn:
+            rows = conn.execute(f"""
+                SELECT "modelName", "timeGenerated", {', '.join(f'"{column}"' for column in self.STATISTICS_COLUMNS)}
+                FROM (
+                    SELECT
+                        o."modelName",
+                        o."timeGenerated",
+                        {self.__statistics_columns_sql('s')},
+                        ROW_NUMBER() OVER (PARTITION BY o."modelName" ORDER BY o."timeGenerated" DESC, o."id" DESC) AS "rowNumber"
+                    FROM "outputs" AS o
+                    INNER JOIN "output_statistics" AS s
+                        ON s."outputID" = o."id"
+                    WHERE o."modelName" IN (SELECT value FROM json_each(:model_names))
+                )
+                WHERE "rowNumber" = 1
+                ORDER BY "modelName"
+            """, {'model_names': json.dumps(list(model_names))}).fetchall()
+
+        return self.__statistics_dicts(rows)
+
+    def find_external_location_code(self, sourceCode: str, location: str, priorityOrder: int = 0) -> str:
+        """Returns a data source location code based off of passed parameters
+           :param sourceCode: str - the data source code (noaaT&C)
+           :param location: str - the local location name
+           :param priorityOrder: int - priority of which locations to go to if one is unavailable
+           :raises IndexError - If no mapping exists
+        """
+        with self.__transaction() as conn:
+            row = conn.execute("""
+                SELECT "dataSourceLocationCode" FROM "dataLocation_dataSource_mapping"
+                WHERE "dataSourceCode" = ? AND "dataLocationCode" = ? AND "priorityOrder" = ?
+                ORDER BY "id"
+                LIMIT 1
+            """, (sourceCode, location, priorityOrder)).fetchone()
+
+        if row is None:
+            raise IndexError(f'No dataLocation_dataSource_mapping row for sourceCode: {sourceCode}, location: {location}, priorityOrder: {priorityOrder}')
+        return row[0]
+
+    def find_lat_lon_coordinates(self, locationCode: str) -> tuple:
+        """Returns lat and lon tuple
+           :param locationCode: str - the local location name
+           :raises TypeError - If the location does not exist
+        """
+        with self.__transaction() as conn:
+            row = conn.execute('SELECT "latitude", "longitude" FROM "ref_dataLocation" WHERE "code" = ?', (locationCode,)).fetchone()
+
+        if row is None:
+            raise TypeError(f'No ref_dataLocation row for locationCode: {locationCode}')
+        return tuple(row)
+
+    def insert_input(self, series: Series, returning: bool = True) -> Series | int:
+        """Inserts actual/predictions into the inputs table, one row per value and one row per member for ensembles.
+            On conflict with inputs_AK00 the acquired time of the existing row is updated to now.
+
+            :param series: Series - A series object with a time description, series description, and input data
+            :param returning: bool - When False the inserted rows are not sent back, only their count
+            :return Series | int - A series object that contains the actually inserted data,
+                or the number of inserted/updated rows if returning is False
+        """
+        if(type(series.description).__name__ != 'SeriesDescription'): raise ValueError('Description should be type SeriesDescription')
+
+        columnList = ', '.join(f'"{column}"' for column in self.INPUT_COLUMNS[1:])
+        stmt = f"""
+            INSERT INTO "inputs" ({columnList})
+            VALUES ({', '.join('?' * len(self.INPUT_COLUMNS[1:]))})
+            ON CONFLICT DO UPDATE SET "acquiredTime" = excluded."acquiredTime"
+        """
+
+        insertionRows = self.__build_input_insertion_rows(series, datetime.now(timezone.utc))
+        with self.__transaction() as conn:
+            if not returning:
+                return conn.executemany(stmt, insertionRows).rowcount
+
+            # RETURNING can not be used with executemany
+            returningSql = 'RETURNING ' + ', '.join(f'"{column}"' for column in self.INPUT_COLUMNS)
+            result = [conn.execute(stmt + returningSql, row).fetchone() for row in insertionRows]
+
+        resultSeries = Series(series.description, series.timeDescription)
+        resultSeries.dataFrame = self.__splice_input([self.__input_row(row) for row in result])
+        return resultSeries
+
+    def insert_output_and_model_run(self, output_series: Series, execution_time: datetime, return_code: int) -> tuple[Series, tuple | None]:
+        """Inserts a model run's output and its model_runs row, see SQLAlchemyORM_Postgres.insert_output_and_model_run.
+
+            :param output_series: Series - A series object with a semaphore series description and a single row output dataframe
+            :param execution_time: datetime - The time this instance of semaphore was ran
+            :param return_code: int - The return code of the run
+            :returns tuple[Series, tuple | None] - The inserted output and the inserted (id, outputID, executionTime, returnCode)
+                model run row, or None if the output already existed
+        """
+        with self.__transaction() as conn:
+            inserted_series, model_run_row, _ = self.__insert_run(conn, output_series, execution_time, return_code, None)
+
+        if model_run_row is None:
+            log('WARNING:: Series Storage was told to insert to both the output and model run table. This failed because no outputs were inserted. This could be caused by the prediction already existing in the database!')
+        return inserted_series, model_run_row
+
+    def insert_outputs_and_model_runs(self, runs: list[tuple[Series, datetime, int, dict | None]]) -> list[tuple[Series, tuple | None, tuple | None]]:
+        """Writes the output, model run and statistics of many model runs in one transaction,
+            see ISeriesStorage.insert_outputs_and_model_runs.
+        """
+        with self.__transaction() as conn:
+            return [self.__insert_run(conn, *run) for run in runs]
+
+    def insert_output(self, series: Series) -> tuple[Series, int | None]:
+        """Inserts a single row for actual/predictions into the outputs table, see SQLAlchemyORM_Postgres.insert_output.
+
+            :param series: Series - A series object with a semaphore series description and a single row output dataframe
+            :returns tuple[Series, int | None] - The inserted output and its id, or None if it already existed
+        """
+        with self.__transaction() as conn:
+            return self.__insert_output(conn, series)
+
+    def insert_output_statistics(self, output_table_id: int, statistics_dict: dict) -> tuple | None:
+        """Inserts the statistics of an output, see SQLAlchemyORM_Postgres.insert_output_statistics.
+
+            :param output_table_id: int - The id of the output table row these statistics are associated with
+            :param statistics_dict: dict - The statistics keyed by STATISTICS_COLUMNS
+            :returns tuple | None - The inserted (id, outputID, p1, ..., std_dev) row or None if the output already had statistics
+        """
+        with self.__transaction() as conn:
+            return self.__insert_output_statistics(conn, output_table_id, statistics_dict)
+
+    def fetch_oldest_generated_time(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription) -> datetime | None:
+        """Returns the oldest of the latest generated times per verified time (and ensemble member) in a time window,
+            see SQLAlchemyORM_Postgres.fetch_oldest_generated_time.
+
+            :param seriesDescription: SeriesDescription - A series description object
+            :param timeDescription: TimeDescription - A hydrated time description object
+        """
+        with self.__transaction() as conn:
+            row = conn.execute(
+                f'SELECT MIN(l."generatedTime") FROM ({self.__latest_inputs_sql()}) AS l',
+                self.__input_params(seriesDescription, timeDescription)
+            ).fetchone()
+
+        if row is None or not row[0]:
+            return None
+        return pd.to_datetime(self.__from_db_time(row[0])).tz_localize(timezone.utc)
+
+    def fetch_row_with_max_verified_time_in_range(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription) -> tuple | None:
+        """Returns the inputs row with the max verified time in the requested range or None if no data is found.
+            The tuple has the order of INPUT_COLUMNS with naive UTC times.
+
+            :param seriesDescription: SeriesDescription - A series description object
+            :param timeDescription: TimeDescription - A hydrated time description object
+        """
+        with self.__transaction() as conn:
+            row = conn.execute(f"""
+                SELECT {', '.join(f'"{column}"' for column in self.INPUT_COLUMNS)} FROM "inputs"
+                WHERE {self.__input_filter_sql()}
+                ORDER BY "verifiedTime" DESC
+                LIMIT 1
+            """, self.__input_params(seriesDescription, timeDescription)).fetchone()
+
+        return self.__input_row(row) if row is not None else None
+
+    def insert_lat_lon_test(self, code: str, displayName: str, notes: str, latitude: str, longitude: str):
+        """Inserts a ref_dataLocation row, for setting up local databases and tests."""
+        with self.__transaction() as conn:
+            conn.execute(
+                'INSERT INTO "ref_dataLocation" ("code", "displayName", "notes", "latitude", "longitude") VALUES (?, ?, ?, ?, ?)',
+                (code, displayName, notes, latitude, longitude)
+            )
+
+    def insert_external_location_code(self, dataLocationCode: str, dataSourceCode: str, dataSourceLocationCode: str, priorityOrder: int):
+        """Inserts a dataLocation_dataSource_mapping row, for setting up local databases and tests."""
+        with self.__transaction() as conn:
+            conn.execute(
+                'INSERT INTO "dataLocation_dataSource_mapping" ("dataLocationCode", "dataSourceCode", "dataSourceLocationCode", "priorityOrder") VALUES (?, ?, ?, ?)',
+                (dataLocationCode, dataSourceCode, dataSourceLocationCode, priorityOrder)
+            )
+
+    #############################################################################################
+    ################################################################################## DB Interaction private methods
+    #############################################################################################
+
+    def __parse_location(self, location: str | None) -> str:
+        """Turns a sqlite:/// location string into the database sqlite3 opens (always as a URI).
+            :param location: str | None - DB_LOCATION_STRING
+            :raises ValueError - If the location is not a sqlite location
+        """
+        if location is None or not location.strip().startswith('sqlite://'):
+            raise ValueError(f'The SQLite storage needs a DB_LOCATION_STRING like sqlite:///path/semaphore.db, got {location}')
+
+        path = location.strip()[len('sqlite://'):]
+        if path in ('', '/:memory:'):
+            # A named in memory database with a shared cache is visible to every connection in the process
+            return 'file:semaphore_memory?mode=memory&cache=shared'
+        return path[1:]
+
+    def __connect(self) -> sqlite3.Connection:
+        """Opens a connection to this instance's database."""
+        database = self.__database
+        if database.startswith('file:'):
+            return sqlite3.connect(database, uri=True, timeout=30, check_same_thread=False)
+        return sqlite3.connect(database, timeout=30, check_same_thread=False)
+
+    @contextmanager
+    def __transaction(self) -> Iterator[sqlite3.Connection]:
+        """Yields a new connection inside a transaction that is committed (or rolled back on error) and closed on exit."""
+        with closing(self.__connect()) as conn:
+            with conn:
+                yield conn
+
+    def __input_filter_sql(self) -> str:
+        """The WHERE clause shared by every input query, binds :dataSource, :dataLocation, :dataSeries, :dataDatum, :from_dt and :to_dt."""
+        return """
+            "dataSource" = :dataSource
+            AND "dataLocation" = :dataLocation
+            AND "dataSeries" = :dataSeries
+            AND "dataDatum" IS :dataDatum
+            AND "verifiedTime" BETWEEN :from_dt AND :to_dt
+        """
+
+    def __input_params(self, seriesDescription: SeriesDescription, timeDescription: TimeDescription) -> dict:
+        """The values bound by __input_filter_sql for a series and time range."""
+        return {
+            'dataSource': seriesDescription.dataSource,
+            'dataLocation': seriesDescription.dataLocation,
+            'dataSeries': seriesDescription.dataSeries,
+            'dataDatum': seriesDescription.dataDatum,
+            'from_dt': self.__to_db_time(timeDescription.fromDateTime),
+            'to_dt': self.__to_db_time(timeDescription.toDateTime)
+        }
+
+    def __latest_inputs_sql(self) -> str:
+        """The inputs rows with the latest generated time per (verifiedTime, ensembleMemberID), ordered by verified time."""
+        columnList = ', '.join(f'"{column}"' for column in self.INPUT_COLUMNS)
+        return f"""
+            SELECT {columnList} FROM (
+                SELECT
+                    {columnList},
+                    ROW_NUMBER() OVER (PARTITION BY "verifiedTime", "ensembleMemberID" ORDER BY "generatedTime" DESC) AS "rowNumber"
+                FROM "inputs"
+                WHERE {self.__input_filter_sql()}
+            )
+            WHERE "rowNumber" = 1
+            ORDER BY "verifiedTime", "ensembleMemberID"
+        """
+
+    def __statistics_columns_sql(self, alias: str) -> str:
+        return ', '.join(f'{alias}."{column}"' for column in self.STATISTICS_COLUMNS)
+
+    def __statistics_dicts(self, rows: list[tuple]) -> list[dict] | None:
+        """Splices (modelName, timeGenerated, *STATISTICS_COLUMNS) rows into statistics dictionaries, None when there are none."""
+        if not rows:
+            return None
+
+        return [
+            {
+                'modelName': row[0],
+                'timeGenerated': self.__from_db_time(row[1]).replace(tzinfo=timezone.utc),
+                **dict(zip(self.STATISTICS_COLUMNS, row[2:]))
+            }
+            for row in rows
+        ]
+
+    def __build_input_insertion_rows(self, series: Series, acquiredTime: datetime) -> list[tuple]:
+        """Flattens an input series into inputs rows ordered as INPUT_COLUMNS without the id.
+            Ensemble series (list dataValues) give one row per member, numbered in list order.
+
+            :param series: Series - A series object with a series description and input data
+            :param acquiredTime: datetime - The acquired time to stamp on every row
+        """
+        df = series.dataFrame
+        if df.empty:
+            return []
+
+        description = series.description
+        isActual = int(description.dataSeries[0] != 'p')
+        acquiredTime = self.__to_db_time(acquiredTime)
+
+        def value(value) -> float | None:
+            return None if value is None or pd.isna(value) else float(value)
+
+        def text(value) -> str | None:
+            return None if value is None or pd.isna(value) else str(value)
+
+        rows = []
+        for dataValue, dataUnit, timeVerified, timeGenerated, longitude, latitude in zip(
+            df['dataValue'], df['dataUnit'], df['timeVerified'], df['timeGenerated'], df['longitude'], df['latitude']
+        ):
+            members = enumerate(dataValue) if isinstance(dataValue, list) else [(None, dataValue)]
+            for memberID, memberValue in members:
+                rows.append((
+                    self.__to_db_time(timeGenerated), acquiredTime, self.__to_db_time(timeVerified), value(memberValue), isActual,
+                    dataUnit, description.dataSource, description.dataLocation, description.dataSeries, description.dataDatum,
+                    text(latitude), text(longitude), memberID
+                ))
+        return rows
+
+    def __insert_run(self, conn: sqlite3.Connection, output_series: Series, execution_time: datetime, return_code: int, statistics_dict: dict | None) -> tuple[Series, tuple | None, tuple | None]:
+        """Writes one model run's output, model run and statistics (when not None) on an open connection.
+            The model run and statistics are skipped when the output already existed.
+        """
+        inserted_series, output_id = self.__insert_output(conn, output_series)
+        if output_id is None:
+            return inserted_series, None, None
+
+        model_run_row = conn.execute(
+            'INSERT INTO "model_runs" ("outputID", "executionTime", "returnCode") VALUES (?, ?, ?) ON CONFLICT DO NOTHING RETURNING *',
+            (output_id, self.__to_db_time(execution_time), return_code)
+        ).fetchone()
+        if model_run_row is not None:
+            model_run_row = (model_run_row[0], model_run_row[1], self.__from_db_time(model_run_row[2]), model_run_row[3])
+
+        statistics_row = None
+        if statistics_dict is not None and model_run_row is not None:
+            statistics_row = self.__insert_output_statistics(conn, output_id, statistics_dict)
+        return inserted_series, model_run_row, statistics_row
+
+    def __insert_output(self, conn: sqlite3.Connection, series: Series) -> tuple[Series, int | None]:
+        """Writes the single row of an output series on an open connection, see insert_output."""
+        if(type(series.description).__name__ != 'SemaphoreSeriesDescription'): raise ValueError('Description should be type SemaphoreSeriesDescription')
+
+        if len(series.dataFrame) != 1: raise ValueError(f'Output series dataframe should only have one row, got {len(series.dataFrame)}')
+
+        output_row = series.dataFrame.iloc[0]
+        result = conn.execute("""
+            INSERT INTO "outputs" ("timeGenerated", "leadTime", "modelName", "modelVersion", "dataValue", "dataUnit", "dataLocation", "dataSeries", "dataDatum")
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT DO NOTHING
+            RETURNING *
+        """, (
+            self.__to_db_time(output_row['timeGenerated']),
+            pd.Timedelta(output_row['leadTime']).total_seconds(),
+            series.description.modelName,
+            series.description.modelVersion,
+            self.__get_output_codec().encode(output_row['dataValue']),
+            output_row['dataUnit'],
+            series.description.dataLocation,
+            series.description.dataSeries,
+            series.description.dataDatum
+        )).fetchone()
+
+        resultSeries = Series(series.description, series.timeDescription)
+        if result is None:
+            resultSeries.dataFrame = get_output_dataFrame()
+            return resultSeries, None
+
+        resultSeries.dataFrame = self.__splice_output([result])
+        return resultSeries, result[0]
+
+    def __insert_output_statistics(self, conn: sqlite3.Connection, output_table_id: int, statistics_dict: dict) -> tuple | None:
+        """Writes an output's statistics on an open connection, see insert_output_statistics."""
+        columnList = ', '.join(f'"{column}"' for column in self.STATISTICS_COLUMNS)
+        return conn.execute(
+            f'INSERT INTO "output_statistics" ("outputID", {columnList}) VALUES (?, {", ".join("?" * len(self.STATISTICS_COLUMNS))}) ON CONFLICT DO NOTHING RETURNING *',
+            (output_table_id, *[statistics_dict[column] for column in self.STATISTICS_COLUMNS])
+        ).fetchone()
+
+    def __output_description(self, row: tuple) -> SemaphoreSeriesDescription:
+        """Parses out model information from an outputs row."""
+        return SemaphoreSeriesDescription(
+            row[3],   # modelName
+            row[4],   # modelVersion
+            row[8],   # dataSeries
+            row[7],   # dataLocation
+            row[9]    # dataDatum
+        )
+
+    def __input_row(self, row: tuple) -> tuple:
+        """Converts an inputs row (INPUT_COLUMNS) to the types Postgres returns: naive datetimes, a float dataValue and a bool isActual."""
+        row = list(row)
+        for index in (1, 2, 3):
+            row[index] = self.__from_db_time(row[index])
+        # RETURNING can report whole REAL values as integers
+        row[4] = None if row[4] is None else float(row[4])
+        row[5] = bool(row[5])
+        return tuple(row)
+
+    def __splice_input(self, rows: list[tuple]) -> DataFrame:
+        """Converts inputs rows (INPUT_COLUMNS with naive datetimes) to an input dataframe, grouping ensemble members
+            into one row per (verifiedTime, generatedTime) with the members as a list ordered by member ID.
+            Rows without a generated time are left out. The output is ordered by (timeVerified, timeGenerated).
+        """
+        records = []
+        ensembles = {}
+        for row in rows:
+            if row[1] is None or row[3] is None:
+                continue
+
+            if row[13] is None:
+                records.append((row[4], row[6], row[3], row[1], row[12], row[11]))
+            else:
+                ensemble = ensembles.setdefault((row[3], row[1]), (row[6], row[12], row[11], []))
+                ensemble[3].append((row[13], row[4]))
+
+        for (verifiedTime, generatedTime), (dataUnit, longitude, latitude, members) in ensembles.items():
+            records.append(([value for _, value in sorted(members)], dataUnit, verifiedTime, generatedTime, longitude, latitude))
+
+        if not records:
+            return get_input_dataFrame()
+
+        records.sort(key=lambda record: (record[2], record[3]))
+        df = DataFrame(records, columns=['dataValue', 'dataUnit', 'timeVerified', 'timeGenerated', 'longitude', 'latitude'])
+        if not ensembles:
+            df['dataValue'] = df['dataValue'].astype(np.float64)
+        df['timeVerified'] = pd.to_datetime(df['timeVerified']).dt.tz_localize(timezone.utc)
+        df['timeGenerated'] = pd.to_datetime(df['timeGenerated']).dt.tz_localize(timezone.utc)
+        return df
+
+    def __splice_output(self, rows: list[tuple], decode: str = 'eager') -> DataFrame:
+        """Converts outputs rows to an output dataframe, see SQLAlchemyORM_Postgres.__splice_output for the decode modes.
+            :raises ValueError - If decode is not eager, lazy or raw
+        """
+        if decode not in ('eager', 'lazy', 'raw'):
+            raise ValueError(f'Unknown output decode mode {decode}, expected eager, lazy or raw')
+
+        if not rows:
+            return get_output_dataFrame()
+
+        columns = list(zip(*rows))
+        codec = self.__get_output_codec()
+        if decode == 'eager':
+            dataValues = codec.decode_many(columns[5])
+        elif decode == 'lazy':
+            dataValues = [None if blob is None else LazyOutputValue(blob, codec) for blob in columns[5]]
+        else:
+            dataValues = list(columns[5])
+
+        return DataFrame({
+            "dataValue":     pd.Series(dataValues, dtype=object),
+            "dataUnit":      np.array(columns[6], dtype=object),
+            "timeGenerated": pd.to_datetime(pd.Series([self.__from_db_time(value) for value in columns[1]])).dt.tz_localize(timezone.utc).array,
+            "leadTime":      pd.to_timedelta(pd.Series(columns[2]), unit='s').array
+        })
+
+    def __to_db_time(self, value) -> str | None:
+        """Stores a datetime (or Timestamp) as naive UTC ISO text, tz aware values are converted to UTC first."""
+        if value is None or pd.isna(value):
+            return None
+        if isinstance(value, pd.Timestamp):
+            value = value.to_pydatetime()
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat(sep=' ')
+
+    def __from_db_time(self, value: str | None) -> datetime | None:
+        """Reads a time stored by __to_db_time back as a naive UTC datetime."""
+        return None if value is None else datetime.fromisoformat(value)
+
+    def __get_output_codec(self) -> OutputCodec:
+        """Returns the codec shared by every storage instance, created from the environment on first use."""
+        if SQLite._outputCodec is None:
+            SQLite._outputCodec = OutputCodec()
+        return SQLite._outputCodec
+
+
+register_at_fork(after_in_child=SQLite._reset_after_fork)
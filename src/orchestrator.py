@@ -24,6 +24,9 @@ from DataClasses import Series, SemaphoreSeriesDescription, get_output_dataFrame
 from utility import log, LogLocationDirector, log_error, log_success
 
 from SeriesStorage.ISeriesStorage import series_storage_factory
+from SeriesStorage.OutputWriteBatch import OutputWriteBatch
+from SeriesStorage.QueryProfiler import QueryProfiler
+from SeriesProvider.SeriesProvider import InputCache
 from ModelExecution.dataGatherer import DataGatherer
 from ModelExecution.InputVectorBuilder import InputVectorBuilder
 from ModelExecution.modelRunner import ModelRunner
@@ -38,6 +41,7 @@ class Orchestrator:
         self.dataGatherer = DataGatherer()
         self.inputVectorBuilder = InputVectorBuilder()
         self.modelRunner = ModelRunner()
+        self.__outputBatch = OutputWriteBatch()
 
 
     def run_semaphore(self, dspecPaths: list[str], executionTime: datetime = None, toss: bool = False):
@@ -51,6 +55,10 @@ class Orchestrator:
                 - Builds the input vectors
                 - Makes the prediction
                 - Handles the successful prediction
+                - Input series already selected for an earlier DSPEC of the run are served from the InputCache
+            - Before the DSPECs run, the input series shared by several of them are ingested once over a covering range
+            - Writes the results of every DSPEC to the database in one transaction
+            - Logs the storage calls of every DSPEC when DB_PROFILE is set
         NOTE: If a prediction fails, it will be handled by the __handle_failed_prediction method. This method will ensure that 
             a notification is sent and that the result is logged in the database.
 
@@ -68,47 +76,92 @@ class Orchestrator:
         if executionTime is None: 
                     executionTime = datetime.now(timezone.utc)
 
-        for dspecPath in checked_dspecs:
-            try:
+        # Input series selected for one dspec are reused by the rest of the run, see InputCache
+        InputCache().open()
+        try:
+            parsed_dspecs = self.__parse_dspecs(checked_dspecs, executionTime)
+            self.__prefetch_inputs(parsed_dspecs)
+
+            for parsed_dspec in parsed_dspecs:
                 try:
+                    try:
+                        # A DSPEC that could not be parsed fails here, the same way it would have while being parsed
+                        if isinstance(parsed_dspec, Exception):
+                            raise parsed_dspec
+                        DSPEC, reference_time = parsed_dspec
+                        statistics_call = DSPEC.outputInfo.statistics
+                        model_name: str = DSPEC.modelName
+
+                        # Storage calls made for this dspec are tagged with it, see __report_queries
+                        with QueryProfiler().scope(model_name, reference_time):
+                            LogLocationDirector().set_log_target_path(getenv('LOG_BASE_PATH'), model_name)
+                            log(f'----Running {dspecPaths} for {executionTime}! Toss: {toss}----')
+
+                            data_repository = self.dataGatherer.get_data_repository(DSPEC, reference_time)
+                            input_vectors = self.inputVectorBuilder.build_batch(DSPEC, data_repository)
+                            
+                            self._log_input_vectors(model_name, reference_time, data_repository, DSPEC)
+
+                            result = self.modelRunner.make_predictions(DSPEC, input_vectors, reference_time)
+
+                            self.__handle_successful_prediction(model_name, reference_time, result, toss, statistics_call)
                     
-                    DSPEC = self.DSPEC_parser.parse_dspec(dspecPath)
-                    statistics_call = DSPEC.outputInfo.statistics
-                    model_name: str = DSPEC.modelName
-                    reference_time = self.__calculate_referenceTime(executionTime, DSPEC)
-
-                    LogLocationDirector().set_log_target_path(getenv('LOG_BASE_PATH'), model_name)
-                    log(f'----Running {dspecPaths} for {executionTime}! Toss: {toss}----')
-
-                    data_repository = self.dataGatherer.get_data_repository(DSPEC, reference_time)
-                    input_vectors = self.inputVectorBuilder.build_batch(DSPEC, data_repository)
+                    except Exception:
+                            raise Semaphore_Exception('Error:: An unknown error ocurred!')
                     
-                    self._log_input_vectors(model_name, reference_time, data_repository, DSPEC)
-
-                    result = self.modelRunner.make_predictions(DSPEC, input_vectors, reference_time)
-
-                    self.__handle_successful_prediction(model_name, reference_time, result, toss, statistics_call)
-                
-                except Exception:
-                        raise Semaphore_Exception('Error:: An unknown error ocurred!')
-                
-            except Semaphore_Exception as se:
-                log_error(f'Error:: Prediction failed due to Semaphore Exception')
-                log_error(f'Exception message: {se}')
-                log_error(f'Full stack trace:\n{traceback.format_exc()}')
-                self.__handle_failed_prediction(se, reference_time, model_name, DSPEC, toss)
-            except Semaphore_Data_Exception as sde:
-                log_error(f'Warning:: Prediction failed due to lack of data')
-                log_error(f'Exception message: {sde}')
-                log_error(f'Full stack trace:\n{traceback.format_exc()}')
-                self.__handle_failed_prediction(sde, reference_time, model_name, DSPEC, toss)
-            except Semaphore_Ingestion_Exception as sie:
-                log_error(f'Error:: Prediction failed due to Semaphore Ingestion Exception')
-                log_error(f'Exception message: {sie}')
-                log_error(f'Full stack trace:\n{traceback.format_exc()}')
-                self.__handle_failed_prediction(sie, reference_time, model_name, DSPEC, toss)
+                except Semaphore_Exception as se:
+                    log_error(f'Error:: Prediction failed due to Semaphore Exception')
+                    log_error(f'Exception message: {se}')
+                    log_error(f'Full stack trace:\n{traceback.format_exc()}')
+                    self.__handle_failed_prediction(se, reference_time, model_name, DSPEC, toss)
+                except Semaphore_Data_Exception as sde:
+                    log_error(f'Warning:: Prediction failed due to lack of data')
+                    log_error(f'Exception message: {sde}')
+                    log_error(f'Full stack trace:\n{traceback.format_exc()}')
+                    self.__handle_failed_prediction(sde, reference_time, model_name, DSPEC, toss)
+                except Semaphore_Ingestion_Exception as sie:
+                    log_error(f'Error:: Prediction failed due to Semaphore Ingestion Exception')
+                    log_error(f'Exception message: {sie}')
+                    log_error(f'Full stack trace:\n{traceback.format_exc()}')
+                    self.__handle_failed_prediction(sie, reference_time, model_name, DSPEC, toss)
+        finally:
+            # Every result queued above is written together, once per run_semaphore call
+            self.__flush_outputs()
+            self.__report_queries()
+            InputCache().close()
 
     
+    def __parse_dspecs(self, dspecPaths: list[str], executionTime: datetime) -> list[tuple[Dspec, datetime] | Exception]:
+        """Parses every DSPEC of the run and calculates its reference time, once, before any of them runs.
+        A DSPEC that can not be parsed is logged and its exception kept in its place, to be raised when it is run.
+        :param dspecPaths: list[str] - The checked DSPEC paths of the run
+        :param executionTime: datetime - The time reference times are built off of
+        :returns list[tuple[Dspec, datetime] | Exception] - A (dspec, reference time) or the parsing exception per path, in order
+        """
+        parsed_dspecs = []
+        for dspecPath in dspecPaths:
+            try:
+                dspec = self.DSPEC_parser.parse_dspec(dspecPath)
+                parsed_dspecs.append((dspec, self.__calculate_referenceTime(executionTime, dspec)))
+            except Exception as e:
+                log(f'WARNING:: Could not parse {dspecPath}, it will fail when it is run: {e!r}')
+                parsed_dspecs.append(e)
+        return parsed_dspecs
+
+
+    def __prefetch_inputs(self, parsed_dspecs: list[tuple[Dspec, datetime] | Exception]) -> None:
+        """Hands the dependent series of every DSPEC of the run to the data gatherer before any of them runs, so a series
+        several DSPECs depend on is checked and ingested once (see DataGatherer.prefetch_data).
+        DSPECs that could not be parsed are skipped.
+        :param parsed_dspecs: list[tuple[Dspec, datetime] | Exception] - The parsed DSPECs of the run, see __parse_dspecs
+        """
+        dspecs = [parsed_dspec for parsed_dspec in parsed_dspecs if not isinstance(parsed_dspec, Exception)]
+        try:
+            self.dataGatherer.prefetch_data(dspecs)
+        except Exception as e:
+            log(f'WARNING:: Prefetching inputs failed, every DSPEC will request its own: {e!r}')
+
+
     def __clean_and_check_dspec(self, dspec_path: str) -> str:
         """Checks that a depsc path ends with the .json extension and that the file actually exists.
         
@@ -138,9 +191,10 @@ class Orchestrator:
 
     def __handle_successful_prediction(self, model_name: str, execution_time: datetime, result_series: Series,
                                         toss: bool, statistics_call: bool | None = None):
-        """Handels a successful run of semaphore, sending a notification and placing the result in the database.
+        """Handels a successful run of semaphore, sending a notification and queuing the result for the database.
                 - Safely sends a discord notification about the successful prediction.
-                - If the toss flag is not set, it will attempt to store the prediction in the database.
+                - If the toss flag is not set, it will compute the statistics (if called for) and queue the prediction
+                  to be written by __flush_outputs.
 
         :param model_name: str - The name of the model that was run.
         :param execution_time: datetime - The time the model was run.
@@ -154,20 +208,12 @@ class Orchestrator:
 
         try:
             if not toss:
-                series_storage = series_storage_factory()
-                inserted_results, model_run_result = series_storage.insert_output_and_model_run(result_series, execution_time, 0)
-
-                # SUCCESS: Log successful database insertion
-                log_success(f"Model {model_name} completed successfully ✓")
-                log_success(f"Results inserted: {inserted_results}")
-                log_success(inserted_results.dataFrame if inserted_results is not None else 'No dataframe')
-
-                # only compute statistics if the call is true and the results were successfully inserted
-                if statistics_call and model_run_result is not None:
-                    # model_run_result has the form (id, outputID, executionTime, returnCode)
-                    output_table_id = model_run_result[1]
-                    inserted_data = inserted_results.dataFrame.iloc[0]['dataValue']
-                    self.__handle_statistics_call(model_name, inserted_data, output_table_id)
+                # only compute statistics if the call is true, they are written alongside the output
+                statistics_dict = None
+                if statistics_call:
+                    statistics_dict = self.__compute_statistics(model_name, result_series.dataFrame.iloc[0]['dataValue'])
+
+                self.__outputBatch.add(result_series, execution_time, 0, statistics_dict)
         except:
             log_error(Semaphore_Exception('ERROR:: An error occurred while trying to interact with series storage from semaphoreRunner'))    
 
@@ -183,7 +229,7 @@ class Orchestrator:
         """Handles a failed predictions. This function handles semaphore in an unstable error state. It emits a notification and 
         ensures something is logged in the database.
             - Safely sends a discord notification about the failed prediction.
-            - If the toss flag is not set, it will attempt to store a Null prediction in the database.
+            - If the toss flag is not set, it will queue a Null prediction to be written by __flush_outputs.
 
         :param exception: Semaphore_Exception | Semaphore_Data_Exception | Semaphore_Ingestion_Exception - The exception that occurred.
         :param execution_time: datetime - The time the model was run.
@@ -209,17 +255,82 @@ class Orchestrator:
                 df_output.loc[0] = [None, dspec.outputInfo.unit, self.__calculate_referenceTime(execution_time, dspec), timedelta(seconds=dspec.outputInfo.leadTime)]
                 result_series.dataFrame = df_output
 
-                # Attempt to store both that in the outputs table and information about the model_run
-                series_storage = series_storage_factory()
-                inserted_results, _ = series_storage.insert_output_and_model_run(result_series, execution_time, exception.error_code)
+                # Queue both the null output and information about the model_run
+                self.__outputBatch.add(result_series, execution_time, exception.error_code)
+        except:
+            log_error(Semaphore_Exception('ERROR:: An error occurred while trying to interact with series storage from semaphoreRunner'))
+    
+
+    def __flush_outputs(self):
+        """Writes every queued model run result to the database in one transaction (one per run if that fails,
+        see OutputWriteBatch.flush), then logs the outcome of each to its own model's log.
+        """
+        try:
+            flushed = self.__outputBatch.flush()
+        except:
+            log_error(Semaphore_Exception('ERROR:: An error occurred while trying to interact with series storage from semaphoreRunner'))
+            log_error(f'Full stack trace:\n{traceback.format_exc()}')
+            return
+
+        for (result_series, _, return_code, statistics_dict), written in flushed:
+            model_name = result_series.description.modelName
+            LogLocationDirector().set_log_target_path(getenv('LOG_BASE_PATH'), model_name)
 
+            if written is None:
+                # the batch already logged why this run could not be written
+                log_error(f"Model {model_name} results could not be written to the database")
+                continue
+            inserted_results, model_run_result, statistics_result = written
+
+            if return_code != 0:
                 # ERROR: Log failed prediction details (always verbose)
                 log_error(f"Model {model_name} FAILED - Null result inserted")
                 log_error(f"Failed results: {inserted_results}")
                 log_error(inserted_results.dataFrame if inserted_results is not None else 'No dataframe')
+                continue
+
+            # SUCCESS: Log successful database insertion
+            log_success(f"Model {model_name} completed successfully ✓")
+            log_success(f"Results inserted: {inserted_results}")
+            log_success(inserted_results.dataFrame if inserted_results is not None else 'No dataframe')
+
+            # statistics are only written when the results were successfully inserted
+            if statistics_dict is not None and model_run_result is not None:
+                if statistics_result:
+                    log_success(f"Computed and stored statistics for model: {model_name} successfully ✓")
+                else:
+                    log_error('STATISTICS:: Failed to insert statistics into the database')
+
+
+    def __report_queries(self):
+        """Logs a summary of the storage calls recorded during the run to each model's log, and writes them to the
+        query_profiles table when DB_PROFILE_PERSIST is set. Does nothing unless DB_PROFILE is set.
+        Calls made outside a dspec (e.g. writing the outputs) are logged to the current log.
+        """
+        profiler = QueryProfiler()
+        if not profiler.enabled:
+            return
+
+        records = profiler.drain()
+        if not records:
+            return
+
+        try:
+            recordsByModel = {}
+            for record in records:
+                recordsByModel.setdefault(record.modelName, []).append(record)
+
+            for model_name, model_records in recordsByModel.items():
+                if model_name is not None:
+                    LogLocationDirector().set_log_target_path(getenv('LOG_BASE_PATH'), model_name)
+                log(profiler.summarize(model_records), force_log=True)
+
+            if getenv('DB_PROFILE_PERSIST', '0') == '1':
+                series_storage_factory().insert_query_profiles(records)
         except:
-            log_error(Semaphore_Exception('ERROR:: An error occurred while trying to interact with series storage from semaphoreRunner'))
-    
+            log_error(Semaphore_Exception('ERROR:: An error occurred while trying to report the storage calls of this run'))
+            log_error(f'Full stack trace:\n{traceback.format_exc()}')
+
 
     def __safe_discord_notification(self, model_name: str, execution_time: datetime, error_code: int, message: str):
         """Safely sends a discord notification if the user has enabled it in the environment variables. Ensures 
@@ -265,32 +376,26 @@ class Orchestrator:
         log('\n'.join(lines))
     
     
-    def __handle_statistics_call(self, model_name: str, data: np.ndarray, output_table_id: int) -> None:
+    def __compute_statistics(self, model_name: str, data: np.ndarray) -> dict | None:
         '''
         This function handles the logic for when a model run should also compute statistics. It will attempt
-        to compute the statistics based on the data stored in the output table, then store the statistics into
-        the statistics table. 
+        to compute the statistics of the predicted data, which are then queued with the output and written
+        into the statistics table by __flush_outputs.
 
         :param model_name: str - the name of the model that was run
-        :param data: np.ndarray - the data that was stored in the output table that the statistics should be computed on
+        :param data: np.ndarray - the predicted data that the statistics should be computed on
             The data is formatted in a 3D ndarray with the shape (member count, input vector count, outputs per vector).
-        :param output_table_id: int - the id to the output table entry this data is linked to
+        :returns dict | None - the statistics dictionary or None if they could not be computed
 
         NOTE: On statistics failures, we do not want to raise an exception as this would show that the entire model run
         failed. Instead, we simply log an error with a clear headline on statistics failures.
         '''
         statistics_class = Statistics()
-        series_storage = series_storage_factory()
         try:
-            statistics_dict = statistics_class.compute_statistics(data)
-            storage_result = series_storage.insert_output_statistics(output_table_id, statistics_dict)
-            
-            if storage_result:
-                log_success(f"Computed and stored statistics for model: {model_name} successfully ✓")
-            else:
-                log_error('STATISTICS:: Failed to insert statistics into the database')
+            return statistics_class.compute_statistics(data)
         except Exception as e:
             log_error(
-                f'STATISTICS:: An error occurred while trying to compute or store statistics for model: {model_name}'
+                f'STATISTICS:: An error occurred while trying to compute statistics for model: {model_name}'
                 f"\nError: {e}. Traceback: {traceback.format_exc()}"
             )
+            return None
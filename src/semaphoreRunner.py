@@ -17,6 +17,7 @@ from dotenv import load_dotenv
 from datetime import datetime, timezone
 from orchestrator import Orchestrator
 from utility import VerbosityController
+from SeriesStorage.ISeriesStorage import dispose_series_storage
 
 load_dotenv()
 
@@ -70,8 +71,11 @@ def main():
     else:
         execution_time = None
 
-    #running semaphore
-    Orchestrator().run_semaphore(args.dspec, execution_time, args.toss)
+    #running semaphore, releasing the shared db connection pool once every dspec has finished
+    try:
+        Orchestrator().run_semaphore(args.dspec, execution_time, args.toss)
+    finally:
+        dispose_series_storage()
 
 
 if __name__ == '__main__':
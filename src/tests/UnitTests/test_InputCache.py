@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+#test_InputCache.py
+#-------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""This file tests the InputCache shared by the dspecs of a run, through the SeriesProvider with a mocked storage
+
+run: docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_InputCache.py
+ """
+#----------------------------------
+#
+#
+import sys
+sys.path.append('/app/src')
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, MagicMock
+
+import pandas as pd
+import pytest
+
+from DataClasses import Series, SeriesDescription, TimeDescription
+from SeriesProvider.SeriesProvider import SeriesProvider, InputCache
+
+
+REFERENCE_TIME = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def build_selection(seriesDescription: SeriesDescription, timeDescription: TimeDescription, generatedTimes: list[datetime]) -> tuple:
+    """Builds what select_input_with_freshness returns for hourly rows over the time description's range."""
+    verifiedTimes = pd.date_range(timeDescription.fromDateTime, timeDescription.toDateTime, freq='h')
+    series = Series(seriesDescription, timeDescription)
+    series.dataFrame = pd.DataFrame({
+        'dataValue': [float(index) for index in range(len(verifiedTimes))],
+        'dataUnit': 'meter',
+        'timeVerified': verifiedTimes,
+        'timeGenerated': pd.DatetimeIndex(generatedTimes),
+        'longitude': '-97.0',
+        'latitude': '27.0'
+    })
+    return series, min(generatedTimes), verifiedTimes.max().tz_localize(None)
+
+
+def time_description(fromHour: int, toHour: int, stalenessOffset: timedelta = timedelta(hours=7)) -> TimeDescription:
+    return TimeDescription(
+        fromDateTime=datetime(2025, 1, 1, fromHour, 0, 0, tzinfo=timezone.utc),
+        toDateTime=datetime(2025, 1, 1, toHour, 0, 0, tzinfo=timezone.utc),
+        interval=timedelta(hours=1),
+        stalenessOffset=stalenessOffset
+    )
+
+
+@pytest.fixture
+def cache():
+    """An open input cache that is emptied afterwards"""
+    with InputCache().scope():
+        yield InputCache()
+
+
+@patch('SeriesProvider.SeriesProvider.series_storage_factory')
+def test_covered_requests_are_sliced_from_the_cache(mock_storage_factory, cache):
+    """
+    This test checks that a request covered by a series another dspec already selected is served from the cache,
+    sliced to its own range, and that a request outside every cached range still goes to the db.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_InputCache.py::test_covered_requests_are_sliced_from_the_cache -s
+    """
+    mock_storage = MagicMock()
+    mock_storage_factory.return_value = mock_storage
+    seriesDescription = SeriesDescription('NOAATANDC', 'dWl', 'packChan', 'MSL')
+    wide = time_description(0, 8)
+    mock_storage.select_input_with_freshness.return_value = build_selection(seriesDescription, wide, [REFERENCE_TIME - timedelta(hours=1)] * 9)
+
+    first = SeriesProvider().request_input(seriesDescription, wide, REFERENCE_TIME)
+    [second] = SeriesProvider().request_inputs([(seriesDescription, time_description(2, 4))], REFERENCE_TIME)
+
+    assert mock_storage.select_input_with_freshness.call_count == 1
+    assert mock_storage.select_inputs_with_freshness.call_count == 0
+    assert len(first.dataFrame) == 9
+    assert second.timeDescription.fromDateTime == datetime(2025, 1, 1, 2, 0, 0, tzinfo=timezone.utc)
+    assert second.dataFrame['dataValue'].tolist() == [2.0, 3.0, 4.0]
+    assert second.dataFrame.index.tolist() == [0, 1, 2]
+
+    # the served rows are a copy, a caller changing them does not change what the next dspec gets
+    second.dataFrame.loc[0, 'dataValue'] = -1.0
+    third = SeriesProvider().request_input(seriesDescription, time_description(2, 4), REFERENCE_TIME)
+    assert third.dataFrame['dataValue'].tolist() == [2.0, 3.0, 4.0]
+
+    mock_storage.select_input_with_freshness.return_value = build_selection(seriesDescription, time_description(6, 10), [REFERENCE_TIME] * 5)
+    SeriesProvider().request_input(seriesDescription, time_description(6, 10), REFERENCE_TIME)
+    assert mock_storage.select_input_with_freshness.call_count == 2
+
+
+@patch('SeriesProvider.SeriesProvider.series_storage_factory')
+def test_stale_slices_are_ingested_and_replaced(mock_storage_factory, cache):
+    """
+    This test checks that freshness is decided on the cached slice with the request's own staleness offset,
+    and that a series ingested again replaces the cached selection.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_InputCache.py::test_stale_slices_are_ingested_and_replaced -s
+    """
+    mock_storage = MagicMock()
+    mock_storage_factory.return_value = mock_storage
+    seriesDescription = SeriesDescription('TWC', 'pAirTemp', 'SouthBirdIsland')
+    wide = time_description(0, 8, stalenessOffset=timedelta(hours=12))
+    mock_storage.select_input_with_freshness.return_value = build_selection(seriesDescription, wide, [REFERENCE_TIME - timedelta(hours=10)] * 9)
+    SeriesProvider().request_input(seriesDescription, wide, REFERENCE_TIME)
+
+    strict = time_description(2, 4, stalenessOffset=timedelta(hours=7))
+    ingested = build_selection(seriesDescription, strict, [REFERENCE_TIME] * 3)[0]
+    with patch.object(SeriesProvider, '_SeriesProvider__data_ingestion_query') as mock_ingestion, \
+         patch.object(SeriesProvider, '_SeriesProvider__data_base_query', return_value=ingested) as mock_db_query:
+        result = SeriesProvider().request_input(seriesDescription, strict, REFERENCE_TIME)
+
+    assert mock_storage.select_input_with_freshness.call_count == 1
+    assert mock_ingestion.call_count == 1
+    assert mock_db_query.call_count == 1
+    assert result is ingested
+
+    # the ingested selection replaced the wide one, so the wide range is selected again
+    cached, oldestGeneratedTime, _ = cache.get(seriesDescription, strict, REFERENCE_TIME)
+    assert oldestGeneratedTime == REFERENCE_TIME
+    assert cached.dataFrame['dataValue'].tolist() == [0.0, 1.0, 2.0]
+    assert cache.get(seriesDescription, wide, REFERENCE_TIME) is None
+
+
+@patch('SeriesProvider.SeriesProvider.series_storage_factory')
+def test_nothing_is_cached_outside_a_scope(mock_storage_factory):
+    """
+    This test checks that requests made outside a scope always read the db, that the cache is emptied when the
+    outermost scope closes, and that entries are kept per reference time.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_InputCache.py::test_nothing_is_cached_outside_a_scope -s
+    """
+    mock_storage = MagicMock()
+    mock_storage_factory.return_value = mock_storage
+    seriesDescription = SeriesDescription('NDFD_EXP', 'pWnSpd', 'Aransas')
+    timeDescription = time_description(0, 4)
+    mock_storage.select_input_with_freshness.return_value = build_selection(seriesDescription, timeDescription, [REFERENCE_TIME] * 5)
+
+    SeriesProvider().request_input(seriesDescription, timeDescription, REFERENCE_TIME)
+    SeriesProvider().request_input(seriesDescription, timeDescription, REFERENCE_TIME)
+    assert mock_storage.select_input_with_freshness.call_count == 2
+
+    with InputCache().scope():
+        with InputCache().scope():
+            SeriesProvider().request_input(seriesDescription, timeDescription, REFERENCE_TIME)
+        SeriesProvider().request_input(seriesDescription, timeDescription, REFERENCE_TIME)
+        assert mock_storage.select_input_with_freshness.call_count == 3
+
+        SeriesProvider().request_input(seriesDescription, timeDescription, REFERENCE_TIME + timedelta(hours=1))
+        assert mock_storage.select_input_with_freshness.call_count == 4
+
+    assert not InputCache().active
+    assert InputCache()._entries == {}
+
+
+def test_coalesce_requests_merges_covering_ranges():
+    """
+    This test checks that requests for the same series are merged when their ranges overlap or touch, that
+    distant ranges, other intervals and other reference times stay separate, and that SEMAPHORE series are left out.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_InputCache.py::test_coalesce_requests_merges_covering_ranges -s
+    """
+    waterLevel = SeriesDescription('NOAATANDC', 'dWl', 'packChan', 'MSL')
+    requests = [
+        (waterLevel, time_description(2, 5, stalenessOffset=None), REFERENCE_TIME),
+        (SeriesDescription('NOAATANDC', 'dWl', 'packChan', 'MSL', verificationOverride={'label': 'equals'}), time_description(0, 3), REFERENCE_TIME),
+        (waterLevel, time_description(6, 8, stalenessOffset=timedelta(hours=2)), REFERENCE_TIME),
+        (waterLevel, time_description(10, 11), REFERENCE_TIME),
+        (waterLevel, time_description(0, 3), REFERENCE_TIME + timedelta(hours=1)),
+        (waterLevel, TimeDescription(time_description(0, 3).fromDateTime, time_description(0, 3).toDateTime, timedelta(minutes=6)), REFERENCE_TIME),
+        (SeriesDescription('SEMAPHORE', 'pWl', 'packChan'), time_description(0, 3), REFERENCE_TIME),
+    ]
+
+    plan = SeriesProvider.coalesce_requests(requests)
+
+    assert list(plan) == [REFERENCE_TIME, REFERENCE_TIME + timedelta(hours=1)]
+    ranges = [
+        (timeDescription.fromDateTime.hour, timeDescription.toDateTime.hour, timeDescription.interval, timeDescription.stalenessOffset)
+        for _, timeDescription in plan[REFERENCE_TIME]
+    ]
+    assert ranges == [
+        (0, 8, timedelta(hours=1), timedelta(hours=2)),
+        (10, 11, timedelta(hours=1), timedelta(hours=7)),
+        (0, 3, timedelta(minutes=6), None),
+    ]
+    assert all(seriesDescription.verificationOverride is None for seriesDescription, _ in plan[REFERENCE_TIME])
+    assert len(plan[REFERENCE_TIME + timedelta(hours=1)]) == 1
+    # the requests themselves are left as they were
+    assert requests[0][1].toDateTime.hour == 5
+
+
+@patch('SeriesProvider.SeriesProvider.series_storage_factory')
+def test_prefetch_inputs_caches_for_the_dspecs(mock_storage_factory, cache):
+    """
+    This test checks that prefetched series answer the dspecs' own requests from the cache, and that a failed
+    prefetch is retried one series at a time without raising.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_InputCache.py::test_prefetch_inputs_caches_for_the_dspecs -s
+    """
+    mock_storage = MagicMock()
+    mock_storage_factory.return_value = mock_storage
+    waterLevel = SeriesDescription('NOAATANDC', 'dWl', 'packChan', 'MSL')
+    airTemperature = SeriesDescription('TWC', 'pAirTemp', 'SouthBirdIsland')
+    mock_storage.select_inputs_with_freshness.side_effect = [
+        Exception('connection lost'),
+        {0: build_selection(waterLevel, time_description(0, 6), [REFERENCE_TIME] * 7)},
+        {0: build_selection(airTemperature, time_description(0, 2), [REFERENCE_TIME] * 3)},
+    ]
+
+    provider = SeriesProvider()
+    coalesced = provider.prefetch_inputs([
+        (waterLevel, time_description(0, 4), REFERENCE_TIME),
+        (waterLevel, time_description(3, 6), REFERENCE_TIME),
+        (airTemperature, time_description(0, 2), REFERENCE_TIME),
+    ])
+
+    assert coalesced == 2
+    assert mock_storage.select_inputs_with_freshness.call_count == 3
+
+    first, second = provider.request_inputs([(waterLevel, time_description(0, 4)), (airTemperature, time_description(1, 2))], REFERENCE_TIME)
+    assert mock_storage.select_inputs_with_freshness.call_count == 3
+    assert first.dataFrame['dataValue'].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert second.dataFrame['dataValue'].tolist() == [1.0, 2.0]
+
+
+@patch('SeriesProvider.SeriesProvider.series_storage_factory')
+def test_prefetch_inputs_outside_a_scope(mock_storage_factory):
+    """
+    This test checks that nothing is prefetched outside a scope, where it could not be kept for the dspecs.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_InputCache.py::test_prefetch_inputs_outside_a_scope -s
+    """
+    mock_storage = MagicMock()
+    mock_storage_factory.return_value = mock_storage
+
+    assert SeriesProvider().prefetch_inputs([(SeriesDescription('TWC', 'pAirTemp', 'SouthBirdIsland'), time_description(0, 2), REFERENCE_TIME)]) == 0
+    assert mock_storage.select_inputs_with_freshness.call_count == 0
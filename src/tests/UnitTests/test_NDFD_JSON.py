@@ -667,11 +667,11 @@ class TestNDFDJSON:
         
         # Verify 
         expected_results = [
-            {'dataValue': '25.5', 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T11:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '25.5', 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T12:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '25.5', 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T13:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '26.0', 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T14:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '26.0', 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T15:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"}
+            {'dataValue': 25.5, 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T11:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 25.5, 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T12:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 25.5, 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T13:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 26.0, 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T14:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 26.0, 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T15:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"}
         ]
         assert result is not None
         assert result.description == mock_series_description
@@ -725,13 +725,13 @@ class TestNDFDJSON:
         
         # Verify 
         expected_results = [
-            {'dataValue': speed1, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T11:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.06777778", 'latitude': "27.83444444"},
-            {'dataValue': speed1, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T12:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.06777778", 'latitude': "27.83444444"},
-            {'dataValue': speed1, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T13:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.06777778", 'latitude': "27.83444444"},
-            {'dataValue': speed1, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T14:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.06777778", 'latitude': "27.83444444"},
-            {'dataValue': speed2, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T15:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.06777778", 'latitude': "27.83444444"},
-            {'dataValue': speed3, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T16:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.06777778", 'latitude': "27.83444444"},
-            {'dataValue': speed3, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T17:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.06777778", 'latitude': "27.83444444"}
+            {'dataValue': float(speed1), 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T11:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.06777778", 'latitude': "27.83444444"},
+            {'dataValue': float(speed1), 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T12:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.06777778", 'latitude': "27.83444444"},
+            {'dataValue': float(speed1), 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T13:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.06777778", 'latitude': "27.83444444"},
+            {'dataValue': float(speed1), 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T14:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.06777778", 'latitude': "27.83444444"},
+            {'dataValue': float(speed2), 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T15:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.06777778", 'latitude': "27.83444444"},
+            {'dataValue': float(speed3), 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T16:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.06777778", 'latitude': "27.83444444"},
+            {'dataValue': float(speed3), 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T17:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.06777778", 'latitude': "27.83444444"}
         ]
 
         assert result is not None
@@ -782,12 +782,12 @@ class TestNDFDJSON:
         
         # Verify 
         expected_results = [
-            {'dataValue': '180', 'dataUnit': 'degrees', 'timeVerified': datetime.fromisoformat("2025-08-27T11:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '180', 'dataUnit': 'degrees', 'timeVerified': datetime.fromisoformat("2025-08-27T12:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '225', 'dataUnit': 'degrees', 'timeVerified': datetime.fromisoformat("2025-08-27T13:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '225', 'dataUnit': 'degrees', 'timeVerified': datetime.fromisoformat("2025-08-27T14:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '270', 'dataUnit': 'degrees', 'timeVerified': datetime.fromisoformat("2025-08-27T15:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '270', 'dataUnit': 'degrees', 'timeVerified': datetime.fromisoformat("2025-08-27T16:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"}
+            {'dataValue': 180.0, 'dataUnit': 'degrees', 'timeVerified': datetime.fromisoformat("2025-08-27T11:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 180.0, 'dataUnit': 'degrees', 'timeVerified': datetime.fromisoformat("2025-08-27T12:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 225.0, 'dataUnit': 'degrees', 'timeVerified': datetime.fromisoformat("2025-08-27T13:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 225.0, 'dataUnit': 'degrees', 'timeVerified': datetime.fromisoformat("2025-08-27T14:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 270.0, 'dataUnit': 'degrees', 'timeVerified': datetime.fromisoformat("2025-08-27T15:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 270.0, 'dataUnit': 'degrees', 'timeVerified': datetime.fromisoformat("2025-08-27T16:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"}
         ]
 
         assert result is not None
@@ -838,12 +838,12 @@ class TestNDFDJSON:
         
         # Verify 
         expected_results = [
-            {'dataValue': '-2.5', 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T11:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '-2.5', 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T12:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '-2.5', 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T13:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '1.8', 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T14:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '1.8', 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T15:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '-3.1', 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T16:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"}
+            {'dataValue': -2.5, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T11:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': -2.5, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T12:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': -2.5, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T13:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 1.8, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T14:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 1.8, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T15:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': -3.1, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T16:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"}
         ]
 
         assert result is not None
@@ -894,12 +894,12 @@ class TestNDFDJSON:
         
         # Verify 
         expected_results = [
-            {'dataValue': '4.2', 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T11:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '4.2', 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T12:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '4.2', 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T13:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '-1.5', 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T14:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '-1.5', 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T15:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '2.8', 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T16:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"}
+            {'dataValue': 4.2, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T11:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 4.2, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T12:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 4.2, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T13:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': -1.5, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T14:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': -1.5, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T15:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 2.8, 'dataUnit': 'mps', 'timeVerified': datetime.fromisoformat("2025-08-27T16:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"}
         ]
 
         assert result is not None
@@ -951,9 +951,9 @@ class TestNDFDJSON:
         
         # Verify 
         expected_results = [
-            {'dataValue': '25.5', 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T13:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '26.0', 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T14:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
-            {'dataValue': '26.0', 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T15:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"}
+            {'dataValue': 25.5, 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T13:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 26.0, 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T14:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"},
+            {'dataValue': 26.0, 'dataUnit': 'celsius', 'timeVerified': datetime.fromisoformat("2025-08-27T15:00:00+00:00"), 'timeGenerated': time_generated, 'longitude': "-97.3183", 'latitude': "27.485"}
         ]
         assert result is not None
         assert result.description == mock_series_description
@@ -201,6 +201,8 @@ class TestNOAATANDCUnit:
             assert isinstance(result, Series)
             assert not result.dataFrame.empty
             assert all(result.dataFrame['dataUnit'] == 'meter')
+            assert result.dataFrame['dataValue'].dtype == float
+            assert result.dataFrame['dataValue'].tolist() == self.sample_data['v'].tolist()
             mock_fetch.assert_called_once_with(series_desc, time_desc, 'water_level')
     
     def test_fetch_pWl(self):
@@ -239,6 +241,7 @@ class TestNOAATANDCUnit:
             assert isinstance(result, Series)
             assert result.description.dataDatum == 'NA'
             assert all(result.dataFrame['dataUnit'] == 'meter')
+            assert result.dataFrame['dataValue'].dtype == float
             assert mock_fetch.call_count == 2
     
     def test_fetch_WnDir(self):
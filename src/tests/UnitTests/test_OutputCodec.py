@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+#test_OutputCodec.py
+#-------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""This file tests the OutputCodec used to store output dataValues
+
+run: docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_OutputCodec.py
+ """
+#----------------------------------
+#
+#
+import sys
+sys.path.append('/app/src')
+
+from io import BytesIO
+
+import numpy as np
+import pytest
+
+from SeriesStorage.OutputCodec import OutputCodec, LazyOutputValue, lz4_frame
+from unittest.mock import patch
+
+
+def prediction_array(shape: tuple, order: str = 'C') -> np.ndarray:
+    """A smooth float32 array shaped like a model prediction (members, inputs, outputs)"""
+    rng = np.random.default_rng(0)
+    array = (np.cumsum(rng.normal(0, 0.01, size=shape), axis=-1) + 0.5).astype(np.float32)
+    return np.asfortranarray(array) if order == 'F' else array
+
+
+@pytest.mark.parametrize("compression", [
+    'none',
+    'zlib',
+    'zstd',
+    pytest.param('lz4', marks=pytest.mark.skipif(lz4_frame is None, reason='lz4 is not installed')),
+])
+@pytest.mark.parametrize("shape, order", [((1, 1, 1), 'C'), ((1, 100, 1), 'C'), ((10, 100, 100), 'C'), ((3, 5, 2), 'F')])
+def test_full_precision_round_trip(compression, shape, order):
+    """
+    This test checks that full precision blobs decode back to the exact original array, for every compression.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_OutputCodec.py::test_full_precision_round_trip -s
+    """
+    codec = OutputCodec(compression, 'full')
+    array = prediction_array(shape, order)
+
+    blob = codec.encode(array)
+    decoded = codec.decode(blob)
+
+    assert blob[0] == OutputCodec.FORMAT_VERSION
+    assert decoded.dtype == array.dtype
+    np.testing.assert_array_equal(decoded, array)
+
+
+@pytest.mark.parametrize("precision, tolerance", [('float16', 1e-3), ('quantized16', 1e-4)])
+def test_reduced_precision_round_trip(precision, tolerance):
+    """
+    This test checks that reduced precision blobs restore the original dtype within the precision's error,
+    that NaN survives, and that non floating arrays are stored at full precision.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_OutputCodec.py::test_reduced_precision_round_trip -s
+    """
+    codec = OutputCodec('zlib', precision)
+    array = prediction_array((10, 100, 100))
+    array[0, 0, 0] = np.nan
+
+    decoded = codec.decode(codec.encode(array))
+
+    assert decoded.dtype == np.float32
+    assert np.isnan(decoded[0, 0, 0])
+    np.testing.assert_allclose(decoded, array, atol=tolerance, equal_nan=True)
+
+    integers = np.arange(12, dtype=np.int64).reshape(1, 3, 4)
+    np.testing.assert_array_equal(codec.decode(codec.encode(integers)), integers)
+
+
+def test_decode_many_mixed_blobs():
+    """
+    This test checks that decode_many decodes codec blobs, legacy .npy rows and None side by side.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_OutputCodec.py::test_decode_many_mixed_blobs -s
+    """
+    codec = OutputCodec('zlib', 'full')
+    array = prediction_array((1, 100, 1))
+
+    buffer = BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    legacy = buffer.getvalue()
+
+    decoded = codec.decode_many([codec.encode(array), legacy, None])
+
+    np.testing.assert_array_equal(decoded[0], array)
+    np.testing.assert_array_equal(decoded[1], array)
+    assert decoded[2] is None
+
+
+def test_default_codec_is_zstd(monkeypatch):
+    """
+    This test checks that without any configuration blobs are written with zstd, the default, rather than falling
+    back to zlib. zstandard is in requirements.txt so this must never be skipped.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_OutputCodec.py::test_default_codec_is_zstd -s
+    """
+    monkeypatch.delenv('OUTPUT_COMPRESSION', raising=False)
+    monkeypatch.delenv('OUTPUT_PRECISION', raising=False)
+    codec = OutputCodec()
+    array = prediction_array((10, 100, 100))
+
+    blob = codec.encode(array)
+
+    assert codec.compression == 'zstd'
+    assert blob[1] == OutputCodec.COMPRESSION_IDS['zstd']
+    np.testing.assert_array_equal(OutputCodec('zlib', 'full').decode(blob), array)
+
+
+def test_invalid_configuration_and_blobs():
+    """
+    This test checks that unknown settings and unknown blob versions raise ValueError.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_OutputCodec.py::test_invalid_configuration_and_blobs -s
+    """
+    with pytest.raises(ValueError):
+        OutputCodec('brotli', 'full')
+    with pytest.raises(ValueError):
+        OutputCodec('zlib', 'int8')
+
+    blob = bytearray(OutputCodec('zlib', 'full').encode(prediction_array((1, 1, 1))))
+    blob[0] = 99
+    with pytest.raises(ValueError):
+        OutputCodec('zlib', 'full').decode(bytes(blob))
+
+
+def test_lazy_output_value_decodes_once():
+    """
+    This test checks that a LazyOutputValue only decodes its blob on first use, caches the array,
+    and can be used wherever numpy expects an array.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_OutputCodec.py::test_lazy_output_value_decodes_once -s
+    """
+    codec = OutputCodec('zlib', 'full')
+    array = prediction_array((10, 5, 2))
+
+    with patch.object(codec, 'decode', wraps=codec.decode) as mock_decode:
+        lazy = LazyOutputValue(codec.encode(array), codec)
+        assert not lazy.is_decoded
+        mock_decode.assert_not_called()
+
+        assert lazy.shape == (10, 5, 2)
+        np.testing.assert_array_equal(np.asarray(lazy), array)
+        np.testing.assert_array_equal(lazy[0], array[0])
+        assert len(lazy) == 10
+        assert lazy.tolist() == array.tolist()
+        assert np.asarray(lazy, dtype=np.float64).dtype == np.float64
+
+    assert lazy.is_decoded
+    mock_decode.assert_called_once()
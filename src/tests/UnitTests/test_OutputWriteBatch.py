@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+#test_OutputWriteBatch.py
+#-------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""This file tests the OutputWriteBatch against the SQLite series storage on a private in memory database
+
+run: docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_OutputWriteBatch.py
+ """
+#----------------------------------
+#
+#
+import sys
+sys.path.append('/app/src')
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from DataClasses import Series, SemaphoreSeriesDescription
+from SeriesStorage.OutputWriteBatch import OutputWriteBatch
+from SeriesStorage.SS_Classes.SQLite import SQLite
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    """A SQLite storage on a fresh in memory database"""
+    monkeypatch.setenv('DB_LOCATION_STRING', 'sqlite://')
+    monkeypatch.setenv('OUTPUT_COMPRESSION', 'zlib')
+    SQLite.dispose()
+    yield SQLite()
+    SQLite.dispose()
+
+
+def output_series(modelName: str, rows: int = 1) -> Series:
+    series = Series(SemaphoreSeriesDescription(modelName, '1.0.0', 'pWl', 'packChan', 'MHHW'))
+    series.dataFrame = pd.DataFrame({
+        'dataValue': [np.ones((1, 1, 1), dtype=np.float32)] * rows,
+        'dataUnit': ['meter'] * rows,
+        'timeGenerated': [pd.Timestamp(datetime(2025, 1, 1), tz='UTC')] * rows,
+        'leadTime': [timedelta(hours=12)] * rows
+    })
+    return series
+
+
+def test_flush_writes_runs_together(storage):
+    """
+    This test checks that flush writes every queued run, pairs the results with their runs in order, and empties the batch.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_OutputWriteBatch.py::test_flush_writes_runs_together -s
+    """
+    batch = OutputWriteBatch(storage)
+    execution_time = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    batch.add(output_series('ModelA'), execution_time, 0)
+    batch.add(output_series('ModelB'), execution_time, 1)
+
+    flushed = batch.flush()
+
+    assert len(batch) == 0
+    assert [run[0].description.modelName for run, _ in flushed] == ['ModelA', 'ModelB']
+    assert [written[1][3] for _, written in flushed] == [0, 1]
+    assert batch.flush() == []
+
+
+def test_flush_keeps_other_runs_when_one_fails(storage):
+    """
+    This test checks that a run that can not be written (here a two row output series) does not discard
+    the results of the other runs in the batch, it is paired with None and the others are written.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_OutputWriteBatch.py::test_flush_keeps_other_runs_when_one_fails -s
+    """
+    batch = OutputWriteBatch(storage)
+    execution_time = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    batch.add(output_series('ModelA'), execution_time, 0)
+    batch.add(output_series('ModelBad', rows=2), execution_time, 0)
+    batch.add(output_series('ModelC'), execution_time, 0)
+
+    flushed = batch.flush()
+
+    assert [written is None for _, written in flushed] == [False, True, False]
+    assert len(batch) == 0
+
+    written = storage.select_latest_output(['ModelA', 'ModelBad', 'ModelC']) or []
+    assert sorted(series.description.modelName for series in written) == ['ModelA', 'ModelC']
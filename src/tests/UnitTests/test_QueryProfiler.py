@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#test_QueryProfiler.py
+#-------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""This file tests the QueryProfiler, its statement counting runs against an in memory SQLite engine
+
+run: docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_QueryProfiler.py
+ """
+#----------------------------------
+#
+#
+import sys
+sys.path.append('/app/src')
+
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+from DataClasses import Series, SeriesDescription
+from SeriesStorage.QueryProfiler import QueryProfiler, profiled
+
+
+class FakeStorage:
+
+    def __init__(self, engine=None) -> None:
+        self.engine = engine
+
+    @profiled
+    def select_rows(self, count: int) -> list:
+        with self.engine.connect() as conn:
+            return conn.execute(text('SELECT * FROM t LIMIT :count'), {'count': count}).fetchall()
+
+    @profiled
+    def insert_and_select(self) -> list:
+        with self.engine.begin() as conn:
+            conn.execute(text("INSERT INTO t (v) VALUES ('abc')"))
+        return self.select_rows(1)
+
+    @profiled
+    def stream(self, chunks: int):
+        for _ in range(chunks):
+            series = Series(SeriesDescription('source', 'series', 'location'))
+            series.dataFrame = pd.DataFrame({'dataValue': [1.0, 2.0]})
+            yield series
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    """An enabled profiler with no records"""
+    monkeypatch.setenv('DB_PROFILE', '1')
+    monkeypatch.setenv('DB_SLOW_QUERY_MS', 'none')
+    profiler = QueryProfiler()
+    profiler.drain()
+    yield profiler
+    profiler.drain()
+
+
+@pytest.fixture
+def engine(profiler):
+    engine = create_engine('sqlite://')
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE t (v VARCHAR)'))
+        conn.execute(text("INSERT INTO t (v) VALUES ('a'), ('b')"))
+    profiler.instrument(engine)
+    yield engine
+    engine.dispose()
+
+
+def test_profiled_calls_are_tagged_and_nested(profiler, engine):
+    """
+    This test checks that a profiled call is tagged with its scope, that the statements it runs are counted
+    against the innermost call, and that nested calls record their depth.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_QueryProfiler.py::test_profiled_calls_are_tagged_and_nested -s
+    """
+    referenceTime = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    with profiler.scope('Model', referenceTime):
+        FakeStorage(engine).insert_and_select()
+    FakeStorage(engine).select_rows(2)
+
+    records = profiler.drain()
+    assert [(record.method, record.modelName, record.depth) for record in records] == [
+        ('select_rows', 'Model', 1),
+        ('insert_and_select', 'Model', 0),
+        ('select_rows', None, 0)
+    ]
+    assert records[1].referenceTime == referenceTime
+    # the insert belongs to insert_and_select, the selection to the nested select_rows
+    assert [record.statements for record in records] == [1, 1, 1]
+    assert records[1].rows == 1
+    assert records[1].bytes == 0
+    assert records[1].elapsed >= records[0].elapsed
+    assert profiler.records() == []
+
+    summary = QueryProfiler.summarize(records)
+    assert summary.startswith('[QueryProfiler] 3 storage call(s)')
+    assert 'select_rows' in summary and 'insert_and_select' in summary
+
+
+def test_profiled_streams_and_disabled_profiler(profiler, monkeypatch):
+    """
+    This test checks that a stream is recorded once with the rows it yielded, even when the caller stops early,
+    and that nothing is recorded while DB_PROFILE is not set.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_QueryProfiler.py::test_profiled_streams_and_disabled_profiler -s
+    """
+    chunks = FakeStorage().stream(3)
+    next(chunks)
+    next(chunks)
+    chunks.close()
+
+    records = profiler.drain()
+    assert len(records) == 1
+    assert (records[0].method, records[0].rows) == ('stream', 4)
+
+    monkeypatch.setenv('DB_PROFILE', '0')
+    assert len(list(FakeStorage().stream(3))) == 3
+    assert profiler.records() == []
+
+
+def test_slow_statements_capture_a_plan(profiler, engine, monkeypatch):
+    """
+    This test checks that a statement over DB_SLOW_QUERY_MS gets a plan, and that a failed EXPLAIN (SQLite has no
+    EXPLAIN (ANALYZE, BUFFERS)) is kept as the plan without failing the call or undoing its write.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_QueryProfiler.py::test_slow_statements_capture_a_plan -s
+    """
+    monkeypatch.setenv('DB_SLOW_QUERY_MS', '0')
+    assert len(FakeStorage(engine).insert_and_select()) == 1
+
+    records = profiler.drain()
+    plans = [plan for record in records for plan in record.plans]
+    assert len(plans) == 2
+    assert all(plan.startswith('EXPLAIN failed') for _, _, plan in plans)
+    assert 'Slow statement in insert_and_select' in QueryProfiler.summarize(records)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM t WHERE v = 'abc'")).scalar() == 1
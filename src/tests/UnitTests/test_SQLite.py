@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+#test_SQLite.py
+#-------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""This file tests the SQLite series storage against a private in memory database
+
+run: docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_SQLite.py
+ """
+#----------------------------------
+#
+#
+import sys
+sys.path.append('/app/src')
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from DataClasses import Series, SeriesDescription, SemaphoreSeriesDescription, TimeDescription
+from SeriesStorage.OutputCodec import LazyOutputValue
+from SeriesStorage.SS_Classes.SQLite import SQLite
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    """A SQLite storage on a fresh in memory database"""
+    monkeypatch.setenv('DB_LOCATION_STRING', 'sqlite://')
+    monkeypatch.setenv('OUTPUT_COMPRESSION', 'zlib')
+    SQLite.dispose()
+    yield SQLite()
+    SQLite.dispose()
+
+
+def utc(hour: int, day: int = 1) -> pd.Timestamp:
+    return pd.Timestamp(datetime(2025, 1, day, hour), tz='UTC')
+
+
+def input_series(description: SeriesDescription, dataValues: list, verifiedHours: list[int], generatedHour: int) -> Series:
+    series = Series(description)
+    series.dataFrame = pd.DataFrame({
+        'dataValue': dataValues,
+        'dataUnit': ['meter'] * len(dataValues),
+        'timeVerified': [utc(hour) for hour in verifiedHours],
+        'timeGenerated': [utc(generatedHour)] * len(dataValues),
+        'longitude': ['-97.2'] * len(dataValues),
+        'latitude': ['27.6'] * len(dataValues)
+    })
+    return series
+
+
+def output_series(hour: int, dataValue: np.ndarray | None) -> Series:
+    series = Series(SemaphoreSeriesDescription('Model', '1.0.0', 'pWl', 'packChan', 'MHHW'))
+    series.dataFrame = pd.DataFrame({
+        'dataValue': [dataValue],
+        'dataUnit': ['meter'],
+        'timeGenerated': [utc(hour)],
+        'leadTime': [timedelta(hours=12)]
+    })
+    return series
+
+
+def test_select_input_latest_per_verified_time(storage):
+    """
+    This test checks that select_input returns the latest generated value per verified time as floats,
+    that ensembles are spliced into member lists, and that re-inserting a row does not duplicate it.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_SQLite.py::test_select_input_latest_per_verified_time -s
+    """
+    description = SeriesDescription('NOAATANDC', 'dWl', 'packChan', 'MHHW')
+    timeDescription = TimeDescription(utc(0).to_pydatetime(), utc(3).to_pydatetime(), timedelta(hours=1))
+
+    storage.insert_input(input_series(description, ['1.0', '2.0', '3.0'], [1, 2, 3], 0))
+    assert storage.insert_input(input_series(description, ['1.5', '2.5'], [1, 2], 1), returning=False) == 2
+    assert storage.insert_input(input_series(description, ['1.5', '2.5'], [1, 2], 1), returning=False) == 2
+
+    df = storage.select_input(description, timeDescription).dataFrame
+    assert df['dataValue'].tolist() == [1.5, 2.5, 3.0]
+    assert df['dataValue'].dtype == np.float64
+    assert df['timeGenerated'].tolist() == [utc(1), utc(1), utc(0)]
+
+    assert storage.fetch_oldest_generated_time(description, timeDescription) == utc(0)
+    maxVerifiedRow = storage.fetch_row_with_max_verified_time_in_range(description, timeDescription)
+    assert maxVerifiedRow[3] == datetime(2025, 1, 1, 3) and maxVerifiedRow[4] == 3.0
+
+    ensembleDescription = SeriesDescription('TWC', 'pAirTemp', 'packChan')
+    storage.insert_input(input_series(ensembleDescription, [['1', '2'], ['3', '4']], [1, 2], 0))
+    df_ensemble = storage.select_input(ensembleDescription, timeDescription).dataFrame
+    assert df_ensemble['dataValue'].tolist() == [[1.0, 2.0], [3.0, 4.0]]
+
+    assert storage.select_input(SeriesDescription('NOAATANDC', 'dWl', 'packChan'), timeDescription).dataFrame.empty
+
+
+def test_repeated_input_without_generated_time_is_not_duplicated(storage):
+    """
+    This test checks that inserting the same input row with a null generated time twice keeps one row,
+    as inputs_AK00 treats nulls as equal the way the Postgres constraint does (NULLS NOT DISTINCT).
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_SQLite.py::test_repeated_input_without_generated_time_is_not_duplicated -s
+    """
+    series = input_series(SeriesDescription('NOAATANDC', 'dWl', 'packChan', 'MHHW'), [1.0], [0], 0)
+    series.dataFrame['timeGenerated'] = [None]
+
+    storage.insert_input(series, returning=False)
+    storage.insert_input(series, returning=False)
+
+    with storage._SQLite__connect() as conn:
+        assert conn.execute('SELECT COUNT(*) FROM "inputs"').fetchone()[0] == 1
+
+
+def test_outputs_model_runs_and_statistics(storage):
+    """
+    This test checks the output round trip through the OutputCodec, that a repeated output is not written again
+    (nor its model run), and the latest output and statistics lookups.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_SQLite.py::test_outputs_model_runs_and_statistics -s
+    """
+    array = np.arange(6, dtype=np.float32).reshape(1, 3, 2)
+    statistics_dict = {column: float(idx) for idx, column in enumerate(SQLite.STATISTICS_COLUMNS)}
+    execution_time = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    inserted, model_run = storage.insert_output_and_model_run(output_series(0, array), execution_time, 0)
+    assert model_run[2:] == (datetime(2025, 1, 1), 0)
+    assert storage.insert_output_statistics(model_run[1], statistics_dict) is not None
+
+    _, repeated_run = storage.insert_output_and_model_run(output_series(0, array), execution_time, 0)
+    assert repeated_run is None
+
+    results = storage.insert_outputs_and_model_runs([(output_series(1, None), execution_time, 1, None), (output_series(2, array * 2), execution_time, 0, statistics_dict)])
+    assert results[0][1][3] == 1 and results[0][2] is None
+    assert results[1][2] is not None
+
+    latest = storage.select_latest_output(['Model', 'Missing'])
+    assert len(latest) == 1
+    assert isinstance(latest[0].dataFrame['dataValue'].iloc[0], LazyOutputValue)
+    np.testing.assert_array_equal(latest[0].dataFrame['dataValue'].iloc[0].value, array * 2)
+    assert latest[0].description.dataDatum == 'MHHW'
+
+    span = storage.select_output('Model', utc(12).to_pydatetime(), utc(13).to_pydatetime(), decode='eager')
+    assert span.dataFrame['timeGenerated'].tolist() == [utc(0), utc(1)]
+    assert span.dataFrame['leadTime'].iloc[0] == pd.Timedelta(hours=12)
+    np.testing.assert_array_equal(span.dataFrame['dataValue'].iloc[0], array)
+    assert span.dataFrame['dataValue'].iloc[1] is None
+
+    specific = storage.select_specific_output(
+        SemaphoreSeriesDescription('Model', '1.0.0', 'pWl', 'packChan', 'MHHW'),
+        TimeDescription(utc(14).to_pydatetime(), utc(14).to_pydatetime())
+    )
+    assert len(specific.dataFrame) == 1
+
+    latest_statistics = storage.select_latest_output_statistics(['Model'])
+    assert latest_statistics == [{'modelName': 'Model', 'timeGenerated': utc(2).to_pydatetime(), **statistics_dict}]
+    assert len(storage.select_output_statistics_range(['Model'], utc(0).to_pydatetime(), utc(5).to_pydatetime())) == 2
+
+
+def test_reference_data(storage):
+    """
+    This test checks the location code and coordinate lookups, and that misses raise as the Postgres storage does.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_SQLite.py::test_reference_data -s
+    """
+    storage.insert_lat_lon_test('packChan', 'Packery Channel', '', '27.6', '-97.2')
+    storage.insert_external_location_code('packChan', 'NOAATANDC', '8775792', 0)
+
+    assert storage.find_lat_lon_coordinates('packChan') == ('27.6', '-97.2')
+    assert storage.find_external_location_code('NOAATANDC', 'packChan') == '8775792'
+
+    with pytest.raises(IndexError):
+        storage.find_external_location_code('NOAATANDC', 'packChan', 1)
+    with pytest.raises(TypeError):
+        storage.find_lat_lon_coordinates('nowhere')
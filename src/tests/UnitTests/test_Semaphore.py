@@ -187,4 +187,40 @@ def test_model_group_runs(model_group):
         
 
         # Assert that "handle successful predictions" function was called for each DSPEC, indicating that the model ran successfully and produced a prediction.
-        assert mock_success.call_count == len(dspecs)
\ No newline at end of file
+        assert mock_success.call_count == len(dspecs)
+
+def test_dspecs_are_parsed_once(tmp_path, monkeypatch):
+    """
+    This test checks that each DSPEC of a run is parsed once, for both the prefetch and the run, and that a DSPEC
+    that can not be parsed only fails its own prediction.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_Semaphore.py::test_dspecs_are_parsed_once -s
+    """
+    monkeypatch.setenv('ISERIESSTORAGE_INSTANCE', 'SQLite')
+    monkeypatch.setenv('DB_LOCATION_STRING', 'sqlite://')
+    monkeypatch.setenv('LOG_BASE_PATH', str(tmp_path))
+    dspecs = []
+    for name in ('good', 'bad'):
+        dspec_path = tmp_path / f'{name}.json'
+        dspec_path.write_text('{}')
+        dspecs.append(str(dspec_path))
+
+    good_dspec = MagicMock()
+    good_dspec.modelName = 'Good'
+    execution_time = datetime(2026, 6, 28, 18, 0, tzinfo=timezone.utc)
+
+    orchestrator = Orchestrator()
+    orchestrator.DSPEC_parser.parse_dspec = MagicMock(side_effect=[good_dspec, ValueError('bad dspec')])
+    orchestrator.dataGatherer = MagicMock()
+    orchestrator.inputVectorBuilder = MagicMock()
+    orchestrator.modelRunner = MagicMock()
+    with patch.object(orchestrator, '_Orchestrator__calculate_referenceTime', return_value=execution_time), \
+         patch.object(orchestrator, '_log_input_vectors'), \
+         patch.object(orchestrator, '_Orchestrator__handle_successful_prediction') as mock_success, \
+         patch.object(orchestrator, '_Orchestrator__handle_failed_prediction') as mock_failure:
+        orchestrator.run_semaphore(dspecs, executionTime=execution_time, toss=True)
+
+    assert orchestrator.DSPEC_parser.parse_dspec.call_count == 2
+    assert orchestrator.dataGatherer.prefetch_data.call_args.args[0] == [(good_dspec, execution_time)]
+    assert mock_success.call_count == 1
+    assert mock_failure.call_count == 1
@@ -17,11 +17,18 @@ import sys
 sys.path.append('/app/src')
 
 import pytest
+import pandas as pd
+import threading
+import time
 from unittest.mock import patch, MagicMock
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from SeriesProvider.SeriesProvider import SeriesProvider
-from DataClasses import SeriesDescription, TimeDescription
+from DataClasses import Series, SeriesDescription, TimeDescription
+from exceptions import Semaphore_Ingestion_Exception
+
+
+REFERENCE_TIME = datetime(2025, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
 
 
 @pytest.mark.parametrize(
@@ -72,22 +79,23 @@ from DataClasses import SeriesDescription, TimeDescription
     ]
 )
 @patch('SeriesProvider.SeriesProvider.series_storage_factory')
-def test_check_verified_time_for_ingestion(
+def test_request_input_ingests_missing_verified_times(
     mock_storage_factory,
     verified_time,
     to_datetime,
     expected_result
 ):
     """
-    This test checks different scenarios for when we want to call ingestion. 
-    The boolean returned decides if ingestion should occur:
+    This test checks different scenarios for when request_input calls ingestion.
     True - call ingestion
     False - don't call ingestion
 
-    We want to call ingestion if the max verified time in the row is strictly < the toDateTime
+    We want to call ingestion if the max verified time in the range is strictly < the toDateTime
 
     NOTE::
-    All datetime objects are timezone naive.
+    Freshness checks are disabled (no staleness offset), so only the max verified time decides.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_VerifiedTimeIngestion.py::test_request_input_ingests_missing_verified_times -s
     """
     # mock the storage factory
     mock_storage = MagicMock()
@@ -106,50 +114,30 @@ def test_check_verified_time_for_ingestion(
     )
 
     time_description = TimeDescription(
-        fromDateTime=datetime(2025, 1, 1, 0, 0, 0),
-        toDateTime=to_datetime,
+        fromDateTime=datetime(2025, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
+        toDateTime=to_datetime.replace(tzinfo=timezone.utc) if to_datetime else datetime(2025, 1, 1, 4, 0, 0, tzinfo=timezone.utc),
         interval=timedelta(hours=1),
-        stalenessOffset=timedelta(hours=7)
+        stalenessOffset=None
     )
 
-    # build the row tuple or set row to None for the empty db case
-    if verified_time is None:
-        row = None
-    else:
-        row = (
-            1,                                                          # id
-            datetime(2025, 1, 1, 1, 0, 0),                              # generatedTime
-            datetime(2025, 1, 1, 1, 0, 0),                              # acquiredTime
-            verified_time,                                              # verifiedTime
-            1.0,                                                        # dataValue
-            True,                                                       # isActual
-            "unit",                                                     # dataUnit  
-            "test_source",                                              # dataSource
-            "test_location",                                            # dataLocation
-            "test_series",                                              # dataSeries
-            None,                                                       # dataDatum
-            "0.0",                                                      # latitude
-            "0.0",                                                      # longitude
-            None                                                        # ensembleMemberID
-        )
-
-    # force series storage to return the test row
-    mock_storage.fetch_row_with_max_verified_time_in_range.return_value = row
-
-    should_ingest = series_provider._SeriesProvider__check_verified_time_for_ingestion(
-        seriesDescription=series_description,
-        timeDescription=time_description,
-    )
+    # the max verified time comes back from the single storage call, tz naive as it is stored
+    oldest_generated_time = None if verified_time is None else datetime(2025, 1, 1, 1, 0, 0, tzinfo=timezone.utc)
+    mock_storage.select_input_with_freshness.return_value = (MagicMock(), oldest_generated_time, verified_time)
 
-    assert should_ingest == expected_result
+    with patch.object(SeriesProvider, '_SeriesProvider__data_ingestion_query') as mock_ingestion:
+        series_provider.request_input(series_description, time_description, REFERENCE_TIME)
+
+    assert mock_ingestion.called == expected_result
 
 @patch('SeriesProvider.SeriesProvider.series_storage_factory')
-def test_check_verified_time_for_ingestion_default_threshold(
+def test_request_input_ingests_missing_verified_times_without_interval(
     mock_storage_factory,
 ):
     """
     This test checks that when no interval is provided in the time description,
-    the default threshold of 1 hour is used.
+    request_input still ingests when the max verified time is before the toDateTime.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_VerifiedTimeIngestion.py::test_request_input_ingests_missing_verified_times_without_interval -s
     """
     mock_storage = MagicMock()
     mock_storage_factory.return_value = mock_storage
@@ -167,40 +155,431 @@ def test_check_verified_time_for_ingestion_default_threshold(
     )
 
     time_description = TimeDescription(
-        fromDateTime=datetime(2025, 1, 1, 0, 0, 0),
-        toDateTime=datetime(2025, 1, 1, 4, 0, 0),
+        fromDateTime=datetime(2025, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
+        toDateTime=datetime(2025, 1, 1, 4, 0, 0, tzinfo=timezone.utc),
         interval=None,                                              # No interval provided
         stalenessOffset=timedelta(hours=7)
     )
 
-    acquired_time = datetime(2025, 1, 1, 5, 0, 0)
     verified_time = datetime(2025, 1, 1, 3, 0, 0)
+    mock_storage.select_input_with_freshness.return_value = (MagicMock(), REFERENCE_TIME - timedelta(hours=1), verified_time)
+
+    with patch.object(SeriesProvider, '_SeriesProvider__data_ingestion_query') as mock_ingestion:
+        series_provider.request_input(series_description, time_description, REFERENCE_TIME)
+
+    # verified time < toDateTime (3 AM < 4 AM)
+    # -> ingestion should occur, over the whole window as there is no interval grid
+    assert mock_ingestion.call_count == 1
+    assert mock_ingestion.call_args.args[1] is time_description
+
+@pytest.mark.parametrize(
+    "oldest_generated_time, max_verified_time, expected_ingestion",
+    [
+        # fresh data covering the whole range -> the rows from the single query are reused
+        (datetime(2025, 1, 1, 3, 0, 0, tzinfo=timezone.utc), datetime(2025, 1, 1, 4, 0, 0), False),
+
+        # stale data -> ingestion occurs and the db is queried again
+        (datetime(2024, 12, 31, 0, 0, 0, tzinfo=timezone.utc), datetime(2025, 1, 1, 4, 0, 0), True),
+
+        # fresh data missing the latest verified times -> ingestion occurs
+        (datetime(2025, 1, 1, 3, 0, 0, tzinfo=timezone.utc), datetime(2025, 1, 1, 2, 0, 0), True),
+
+        # no data at all -> ingestion occurs
+        (None, None, True),
+    ],
+    ids=["fresh", "stale", "missing_verified_times", "no_data"]
+)
+@patch('SeriesProvider.SeriesProvider.series_storage_factory')
+def test_request_input_single_round_trip(
+    mock_storage_factory,
+    oldest_generated_time,
+    max_verified_time,
+    expected_ingestion
+):
+    """
+    This test checks that request_input decides on ingestion from select_input_with_freshness
+    and only goes back to the db when ingestion was needed.
+    """
+    mock_storage = MagicMock()
+    mock_storage_factory.return_value = mock_storage
+    fresh_series = MagicMock()
+    mock_storage.select_input_with_freshness.return_value = (fresh_series, oldest_generated_time, max_verified_time)
+
+    series_provider = SeriesProvider()
+
+    series_description = SeriesDescription(
+        dataSource="test_source",
+        dataSeries="test_series",
+        dataLocation="test_location",
+        dataDatum=None
+    )
+
+    time_description = TimeDescription(
+        fromDateTime=datetime(2025, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
+        toDateTime=datetime(2025, 1, 1, 4, 0, 0, tzinfo=timezone.utc),
+        interval=timedelta(hours=1),
+        stalenessOffset=timedelta(hours=7)
+    )
+
+    with patch.object(SeriesProvider, '_SeriesProvider__data_ingestion_query') as mock_ingestion:
+        result = series_provider.request_input(series_description, time_description, datetime(2025, 1, 1, 5, 0, 0, tzinfo=timezone.utc))
+
+    assert mock_storage.select_input_with_freshness.call_count == 1
+    assert mock_storage.fetch_ingestion_ledger.call_count == 0
+    assert mock_storage.fetch_oldest_generated_time.call_count == 0
+    assert mock_storage.fetch_row_with_max_verified_time_in_range.call_count == 0
+    assert mock_ingestion.called is expected_ingestion
+    if expected_ingestion:
+        assert result is mock_storage.select_input.return_value
+    else:
+        assert result is fresh_series
+        assert mock_storage.select_input.call_count == 0
+
+
+@patch('SeriesProvider.SeriesProvider.series_storage_factory')
+def test_request_inputs_batches_fresh_series(mock_storage_factory):
+    """
+    This test checks that request_inputs selects every series with one select_inputs_with_freshness call,
+    reuses the rows of fresh series, and only ingests and re-queries the series that need it.
+    """
+    mock_storage = MagicMock()
+    mock_storage_factory.return_value = mock_storage
+    fresh_series = MagicMock()
+    stale_series = MagicMock()
+    mock_storage.select_inputs_with_freshness.return_value = {
+        0: (fresh_series, datetime(2025, 1, 1, 3, 0, 0, tzinfo=timezone.utc), datetime(2025, 1, 1, 4, 0, 0)),
+        1: (stale_series, datetime(2024, 12, 31, 0, 0, 0, tzinfo=timezone.utc), datetime(2025, 1, 1, 4, 0, 0)),
+    }
 
-    row = ( 
-        1,
-        datetime(2025, 1, 1, 1, 0, 0),
-        acquired_time,
-        verified_time,
-        1.0,
-        True,
-        "unit",
-        "test_source",
-        "test_location",
-        "test_series",
-        None,
-        "0.0",
-        "0.0",
-        None
+    series_provider = SeriesProvider()
+
+    time_description = TimeDescription(
+        fromDateTime=datetime(2025, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
+        toDateTime=datetime(2025, 1, 1, 4, 0, 0, tzinfo=timezone.utc),
+        interval=timedelta(hours=1),
+        stalenessOffset=timedelta(hours=7)
     )
+    requests = [
+        (SeriesDescription(dataSource="fresh_source", dataSeries="test_series", dataLocation="test_location"), time_description),
+        (SeriesDescription(dataSource="stale_source", dataSeries="test_series", dataLocation="test_location"), time_description),
+        (SeriesDescription(dataSource="SEMAPHORE", dataSeries="test_series", dataLocation="test_location"), time_description),
+    ]
 
-    # force series storage to return the test row
-    mock_storage.fetch_row_with_max_verified_time_in_range.return_value = row
+    with patch.object(SeriesProvider, '_SeriesProvider__data_ingestion_query') as mock_ingestion:
+        result = series_provider.request_inputs(requests, datetime(2025, 1, 1, 5, 0, 0, tzinfo=timezone.utc))
 
-    should_ingest = series_provider._SeriesProvider__check_verified_time_for_ingestion(
-        seriesDescription=series_description,
-        timeDescription=time_description,
+    assert mock_storage.select_inputs_with_freshness.call_count == 1
+    assert mock_storage.select_inputs_with_freshness.call_args.args[0] == requests[:2]
+    assert [call.args[0] for call in mock_ingestion.call_args_list] == [requests[2][0], requests[1][0]]
+    assert result == [fresh_series, mock_storage.select_input.return_value, mock_ingestion.return_value]
+
+
+@patch('SeriesProvider.SeriesProvider.series_storage_factory')
+def test_request_inputs_ingests_concurrently(mock_storage_factory, monkeypatch):
+    """
+    This test checks that with INGESTION_WORKERS set the stale series of a batch are ingested concurrently, never
+    more than INGESTION_WORKERS_PER_SOURCE at once from the same source, and that the results keep the request order.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_VerifiedTimeIngestion.py::test_request_inputs_ingests_concurrently -s
+    """
+    monkeypatch.setenv('INGESTION_WORKERS', '4')
+    monkeypatch.setenv('INGESTION_WORKERS_PER_SOURCE', '1')
+    mock_storage = MagicMock()
+    mock_storage_factory.return_value = mock_storage
+
+    time_description = TimeDescription(
+        fromDateTime=datetime(2025, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
+        toDateTime=datetime(2025, 1, 1, 4, 0, 0, tzinfo=timezone.utc),
+        interval=timedelta(hours=1),
+        stalenessOffset=timedelta(hours=7)
     )
+    sources = ['NOAATANDC', 'NOAATANDC', 'TWC', 'LIGHTHOUSE']
+    requests = [
+        (SeriesDescription(dataSource=source, dataSeries=f'series{index}', dataLocation='test_location'), time_description)
+        for index, source in enumerate(sources)
+    ]
+    # nothing in the db, so every series needs ingestion
+    mock_storage.select_inputs_with_freshness.return_value = {index: (MagicMock(), None, None) for index in range(len(requests))}
+    mock_storage.select_input.side_effect = lambda seriesDescription, timeDescription: seriesDescription.dataSeries
 
-    # verified time < toDateTime (3 AM < 4 AM)
-    # -> ingestion should occur (return True)
-    assert should_ingest is True
\ No newline at end of file
+    lock = threading.Lock()
+    running: dict[str, int] = {}
+    peaks = {'total': 0, 'NOAATANDC': 0}
+
+    def ingest(seriesDescription, timeDescription):
+        with lock:
+            running[seriesDescription.dataSource] = running.get(seriesDescription.dataSource, 0) + 1
+            peaks['total'] = max(peaks['total'], sum(running.values()))
+            peaks['NOAATANDC'] = max(peaks['NOAATANDC'], running.get('NOAATANDC', 0))
+        time.sleep(0.05)
+        with lock:
+            running[seriesDescription.dataSource] -= 1
+
+    with patch.object(SeriesProvider, '_SeriesProvider__data_ingestion_query', side_effect=ingest) as mock_ingestion:
+        result = SeriesProvider().request_inputs(requests, datetime(2025, 1, 1, 5, 0, 0, tzinfo=timezone.utc))
+
+    assert mock_ingestion.call_count == 4
+    assert result == ['series0', 'series1', 'series2', 'series3']
+    assert peaks['total'] > 1
+    assert peaks['NOAATANDC'] == 1
+
+    def fail_twc(seriesDescription, timeDescription):
+        if seriesDescription.dataSource == 'TWC':
+            raise Semaphore_Ingestion_Exception('Error:: A problem occurred attempting to ingest data!')
+
+    with patch.object(SeriesProvider, '_SeriesProvider__data_ingestion_query', side_effect=fail_twc):
+        with pytest.raises(Semaphore_Ingestion_Exception):
+            SeriesProvider().request_inputs(requests, datetime(2025, 1, 1, 5, 0, 0, tzinfo=timezone.utc))
+
+
+def build_db_series(source: str, rows: dict[int, datetime]) -> Series:
+    """Builds the series select_input_with_freshness returns, with one row per {hour verified: time generated}."""
+    series = Series(SeriesDescription(dataSource=source, dataSeries='dWl', dataLocation='packChan', dataDatum='MSL'))
+    series.dataFrame = pd.DataFrame({
+        'dataValue': [1.0] * len(rows),
+        'timeVerified': pd.DatetimeIndex([datetime(2025, 1, 1, hour, 0, 0, tzinfo=timezone.utc) for hour in rows]),
+        'timeGenerated': pd.DatetimeIndex(list(rows.values())),
+    })
+    return series
+
+
+@pytest.mark.parametrize(
+    "source, rows, toHour, stalenessOffset, expected_ranges",
+    [
+        # the end of the window was never ingested
+        ('NOAATANDC', {0: REFERENCE_TIME, 1: REFERENCE_TIME, 2: REFERENCE_TIME}, 5, None, [(3, 5)]),
+
+        # a stale row and the missing end are fetched on their own
+        ('LIGHTHOUSE', {0: REFERENCE_TIME, 1: REFERENCE_TIME - timedelta(hours=9), 2: REFERENCE_TIME, 3: REFERENCE_TIME}, 5, timedelta(hours=7), [(1, 1), (4, 5)]),
+
+        # more runs than MAX_INGESTION_SUB_RANGES are fetched as one range covering them
+        ('NOAATANDC', {0: REFERENCE_TIME, 2: REFERENCE_TIME, 4: REFERENCE_TIME, 6: REFERENCE_TIME, 8: REFERENCE_TIME}, 9, None, [(1, 9)]),
+
+        # a source without sub range support gets the whole window
+        ('TWC', {0: REFERENCE_TIME, 1: REFERENCE_TIME, 2: REFERENCE_TIME}, 5, None, [(0, 5)]),
+    ]
+)
+@patch('SeriesProvider.SeriesProvider.series_storage_factory')
+def test_request_input_ingests_missing_sub_ranges(mock_storage_factory, source, rows, toHour, stalenessOffset, expected_ranges):
+    """
+    This test checks that only the missing or stale verified times of a request are ingested, as one range per
+    contiguous run, when the source's ingestion class supports sub ranges.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_VerifiedTimeIngestion.py::test_request_input_ingests_missing_sub_ranges -s
+    """
+    mock_storage = MagicMock()
+    mock_storage_factory.return_value = mock_storage
+    db_series = build_db_series(source, rows)
+    mock_storage.select_input_with_freshness.return_value = (db_series, min(rows.values()), datetime(2025, 1, 1, max(rows), 0, 0))
+
+    time_description = TimeDescription(
+        fromDateTime=datetime(2025, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
+        toDateTime=datetime(2025, 1, 1, toHour, 0, 0, tzinfo=timezone.utc),
+        interval=timedelta(hours=1),
+        stalenessOffset=stalenessOffset
+    )
+
+    with patch.object(SeriesProvider, '_SeriesProvider__data_ingestion_query') as mock_ingestion:
+        result = SeriesProvider().request_input(db_series.description, time_description, REFERENCE_TIME)
+
+    ingested = [call.args[1] for call in mock_ingestion.call_args_list]
+    assert [(time.fromDateTime.hour, time.toDateTime.hour) for time in ingested] == expected_ranges
+    assert all(time.interval == timedelta(hours=1) and time.stalenessOffset == stalenessOffset for time in ingested)
+    # the whole window is still selected afterwards
+    assert mock_storage.select_input.call_args.args[1] is time_description
+    assert result is mock_storage.select_input.return_value
+
+
+def ledger_entry(fromHour: int, toHour: int, oldestGeneratedTime: datetime) -> dict:
+    """Builds an ingestion ledger entry, as fetch_ingestion_ledger returns it, verified from fromHour to toHour."""
+    return {
+        'fromVerifiedTime': datetime(2025, 1, 1, fromHour, 0, 0, tzinfo=timezone.utc),
+        'toVerifiedTime': datetime(2025, 1, 1, toHour, 0, 0, tzinfo=timezone.utc),
+        'oldestGeneratedTime': oldestGeneratedTime,
+        'latestGeneratedTime': oldestGeneratedTime,
+        'acquiredTime': oldestGeneratedTime,
+    }
+
+
+@pytest.mark.parametrize(
+    "entries, expected_ranges",
+    [
+        # no ledger entries, freshness is decided from the selected rows
+        (None, []),
+
+        # a fresh entry covers the whole window, nothing is ingested
+        ([ledger_entry(0, 5, REFERENCE_TIME - timedelta(hours=1))], []),
+
+        # the end of the window was never ingested
+        ([ledger_entry(0, 3, REFERENCE_TIME - timedelta(hours=1))], [(4, 5)]),
+
+        # the part of the window only a stale entry covers is ingested again
+        ([ledger_entry(0, 2, REFERENCE_TIME - timedelta(hours=1)), ledger_entry(3, 5, REFERENCE_TIME - timedelta(hours=9))], [(3, 5)]),
+
+        # a hole between fresh entries is ingested on its own
+        ([ledger_entry(0, 1, REFERENCE_TIME - timedelta(hours=1)), ledger_entry(4, 5, REFERENCE_TIME - timedelta(hours=1))], [(2, 3)]),
+    ]
+)
+@patch('SeriesProvider.SeriesProvider.series_storage_factory')
+def test_request_inputs_decides_from_ledger_ranges(mock_storage_factory, entries, expected_ranges):
+    """
+    This test checks that a series of a batch with ingestion ledger entries is decided by them without selecting its rows
+    with their freshness checks, and that only the verified times no fresh entry covers are ingested.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_VerifiedTimeIngestion.py::test_request_inputs_decides_from_ledger_ranges -s
+    """
+    mock_storage = MagicMock()
+    mock_storage_factory.return_value = mock_storage
+    mock_storage.fetch_ingestion_ledger.return_value = None if entries is None else {0: entries, 1: []}
+    db_series = build_db_series('NOAATANDC', {hour: REFERENCE_TIME for hour in range(6)})
+    mock_storage.select_inputs_with_freshness.side_effect = lambda requests: {
+        requestIndex: (db_series, REFERENCE_TIME, datetime(2025, 1, 1, 5, 0, 0)) for requestIndex in range(len(requests))
+    }
+    mock_storage.select_inputs.side_effect = lambda requests: {requestIndex: db_series for requestIndex in range(len(requests))}
+
+    time_description = TimeDescription(
+        fromDateTime=datetime(2025, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
+        toDateTime=datetime(2025, 1, 1, 5, 0, 0, tzinfo=timezone.utc),
+        interval=timedelta(hours=1),
+        stalenessOffset=timedelta(hours=7)
+    )
+    # the second series has no ledger entries, its rows decide
+    requests = [(db_series.description, time_description), (SeriesDescription('NOAATANDC', 'other', 'test_location'), time_description)]
+
+    with patch.object(SeriesProvider, '_SeriesProvider__data_ingestion_query') as mock_ingestion:
+        result = SeriesProvider().request_inputs(requests, REFERENCE_TIME)
+
+    ingested = [call.args[1] for call in mock_ingestion.call_args_list]
+    assert [(time.fromDateTime.hour, time.toDateTime.hour) for time in ingested] == expected_ranges
+    scanned = mock_storage.select_inputs_with_freshness.call_args.args[0]
+    assert scanned == (requests if entries is None else [requests[1]])
+    if entries is None or expected_ranges:
+        assert not mock_storage.select_inputs.called
+    if expected_ranges:
+        assert mock_storage.select_input.call_args.args[1] is time_description
+        assert result[0] is mock_storage.select_input.return_value
+    else:
+        assert result[0] is db_series
+
+
+@pytest.mark.parametrize(
+    "entries, expected_ingestion",
+    [
+        # one fresh entry covers the whole window
+        ([(0, 5)], False),
+
+        # fresh entries that chain from the start of the window to its end
+        ([(0, 3), (2, 5)], False),
+
+        # fresh entries at both ends with a gap in the middle
+        ([(0, 1), (4, 5)], True),
+
+        # no fresh entry reaches the start of the window
+        ([(1, 5)], True),
+    ]
+)
+@patch('SeriesProvider.SeriesProvider.series_storage_factory')
+def test_request_inputs_ledger_without_interval(mock_storage_factory, entries, expected_ingestion):
+    """
+    This test checks that without an interval the ledger only answers a request from the db when its fresh entries
+    chain without a gap over the whole window, otherwise the whole window is ingested.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_VerifiedTimeIngestion.py::test_request_inputs_ledger_without_interval -s
+    """
+    mock_storage = MagicMock()
+    mock_storage_factory.return_value = mock_storage
+
+    time_description = TimeDescription(
+        fromDateTime=datetime(2025, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
+        toDateTime=datetime(2025, 1, 1, 5, 0, 0, tzinfo=timezone.utc),
+        interval=None,
+        stalenessOffset=timedelta(hours=7)
+    )
+    requests = [
+        (SeriesDescription(dataSource='NOAATANDC', dataSeries=f'series{index}', dataLocation='test_location'), time_description)
+        for index in range(2)
+    ]
+    mock_storage.fetch_ingestion_ledger.return_value = {
+        0: [ledger_entry(fromHour, toHour, REFERENCE_TIME - timedelta(hours=1)) for fromHour, toHour in entries],
+        1: [ledger_entry(0, 5, REFERENCE_TIME - timedelta(hours=1))],
+    }
+    mock_storage.select_inputs.side_effect = lambda requests: {requestIndex: 'selected' for requestIndex in range(len(requests))}
+
+    with patch.object(SeriesProvider, '_SeriesProvider__data_ingestion_query') as mock_ingestion:
+        SeriesProvider().request_inputs(requests, REFERENCE_TIME)
+
+    ingested = [call.args for call in mock_ingestion.call_args_list]
+    assert [(seriesDescription.dataSeries, time.fromDateTime.hour, time.toDateTime.hour) for seriesDescription, time in ingested] == \
+        ([('series0', 0, 5)] if expected_ingestion else [])
+
+
+@patch('SeriesProvider.SeriesProvider.series_storage_factory')
+def test_request_inputs_decides_from_ledger(mock_storage_factory):
+    """
+    This test checks that a batch is split by the ingestion ledger: series it shows are fresh are selected together
+    without freshness checks, series it shows are stale are ingested, and series without entries are checked as before.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_VerifiedTimeIngestion.py::test_request_inputs_decides_from_ledger -s
+    """
+    mock_storage = MagicMock()
+    mock_storage_factory.return_value = mock_storage
+
+    time_description = TimeDescription(
+        fromDateTime=datetime(2025, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
+        toDateTime=datetime(2025, 1, 1, 5, 0, 0, tzinfo=timezone.utc),
+        interval=timedelta(hours=1),
+        stalenessOffset=timedelta(hours=7)
+    )
+    requests = [
+        (SeriesDescription(dataSource='NOAATANDC', dataSeries=f'series{index}', dataLocation='test_location'), time_description)
+        for index in range(3)
+    ]
+    mock_storage.fetch_ingestion_ledger.return_value = {
+        0: [ledger_entry(0, 5, REFERENCE_TIME - timedelta(hours=1))],
+        1: [ledger_entry(0, 5, REFERENCE_TIME - timedelta(hours=9))],
+        2: [],
+    }
+    mock_storage.select_inputs.return_value = {0: 'series0'}
+    mock_storage.select_inputs_with_freshness.return_value = {0: ('series2', REFERENCE_TIME, datetime(2025, 1, 1, 5, 0, 0))}
+    mock_storage.select_input.side_effect = lambda seriesDescription, timeDescription: seriesDescription.dataSeries
+
+    with patch.object(SeriesProvider, '_SeriesProvider__data_ingestion_query') as mock_ingestion:
+        result = SeriesProvider().request_inputs(requests, REFERENCE_TIME)
+
+    assert result == ['series0', 'series1', 'series2']
+    assert mock_storage.select_inputs.call_args.args[0] == [requests[0]]
+    assert mock_storage.select_inputs_with_freshness.call_args.args[0] == [requests[2]]
+    ingested = [call.args for call in mock_ingestion.call_args_list]
+    assert [(seriesDescription.dataSeries, time.fromDateTime.hour, time.toDateTime.hour) for seriesDescription, time in ingested] == [('series1', 0, 5)]
+
+
+@pytest.mark.parametrize("inserted_count, recorded", [(6, True), (0, False)])
+@patch('SeriesProvider.SeriesProvider.data_ingestion_factory')
+@patch('SeriesProvider.SeriesProvider.series_storage_factory')
+def test_ingestion_is_recorded_in_ledger(mock_storage_factory, mock_ingestion_factory, inserted_count, recorded):
+    """
+    This test checks that an ingestion is recorded in the ingestion ledger with the range it was requested for,
+    only once its rows were inserted.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_VerifiedTimeIngestion.py::test_ingestion_is_recorded_in_ledger -s
+    """
+    mock_storage = MagicMock()
+    mock_storage_factory.return_value = mock_storage
+    mock_storage.fetch_ingestion_ledger.return_value = None
+    mock_storage.select_input_with_freshness.return_value = (MagicMock(), None, None)
+    mock_storage.insert_input.return_value = inserted_count
+    ingested_series = build_db_series('TWC', {hour: REFERENCE_TIME for hour in range(6)})
+    mock_ingestion_factory.return_value.ingest_series.return_value = ingested_series
+
+    time_description = TimeDescription(
+        fromDateTime=datetime(2025, 1, 1, 0, 0, 0, tzinfo=timezone.utc),
+        toDateTime=datetime(2025, 1, 1, 5, 0, 0, tzinfo=timezone.utc),
+        interval=timedelta(hours=1),
+        stalenessOffset=timedelta(hours=7)
+    )
+    SeriesProvider().request_input(ingested_series.description, time_description, REFERENCE_TIME)
+
+    if recorded:
+        mock_storage.insert_ingestion_ledger.assert_called_once_with(ingested_series, time_description)
+    else:
+        mock_storage.insert_ingestion_ledger.assert_not_called()
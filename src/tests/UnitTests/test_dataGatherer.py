@@ -132,7 +132,7 @@ def test_get_data_repository(data_gatherer, mock_dspec):
     ))
 
     # Force the series provider to return the mock series
-    data_gatherer._DataGatherer__seriesProvider.request_input.return_value = mock_series
+    data_gatherer._DataGatherer__seriesProvider.request_inputs.return_value = [mock_series]
 
     # Request the data in the mock dspec
     result = data_gatherer.get_data_repository(mock_dspec, reference_time)
@@ -257,7 +257,7 @@ def test_data_integrity_call(data_gatherer, mock_dspec, mock_integrity_factory):
     ))
 
     # Force the series provider to return the mock series
-    data_gatherer._DataGatherer__seriesProvider.request_input.return_value = mock_series
+    data_gatherer._DataGatherer__seriesProvider.request_inputs.return_value = [mock_series]
 
     # Force the integrity factory to return the same mock series
     mock_integrity_class = MagicMock()
@@ -373,10 +373,36 @@ def test_buffer_slots_trimmed_before_validation(data_gatherer, mock_dspec):
     mock_dspec.orderedVector = mock_vector_order
 
     # Return our 5-row series (including null buffer slots) from the series provider
-    data_gatherer._DataGatherer__seriesProvider.request_input.return_value = mock_series
+    data_gatherer._DataGatherer__seriesProvider.request_inputs.return_value = [mock_series]
 
     # Should succeed: validation only runs against rows 0-2 (the 3 real data points).
     # If the fix is broken and validation runs against all 5 rows, the nulls at
     # index 3 and 4 will cause DateRangeValidation to fail and raise an exception.
     result = data_gatherer.get_data_repository(mock_dspec, reference_time)
-    assert 'key1' in result
\ No newline at end of file
+    assert 'key1' in result
+
+def test_prefetch_data(data_gatherer, mock_dspec):
+    """ This test checks that the dependent series of every dspec are handed to the series provider in one plan,
+    each with its own dspec's reference time.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_dataGatherer.py::test_prefetch_data -s
+    """
+    reference_time = datetime(2000, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+    other_dspec = copy.deepcopy(mock_dspec)
+    other_dspec.dependentSeries[0].range = [3, 1]
+    series_provider = data_gatherer._DataGatherer__seriesProvider
+
+    data_gatherer.prefetch_data([(mock_dspec, reference_time), (other_dspec, reference_time + timedelta(hours=1))])
+
+    assert series_provider.prefetch_inputs.call_count == 1
+    requests = series_provider.prefetch_inputs.call_args.args[0]
+    assert [(description.dataSource, description.dataLocation) for description, _, _ in requests] == [('source1', 'location1')] * 2
+    assert [(time.fromDateTime, time.toDateTime) for _, time, _ in requests] == [
+        (reference_time + timedelta(hours=1), reference_time),
+        (reference_time + timedelta(hours=2), reference_time + timedelta(hours=4)),
+    ]
+    assert [request_reference_time for _, _, request_reference_time in requests] == [reference_time, reference_time + timedelta(hours=1)]
+
+    # a run without dependent series makes no plan
+    data_gatherer.prefetch_data([])
+    assert series_provider.prefetch_inputs.call_count == 1
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#test_export_series.py
+#-------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""This file tests the export_series tool against the SQLite series storage on a private in memory database
+
+run: docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_export_series.py
+ """
+#----------------------------------
+#
+#
+import sys
+from os import path
+sys.path.append('/app/src')
+sys.path.append(path.join(path.dirname(path.abspath(__file__)), '..', '..', '..', 'tools'))
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from DataClasses import Series, SemaphoreSeriesDescription
+from SeriesStorage.SS_Classes.SQLite import SQLite
+import export_series
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    """A SQLite storage on a fresh in memory database, the one series_storage_factory returns"""
+    monkeypatch.setenv('ISERIESSTORAGE_INSTANCE', 'SQLite')
+    monkeypatch.setenv('DB_LOCATION_STRING', 'sqlite://')
+    monkeypatch.setenv('OUTPUT_COMPRESSION', 'zlib')
+    SQLite.dispose()
+    yield SQLite()
+    SQLite.dispose()
+
+
+def output_series(hour: int, dataValue: np.ndarray) -> Series:
+    series = Series(SemaphoreSeriesDescription('Model', '1.0.0', 'pWl', 'packChan', 'MHHW'))
+    series.dataFrame = pd.DataFrame({
+        'dataValue': [dataValue],
+        'dataUnit': ['meter'],
+        'timeGenerated': [pd.Timestamp(datetime(2025, 1, 1, hour), tz='UTC')],
+        'leadTime': [timedelta(hours=1)]
+    })
+    return series
+
+
+def test_export_outputs_writes_the_predicted_values(storage, monkeypatch, tmp_path):
+    """
+    This test checks that exported outputs hold their predictions as JSON arrays of numbers, across several chunks.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_export_series.py::test_export_outputs_writes_the_predicted_values -s
+    """
+    arrays = [np.array([[[0.5], [1.25]]], dtype=np.float32) + hour for hour in range(3)]
+    execution_time = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    storage.insert_outputs_and_model_runs([(output_series(hour, array), execution_time, 0, None) for hour, array in enumerate(arrays)])
+
+    out = tmp_path / 'outputs.csv'
+    monkeypatch.setattr(sys, 'argv', [
+        'export_series.py', 'outputs', '--model_name', 'Model', '--from_time', '2025010100', '--to_time', '2025010200',
+        '--chunk_size', '2', '--out', str(out)
+    ])
+    export_series.main()
+
+    df = pd.read_csv(out)
+    assert [json.loads(value) for value in df['dataValue']] == [array.tolist() for array in arrays]
@@ -14,8 +14,11 @@ import numpy as np
 import pandas as pd
 import pytest
 from datetime import datetime, timezone
-from DataClasses import Series, SemaphoreSeriesDescription
-from src.API.apiDriver import serialize_output_series, serialize_statistics
+from DataClasses import Series, SeriesDescription, SemaphoreSeriesDescription
+from src.API.apiDriver import serialize_input_series, serialize_output_series, serialize_statistics, stream_outputs_time_span
+from unittest.mock import MagicMock
+from SeriesStorage.OutputCodec import OutputCodec, LazyOutputValue
+import json
 
 @pytest.mark.parametrize(
     "data_array",
@@ -437,4 +440,83 @@ def test_serialize_statistics(ranged,statistics_results,requested_model_names, e
         ranged=ranged,
     )
 
-    assert result == expected_result
\ No newline at end of file
+    assert result == expected_result
+
+def test_stream_outputs_time_span():
+    """
+    Verify that the streamed time span yields one JSON line per chunk of each model's outputs,
+    requesting the chunks through the TIME_SPAN_STREAM method.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_unit_api.py::test_stream_outputs_time_span -s
+    """
+    def chunk(hour: int) -> Series:
+        series = Series(description=SemaphoreSeriesDescription("model", "1.0", "series", "location", "datum"))
+        series.dataFrame = pd.DataFrame([{
+            "dataValue": np.array([[[float(hour)]]]),
+            "dataUnit": "celsius",
+            "timeGenerated": datetime(2026, 1, 1, hour),
+            "leadTime": 3600
+        }])
+        return series
+
+    provider = MagicMock()
+    provider.request_output.side_effect = lambda method, **kwargs: iter([chunk(0), chunk(1)] if kwargs['model_name'] == 'model' else [])
+
+    fromDateTime = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    toDateTime = datetime(2026, 1, 2, tzinfo=timezone.utc)
+    lines = list(stream_outputs_time_span(provider, ['model', 'empty'], fromDateTime, toDateTime, 1))
+
+    provider.request_output.assert_any_call('TIME_SPAN_STREAM', model_name='model', from_time=fromDateTime, to_time=toDateTime, chunk_size=1)
+    assert len(lines) == 2 and all(line.endswith('\n') for line in lines)
+
+    decoded = [json.loads(line) for line in lines]
+    assert [line['modelName'] for line in decoded] == ['model', 'model']
+    assert [line['series']['_Series__data'][0]['dataValue'] for line in decoded] == [[[[0.0]]], [[[1.0]]]]
+    assert decoded[1]['series']['_Series__data'][0]['timeGenerated'] == "2026-01-01T01:00:00"
+
+
+def test_serialize_output_lazy_values():
+    """
+    Verify that outputs selected lazily are decoded when they are serialized.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_unit_api.py::test_serialize_output_lazy_values -s
+    """
+    codec = OutputCodec('zlib', 'full')
+    data_array = np.array([[[1.0], [2.0]]])
+
+    series = Series(description=SemaphoreSeriesDescription("model", "1.0", "series", "location", "datum"))
+    series.dataFrame = pd.DataFrame([{
+        "dataValue": LazyOutputValue(codec.encode(data_array), codec),
+        "dataUnit": "celsius",
+        "timeGenerated": datetime(2026, 1, 1, 0, 0, 0),
+        "leadTime": 367200
+    }])
+
+    result = serialize_output_series(series)
+
+    assert result['_Series__data'][0]['dataValue'] == data_array.tolist()
+
+
+def test_serialize_input_values_keep_their_string_format():
+    """
+    Verify that float input values are served in the same strings as before version 3.11, where get_input
+    converted them with astype(str), and that a null value stays null.
+
+    docker exec semaphore-core python3 -m pytest src/tests/UnitTests/test_unit_api.py::test_serialize_input_values_keep_their_string_format -s
+    """
+    series = Series(description=SeriesDescription("NOAATANDC", "dWl", "packChan", "MSL"))
+    series.dataFrame = pd.DataFrame([
+        {
+            "dataValue": value,
+            "dataUnit": "meter",
+            "timeVerified": datetime(2026, 1, 1, hour, tzinfo=timezone.utc),
+            "timeGenerated": datetime(2026, 1, 1, hour, tzinfo=timezone.utc),
+            "longitude": None,
+            "latitude": None
+        }
+        for hour, value in enumerate([25.0, 0.178, -1.5, float('nan'), [1.0, 2.5], None])
+    ])
+
+    result = serialize_input_series(series)
+
+    assert [row['dataValue'] for row in result['_Series__data']] == ['25.0', '0.178', '-1.5', 'nan', "['1.0', '2.5']", None]
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+#input_index_benchmark.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""
+Benchmarks the hot input queries against a seeded copy of the inputs table, before and after adding the
+idx_inputs_series_lookup index from database version 3.8.
+
+A scratch table shaped like inputs is created and seeded with synthetic series (several generated runs per
+verified time, optionally ensembles), so the live inputs table is never touched. The queries are timed with
+EXPLAIN (ANALYZE, BUFFERS) with only the 3.4 idx_inputs_ordering index present, then the 3.8 index is built
+and they are timed again. The scratch table is dropped at the end unless --keep is passed.
+
+Requires DB_LOCATION_STRING (read from the .env file).
+
+Usage:
+    docker exec semaphore-core python3 tools/Benchmarks/input_index_benchmark.py
+    docker exec semaphore-core python3 tools/Benchmarks/input_index_benchmark.py --series 50 --days 60 --runs 4 --members 10 --repeats 5
+"""
+#----------------------------------
+#
+#
+#Imports
+import argparse
+from datetime import datetime, timedelta
+from os import getenv
+from statistics import median
+
+from dotenv import load_dotenv
+from sqlalchemy import Connection, create_engine, text
+
+load_dotenv()
+
+SCRATCH_TABLE = 'inputs_index_benchmark'
+
+LATEST_PER_GROUP = """
+    SELECT DISTINCT ON ("verifiedTime", "ensembleMemberID")
+        i.*
+    FROM {table} AS i
+    WHERE i."dataSource" = :dataSource
+        AND i."dataLocation" = :dataLocation
+        AND i."dataSeries" = :dataSeries
+        AND i."dataDatum" IS NULL
+        AND i."verifiedTime" BETWEEN :from_dt AND :to_dt
+    ORDER BY i."verifiedTime", i."ensembleMemberID", i."generatedTime" DESC
+"""
+
+# The filters and ordering of the storage queries, pointed at the scratch table
+QUERIES = {
+    'select_input': LATEST_PER_GROUP,
+    'fetch_oldest_generated_time': f"""
+        WITH latest_per_group AS ({LATEST_PER_GROUP})
+        SELECT MIN("generatedTime") OVER () FROM latest_per_group ORDER BY "verifiedTime", "ensembleMemberID" LIMIT 1
+    """,
+    'fetch_row_with_max_verified_time_in_range': """
+        SELECT i.* FROM {table} AS i
+        WHERE i."dataSource" = :dataSource
+            AND i."dataLocation" = :dataLocation
+            AND i."dataSeries" = :dataSeries
+            AND i."dataDatum" IS NULL
+            AND i."verifiedTime" BETWEEN :from_dt AND :to_dt
+        ORDER BY i."verifiedTime" DESC
+        LIMIT 1
+    """,
+    'select_input_with_freshness': f"""
+        WITH latest_per_group AS ({LATEST_PER_GROUP})
+        SELECT l.*, MIN(l."generatedTime") OVER (), MAX(l."verifiedTime") OVER ()
+        FROM latest_per_group AS l ORDER BY l."verifiedTime", l."ensembleMemberID"
+    """,
+}
+
+
+def seed(connection: Connection, series: int, days: int, runs: int, members: int, start: datetime) -> int:
+    """Creates the scratch table with the 3.4 index and fills it with synthetic rows.
+        Each series has hourly verified times, each verified time is predicted by `runs` generated times six hours apart
+        and each prediction has `members` ensemble members (1 seeds non ensemble rows).
+
+        :returns int - The number of rows seeded
+    """
+    connection.execute(text(f'DROP TABLE IF EXISTS {SCRATCH_TABLE};'))
+    connection.execute(text(f'CREATE TABLE {SCRATCH_TABLE} AS SELECT * FROM inputs WITH NO DATA;'))
+    connection.execute(text(f'CREATE INDEX ON {SCRATCH_TABLE} ("verifiedTime", "ensembleMemberID", "generatedTime" DESC);'))
+    result = connection.execute(text(f"""
+        INSERT INTO {SCRATCH_TABLE} (
+            "id", "generatedTime", "acquiredTime", "verifiedTime", "dataValue", "isActual", "dataUnit", "dataSource",
+            "dataLocation", "dataSeries", "dataDatum", "latitude", "longitude", "ensembleMemberID"
+        )
+        SELECT
+            row_number() OVER (),
+            v.verified - r.run * interval '6 hours',
+            v.verified - r.run * interval '6 hours',
+            v.verified,
+            round((random() * 10)::numeric, 3)::text,
+            false,
+            'meter',
+            'BENCH',
+            'location_' || s.series,
+            'pBench',
+            NULL,
+            '27.0',
+            '-97.0',
+            CASE WHEN :members > 1 THEN m.member END
+        FROM generate_series(1, :series) AS s(series)
+        CROSS JOIN generate_series(CAST(:start AS timestamp), CAST(:start AS timestamp) + :days * interval '1 day', interval '1 hour') AS v(verified)
+        CROSS JOIN generate_series(0, :runs - 1) AS r(run)
+        CROSS JOIN generate_series(0, :members - 1) AS m(member);
+    """).bindparams(series=series, days=days, runs=runs, members=members, start=start))
+    connection.execute(text(f'ANALYZE {SCRATCH_TABLE};'))
+    connection.commit()
+    return result.rowcount
+
+
+def explain(connection: Connection, query: str, bind_params: dict, repeats: int) -> tuple[float, str]:
+    """Runs EXPLAIN ANALYZE on a query several times.
+        :returns tuple[float, str] - The median execution time in ms and the plan's top scan node
+    """
+    stmt = text(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query.format(table=SCRATCH_TABLE)}').bindparams(**bind_params)
+    timings = []
+    for _ in range(repeats):
+        plan = connection.execute(stmt).scalar()[0]
+        timings.append(plan['Execution Time'])
+
+    # Walk down to the first scan so the table shows which access path was used
+    node = plan['Plan']
+    while 'Plans' in node and 'Scan' not in node['Node Type']:
+        node = node['Plans'][0]
+    return median(timings), f"{node['Node Type']} {node.get('Index Name', '')}".strip()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EXPLAIN ANALYZE the hot input queries before and after the 3.8 index')
+    parser.add_argument('--series', type=int, default=20, help='Number of synthetic series to seed')
+    parser.add_argument('--days', type=int, default=30, help='Days of hourly verified times per series')
+    parser.add_argument('--runs', type=int, default=4, help='Generated runs per verified time')
+    parser.add_argument('--members', type=int, default=10, help='Ensemble members per run, 1 seeds non ensemble rows')
+    parser.add_argument('--window', type=int, default=48, help='Hours in the queried verified time window')
+    parser.add_argument('--repeats', type=int, default=5, help='EXPLAIN ANALYZE runs per query, the median is reported')
+    parser.add_argument('--keep', action='store_true', help='Keep the scratch table instead of dropping it')
+    args = parser.parse_args()
+
+    engine = create_engine(getenv('DB_LOCATION_STRING'))
+    start = datetime(2025, 1, 1)
+    from_dt = start + timedelta(days=args.days // 2)
+    bind_params = {
+        'dataSource': 'BENCH',
+        'dataLocation': 'location_1',
+        'dataSeries': 'pBench',
+        'from_dt': from_dt,
+        'to_dt': from_dt + timedelta(hours=args.window),
+    }
+
+    with engine.connect() as connection:
+        rows = seed(connection, args.series, args.days, args.runs, args.members, start)
+        print(f'Seeded {rows} rows into {SCRATCH_TABLE}\n')
+
+        try:
+            before = {name: explain(connection, query, bind_params, args.repeats) for name, query in QUERIES.items()}
+
+            connection.execute(text(f"""
+                CREATE INDEX ON {SCRATCH_TABLE} (
+                    "dataSource", "dataLocation", "dataSeries", "dataDatum", "verifiedTime", "ensembleMemberID", "generatedTime" DESC
+                );
+            """))
+            connection.execute(text(f'ANALYZE {SCRATCH_TABLE};'))
+            connection.commit()
+
+            after = {name: explain(connection, query, bind_params, args.repeats) for name, query in QUERIES.items()}
+        finally:
+            connection.rollback()
+            if not args.keep:
+                connection.execute(text(f'DROP TABLE IF EXISTS {SCRATCH_TABLE};'))
+                connection.commit()
+
+    print(f"{'query':<45}{'before ms':>12}{'after ms':>12}{'speedup':>10}  plan after")
+    for name in QUERIES:
+        before_ms, _ = before[name]
+        after_ms, plan = after[name]
+        print(f'{name:<45}{before_ms:>12.2f}{after_ms:>12.2f}{before_ms / after_ms:>9.1f}x  {plan}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#output_codec_benchmark.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""
+Benchmarks the OutputCodec settings on prediction arrays shaped like the three model types:
+(1, 1, 1) single point, (1, 100, 1) MRE and (10, 100, 100) CRPS. No database is needed.
+
+Every available compression is combined with every precision and compared to the legacy plain .npy blob
+on blob size, encode time, decode time and the largest absolute error after a round trip. zstd and lz4
+are only included when their wheels are installed.
+
+The synthetic predictions are smooth random walks around a water level, which compress roughly like
+real model outputs. Pure noise compresses far worse, pass --noise to see that worst case.
+
+Usage:
+    docker exec semaphore-core python3 tools/Benchmarks/output_codec_benchmark.py
+    docker exec semaphore-core python3 tools/Benchmarks/output_codec_benchmark.py --shapes 10x100x100 --repeats 20 --noise
+"""
+#----------------------------------
+#
+#
+#Imports
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.abspath(__file__)), '..', '..', 'src'))
+
+import argparse
+from io import BytesIO
+from time import perf_counter
+
+import numpy as np
+
+from SeriesStorage.OutputCodec import OutputCodec, zstandard, lz4_frame
+
+
+def prediction_array(shape: tuple[int, ...], noise: bool) -> np.ndarray:
+    """Builds a float32 array shaped (members, inputs, outputs) of synthetic predictions.
+        :param shape: tuple[int, ...] - The array shape
+        :param noise: bool - Use uniform noise instead of smooth random walks
+        :returns ndarray - The array
+    """
+    rng = np.random.default_rng(0)
+    if noise:
+        return rng.uniform(-1, 1, size=shape).astype(np.float32)
+    walk = np.cumsum(rng.normal(0, 0.005, size=shape), axis=-1)
+    return (0.4 + walk + rng.normal(0, 0.05, size=shape[:-1] + (1,))).astype(np.float32)
+
+
+def legacy_encode(array: np.ndarray) -> bytes:
+    """The plain .npy serialization outputs used before the codec."""
+    buffer = BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def best_ms(func, argument, repeats: int) -> float:
+    """Returns the best wall clock time in milliseconds over the repeats."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = perf_counter()
+        func(argument)
+        best = min(best, perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the output codec settings on prediction arrays.')
+    parser.add_argument('--shapes', type=str, nargs='+', default=['1x1x1', '1x100x1', '10x100x100'], help='Array shapes as MxIxO.')
+    parser.add_argument('--repeats', type=int, default=10, help='Runs per case, the best time is reported.')
+    parser.add_argument('--noise', action='store_true', help='Use uniform noise instead of smooth predictions.')
+    args = parser.parse_args()
+
+    compressions = ['none', 'zlib'] + (['zstd'] if zstandard is not None else []) + (['lz4'] if lz4_frame is not None else [])
+    precisions = list(OutputCodec.PRECISION_IDS)
+
+    print(f'{"shape":>12} {"codec":>22} {"bytes":>10} {"ratio":>7} {"encode ms":>10} {"decode ms":>10} {"max error":>10}')
+    for shapeText in args.shapes:
+        shape = tuple(int(size) for size in shapeText.split('x'))
+        array = prediction_array(shape, args.noise)
+
+        legacy = legacy_encode(array)
+        legacyCodec = OutputCodec('none', 'full')
+        print(f'{shapeText:>12} {"legacy npy":>22} {len(legacy):>10} {1.0:>7.2f} '
+              f'{best_ms(legacy_encode, array, args.repeats):>10.3f} {best_ms(legacyCodec.decode, legacy, args.repeats):>10.3f} {0.0:>10.2e}')
+
+        for compression in compressions:
+            for precision in precisions:
+                codec = OutputCodec(compression, precision)
+                blob = codec.encode(array)
+                error = float(np.nanmax(np.abs(codec.decode(blob).astype(np.float64) - array)))
+                print(f'{shapeText:>12} {f"{compression}/{precision}":>22} {len(blob):>10} {len(legacy) / len(blob):>7.2f} '
+                      f'{best_ms(codec.encode, array, args.repeats):>10.3f} {best_ms(codec.decode, blob, args.repeats):>10.3f} {error:>10.2e}')
+        print()
+
+
+if __name__ == '__main__':
+    main()
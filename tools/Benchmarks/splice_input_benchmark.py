@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#splice_input_benchmark.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""
+Benchmarks how SQLAlchemyORM_Postgres.__splice_input scales with the number of verified times
+and the number of ensemble members in a selection. No database is needed, synthetic rows shaped like
+the inputs table are spliced directly.
+
+The legacy groupby/loc splice is included as a reference so the two can be compared side by side.
+It is quadratic in the row count, pass --skip_legacy to leave it out on large sizes.
+
+Usage:
+    docker exec semaphore-core python3 tools/Benchmarks/splice_input_benchmark.py
+    docker exec semaphore-core python3 tools/Benchmarks/splice_input_benchmark.py --hours 24 120 --members 1 10 100 --repeats 5
+"""
+#----------------------------------
+#
+#
+#Imports
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.abspath(__file__)), '..', '..', 'src'))
+
+import argparse
+from datetime import datetime, timedelta, timezone
+from time import perf_counter
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from DataClasses import get_input_dataFrame
+from SeriesStorage.SS_Classes.SQLAlchemyORM_Postgres import SQLAlchemyORM_Postgres
+
+
+def build_rows(hours: int, members: int) -> list[tuple]:
+    """Builds rows in the column order select_input returns them.
+        :param hours: int - The number of hourly verified times
+        :param members: int - The number of ensemble members, 1 builds a non ensemble series
+        :returns list[tuple] - The synthetic rows
+    """
+    rng = np.random.default_rng(0)
+    generated = datetime(2025, 1, 1)
+    rows = []
+    for hour in range(hours):
+        verified = generated + timedelta(hours=hour)
+        for member in range(members):
+            rows.append((
+                len(rows), generated, generated, verified, f'{rng.normal(20, 2):.3f}', False, 'celsius',
+                'TWC', 'SBirdIsland', 'pAirTemp', None, '26.48', '-97.28',
+                member if members > 1 else None
+            ))
+    return rows
+
+
+def legacy_splice_input(results: list[tuple]) -> pd.DataFrame:
+    """The row by row splice that __splice_input replaced, kept here for comparison."""
+    df_results = pd.DataFrame(data=results, columns=[
+        "id", "generatedTime", "acquiredTime", "verifiedTime", "dataValue",
+        "isActual", "dataUnit", "dataSource", "dataLocation", "dataSeries",
+        "dataDatum", "latitude", "longitude", "ensembleMemberID"
+    ])
+    df_results["generatedTime"] = pd.to_datetime(df_results["generatedTime"], errors="coerce").dt.tz_localize(timezone.utc)
+    df_results["verifiedTime"] = pd.to_datetime(df_results["verifiedTime"], errors="coerce").dt.tz_localize(timezone.utc)
+    df_results["acquiredTime"] = pd.to_datetime(df_results["acquiredTime"], errors="coerce").dt.tz_localize(timezone.utc)
+
+    df_out = get_input_dataFrame()
+    for _, group in df_results.groupby(["verifiedTime", "generatedTime"]):
+        firstRow = group.iloc[0]
+        if firstRow["ensembleMemberID"] is not None:
+            group = group.sort_values(by=("ensembleMemberID"))
+            df_out.loc[len(df_out)] = [group["dataValue"].to_list(), firstRow["dataUnit"], firstRow["verifiedTime"],
+                                       firstRow["generatedTime"], firstRow["longitude"], firstRow["latitude"]]
+        else:
+            for _, row in group.iterrows():
+                df_out.loc[len(df_out)] = [row["dataValue"], row["dataUnit"], row["verifiedTime"],
+                                           row["generatedTime"], row["longitude"], row["latitude"]]
+    return df_out
+
+
+def time_call(func, rows: list[tuple], repeats: int) -> float:
+    """Returns the best wall clock time in milliseconds over the repeats."""
+    best = float('inf')
+    for _ in range(repeats):
+        start = perf_counter()
+        func(rows)
+        best = min(best, perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the input splicer of SQLAlchemyORM_Postgres.')
+    parser.add_argument('--hours', type=int, nargs='+', default=[24, 120, 480], help='Verified time counts to benchmark.')
+    parser.add_argument('--members', type=int, nargs='+', default=[1, 10, 100], help='Ensemble member counts to benchmark (1 = not an ensemble).')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs per case, the best time is reported.')
+    parser.add_argument('--skip_legacy', action='store_true', help='Do not time the legacy splice.')
+    args = parser.parse_args()
+
+    # The splicer does not need a database connection
+    with patch.object(SQLAlchemyORM_Postgres, '__init__', lambda x: None):
+        storage = SQLAlchemyORM_Postgres()
+    splice_input = storage._SQLAlchemyORM_Postgres__splice_input
+
+    print(f'{"hours":>6} {"members":>8} {"db rows":>9} {"columnar ms":>12} {"legacy ms":>10} {"speedup":>8}')
+    for members in args.members:
+        for hours in args.hours:
+            rows = build_rows(hours, members)
+            columnar_ms = time_call(splice_input, rows, args.repeats)
+
+            if args.skip_legacy:
+                print(f'{hours:>6} {members:>8} {len(rows):>9} {columnar_ms:>12.2f} {"-":>10} {"-":>8}')
+                continue
+
+            legacy_ms = time_call(legacy_splice_input, rows, args.repeats)
+            print(f'{hours:>6} {members:>8} {len(rows):>9} {columnar_ms:>12.2f} {legacy_ms:>10.2f} {legacy_ms / columnar_ms:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#statement_cache_benchmark.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""
+Measures the per call overhead of the SQLAlchemyORM_Postgres input queries with and without psycopg server side
+prepared statements, against a local Postgres.
+
+The queries are read only and run against the live inputs tables, pick a series that has data with --source,
+--location, --series and --datum. Each call is timed through the public storage methods in two modes:
+    registry            - Statements are built once and reused, prepared statements are off.
+    registry+prepared   - Statements are built once and reused, psycopg prepares them on their first execution.
+
+The code from before the statement registry is not kept, so it is not measured here. Clearing the registry before
+every call would not reproduce it either, the rebuilt statements still hit SQLAlchemy's compiled cache.
+
+fetch_oldest_generated_time returns a single value, so its timings are almost entirely per call overhead.
+select_input also includes splicing the returned rows, which is the same in every mode.
+
+Requires DB_LOCATION_STRING (read from the .env file).
+
+Usage:
+    docker exec semaphore-core python3 tools/Benchmarks/statement_cache_benchmark.py
+    docker exec semaphore-core python3 tools/Benchmarks/statement_cache_benchmark.py --source NOAATANDC --location packChan --series dWl --datum MHHW --hours 48 --calls 500
+"""
+#----------------------------------
+#
+#
+#Imports
+import sys
+from os import path, environ
+sys.path.append(path.join(path.dirname(path.abspath(__file__)), '..', '..', 'src'))
+
+import argparse
+from datetime import datetime, timedelta, timezone
+from statistics import mean, median
+from time import perf_counter
+
+from dotenv import load_dotenv
+
+from DataClasses import SeriesDescription, TimeDescription
+from SeriesStorage.SS_Classes.SQLAlchemyORM_Postgres import SQLAlchemyORM_Postgres
+
+load_dotenv()
+
+# (mode name, DB_PREPARE_THRESHOLD)
+MODES = [
+    ('registry', 'none'),
+    ('registry+prepared', '0'),
+]
+
+
+def time_calls(call, calls: int) -> list[float]:
+    """Runs call `calls` times after a warm up call and returns each wall clock time in milliseconds."""
+    call()
+    times = []
+    for _ in range(calls):
+        start = perf_counter()
+        call()
+        times.append((perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the per call overhead of the input queries with and without prepared statements.')
+    parser.add_argument('--source', type=str, default='LIGHTHOUSE', help='dataSource of the queried series')
+    parser.add_argument('--location', type=str, default='SouthBirdIsland', help='dataLocation of the queried series')
+    parser.add_argument('--series', type=str, default='dWaterTmp', help='dataSeries of the queried series')
+    parser.add_argument('--datum', type=str, default=None, help='dataDatum of the queried series, omit for none')
+    parser.add_argument('--hours', type=int, default=24, help='Hours in the queried verified time window, ending now')
+    parser.add_argument('--calls', type=int, default=200, help='Timed calls per query and mode')
+    args = parser.parse_args()
+
+    toDateTime = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    seriesDescription = SeriesDescription(args.source, args.series, args.location, args.datum)
+    timeDescription = TimeDescription(toDateTime - timedelta(hours=args.hours), toDateTime, timedelta(hours=1))
+
+    print(f'{"query":>30} {"mode":>20} {"median ms":>10} {"mean ms":>10}')
+    for modeName, threshold in MODES:
+        # The engine reads the threshold when it is created, so each mode gets a fresh one
+        environ['DB_PREPARE_THRESHOLD'] = threshold
+        SQLAlchemyORM_Postgres.dispose()
+        SQLAlchemyORM_Postgres._statements.clear()
+        storage = SQLAlchemyORM_Postgres()
+
+        queries = {
+            'fetch_oldest_generated_time': lambda: storage.fetch_oldest_generated_time(seriesDescription, timeDescription),
+            'select_input': lambda: storage.select_input(seriesDescription, timeDescription),
+        }
+        for queryName, call in queries.items():
+            times = time_calls(call, args.calls)
+            print(f'{queryName:>30} {modeName:>20} {median(times):>10.3f} {mean(times):>10.3f}')
+
+    SQLAlchemyORM_Postgres.dispose()
+
+
+if __name__ == '__main__':
+    main()
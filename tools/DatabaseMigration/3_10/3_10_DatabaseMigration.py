@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#3_10_DatabaseMigration.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# Version 1.0
+#----------------------------------
+"""This is a database migration script that will initialize version
+    3.10 of the database (without using the ORM). It adds the input_ensembles table, which stores an ensemble
+    as one row per (series, verifiedTime, generatedTime) with every member in a DOUBLE PRECISION[] array,
+    and moves the existing one row per member ensemble inputs into it.
+
+    A 100 member ensemble drops from 100 inputs rows to a single input_ensembles row and selecting it no longer
+    needs the members regrouped. The members are ordered by their old ensembleMemberID.
+"""
+#----------------------------------
+
+from DatabaseMigration.IDatabaseMigration import IDatabaseMigration
+from sqlalchemy import Engine, text
+
+
+class Migrator(IDatabaseMigration):
+
+    def update(self, databaseEngine: Engine) -> bool:
+        """This function updates the database to version 3.10.
+
+           :param databaseEngine: Engine - the engine of the database we are connecting to (semaphore)
+           :return: bool indicating successful update
+
+           Updates DB:
+            - Create input_ensembles with its constraints and lookup index
+            - Aggregate the ensemble member rows in inputs into input_ensembles
+            - Delete the ensemble member rows from inputs
+        """
+        with databaseEngine.connect() as connection:
+
+            connection.execute(text("""
+                CREATE TABLE public."input_ensembles" (
+                    "id" INTEGER GENERATED BY DEFAULT AS IDENTITY,
+                    "generatedTime" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                    "acquiredTime" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                    "verifiedTime" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                    "dataValues" DOUBLE PRECISION[] NOT NULL,
+                    "isActual" BOOLEAN NOT NULL,
+                    "dataUnit" VARCHAR(10) NOT NULL,
+                    "dataSource" VARCHAR(10) NOT NULL,
+                    "dataLocation" VARCHAR(25) NOT NULL,
+                    "dataSeries" VARCHAR(25) NOT NULL,
+                    "dataDatum" VARCHAR(10),
+                    "latitude" VARCHAR(16),
+                    "longitude" VARCHAR(16),
+
+                    CONSTRAINT "input_ensembles_pkey" PRIMARY KEY ("id"),
+
+                    CONSTRAINT "input_ensembles_AK00"
+                        UNIQUE NULLS NOT DISTINCT (
+                            "isActual", "generatedTime", "verifiedTime", "dataUnit", "dataSource",
+                            "dataLocation", "dataSeries", "dataDatum", "latitude", "longitude"
+                        ),
+
+                    CONSTRAINT "input_ensembles_dataUnit_fkey"
+                        FOREIGN KEY ("dataUnit") REFERENCES public."ref_dataUnit" ("code"),
+
+                    CONSTRAINT "input_ensembles_dataSource_fkey"
+                        FOREIGN KEY ("dataSource") REFERENCES public."ref_dataSource" ("code"),
+
+                    CONSTRAINT "input_ensembles_dataLocation_fkey"
+                        FOREIGN KEY ("dataLocation") REFERENCES public."ref_dataLocation" ("code"),
+
+                    CONSTRAINT "input_ensembles_dataSeries_fkey"
+                        FOREIGN KEY ("dataSeries") REFERENCES public."ref_dataSeries" ("code"),
+
+                    CONSTRAINT "input_ensembles_dataDatum_fkey"
+                        FOREIGN KEY ("dataDatum") REFERENCES public."ref_dataDatum" ("code")
+                );
+            """))
+
+            connection.execute(text("""
+                CREATE INDEX idx_input_ensembles_series_lookup ON input_ensembles (
+                    "dataSource", "dataLocation", "dataSeries", "dataDatum", "verifiedTime", "generatedTime" DESC
+                );
+            """))
+
+            # Every member of a run shares the AK00 columns apart from ensembleMemberID
+            connection.execute(text("""
+                INSERT INTO public."input_ensembles" (
+                    "generatedTime", "acquiredTime", "verifiedTime", "dataValues", "isActual", "dataUnit",
+                    "dataSource", "dataLocation", "dataSeries", "dataDatum", "latitude", "longitude"
+                )
+                SELECT
+                    "generatedTime",
+                    MAX("acquiredTime"),
+                    "verifiedTime",
+                    array_agg("dataValue"::DOUBLE PRECISION ORDER BY "ensembleMemberID"),
+                    "isActual",
+                    "dataUnit",
+                    "dataSource",
+                    "dataLocation",
+                    "dataSeries",
+                    "dataDatum",
+                    "latitude",
+                    "longitude"
+                FROM public."inputs"
+                WHERE "ensembleMemberID" IS NOT NULL
+                GROUP BY
+                    "isActual", "generatedTime", "verifiedTime", "dataUnit", "dataSource",
+                    "dataLocation", "dataSeries", "dataDatum", "latitude", "longitude";
+            """))
+
+            connection.execute(text('DELETE FROM public."inputs" WHERE "ensembleMemberID" IS NOT NULL;'))
+            connection.execute(text('ANALYZE public."input_ensembles";'))
+            connection.execute(text('ANALYZE public."inputs";'))
+
+            connection.commit()
+        return True
+
+
+    def rollback(self, databaseEngine: Engine) -> bool:
+        """This function rolls the database back to version 3.9.
+
+           :param databaseEngine: Engine - the engine of the database we are connecting to (semaphore)
+           :return: bool indicating successful rollback
+
+           Rollback:
+            - Create the inputs partitions covering the ensembles
+            - Expand every input_ensembles row back into one inputs row per member, the member ID is the array position
+              (null members are dropped, inputs.dataValue can not be null)
+            - Drop input_ensembles
+        """
+        with databaseEngine.connect() as connection:
+
+            connection.execute(text("""
+                SELECT create_inputs_partitions(MIN("verifiedTime"), MAX("verifiedTime"))
+                FROM public."input_ensembles"
+                HAVING COUNT(*) > 0;
+            """))
+
+            connection.execute(text("""
+                INSERT INTO public."inputs" (
+                    "generatedTime", "acquiredTime", "verifiedTime", "dataValue", "isActual", "dataUnit", "dataSource",
+                    "dataLocation", "dataSeries", "dataDatum", "latitude", "longitude", "ensembleMemberID"
+                )
+                SELECT
+                    e."generatedTime",
+                    e."acquiredTime",
+                    e."verifiedTime",
+                    member.value::VARCHAR(25),
+                    e."isActual",
+                    e."dataUnit",
+                    e."dataSource",
+                    e."dataLocation",
+                    e."dataSeries",
+                    e."dataDatum",
+                    e."latitude",
+                    e."longitude",
+                    (member.position - 1)::INTEGER
+                FROM public."input_ensembles" AS e
+                CROSS JOIN LATERAL unnest(e."dataValues") WITH ORDINALITY AS member(value, position)
+                WHERE member.value IS NOT NULL
+                ON CONFLICT ON CONSTRAINT "inputs_AK00" DO NOTHING;
+            """))
+
+            connection.execute(text('DROP TABLE public."input_ensembles";'))
+            connection.execute(text('ANALYZE public."inputs";'))
+
+            connection.commit()
+        return True
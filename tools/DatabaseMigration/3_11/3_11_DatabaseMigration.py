@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+#3_11_DatabaseMigration.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# Version 1.0
+#----------------------------------
+"""This is a database migration script that will initialize version
+    3.11 of the database (without using the ORM). It changes inputs."dataValue" from VARCHAR(25) to DOUBLE PRECISION,
+    so input values are stored, selected and inserted as floats and are no longer parsed from strings on every read.
+
+    Existing values that are not numbers are converted to NaN, the column stays NOT NULL.
+"""
+#----------------------------------
+
+from DatabaseMigration.IDatabaseMigration import IDatabaseMigration
+from sqlalchemy import Engine, text
+
+
+class Migrator(IDatabaseMigration):
+
+    def update(self, databaseEngine: Engine) -> bool:
+        """This function updates the database to version 3.11.
+
+           :param databaseEngine: Engine - the engine of the database we are connecting to (semaphore)
+           :return: bool indicating successful update
+
+           Updates DB:
+            - Change inputs."dataValue" to DOUBLE PRECISION (this rewrites every partition once)
+        """
+        with databaseEngine.connect() as connection:
+
+            # Accepts everything float8 input does (NaN and infinities included), anything else becomes NaN
+            connection.execute(text(r"""
+                ALTER TABLE public."inputs" ALTER COLUMN "dataValue" TYPE DOUBLE PRECISION
+                USING (
+                    CASE
+                        WHEN "dataValue" ~* '^\s*[-+]?(([0-9]+\.?[0-9]*|\.[0-9]+)(e[-+]?[0-9]+)?|nan|inf|infinity)\s*$'
+                        THEN "dataValue"::DOUBLE PRECISION
+                        ELSE 'NaN'::DOUBLE PRECISION
+                    END
+                );
+            """))
+            connection.execute(text('ANALYZE public."inputs";'))
+
+            connection.commit()
+        return True
+
+
+    def rollback(self, databaseEngine: Engine) -> bool:
+        """This function rolls the database back to version 3.10.
+
+           :param databaseEngine: Engine - the engine of the database we are connecting to (semaphore)
+           :return: bool indicating successful rollback
+
+           Rollback:
+            - Change inputs."dataValue" back to VARCHAR(25)
+        """
+        with databaseEngine.connect() as connection:
+
+            connection.execute(text('ALTER TABLE public."inputs" ALTER COLUMN "dataValue" TYPE VARCHAR(25) USING "dataValue"::VARCHAR(25);'))
+
+            connection.commit()
+        return True
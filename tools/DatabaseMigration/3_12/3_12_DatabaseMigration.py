@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+#3_12_DatabaseMigration.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# Version 1.0
+#----------------------------------
+"""This is a database migration script that will initialize version
+    3.12 of the database (without using the ORM). It adds two small side tables that always point at the
+    latest rows of each model, so the latest output lookups read a handful of rows instead of aggregating
+    the whole outputs table:
+        latest_outputs - Every outputs row sharing its model's latest "timeGenerated" (one per model unless
+            several versions generated at the same time), keyed by ("modelName", "outputID").
+        latest_output_statistics - The latest output of each model that has statistics, keyed by "modelName".
+
+    Both are maintained by AFTER INSERT triggers on outputs and output_statistics, so every writer keeps them
+    current in the same transaction as the insert. AFTER DELETE triggers recompute the rows of every model that
+    lost outputs or statistics, so a delete never leaves a model without its latest rows. refresh_latest_outputs()
+    rebuilds both from scratch and backfills them here.
+"""
+#----------------------------------
+
+from DatabaseMigration.IDatabaseMigration import IDatabaseMigration
+from sqlalchemy import Engine, text
+
+
+class Migrator(IDatabaseMigration):
+
+    def update(self, databaseEngine: Engine) -> bool:
+        """This function updates the database to version 3.12.
+
+           :param databaseEngine: Engine - the engine of the database we are connecting to (semaphore)
+           :return: bool indicating successful update
+
+           Updates DB:
+            - Create latest_outputs and latest_output_statistics
+            - Create the trigger functions and triggers that maintain them on insert and delete
+            - Create refresh_latest_outputs() and backfill both tables with it
+        """
+        with databaseEngine.connect() as connection:
+
+            connection.execute(text("""
+                CREATE TABLE public."latest_outputs" (
+                    "modelName" VARCHAR(50) NOT NULL,
+                    "outputID" INTEGER NOT NULL,
+                    "timeGenerated" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+
+                    CONSTRAINT "latest_outputs_pkey" PRIMARY KEY ("modelName", "outputID"),
+
+                    CONSTRAINT "latest_outputs_outputID_fkey"
+                        FOREIGN KEY ("outputID") REFERENCES public."outputs" ("id") ON DELETE CASCADE
+                );
+            """))
+
+            connection.execute(text("""
+                CREATE TABLE public."latest_output_statistics" (
+                    "modelName" VARCHAR(50) NOT NULL,
+                    "outputID" INTEGER NOT NULL,
+                    "timeGenerated" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+
+                    CONSTRAINT "latest_output_statistics_pkey" PRIMARY KEY ("modelName"),
+
+                    CONSTRAINT "latest_output_statistics_outputID_fkey"
+                        FOREIGN KEY ("outputID") REFERENCES public."outputs" ("id") ON DELETE CASCADE
+                );
+            """))
+
+            # A newer output replaces the model's rows, an output at the same time joins them, an older one is ignored.
+            # The advisory lock serializes concurrent inserts for the same model so they can not both keep their rows.
+            connection.execute(text("""
+                CREATE OR REPLACE FUNCTION track_latest_output() RETURNS TRIGGER AS $$
+                BEGIN
+                    PERFORM pg_advisory_xact_lock(hashtext('latest_outputs:' || NEW."modelName"));
+
+                    DELETE FROM public."latest_outputs"
+                    WHERE "modelName" = NEW."modelName" AND "timeGenerated" < NEW."timeGenerated";
+
+                    IF NOT EXISTS (
+                        SELECT 1 FROM public."latest_outputs"
+                        WHERE "modelName" = NEW."modelName" AND "timeGenerated" > NEW."timeGenerated"
+                    ) THEN
+                        INSERT INTO public."latest_outputs" ("modelName", "outputID", "timeGenerated")
+                        VALUES (NEW."modelName", NEW."id", NEW."timeGenerated")
+                        ON CONFLICT DO NOTHING;
+                    END IF;
+
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+            """))
+
+            connection.execute(text("""
+                CREATE OR REPLACE FUNCTION track_latest_output_statistics() RETURNS TRIGGER AS $$
+                BEGIN
+                    INSERT INTO public."latest_output_statistics" ("modelName", "outputID", "timeGenerated")
+                    SELECT o."modelName", o."id", o."timeGenerated"
+                    FROM public."outputs" AS o
+                    WHERE o."id" = NEW."outputID"
+                    ON CONFLICT ("modelName") DO UPDATE
+                        SET "outputID" = EXCLUDED."outputID", "timeGenerated" = EXCLUDED."timeGenerated"
+                        WHERE latest_output_statistics."timeGenerated" <= EXCLUDED."timeGenerated";
+
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+            """))
+
+            connection.execute(text("""
+                CREATE TRIGGER outputs_track_latest
+                AFTER INSERT ON public."outputs"
+                FOR EACH ROW EXECUTE FUNCTION track_latest_output();
+            """))
+
+            connection.execute(text("""
+                CREATE TRIGGER output_statistics_track_latest
+                AFTER INSERT ON public."output_statistics"
+                FOR EACH ROW EXECUTE FUNCTION track_latest_output_statistics();
+            """))
+
+            # A delete recomputes the models it touched once per statement, after the foreign keys have cascaded
+            # the deleted rows out of both side tables, so bulk deletes do not recompute a model per row.
+            connection.execute(text("""
+                CREATE OR REPLACE FUNCTION track_deleted_outputs() RETURNS TRIGGER AS $$
+                BEGIN
+                    PERFORM pg_advisory_xact_lock(hashtext('latest_outputs:' || m."modelName"))
+                    FROM (SELECT DISTINCT "modelName" FROM deleted_outputs ORDER BY "modelName") AS m;
+
+                    DELETE FROM public."latest_outputs"
+                    WHERE "modelName" IN (SELECT "modelName" FROM deleted_outputs);
+
+                    INSERT INTO public."latest_outputs" ("modelName", "outputID", "timeGenerated")
+                    SELECT o."modelName", o."id", o."timeGenerated"
+                    FROM public."outputs" AS o
+                    INNER JOIN (
+                        SELECT "modelName", MAX("timeGenerated") AS latest_time
+                        FROM public."outputs"
+                        WHERE "modelName" IN (SELECT "modelName" FROM deleted_outputs)
+                        GROUP BY "modelName"
+                    ) AS l
+                        ON o."modelName" = l."modelName"
+                        AND o."timeGenerated" = l.latest_time
+                    ON CONFLICT DO NOTHING;
+
+                    DELETE FROM public."latest_output_statistics"
+                    WHERE "modelName" IN (SELECT "modelName" FROM deleted_outputs);
+
+                    INSERT INTO public."latest_output_statistics" ("modelName", "outputID", "timeGenerated")
+                    SELECT DISTINCT ON (o."modelName") o."modelName", o."id", o."timeGenerated"
+                    FROM public."outputs" AS o
+                    INNER JOIN public."output_statistics" AS s
+                        ON s."outputID" = o."id"
+                    WHERE o."modelName" IN (SELECT "modelName" FROM deleted_outputs)
+                    ORDER BY o."modelName", o."timeGenerated" DESC;
+
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+            """))
+
+            # Only models whose latest statistics were deleted need a new one, the outputs themselves are untouched
+            connection.execute(text("""
+                CREATE OR REPLACE FUNCTION track_deleted_output_statistics() RETURNS TRIGGER AS $$
+                BEGIN
+                    WITH affected AS (
+                        DELETE FROM public."latest_output_statistics"
+                        WHERE "outputID" IN (SELECT "outputID" FROM deleted_statistics)
+                        RETURNING "modelName"
+                    )
+                    INSERT INTO public."latest_output_statistics" ("modelName", "outputID", "timeGenerated")
+                    SELECT DISTINCT ON (o."modelName") o."modelName", o."id", o."timeGenerated"
+                    FROM public."outputs" AS o
+                    INNER JOIN public."output_statistics" AS s
+                        ON s."outputID" = o."id"
+                    WHERE o."modelName" IN (SELECT "modelName" FROM affected)
+                    ORDER BY o."modelName", o."timeGenerated" DESC;
+
+                    RETURN NULL;
+                END;
+                $$ LANGUAGE plpgsql;
+            """))
+
+            connection.execute(text("""
+                CREATE TRIGGER outputs_track_deleted
+                AFTER DELETE ON public."outputs"
+                REFERENCING OLD TABLE AS deleted_outputs
+                FOR EACH STATEMENT EXECUTE FUNCTION track_deleted_outputs();
+            """))
+
+            connection.execute(text("""
+                CREATE TRIGGER output_statistics_track_deleted
+                AFTER DELETE ON public."output_statistics"
+                REFERENCING OLD TABLE AS deleted_statistics
+                FOR EACH STATEMENT EXECUTE FUNCTION track_deleted_output_statistics();
+            """))
+
+            connection.execute(text("""
+                CREATE OR REPLACE FUNCTION refresh_latest_outputs() RETURNS VOID AS $$
+                BEGIN
+                    DELETE FROM public."latest_outputs";
+                    INSERT INTO public."latest_outputs" ("modelName", "outputID", "timeGenerated")
+                    SELECT o."modelName", o."id", o."timeGenerated"
+                    FROM public."outputs" AS o
+                    INNER JOIN (
+                        SELECT "modelName", MAX("timeGenerated") AS latest_time
+                        FROM public."outputs"
+                        GROUP BY "modelName"
+                    ) AS l
+                        ON o."modelName" = l."modelName"
+                        AND o."timeGenerated" = l.latest_time;
+
+                    DELETE FROM public."latest_output_statistics";
+                    INSERT INTO public."latest_output_statistics" ("modelName", "outputID", "timeGenerated")
+                    SELECT DISTINCT ON (o."modelName") o."modelName", o."id", o."timeGenerated"
+                    FROM public."outputs" AS o
+                    INNER JOIN public."output_statistics" AS s
+                        ON s."outputID" = o."id"
+                    ORDER BY o."modelName", o."timeGenerated" DESC;
+                END;
+                $$ LANGUAGE plpgsql;
+            """))
+
+            connection.execute(text('SELECT refresh_latest_outputs();'))
+
+            connection.commit()
+        return True
+
+
+    def rollback(self, databaseEngine: Engine) -> bool:
+        """This function rolls the database back to version 3.11.
+
+           :param databaseEngine: Engine - the engine of the database we are connecting to (semaphore)
+           :return: bool indicating successful rollback
+
+           Rollback:
+            - Drop the triggers, the functions and both side tables
+        """
+        with databaseEngine.connect() as connection:
+
+            connection.execute(text('DROP TRIGGER IF EXISTS outputs_track_latest ON public."outputs";'))
+            connection.execute(text('DROP TRIGGER IF EXISTS output_statistics_track_latest ON public."output_statistics";'))
+            connection.execute(text('DROP TRIGGER IF EXISTS outputs_track_deleted ON public."outputs";'))
+            connection.execute(text('DROP TRIGGER IF EXISTS output_statistics_track_deleted ON public."output_statistics";'))
+            connection.execute(text('DROP FUNCTION IF EXISTS track_latest_output();'))
+            connection.execute(text('DROP FUNCTION IF EXISTS track_latest_output_statistics();'))
+            connection.execute(text('DROP FUNCTION IF EXISTS track_deleted_outputs();'))
+            connection.execute(text('DROP FUNCTION IF EXISTS track_deleted_output_statistics();'))
+            connection.execute(text('DROP FUNCTION IF EXISTS refresh_latest_outputs();'))
+            connection.execute(text('DROP TABLE IF EXISTS public."latest_outputs";'))
+            connection.execute(text('DROP TABLE IF EXISTS public."latest_output_statistics";'))
+
+            connection.commit()
+        return True
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#3_13_DatabaseMigration.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# Version 1.0
+#----------------------------------
+"""This is a database migration script that will initialize version
+    3.13 of the database (without using the ORM). It adds query_profiles, where the orchestrator writes the
+    storage calls recorded by the QueryProfiler when DB_PROFILE and DB_PROFILE_PERSIST are set. Each row is one
+    storage call with its timing, counts and the EXPLAIN (ANALYZE, BUFFERS) plans of its slow statements.
+"""
+#----------------------------------
+
+from DatabaseMigration.IDatabaseMigration import IDatabaseMigration
+from sqlalchemy import Engine, text
+
+
+class Migrator(IDatabaseMigration):
+
+    def update(self, databaseEngine: Engine) -> bool:
+        """This function updates the database to version 3.13.
+
+           :param databaseEngine: Engine - the engine of the database we are connecting to (semaphore)
+           :return: bool indicating successful update
+
+           Updates DB:
+            - Create query_profiles and index it by model and start time
+        """
+        with databaseEngine.connect() as connection:
+
+            connection.execute(text("""
+                CREATE TABLE public."query_profiles" (
+                    "id" BIGSERIAL NOT NULL,
+                    "method" VARCHAR(100) NOT NULL,
+                    "modelName" VARCHAR(50),
+                    "referenceTime" TIMESTAMP WITHOUT TIME ZONE,
+                    "startedAt" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                    "depth" SMALLINT NOT NULL,
+                    "elapsedMs" DOUBLE PRECISION NOT NULL,
+                    "statements" INTEGER NOT NULL,
+                    "rows" BIGINT NOT NULL,
+                    "bytes" BIGINT NOT NULL,
+                    "plans" TEXT,
+
+                    CONSTRAINT "query_profiles_pkey" PRIMARY KEY ("id")
+                );
+            """))
+
+            connection.execute(text("""
+                CREATE INDEX "query_profiles_modelName_startedAt_idx"
+                ON public."query_profiles" ("modelName", "startedAt");
+            """))
+
+            connection.commit()
+        return True
+
+
+    def rollback(self, databaseEngine: Engine) -> bool:
+        """This function rolls the database back to version 3.12.
+
+           :param databaseEngine: Engine - the engine of the database we are connecting to (semaphore)
+           :return: bool indicating successful rollback
+
+           Rollback:
+            - Drop query_profiles
+        """
+        with databaseEngine.connect() as connection:
+
+            connection.execute(text('DROP TABLE IF EXISTS public."query_profiles";'))
+
+            connection.commit()
+        return True
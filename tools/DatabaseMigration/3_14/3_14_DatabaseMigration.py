@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+#3_14_DatabaseMigration.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# Version 1.0
+#----------------------------------
+"""This is a database migration script that will initialize version
+    3.14 of the database (without using the ORM). It adds ingestion_ledger, where the series provider records every
+    successful ingestion of an input series: the verified range it covered, its oldest and latest generated times and
+    when it was acquired. Freshness and coverage are then answered from the ledger instead of scanning inputs.
+"""
+#----------------------------------
+
+from DatabaseMigration.IDatabaseMigration import IDatabaseMigration
+from sqlalchemy import Engine, text
+
+
+class Migrator(IDatabaseMigration):
+
+    def update(self, databaseEngine: Engine) -> bool:
+        """This function updates the database to version 3.14.
+
+           :param databaseEngine: Engine - the engine of the database we are connecting to (semaphore)
+           :return: bool indicating successful update
+
+           Updates DB:
+            - Create ingestion_ledger and index it by series and the end of the covered verified range
+        """
+        with databaseEngine.connect() as connection:
+
+            connection.execute(text("""
+                CREATE TABLE public."ingestion_ledger" (
+                    "id" BIGSERIAL NOT NULL,
+                    "dataSource" VARCHAR(10) NOT NULL,
+                    "dataLocation" VARCHAR(25) NOT NULL,
+                    "dataSeries" VARCHAR(25) NOT NULL,
+                    "dataDatum" VARCHAR(10),
+                    "fromVerifiedTime" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                    "toVerifiedTime" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                    "oldestGeneratedTime" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                    "latestGeneratedTime" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                    "acquiredTime" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                    "rowCount" INTEGER NOT NULL,
+
+                    CONSTRAINT "ingestion_ledger_pkey" PRIMARY KEY ("id")
+                );
+            """))
+
+            connection.execute(text("""
+                CREATE INDEX "ingestion_ledger_series_toVerifiedTime_idx"
+                ON public."ingestion_ledger" ("dataSource", "dataLocation", "dataSeries", "toVerifiedTime");
+            """))
+
+            connection.commit()
+        return True
+
+
+    def rollback(self, databaseEngine: Engine) -> bool:
+        """This function rolls the database back to version 3.13.
+
+           :param databaseEngine: Engine - the engine of the database we are connecting to (semaphore)
+           :return: bool indicating successful rollback
+
+           Rollback:
+            - Drop ingestion_ledger
+        """
+        with databaseEngine.connect() as connection:
+
+            connection.execute(text('DROP TABLE IF EXISTS public."ingestion_ledger";'))
+
+            connection.commit()
+        return True
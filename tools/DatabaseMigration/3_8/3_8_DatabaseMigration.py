@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+#3_8_DatabaseMigration.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# Version 1.0
+#----------------------------------
+"""This is a database migration script that will initialize version
+    3.8 of the database (without using the ORM). It adds a composite index on inputs matching the
+    access pattern of the hot input queries (select_input, fetch_oldest_generated_time,
+    fetch_row_with_max_verified_time_in_range and select_input_with_freshness).
+
+    Those queries filter on source, location, series and datum, range over verifiedTime and then order by
+    verifiedTime, ensembleMemberID, generatedTime DESC. The index keys follow that order so the equality
+    filters narrow the scan to one series and the DISTINCT ON can read rows already in order without a sort.
+"""
+#----------------------------------
+
+from DatabaseMigration.IDatabaseMigration import IDatabaseMigration
+from sqlalchemy import Engine, text
+
+
+class Migrator(IDatabaseMigration):
+
+    def update(self, databaseEngine: Engine) -> bool:
+        """This function updates the database to version 3.8.
+
+           :param databaseEngine: Engine - the engine of the database we are connecting to (semaphore)
+           :return: bool indicating successful update
+
+           Updates DB:
+            - Create idx_inputs_series_lookup on inputs
+            - Analyze inputs so the planner picks the new index up straight away
+        """
+
+        stmt_drop_idx_inputs_series_lookup = text('DROP INDEX IF EXISTS idx_inputs_series_lookup;')
+        stmt_create_idx_inputs_series_lookup = text("""
+            CREATE INDEX idx_inputs_series_lookup ON inputs (
+                "dataSource",
+                "dataLocation",
+                "dataSeries",
+                "dataDatum",
+                "verifiedTime",
+                "ensembleMemberID",
+                "generatedTime" DESC
+            );
+        """)
+        stmt_analyze_inputs = text('ANALYZE inputs;')
+        with databaseEngine.connect() as connection:
+            connection.execute(stmt_drop_idx_inputs_series_lookup)
+            connection.execute(stmt_create_idx_inputs_series_lookup)
+            connection.execute(stmt_analyze_inputs)
+            connection.commit()
+    
+        return True
+
+
+    def rollback(self, databaseEngine: Engine) -> bool:
+        """This function rolls the database back to version 3.7.
+
+           :param databaseEngine: Engine - the engine of the database we are connecting to (semaphore)
+           :return: bool indicating successful rollback
+        """
+        
+        stmt_drop_idx_inputs_series_lookup = text('DROP INDEX IF EXISTS idx_inputs_series_lookup;')
+        with databaseEngine.connect() as connection:
+            connection.execute(stmt_drop_idx_inputs_series_lookup)
+            connection.commit()
+    
+        return True
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+#3_9_DatabaseMigration.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# Version 1.0
+#----------------------------------
+"""This is a database migration script that will initialize version
+    3.9 of the database (without using the ORM). It rebuilds inputs as a table range partitioned by the month
+    of "verifiedTime". Every input query is bounded on verifiedTime so the planner only visits the months a
+    request touches, and old months can be detached and archived without rewriting the live table.
+
+    Partitions are named inputs_YYYY_MM. Two functions manage them:
+        create_inputs_partitions(from_time, to_time) - Creates any missing monthly partitions covering the range,
+            insert_input calls this before every insert so future months are created automatically.
+        detach_inputs_partitions(before_time) - Detaches every partition that ends on or before the month of
+            before_time and renames it to archived_inputs_YYYY_MM. Detaching only changes the catalog, the archived
+            tables can then be dumped and dropped at leisure.
+"""
+#----------------------------------
+
+from DatabaseMigration.IDatabaseMigration import IDatabaseMigration
+from sqlalchemy import Engine, text
+
+
+# The column list of inputs, in table order
+INPUTS_COLUMNS = '''
+    "id", "generatedTime", "acquiredTime", "verifiedTime", "dataValue", "isActual", "dataUnit", "dataSource",
+    "dataLocation", "dataSeries", "dataDatum", "latitude", "longitude", "ensembleMemberID"
+'''
+
+# Column definitions shared by the partitioned and the plain inputs tables
+INPUTS_COLUMN_DEFINITIONS = '''
+    "id" INTEGER NOT NULL DEFAULT nextval('public.inputs_id_seq'),
+    "generatedTime" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    "acquiredTime" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    "verifiedTime" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    "dataValue" VARCHAR(25) NOT NULL,
+    "isActual" BOOLEAN NOT NULL,
+    "dataUnit" VARCHAR(10) NOT NULL,
+    "dataSource" VARCHAR(10) NOT NULL,
+    "dataLocation" VARCHAR(25) NOT NULL,
+    "dataSeries" VARCHAR(25) NOT NULL,
+    "dataDatum" VARCHAR(10),
+    "latitude" VARCHAR(16),
+    "longitude" VARCHAR(16),
+    "ensembleMemberID" INTEGER,
+'''
+
+INPUTS_CONSTRAINT_DEFINITIONS = '''
+    CONSTRAINT "inputs_AK00"
+        UNIQUE NULLS NOT DISTINCT (
+            "isActual", "generatedTime", "verifiedTime", "dataUnit", "dataSource", "dataLocation",
+            "dataSeries", "dataDatum", "latitude", "longitude", "ensembleMemberID"
+        ),
+
+    CONSTRAINT "inputs_dataUnit_fkey"
+        FOREIGN KEY ("dataUnit") REFERENCES public."ref_dataUnit" ("code"),
+
+    CONSTRAINT "inputs_dataSource_fkey"
+        FOREIGN KEY ("dataSource") REFERENCES public."ref_dataSource" ("code"),
+
+    CONSTRAINT "inputs_dataLocation_fkey"
+        FOREIGN KEY ("dataLocation") REFERENCES public."ref_dataLocation" ("code"),
+
+    CONSTRAINT "inputs_dataSeries_fkey"
+        FOREIGN KEY ("dataSeries") REFERENCES public."ref_dataSeries" ("code"),
+
+    CONSTRAINT "inputs_dataDatum_fkey"
+        FOREIGN KEY ("dataDatum") REFERENCES public."ref_dataDatum" ("code")
+'''
+
+# The indexes from 3.4 and 3.8, created on whichever inputs table is live
+STMT_CREATE_INPUTS_INDEXES = [
+    'CREATE INDEX idx_inputs_ordering ON inputs ("verifiedTime", "ensembleMemberID", "generatedTime" DESC);',
+    '''CREATE INDEX idx_inputs_series_lookup ON inputs (
+        "dataSource", "dataLocation", "dataSeries", "dataDatum", "verifiedTime", "ensembleMemberID", "generatedTime" DESC
+    );''',
+]
+
+
+class Migrator(IDatabaseMigration):
+
+    def update(self, databaseEngine: Engine) -> bool:
+        """This function updates the database to version 3.9.
+
+           :param databaseEngine: Engine - the engine of the database we are connecting to (semaphore)
+           :return: bool indicating successful update
+
+           Updates DB:
+            - Rename inputs to retired_inputs along with its constraints and indexes
+            - Create the partitioned inputs table, keeping the column order and the inputs_id_seq sequence
+            - Create the partition management functions
+            - Create monthly partitions from the oldest verified time through three months from now
+            - Copy every row into the partitioned table and drop retired_inputs
+        """
+        with databaseEngine.connect() as connection:
+
+            # Retire the plain table so the names are free for the partitioned one
+            connection.execute(text('ALTER TABLE public."inputs" RENAME TO "retired_inputs";'))
+            connection.execute(text(self.__rename_constraints_stmt('retired_inputs', 'retired_')))
+            connection.execute(text('ALTER INDEX IF EXISTS idx_inputs_ordering RENAME TO retired_idx_inputs_ordering;'))
+            connection.execute(text('ALTER INDEX IF EXISTS idx_inputs_series_lookup RENAME TO retired_idx_inputs_series_lookup;'))
+
+            # The primary key must include the partition key
+            connection.execute(text(f"""
+                CREATE TABLE public."inputs" (
+                    {INPUTS_COLUMN_DEFINITIONS}
+
+                    CONSTRAINT "inputs_pkey" PRIMARY KEY ("id", "verifiedTime"),
+
+                    {INPUTS_CONSTRAINT_DEFINITIONS}
+                ) PARTITION BY RANGE ("verifiedTime");
+            """))
+            for stmt in STMT_CREATE_INPUTS_INDEXES:
+                connection.execute(text(stmt))
+
+            connection.execute(text("""
+                CREATE OR REPLACE FUNCTION create_inputs_partitions(from_time TIMESTAMP, to_time TIMESTAMP) RETURNS INTEGER AS $$
+                DECLARE
+                    month_start TIMESTAMP := date_trunc('month', from_time);
+                    partition_name TEXT;
+                    created INTEGER := 0;
+                BEGIN
+                    -- Serialize creators so concurrent ingests can not race on the same month
+                    PERFORM pg_advisory_xact_lock(hashtext('create_inputs_partitions'));
+
+                    WHILE month_start <= to_time LOOP
+                        partition_name := 'inputs_' || to_char(month_start, 'YYYY_MM');
+                        IF to_regclass(format('public.%I', partition_name)) IS NULL THEN
+                            EXECUTE format(
+                                'CREATE TABLE public.%I PARTITION OF public.inputs FOR VALUES FROM (%L) TO (%L);',
+                                partition_name, month_start, month_start + INTERVAL '1 month'
+                            );
+                            created := created + 1;
+                        END IF;
+                        month_start := month_start + INTERVAL '1 month';
+                    END LOOP;
+
+                    RETURN created;
+                END;
+                $$ LANGUAGE plpgsql;
+            """))
+
+            connection.execute(text("""
+                CREATE OR REPLACE FUNCTION detach_inputs_partitions(before_time TIMESTAMP) RETURNS SETOF TEXT AS $$
+                DECLARE
+                    r RECORD;
+                BEGIN
+                    FOR r IN
+                        SELECT child.relname AS partition_name
+                        FROM pg_inherits
+                        JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+                        WHERE pg_inherits.inhparent = 'public.inputs'::regclass
+                        AND child.relname ~ '^inputs_[0-9]{4}_[0-9]{2}$'
+                        AND to_date(substr(child.relname, 8), 'YYYY_MM')::TIMESTAMP + INTERVAL '1 month' <= date_trunc('month', before_time)
+                        ORDER BY child.relname
+                    LOOP
+                        EXECUTE format('ALTER TABLE public.inputs DETACH PARTITION public.%I;', r.partition_name);
+                        EXECUTE format('ALTER TABLE public.%I RENAME TO %I;', r.partition_name, 'archived_' || r.partition_name);
+                        RETURN NEXT 'archived_' || r.partition_name;
+                    END LOOP;
+                END;
+                $$ LANGUAGE plpgsql;
+            """))
+
+            connection.execute(text("""
+                SELECT create_inputs_partitions(
+                    COALESCE((SELECT MIN("verifiedTime") FROM retired_inputs), now()::TIMESTAMP),
+                    GREATEST(
+                        COALESCE((SELECT MAX("verifiedTime") FROM retired_inputs), now()::TIMESTAMP),
+                        now()::TIMESTAMP + INTERVAL '3 months'
+                    )
+                );
+            """))
+
+            connection.execute(text(f"""
+                INSERT INTO public."inputs" ({INPUTS_COLUMNS})
+                SELECT {INPUTS_COLUMNS} FROM public."retired_inputs";
+            """))
+
+            # Hand the id sequence to the new table before the retired one (its old owner) is dropped
+            connection.execute(text('ALTER SEQUENCE public.inputs_id_seq OWNED BY public."inputs"."id";'))
+            connection.execute(text('DROP TABLE public."retired_inputs";'))
+            connection.execute(text('ANALYZE public."inputs";'))
+
+            connection.commit()
+        return True
+
+
+    def rollback(self, databaseEngine: Engine) -> bool:
+        """This function rolls the database back to version 3.8.
+
+           :param databaseEngine: Engine - the engine of the database we are connecting to (semaphore)
+           :return: bool indicating successful rollback
+
+           Rollback:
+            - Rename the partitioned inputs to partitioned_inputs along with its constraints and indexes
+            - Recreate the plain inputs table with its 3.8 constraints and indexes
+            - Copy every row back, then drop the partitioned table, its partitions and the partition functions
+            - Archived (detached) partitions are left in place
+        """
+        with databaseEngine.connect() as connection:
+
+            connection.execute(text('ALTER TABLE public."inputs" RENAME TO "partitioned_inputs";'))
+            connection.execute(text(self.__rename_constraints_stmt('partitioned_inputs', 'partitioned_')))
+            connection.execute(text('ALTER INDEX IF EXISTS idx_inputs_ordering RENAME TO partitioned_idx_inputs_ordering;'))
+            connection.execute(text('ALTER INDEX IF EXISTS idx_inputs_series_lookup RENAME TO partitioned_idx_inputs_series_lookup;'))
+
+            connection.execute(text(f"""
+                CREATE TABLE public."inputs" (
+                    {INPUTS_COLUMN_DEFINITIONS}
+
+                    CONSTRAINT "inputs_pkey" PRIMARY KEY ("id"),
+
+                    {INPUTS_CONSTRAINT_DEFINITIONS}
+                );
+            """))
+            for stmt in STMT_CREATE_INPUTS_INDEXES:
+                connection.execute(text(stmt))
+
+            connection.execute(text(f"""
+                INSERT INTO public."inputs" ({INPUTS_COLUMNS})
+                SELECT {INPUTS_COLUMNS} FROM public."partitioned_inputs";
+            """))
+
+            connection.execute(text('ALTER SEQUENCE public.inputs_id_seq OWNED BY public."inputs"."id";'))
+            connection.execute(text('DROP TABLE public."partitioned_inputs";'))
+            connection.execute(text('DROP FUNCTION IF EXISTS create_inputs_partitions(TIMESTAMP, TIMESTAMP);'))
+            connection.execute(text('DROP FUNCTION IF EXISTS detach_inputs_partitions(TIMESTAMP);'))
+            connection.execute(text('ANALYZE public."inputs";'))
+
+            connection.commit()
+        return True
+
+
+    def __rename_constraints_stmt(self, tableName: str, prefix: str) -> str:
+        """Builds a DO block that prefixes every constraint on a table, freeing the inputs_* names.
+
+           :param tableName: str - The (already renamed) table whose constraints are renamed
+           :param prefix: str - The prefix to add
+           :return: str - The statement to execute
+        """
+        return f"""
+            DO $$
+            DECLARE
+                r RECORD;
+            BEGIN
+                FOR r IN
+                    SELECT conname
+                    FROM pg_constraint
+                    WHERE conrelid = 'public."{tableName}"'::regclass
+                    AND conparentid = 0
+                LOOP
+                    IF r.conname NOT LIKE '{prefix}%' THEN
+                        EXECUTE format(
+                            'ALTER TABLE public."{tableName}" RENAME CONSTRAINT %I TO %I;',
+                            r.conname,
+                            '{prefix}' || r.conname
+                        );
+                    END IF;
+                END LOOP;
+            END $$;
+        """
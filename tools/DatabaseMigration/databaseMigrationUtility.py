@@ -26,27 +26,27 @@ class KeywordType(Enum):
 KEYWORD_DEPENDENT_TABLES = {
     KeywordType.DATA_UNIT:{
         "column_name": "dataUnit",
-        "primaries":["inputs", "outputs"],
+        "primaries":["inputs", "input_ensembles", "outputs"],
         "reference": "ref_dataUnit"
     },
     KeywordType.DATA_SOURCE:{
         "column_name": "dataSource",
-        "primaries":["inputs", "dataLocation_dataSource_mapping"],
+        "primaries":["inputs", "input_ensembles", "dataLocation_dataSource_mapping"],
         "reference": "ref_dataSource"
     },
     KeywordType.DATA_LOCATION:{
         "column_name": "dataLocation",
-        "primaries":["inputs", "outputs", "dataLocation_dataSource_mapping"],
+        "primaries":["inputs", "input_ensembles", "outputs", "dataLocation_dataSource_mapping"],
         "reference": "ref_dataLocation"
     },
     KeywordType.DATA_SERIES:{
         "column_name": "dataSeries",
-        "primaries":["inputs", "outputs"],
+        "primaries":["inputs", "input_ensembles", "outputs"],
         "reference": "ref_dataSeries"
     },
     KeywordType.DATA_DATUM:{
         "column_name": "dataDatum",
-        "primaries":["inputs", "outputs"],
+        "primaries":["inputs", "input_ensembles", "outputs"],
         "reference": "ref_dataDatum"
     }
 }
@@ -69,6 +69,10 @@ class DatabaseDeletionHelper():
             :param: tableName - str - The name of the table we want to delete from.
             :param: columnName - str - The name of the colum that the keyword is in. 
         """
+        # Tables added by later versions (e.g. input_ensembles in 3.10) do not exist when rolling back older versions
+        if tableName not in self.__metadata.tables:
+            return
+
         # In dataLocation_dataSource_mapping table the column names are different from the columns in the other tables
         processedColumnName = columnName if tableName != "dataLocation_dataSource_mapping" else f'{columnName}Code'
         
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+#export_series.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""
+Exports a model's outputs or an input series over a time range to CSV, for research and backfill checks over
+ranges too long to select at once.
+
+The rows are read through a server side cursor (see SQLAlchemyORM_Postgres.stream_output and stream_input) and
+written a chunk at a time, so memory stays bounded by --chunk_size no matter how long the range is.
+Output predictions and input ensembles are written as JSON arrays in the dataValue column.
+
+Command Line Arguments:
+    outputs --model_name
+        Export the outputs of a model, the model details are inferred the same way /output_time_span/ does.
+    inputs --source --series --location [--datum]
+        Export the latest generated value per verified time of an input series, the same rows select_input returns.
+        Nothing is ingested, only what is already in the database is exported.
+    --from_time --to_time
+        The time range (YYYYMMDDHH, UTC). For outputs it is the range of predicted times, for inputs of verified times.
+    --out (optional)
+        The CSV file to write, stdout when omitted.
+    --chunk_size (optional)
+        Rows fetched from the database at a time (default 100 for outputs and 10000 for inputs).
+
+Usage:
+    docker exec semaphore-core python3 tools/export_series.py outputs --model_name Bird-Island_Water-Temperature_102hr --from_time 2025010100 --to_time 2025070100 --out /tmp/bird_island.csv
+    docker exec semaphore-core python3 tools/export_series.py inputs --source NOAATANDC --series dWl --location packChan --datum MHHW --from_time 2024010100 --to_time 2025010100 --chunk_size 50000
+"""
+#----------------------------------
+#
+#
+#Imports
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.abspath(__file__)), '..', 'src'))
+
+import argparse
+import json
+from datetime import datetime, timezone
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from DataClasses import SeriesDescription, TimeDescription
+from SeriesStorage.ISeriesStorage import series_storage_factory, dispose_series_storage
+from SeriesStorage.OutputCodec import LazyOutputValue
+
+
+def parse_time(value: str) -> datetime:
+    """Parses a YYYYMMDDHH argument as a UTC datetime."""
+    return datetime.strptime(value, '%Y%m%d%H').replace(tzinfo=timezone.utc)
+
+
+def encode_value(value) -> str | float | None:
+    """Writes arrays (decoding lazy output values) and lists as JSON arrays, scalars are left as is."""
+    if isinstance(value, LazyOutputValue):
+        value = value.value
+    if isinstance(value, np.ndarray):
+        return json.dumps(value.tolist())
+    if isinstance(value, list):
+        return json.dumps(value)
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export outputs or inputs over a time range to CSV, streaming them from the database')
+    subparsers = parser.add_subparsers(dest='kind', required=True)
+
+    outputs_parser = subparsers.add_parser('outputs', help='Export the outputs of a model')
+    outputs_parser.add_argument('--model_name', type=str, required=True, help='The name of the model')
+    outputs_parser.add_argument('--chunk_size', type=int, default=100, help='Outputs fetched from the database at a time')
+
+    inputs_parser = subparsers.add_parser('inputs', help='Export an input series')
+    inputs_parser.add_argument('--source', type=str, required=True, help='dataSource of the series')
+    inputs_parser.add_argument('--series', type=str, required=True, help='dataSeries of the series')
+    inputs_parser.add_argument('--location', type=str, required=True, help='dataLocation of the series')
+    inputs_parser.add_argument('--datum', type=str, default=None, help='dataDatum of the series, omit for none')
+    inputs_parser.add_argument('--chunk_size', type=int, default=10000, help='Rows fetched from the database at a time')
+
+    for subparser in (outputs_parser, inputs_parser):
+        subparser.add_argument('--from_time', type=parse_time, required=True, help='Start of the range (YYYYMMDDHH, UTC)')
+        subparser.add_argument('--to_time', type=parse_time, required=True, help='End of the range (YYYYMMDDHH, UTC)')
+        subparser.add_argument('--out', type=str, default=None, help='The CSV file to write, stdout when omitted')
+    args = parser.parse_args()
+
+    storage = series_storage_factory()
+    if args.kind == 'outputs':
+        chunks = storage.stream_output(args.model_name, args.from_time, args.to_time, chunk_size=args.chunk_size, decode='eager')
+    else:
+        seriesDescription = SeriesDescription(args.source, args.series, args.location, args.datum)
+        chunks = storage.stream_input(seriesDescription, TimeDescription(args.from_time, args.to_time), chunk_size=args.chunk_size)
+
+    out = open(args.out, 'w', newline='') if args.out else sys.stdout
+    try:
+        rowCount = 0
+        for series in chunks:
+            df = series.dataFrame.copy()
+            df['dataValue'] = df['dataValue'].map(encode_value)
+            df.to_csv(out, header=(rowCount == 0), index=False)
+            rowCount += len(df)
+        print(f'Exported {rowCount} row(s)', file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        dispose_series_storage()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#input_partitions.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""
+Manages the monthly partitions of the inputs table (database version 3.9 and later).
+
+insert_input already creates the partition for any month it writes to, so this tool is only needed to
+create partitions ahead of time or to archive old months.
+
+Command Line Arguments:
+    --months_ahead (optional)
+        Create partitions from the current month through this many months ahead (default 3).
+    --detach_before (optional)
+        A date (YYYY-MM-DD). Every partition for a month entirely before this date's month is detached from
+        inputs and renamed to archived_inputs_YYYY_MM. Detaching does not rewrite the live table, the archived
+        tables keep their rows until they are dumped (pg_dump -t) and dropped. The ingestion_ledger entries starting
+        before that month are deleted with them, so those times are checked from the input rows again.
+
+Usage:
+    docker exec semaphore-core python3 tools/input_partitions.py --months_ahead 6
+    docker exec semaphore-core python3 tools/input_partitions.py --detach_before 2025-01-01
+"""
+#----------------------------------
+#
+#
+#Imports
+import sys
+from os import path
+sys.path.append(path.join(path.dirname(path.abspath(__file__)), '..', 'src'))
+
+import argparse
+from datetime import datetime, timezone
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from SeriesStorage.SS_Classes.SQLAlchemyORM_Postgres import SQLAlchemyORM_Postgres
+
+
+def add_months(time: datetime, months: int) -> datetime:
+    """Returns the first of the month `months` after the month of time."""
+    month_index = time.year * 12 + time.month - 1 + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the monthly partitions of the inputs table')
+    parser.add_argument('--months_ahead', type=int, default=3, help='Create partitions through this many months ahead')
+    parser.add_argument('--detach_before', type=str, required=False, help='Detach and archive partitions for months before this date (YYYY-MM-DD)')
+    args = parser.parse_args()
+
+    storage = SQLAlchemyORM_Postgres()
+    try:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        created = storage.create_input_partitions(add_months(now, 0), add_months(now, args.months_ahead))
+        print(f'Created {created} partition(s) through {add_months(now, args.months_ahead):%Y-%m}')
+
+        if args.detach_before:
+            try:
+                before_time = datetime.strptime(args.detach_before, '%Y-%m-%d')
+            except ValueError:
+                parser.error(f'Invalid date: {args.detach_before}. Expected format YYYY-MM-DD.')
+
+            archived = storage.detach_input_partitions(before_time)
+            for name in archived:
+                print(f'Detached {name}')
+            print(f'Detached {len(archived)} partition(s)')
+    finally:
+        SQLAlchemyORM_Postgres.dispose()
+
+
+if __name__ == '__main__':
+    main()
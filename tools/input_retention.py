@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#input_retention.py
+#----------------------------------
+# Created By: Op Team
+# Created Date: 10/18/2026
+# version 1.0
+#----------------------------------
+"""
+Prunes the superseded generations of inputs. Every TWC, NDFD, ... pull is kept for every verified time,
+but select_input only ever reads the latest generated time, so the older generations only grow the tables.
+
+Rows verified before the horizon are deleted when a later generation of the same series, verified time
+(and ensemble member) exists, from both inputs and input_ensembles. The latest generation is always kept,
+so nothing select_input or the staleness checks read is removed (see SQLAlchemyORM_Postgres.prune_superseded_inputs).
+Ingestion ledger entries verified entirely before the horizon are deleted as well (see prune_ingestion_ledger).
+The deletes run in small batches, one verified time window at a time, each in its own short transaction.
+
+Command Line Arguments:
+    --older_than_days (optional)
+        The horizon, only rows verified more than this many days ago are pruned (default 30).
+    --batch_size (optional)
+        The most rows deleted per transaction (default 10000).
+    --window_hours (optional)
+        The span of verified time each batch looks through (default 24).
+    --lock_timeout_ms (optional)
+        The longest a batch waits for a lock before its window is skipped until the next run (default 2000).
+    --archive_dir (optional)
+        A directory the pruned rows are exported to before they are deleted, one file per batch. Files are zstd
+        compressed Parquet when pyarrow or fastparquet is installed, gzip compressed CSV otherwise.
+    --vacuum (optional)
+        Run VACUUM (ANALYZE) on both tables afterwards so the freed space is reused.
+
+Usage:
+    docker exec semaphore-core python3 tools/input_retention.py --older_than_days 60
+    docker exec semaphore-core python3 tools/input_retention.py --older_than_days 30 --archive_dir /app/data/archive --vacuum
+"""
+#----------------------------------
+#
+#
+#Imports
+import sys
+from os import path, makedirs
+sys.path.append(path.join(path.dirname(path.abspath(__file__)), '..', 'src'))
+
+import argparse
+from datetime import datetime, timedelta, timezone
+from importlib.util import find_spec
+
+from dotenv import load_dotenv
+from pandas import DataFrame
+
+load_dotenv()
+
+from SeriesStorage.SS_Classes.SQLAlchemyORM_Postgres import SQLAlchemyORM_Postgres
+
+
+class BatchArchiver:
+    """Writes the rows of every pruned batch to its own file in a directory."""
+
+    def __init__(self, directory: str) -> None:
+        """
+        :param directory: str - The directory to write to, created if missing
+        """
+        makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.parquet = find_spec('pyarrow') is not None or find_spec('fastparquet') is not None
+        self.files = 0
+
+    def __call__(self, tableName: str, rows: DataFrame) -> None:
+        """Writes a batch. An exception raised here rolls the batch back, so rows are never deleted without their file."""
+        self.files += 1
+        name = f'{tableName}_{datetime.now(timezone.utc):%Y%m%dT%H%M%S}_{self.files:05d}'
+        if self.parquet:
+            rows.to_parquet(path.join(self.directory, f'{name}.parquet'), compression='zstd', index=False)
+        else:
+            rows.to_csv(path.join(self.directory, f'{name}.csv.gz'), compression='gzip', index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prune superseded generations of inputs verified before a horizon')
+    parser.add_argument('--older_than_days', type=float, default=30, help='Only prune rows verified more than this many days ago')
+    parser.add_argument('--batch_size', type=int, default=10000, help='The most rows deleted per transaction')
+    parser.add_argument('--window_hours', type=float, default=24, help='The span of verified time each batch looks through')
+    parser.add_argument('--lock_timeout_ms', type=int, default=2000, help='The longest a batch waits for a lock')
+    parser.add_argument('--archive_dir', type=str, required=False, help='Export the pruned rows to this directory before deleting them')
+    parser.add_argument('--vacuum', action='store_true', help='VACUUM (ANALYZE) both tables afterwards')
+    args = parser.parse_args()
+
+    if args.older_than_days < 0 or args.batch_size < 1 or args.window_hours <= 0:
+        parser.error('--older_than_days must not be negative, --batch_size and --window_hours must be positive')
+
+    archive = None
+    if args.archive_dir:
+        archive = BatchArchiver(args.archive_dir)
+        if not archive.parquet:
+            print('pyarrow and fastparquet are not installed, archiving as gzip compressed CSV')
+
+    storage = SQLAlchemyORM_Postgres()
+    try:
+        before_time = datetime.now(timezone.utc) - timedelta(days=args.older_than_days)
+        deleted = storage.prune_superseded_inputs(
+            before_time,
+            batch_size=args.batch_size,
+            window=timedelta(hours=args.window_hours),
+            archive=archive,
+            lock_timeout_ms=args.lock_timeout_ms
+        )
+        for tableName, count in deleted.items():
+            print(f'Deleted {count} superseded {tableName} row(s) verified before {before_time:%Y-%m-%d %H:%M}')
+        ledgerCount = storage.prune_ingestion_ledger(before_time)
+        print(f'Deleted {ledgerCount} ingestion_ledger entries verified before {before_time:%Y-%m-%d %H:%M}')
+        if archive is not None:
+            print(f'Archived to {archive.files} file(s) in {args.archive_dir}')
+
+        if args.vacuum:
+            storage.vacuum_input_tables()
+            print('Vacuumed inputs and input_ensembles')
+    finally:
+        SQLAlchemyORM_Postgres.dispose()
+
+
+if __name__ == '__main__':
+    main()